@@ -12,11 +12,13 @@ def __getattr__(name):
     """Lazy load submodules only when accessed"""
     if name in [
         "bedrock",
+        "chunking",
         "s3",
         "dynamodb",
         "appsync",
         "docs_service",
         "metrics",
+        "tracing",
         "image",
         "utils",
         "config",
@@ -48,11 +50,13 @@ def __getattr__(name):
 
 __all__ = [
     "bedrock",
+    "chunking",
     "s3",
     "dynamodb",
     "appsync",
     "docs_service",
     "metrics",
+    "tracing",
     "image",
     "utils",
     "config",
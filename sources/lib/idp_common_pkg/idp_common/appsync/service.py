@@ -11,11 +11,20 @@ storage and retrieval through AWS AppSync.
 import datetime
 import json
 import logging
-from typing import Any, Dict, Optional
+import os
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Union
 
 from idp_common.appsync.client import AppSyncClient
 from idp_common.appsync.mutations import CREATE_DOCUMENT, UPDATE_DOCUMENT
 from idp_common.models import Document, HitlMetadata, Page, Section, Status
+from idp_common.utils.status_updates import (
+    CONDITIONAL_CHECK_FAILED,
+    build_status_update,
+    get_coalescing_key,
+    get_workflow_status,
+    status_update_coalescer,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +41,7 @@ class DocumentAppSyncService:
         self,
         appsync_client: Optional[AppSyncClient] = None,
         api_url: Optional[str] = None,
+        tracking_table: Optional[str] = None,
     ):
         """
         Initialize the DocumentAppSyncService.
@@ -39,8 +49,13 @@ class DocumentAppSyncService:
         Args:
             appsync_client: Optional AppSyncClient instance. If not provided, a new one will be created.
             api_url: Optional AppSync API URL. Used only if appsync_client is not provided.
+            tracking_table: Optional name of the DynamoDB table behind the AppSync
+                API, used to coalesce status-only updates across invocations.
+                Defaults to the TRACKING_TABLE environment variable.
         """
         self.client = appsync_client or AppSyncClient(api_url=api_url)
+        self.tracking_table = tracking_table or os.environ.get("TRACKING_TABLE")
+        self._tracking_client = None
 
     def _document_to_create_input(
         self, document: Document, expires_after: Optional[int] = None
@@ -379,6 +394,118 @@ class DocumentAppSyncService:
         # Convert the response back to a Document object
         return self._appsync_to_document(result["updateDocument"])
 
+    def update_document_status(
+        self,
+        document: Document,
+        status: Optional[Status] = None,
+        wait: bool = True,
+    ) -> Union[bool, "Future[bool]"]:
+        """
+        Update only the status of a document in AppSync.
+
+        Unlike update_document, the mutation input holds only ObjectKey,
+        ObjectStatus, WorkflowStatus and WorkflowExecutionArn. When the tracking
+        table is known, the status is first set there with a conditional write,
+        and the mutation that notifies subscribers is only sent if the document
+        did not already have the status or a later in-progress status. This
+        way concurrent Map iterations reporting the same status send a single
+        mutation.
+
+        Args:
+            document: The document to update
+            status: The new status. Defaults to document.status.
+            wait: If False, the update is sent on a background thread and a
+                Future is returned; failures are logged instead of raised.
+
+        Returns:
+            Whether the status was sent, or a Future of it
+
+        Raises:
+            AppSyncError: If the GraphQL operation fails and wait is True
+        """
+        status = status or document.status
+        object_key = document.input_key
+        workflow_execution_arn = document.workflow_execution_arn
+
+        def send() -> bool:
+            if self.tracking_table and not self._claim_status(
+                object_key, status, workflow_execution_arn
+            ):
+                logger.info(
+                    f"Skipped status update of document {object_key}: status is "
+                    f"already {status.value} or later, or the document does not exist"
+                )
+                return False
+
+            input_data = {
+                "ObjectKey": object_key,
+                "ObjectStatus": status.value,
+                "WorkflowStatus": get_workflow_status(status),
+            }
+            if workflow_execution_arn:
+                input_data["WorkflowExecutionArn"] = workflow_execution_arn
+
+            # The full selection set is kept: subscribers receive the fields
+            # selected by the mutation and replace their copy of the document
+            self.client.execute_mutation(UPDATE_DOCUMENT, {"input": input_data})
+            logger.info(f"Updated status of document {object_key} to {status.value}")
+            return True
+
+        return status_update_coalescer.update(
+            get_coalescing_key(document), status, send, wait
+        )
+
+    def flush_status_updates(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for status updates sent with wait=False to finish.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+        """
+        status_update_coalescer.flush(timeout)
+
+    def _claim_status(
+        self,
+        object_key: str,
+        status: Status,
+        workflow_execution_arn: Optional[str] = None,
+    ) -> bool:
+        """
+        Set the status in the tracking table if it is not already set.
+
+        Args:
+            object_key: The object key of the document
+            status: The new status
+            workflow_execution_arn: Optional execution ARN to store with the status
+
+        Returns:
+            True if the status was changed, False if the condition failed
+        """
+        # Imported here to keep the AppSync module free of DynamoDB setup
+        # unless status updates are coalesced
+        from idp_common.dynamodb.client import DynamoDBClient, DynamoDBError
+
+        if self._tracking_client is None:
+            self._tracking_client = DynamoDBClient(table_name=self.tracking_table)
+
+        update_expression, condition_expression, names, values = build_status_update(
+            status, workflow_execution_arn
+        )
+        try:
+            self._tracking_client.update_item(
+                key={"PK": f"doc#{object_key}", "SK": "none"},
+                update_expression=update_expression,
+                expression_attribute_names=names,
+                expression_attribute_values=values,
+                return_values="NONE",
+                condition_expression=condition_expression,
+            )
+        except DynamoDBError as e:
+            if e.error_code == CONDITIONAL_CHECK_FAILED:
+                return False
+            raise
+        return True
+
     def calculate_ttl(self, days: int = 30) -> int:
         """
         Calculate a TTL timestamp for document expiration.
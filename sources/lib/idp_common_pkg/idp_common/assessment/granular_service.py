@@ -19,7 +19,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
-from idp_common import bedrock, image, metrics, s3, utils
+from idp_common import bedrock, image, metrics, s3, tracing, utils
 from idp_common.models import Document, Status
 from idp_common.utils import check_token_limit, extract_json_from_text
 
@@ -1220,13 +1220,12 @@ class GranularAssessmentService:
         # Fallback: use raw OCR data if text confidence is not available (for backward compatibility)
         if page.raw_text_uri:
             try:
-                from idp_common.ocr.service import OcrService
+                from idp_common.ocr.textract_blocks import (
+                    generate_text_confidence_data,
+                )
 
-                ocr_service = OcrService()
                 raw_ocr_data = s3.get_json_content(page.raw_text_uri)
-                text_confidence_data = ocr_service._generate_text_confidence_data(
-                    raw_ocr_data
-                )
+                text_confidence_data = generate_text_confidence_data(raw_ocr_data)
                 return json.dumps(text_confidence_data, indent=2)
             except Exception as e:
                 logger.warning(
@@ -1378,6 +1377,7 @@ class GranularAssessmentService:
 
         return enhanced_assessment
 
+    @tracing.traced("assessment.section")
     def process_document_section(self, document: Document, section_id: str) -> Document:
         """
         Process a single section from a Document object to assess extraction confidence using granular approach.
@@ -1403,6 +1403,7 @@ class GranularAssessmentService:
             logger.error("No document provided")
             return document
 
+        tracing.annotate(document_id=document.id, section_id=section_id)
         if not document.sections:
             logger.error("Document has no sections to process")
             document.errors.append("Document has no sections to process")
@@ -1611,7 +1612,7 @@ class GranularAssessmentService:
                         # Submit all uncached tasks
                         future_to_task = {
                             executor.submit(
-                                self._process_assessment_task,
+                                tracing.wrap(self._process_assessment_task),
                                 task,
                                 base_content,
                                 attributes,
@@ -19,7 +19,7 @@ import os
 import time
 from typing import Any, Dict, List
 
-from idp_common import bedrock, image, metrics, s3, utils
+from idp_common import bedrock, image, metrics, s3, tracing, utils
 from idp_common.models import Document
 from idp_common.utils import extract_json_from_text
 
@@ -572,13 +572,12 @@ class AssessmentService:
         # Fallback: use raw OCR data if text confidence is not available (for backward compatibility)
         if page.raw_text_uri:
             try:
-                from idp_common.ocr.service import OcrService
+                from idp_common.ocr.textract_blocks import (
+                    generate_text_confidence_data,
+                )
 
-                ocr_service = OcrService()
                 raw_ocr_data = s3.get_json_content(page.raw_text_uri)
-                text_confidence_data = ocr_service._generate_text_confidence_data(
-                    raw_ocr_data
-                )
+                text_confidence_data = generate_text_confidence_data(raw_ocr_data)
                 return json.dumps(text_confidence_data, indent=2)
             except Exception as e:
                 logger.warning(
@@ -730,6 +729,7 @@ class AssessmentService:
 
         return enhanced_assessment
 
+    @tracing.traced("assessment.section")
     def process_document_section(self, document: Document, section_id: str) -> Document:
         """
         Process a single section from a Document object to assess extraction confidence.
@@ -755,6 +755,7 @@ class AssessmentService:
             logger.error("No document provided")
             return document
 
+        tracing.annotate(document_id=document.id, section_id=section_id)
         if not document.sections:
             logger.error("Document has no sections to process")
             document.errors.append("Document has no sections to process")
@@ -4,6 +4,7 @@
 """Bedrock integration module for IDP Common package."""
 
 from .client import BedrockClient, invoke_model, default_client
+from .async_client import AsyncBedrockClient
 
 # Add version info
 __version__ = "0.1.0"
@@ -11,6 +12,7 @@ __version__ = "0.1.0"
 # Export the public API
 __all__ = [
     "BedrockClient",
+    "AsyncBedrockClient",
     "invoke_model",
     "default_client"
 ]
@@ -18,4 +20,4 @@ __all__ = [
 # Re-export key functions from the default client for backward compatibility
 extract_text_from_response = default_client.extract_text_from_response
 generate_embedding = default_client.generate_embedding
-format_prompt = default_client.format_prompt
\ No newline at end of file
+format_prompt = default_client.format_prompt
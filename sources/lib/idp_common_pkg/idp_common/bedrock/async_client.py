@@ -0,0 +1,319 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Async Bedrock client module for high-concurrency model invocation.
+
+This module provides an asyncio-native counterpart to BedrockClient. Requests
+share a single connection pool, the number of in-flight requests is bounded by
+a semaphore, and retry backoff uses asyncio.sleep so throttled requests do not
+hold a worker thread while they wait.
+
+When aiobotocore is installed (it is pulled in by s3fs for the
+criteria_validation extra) requests are sent on the event loop. Otherwise the
+synchronous boto3 client is driven from a dedicated thread pool sized to the
+concurrency limit.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from .client import (
+    DEFAULT_INITIAL_BACKOFF,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_MAX_RETRIES,
+    RETRYABLE_CONNECTION_EXCEPTIONS,
+    RETRYABLE_ERROR_CODES,
+    BedrockClient,
+)
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session as get_aio_session
+except ImportError:
+    # Fall back to the thread pool transport if aiobotocore is not available
+    AioConfig = None
+    get_aio_session = None
+
+logger = logging.getLogger(__name__)
+
+# Default maximum number of concurrent in-flight Bedrock requests
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+class AsyncBedrockClient:
+    """Asyncio client for invoking Amazon Bedrock models concurrently."""
+
+    def __init__(
+        self,
+        region: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        initial_backoff: float = DEFAULT_INITIAL_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        metrics_enabled: bool = True,
+        use_aiobotocore: Optional[bool] = None,
+    ):
+        """
+        Initialize an async Bedrock client.
+
+        Args:
+            region: AWS region (defaults to AWS_REGION env var)
+            max_concurrency: Maximum number of concurrent in-flight requests, also
+                used as the size of the shared connection pool
+            max_retries: Maximum number of retry attempts
+            initial_backoff: Initial backoff time in seconds
+            max_backoff: Maximum backoff time in seconds
+            metrics_enabled: Whether to publish metrics
+            use_aiobotocore: Force (True) or disable (False) the aiobotocore
+                transport. Defaults to using it when it is installed.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        # The synchronous client is reused for request building, backoff
+        # calculation, metrics and metering so both clients behave identically
+        self._sync_client = BedrockClient(
+            region=region,
+            max_retries=max_retries,
+            initial_backoff=initial_backoff,
+            max_backoff=max_backoff,
+            metrics_enabled=metrics_enabled,
+        )
+        self.region = self._sync_client.region
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+
+        if use_aiobotocore is None:
+            use_aiobotocore = get_aio_session is not None
+        elif use_aiobotocore and get_aio_session is None:
+            raise ImportError(
+                "aiobotocore is required for use_aiobotocore=True. "
+                "Install it with: pip install aiobotocore"
+            )
+        self.use_aiobotocore = use_aiobotocore
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client_lock: Optional[asyncio.Lock] = None
+        self._aio_client_context = None
+        self._aio_client = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._boto_client = None
+
+    async def __aenter__(self) -> "AsyncBedrockClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def _client_config(self) -> Dict[str, Any]:
+        """Connection settings shared by both transports."""
+        return {
+            "connect_timeout": 10,
+            # allow plenty of time for large extraction or assessment inferences
+            "read_timeout": 300,
+            "max_pool_connections": self.max_concurrency,
+        }
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Create the concurrency semaphore lazily inside the running event loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _get_aio_client(self):
+        """Create the shared aiobotocore client on first use."""
+        if self._aio_client is None:
+            if self._client_lock is None:
+                self._client_lock = asyncio.Lock()
+            async with self._client_lock:
+                if self._aio_client is None:
+                    session = get_aio_session()
+                    self._aio_client_context = session.create_client(
+                        "bedrock-runtime",
+                        region_name=self.region,
+                        config=AioConfig(**self._client_config()),
+                    )
+                    self._aio_client = await self._aio_client_context.__aenter__()
+        return self._aio_client
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the dedicated thread pool and boto3 client on first use."""
+        if self._executor is None:
+            self._boto_client = boto3.client(
+                "bedrock-runtime",
+                region_name=self.region,
+                config=Config(**self._client_config()),
+            )
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="bedrock-async",
+            )
+        return self._executor
+
+    async def _converse(self, converse_params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a single converse request without retries.
+
+        Args:
+            converse_params: Parameters for the Bedrock converse API call
+
+        Returns:
+            Raw converse API response
+        """
+        if self.use_aiobotocore:
+            client = await self._get_aio_client()
+            return await client.converse(**converse_params)
+
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, lambda: self._boto_client.converse(**converse_params)
+        )
+
+    async def invoke_model(
+        self,
+        model_id: str,
+        system_prompt: Union[str, List[Dict[str, str]]],
+        content: List[Dict[str, Any]],
+        temperature: Union[float, str] = 0.0,
+        top_k: Optional[Union[float, str]] = 5,
+        top_p: Optional[Union[float, str]] = 0.1,
+        max_tokens: Optional[Union[int, str]] = None,
+        max_retries: Optional[int] = None,
+        context: str = "Unspecified",
+    ) -> Dict[str, Any]:
+        """
+        Invoke a Bedrock model with async retry logic.
+
+        The concurrency semaphore is held only while a request is in flight, so
+        requests that are backing off do not block other callers.
+
+        Args:
+            model_id: The Bedrock model ID (e.g., 'anthropic.claude-3-sonnet-20240229-v1:0')
+            system_prompt: The system prompt as string or list of content objects
+            content: The content for the user message (can include text and images)
+            temperature: The temperature parameter for model inference (float or string)
+            top_k: Optional top_k parameter (float or string)
+            top_p: Optional top_p parameter (float or string)
+            max_tokens: Optional max_tokens parameter (int or string)
+            max_retries: Optional override for the instance's max_retries setting
+            context: Context prefix for metering key
+
+        Returns:
+            Bedrock response object with metering information
+        """
+        sync_client = self._sync_client
+        sync_client._put_metric("BedrockRequestsTotal", 1)
+
+        effective_max_retries = (
+            max_retries if max_retries is not None else self.max_retries
+        )
+
+        converse_params = sync_client.build_converse_params(
+            model_id=model_id,
+            system_prompt=system_prompt,
+            content=content,
+            temperature=temperature,
+            top_k=top_k,
+            top_p=top_p,
+            max_tokens=max_tokens,
+        )
+
+        request_start_time = time.time()
+        retry_count = 0
+
+        while True:
+            try:
+                async with self._get_semaphore():
+                    logger.info(
+                        f"Async Bedrock request attempt {retry_count + 1}/{effective_max_retries} "
+                        f"for model {converse_params['modelId']}"
+                    )
+                    attempt_start_time = time.time()
+                    response = await self._converse(converse_params)
+                    duration = time.time() - attempt_start_time
+
+                return sync_client._handle_successful_response(
+                    model_id=model_id,
+                    response=response,
+                    duration=duration,
+                    retry_count=retry_count,
+                    request_start_time=request_start_time,
+                    context=context,
+                )
+
+            except ClientError as e:
+                error_code = e.response["Error"]["Code"]
+                error_message = e.response["Error"]["Message"]
+
+                if error_code not in RETRYABLE_ERROR_CODES:
+                    logger.error(
+                        f"Non-retryable Bedrock error: {error_code} - {error_message}"
+                    )
+                    sync_client._put_metric("BedrockRequestsFailed", 1)
+                    sync_client._put_metric("BedrockNonRetryableErrors", 1)
+                    raise
+
+                sync_client._put_metric("BedrockThrottles", 1)
+                reason = "throttling"
+                last_exception = e
+
+            except RETRYABLE_CONNECTION_EXCEPTIONS as e:
+                error_message = str(e)
+                sync_client._put_metric("BedrockTimeouts", 1)
+                reason = "timeout"
+                last_exception = e
+
+            except Exception as e:
+                logger.error(f"Unexpected Bedrock error: {str(e)}", exc_info=True)
+                sync_client._put_metric("BedrockRequestsFailed", 1)
+                sync_client._put_metric("BedrockUnexpectedErrors", 1)
+                raise
+
+            if retry_count >= effective_max_retries:
+                logger.error(
+                    f"Max retries ({effective_max_retries}) exceeded. Last error: {error_message}"
+                )
+                sync_client._put_metric("BedrockRequestsFailed", 1)
+                sync_client._put_metric("BedrockMaxRetriesExceeded", 1)
+                raise last_exception
+
+            backoff = sync_client._calculate_backoff(retry_count)
+            logger.warning(
+                f"Bedrock {reason} occurred (attempt {retry_count + 1}/{effective_max_retries}). "
+                f"Error: {error_message}. "
+                f"Backing off for {backoff:.2f}s"
+            )
+            await asyncio.sleep(backoff)
+            retry_count += 1
+
+    def extract_text_from_response(self, response: Dict[str, Any]) -> str:
+        """
+        Extract text from a Bedrock response.
+
+        Args:
+            response: Bedrock response object
+
+        Returns:
+            Extracted text content
+        """
+        return self._sync_client.extract_text_from_response(response)
+
+    async def close(self) -> None:
+        """Release the shared connection pool and any worker threads."""
+        if self._aio_client_context is not None:
+            await self._aio_client_context.__aexit__(None, None, None)
+            self._aio_client_context = None
+            self._aio_client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._boto_client = None
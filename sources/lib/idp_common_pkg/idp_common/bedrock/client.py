@@ -20,6 +20,7 @@ from typing import Dict, Any, List, Optional, Union, Tuple
 from botocore.config import Config
 from botocore.exceptions import ClientError, ReadTimeoutError, ConnectTimeoutError, EndpointConnectionError
 from urllib3.exceptions import ReadTimeoutError as Urllib3ReadTimeoutError
+from idp_common import tracing
 try:
     from requests.exceptions import ReadTimeout as RequestsReadTimeout, ConnectTimeout as RequestsConnectTimeout
 except ImportError:
@@ -34,6 +35,24 @@ DEFAULT_MAX_RETRIES = 7
 DEFAULT_INITIAL_BACKOFF = 2  # seconds
 DEFAULT_MAX_BACKOFF = 300    # 5 minutes
 
+# Converse error codes that are retried with exponential backoff
+RETRYABLE_ERROR_CODES = [
+    'ThrottlingException', 
+    'ServiceQuotaExceededException', 
+    'RequestLimitExceeded', 
+    'TooManyRequestsException', 
+    'ServiceUnavailableException',
+    'ModelErrorException',
+    'RequestTimeout',
+    'RequestTimeoutException'
+]
+
+# Timeout and connection exceptions that are retried with exponential backoff
+RETRYABLE_CONNECTION_EXCEPTIONS = (
+    ReadTimeoutError, ConnectTimeoutError, EndpointConnectionError,
+    Urllib3ReadTimeoutError, RequestsReadTimeout, RequestsConnectTimeout
+)
+
 
 # Models that support cachePoint functionality
 CACHEPOINT_SUPPORTED_MODELS = [
@@ -221,6 +240,62 @@ class BedrockClient:
         # Use instance max_retries if not overridden
         effective_max_retries = max_retries if max_retries is not None else self.max_retries
         
+        with tracing.span('bedrock.invoke_model', model_id=model_id, context=context):
+            with tracing.span('bedrock.build_request'):
+                converse_params = self.build_converse_params(
+                    model_id=model_id,
+                    system_prompt=system_prompt,
+                    content=content,
+                    temperature=temperature,
+                    top_k=top_k,
+                    top_p=top_p,
+                    max_tokens=max_tokens
+                )
+            
+            # Start timing the entire request
+            request_start_time = time.time()
+            
+            # Call the recursive retry function
+            result = self._invoke_with_retry(
+                model_id=model_id,
+                converse_params=converse_params,
+                retry_count=0,
+                max_retries=effective_max_retries,
+                request_start_time=request_start_time,
+                context=context
+            )
+        
+        return result
+
+    def build_converse_params(
+        self,
+        model_id: str,
+        system_prompt: Union[str, List[Dict[str, str]]],
+        content: List[Dict[str, Any]],
+        temperature: Union[float, str] = 0.0,
+        top_k: Optional[Union[float, str]] = 5,
+        top_p: Optional[Union[float, str]] = 0.1,
+        max_tokens: Optional[Union[int, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the parameters for a Bedrock converse API call.
+        
+        Handles cachePoint tags, inference parameter type conversion, model-specific
+        request fields and guardrail configuration. Shared by the synchronous and
+        asynchronous clients so both send identical requests.
+        
+        Args:
+            model_id: The Bedrock model ID (e.g., 'anthropic.claude-3-sonnet-20240229-v1:0')
+            system_prompt: The system prompt as string or list of content objects
+            content: The content for the user message (can include text and images)
+            temperature: The temperature parameter for model inference (float or string)
+            top_k: Optional top_k parameter (float or string)
+            top_p: Optional top_p parameter (float or string)
+            max_tokens: Optional max_tokens parameter (int or string)
+            
+        Returns:
+            Dictionary of keyword arguments for the converse API
+        """
         # Format system prompt if needed
         if isinstance(system_prompt, str):
             formatted_system_prompt = [{"text": system_prompt}]
@@ -355,20 +430,7 @@ class BedrockClient:
         if guardrail_config:
             converse_params["guardrailConfig"] = guardrail_config
         
-        # Start timing the entire request
-        request_start_time = time.time()
-        
-        # Call the recursive retry function
-        result = self._invoke_with_retry(
-            model_id=model_id,
-            converse_params=converse_params,
-            retry_count=0,
-            max_retries=effective_max_retries,
-            request_start_time=request_start_time,
-            context=context
-        )
-        
-        return result
+        return converse_params
 
     def _invoke_with_retry(
         self,
@@ -418,69 +480,32 @@ class BedrockClient:
             attempt_start_time = time.time()
 
             # Make the API call
-            response = self.client.converse(**converse_params)
+            with tracing.span('bedrock.converse', attempt=retry_count + 1) as span:
+                response = self.client.converse(**converse_params)
+                usage = response.get('usage') or {}
+                span.set_attributes(
+                    input_tokens=usage.get('inputTokens'),
+                    output_tokens=usage.get('outputTokens'),
+                )
             
             # Calculate duration
             duration = time.time() - attempt_start_time
             
-            # Log response details, but sanitize large content
-            sanitized_response = self._sanitize_response_for_logging(response)
-            logger.info(f"Bedrock request successful after {retry_count + 1} attempts. Duration: {duration:.2f}s")
-            logger.debug(f"Response: {sanitized_response}")
-            logger.info(f"Token Usage: {response.get('usage')}")
-            # Track successful requests and latency
-            self._put_metric('BedrockRequestsSucceeded', 1)
-            self._put_metric('BedrockRequestLatency', duration * 1000, 'Milliseconds')
-            if retry_count > 0:
-                self._put_metric('BedrockRetrySuccess', 1)
-            
-            # Track token usage
-            if 'usage' in response:
-                inputTokens = response['usage'].get('inputTokens', 0)
-                outputTokens = response['usage'].get('outputTokens', 0)
-                total_tokens = response['usage'].get('totalTokens', 0)
-                cacheReadInputTokens = response['usage'].get('cacheReadInputTokens', 0)
-                cacheWriteInputTokens = response['usage'].get('cacheWriteInputTokens', 0)
-                self._put_metric('InputTokens', inputTokens)
-                self._put_metric('OutputTokens', outputTokens)
-                self._put_metric('TotalTokens', total_tokens)
-                self._put_metric('CacheReadInputTokens', cacheReadInputTokens)
-                self._put_metric('CacheWriteInputTokens', cacheWriteInputTokens)
-            
-            # Calculate total duration
-            total_duration = time.time() - request_start_time
-            self._put_metric('BedrockTotalLatency', total_duration * 1000, 'Milliseconds')
-            
-            # Create metering data
-            usage = response.get('usage', {})
-            response_with_metering = {
-                "response": response,
-                "metering": {
-                    f"{context}/bedrock/{model_id}": {
-                        **usage
-                    }
-                }
-            }
-            
-            return response_with_metering
+            return self._handle_successful_response(
+                model_id=model_id,
+                response=response,
+                duration=duration,
+                retry_count=retry_count,
+                request_start_time=request_start_time,
+                context=context
+            )
             
         except ClientError as e:
             # Handle boto3/botocore client errors (have response structure)
             error_code = e.response['Error']['Code']
             error_message = e.response['Error']['Message']
             
-            retryable_errors = [
-                'ThrottlingException', 
-                'ServiceQuotaExceededException', 
-                'RequestLimitExceeded', 
-                'TooManyRequestsException', 
-                'ServiceUnavailableException',
-                'ModelErrorException',
-                'RequestTimeout',
-                'RequestTimeoutException'
-            ]
-            
-            if error_code in retryable_errors:
+            if error_code in RETRYABLE_ERROR_CODES:
                 self._put_metric('BedrockThrottles', 1)
                 
                 # Check if we've reached max retries
@@ -497,7 +522,8 @@ class BedrockClient:
                              f"Backing off for {backoff:.2f}s")
                 
                 # Sleep for backoff period
-                time.sleep(backoff)
+                with tracing.span('retry.sleep', backoff_s=round(backoff, 3), reason=error_code):
+                    time.sleep(backoff)
                 
                 # Recursive call with incremented retry count
                 return self._invoke_with_retry(
@@ -515,8 +541,7 @@ class BedrockClient:
                 self._put_metric('BedrockNonRetryableErrors', 1)
                 raise
                 
-        except (ReadTimeoutError, ConnectTimeoutError, EndpointConnectionError, 
-                Urllib3ReadTimeoutError, RequestsReadTimeout, RequestsConnectTimeout) as e:
+        except RETRYABLE_CONNECTION_EXCEPTIONS as e:
             # Handle timeout and connection errors (these are retryable)
             error_message = str(e)
             
@@ -536,7 +561,8 @@ class BedrockClient:
                          f"Backing off for {backoff:.2f}s")
             
             # Sleep for backoff period
-            time.sleep(backoff)
+            with tracing.span('retry.sleep', backoff_s=round(backoff, 3), reason=type(e).__name__):
+                time.sleep(backoff)
             
             # Recursive call with incremented retry count
             return self._invoke_with_retry(
@@ -557,6 +583,69 @@ class BedrockClient:
             self._put_metric('BedrockUnexpectedErrors', 1)
             raise
 
+    def _handle_successful_response(
+        self,
+        model_id: str,
+        response: Dict[str, Any],
+        duration: float,
+        retry_count: int,
+        request_start_time: float,
+        context: str = "Unspecified"
+    ) -> Dict[str, Any]:
+        """
+        Log, publish metrics for, and attach metering data to a successful response.
+        
+        Args:
+            model_id: The Bedrock model ID used for the request
+            response: Raw converse API response
+            duration: Duration of the successful attempt in seconds
+            retry_count: Number of retries before the successful attempt
+            request_start_time: Time when the original request started
+            context: Context prefix for metering key
+            
+        Returns:
+            Bedrock response object with metering information
+        """
+        # Log response details, but sanitize large content
+        sanitized_response = self._sanitize_response_for_logging(response)
+        logger.info(f"Bedrock request successful after {retry_count + 1} attempts. Duration: {duration:.2f}s")
+        logger.debug(f"Response: {sanitized_response}")
+        logger.info(f"Token Usage: {response.get('usage')}")
+        # Track successful requests and latency
+        self._put_metric('BedrockRequestsSucceeded', 1)
+        self._put_metric('BedrockRequestLatency', duration * 1000, 'Milliseconds')
+        if retry_count > 0:
+            self._put_metric('BedrockRetrySuccess', 1)
+        
+        # Track token usage
+        if 'usage' in response:
+            inputTokens = response['usage'].get('inputTokens', 0)
+            outputTokens = response['usage'].get('outputTokens', 0)
+            total_tokens = response['usage'].get('totalTokens', 0)
+            cacheReadInputTokens = response['usage'].get('cacheReadInputTokens', 0)
+            cacheWriteInputTokens = response['usage'].get('cacheWriteInputTokens', 0)
+            self._put_metric('InputTokens', inputTokens)
+            self._put_metric('OutputTokens', outputTokens)
+            self._put_metric('TotalTokens', total_tokens)
+            self._put_metric('CacheReadInputTokens', cacheReadInputTokens)
+            self._put_metric('CacheWriteInputTokens', cacheWriteInputTokens)
+        
+        # Calculate total duration
+        total_duration = time.time() - request_start_time
+        self._put_metric('BedrockTotalLatency', total_duration * 1000, 'Milliseconds')
+        
+        # Create metering data
+        usage = response.get('usage', {})
+        response_with_metering = {
+            "response": response,
+            "metering": {
+                f"{context}/bedrock/{model_id}": {
+                    **usage
+                }
+            }
+        }
+        
+        return response_with_metering
     
     def get_guardrail_config(self) -> Optional[Dict[str, str]]:
         """
@@ -665,12 +754,13 @@ class BedrockClient:
             logger.debug(f"  - input text length: {len(normalized_text)} characters")
             
             attempt_start_time = time.time()
-            response = self.client.invoke_model(
-                modelId=model_id,
-                contentType="application/json",
-                accept="application/json",
-                body=request_body
-            )
+            with tracing.span('bedrock.invoke_embedding', model_id=model_id, attempt=retry_count + 1):
+                response = self.client.invoke_model(
+                    modelId=model_id,
+                    contentType="application/json",
+                    accept="application/json",
+                    body=request_body
+                )
             duration = time.time() - attempt_start_time
             
             # Extract the embedding vector from response
@@ -723,7 +813,8 @@ class BedrockClient:
                             f"Backing off for {backoff:.2f}s")
                 
                 # Sleep for backoff period
-                time.sleep(backoff)
+                with tracing.span('retry.sleep', backoff_s=round(backoff, 3), reason=error_code):
+                    time.sleep(backoff)
                 
                 # Recursive call with incremented retry count
                 return self._generate_embedding_with_retry(
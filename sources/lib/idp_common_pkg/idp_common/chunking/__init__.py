@@ -0,0 +1,23 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Chunking module for IDP documents.
+
+This module provides token counting and boundary-aware text chunking shared by
+services that need to fit long documents into model context windows.
+"""
+
+from idp_common.chunking.chunker import (
+    PAGE_MARKER_PATTERN,
+    TextChunk,
+    TextChunker,
+    TokenCounter,
+)
+
+__all__ = [
+    "PAGE_MARKER_PATTERN",
+    "TextChunk",
+    "TextChunker",
+    "TokenCounter",
+]
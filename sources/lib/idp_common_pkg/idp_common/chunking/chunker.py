@@ -0,0 +1,459 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Token-aware text chunking for long documents.
+
+This module splits document text into chunks that fit a token budget while
+respecting page, paragraph, line and sentence boundaries, with deterministic
+overlap between consecutive chunks. Chunks can be produced from a complete
+string or streamed from an iterable of pages so that long documents do not
+need to be materialized twice.
+"""
+
+import logging
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+logger = logging.getLogger(__name__)
+
+# Page marker used when page texts are concatenated for LLM prompts
+PAGE_MARKER_PATTERN = re.compile(r"<page-number>(.*?)</page-number>")
+
+# Word, number and punctuation pieces used by the heuristic token estimate
+_TOKEN_PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+# Zero-width separators tried in order when a paragraph alone exceeds the
+# token budget. Splitting never drops characters, so joined pieces reproduce
+# the original text exactly.
+_SPLIT_PATTERNS = [
+    re.compile(r"(?<=\n)"),  # lines (keeps table rows intact)
+    re.compile(r"(?<=[.!?][ \t])"),  # sentences
+    re.compile(r"(?<=\s)"),  # words
+]
+
+# Paragraph boundary: after a blank line
+_PARAGRAPH_PATTERN = re.compile(r"(?<=\n\n)")
+
+PageInput = Union[str, Tuple[Optional[str], str]]
+
+
+class TokenCounter:
+    """
+    Estimate token counts for text sent to LLMs.
+
+    By default counts are estimated from word, number and punctuation pieces,
+    which tracks BPE tokenizers far more closely than a flat characters-per-token
+    ratio on prose, tables and identifiers alike. The estimate can be scaled,
+    calibrated against the input token counts Bedrock reports for the prompts
+    sent, or replaced entirely by a real tokenizer callable.
+    """
+
+    # Characters per token for alphabetic runs; short words are a single token
+    WORD_CHARS_PER_TOKEN = 6
+    # Digits per token for numeric runs
+    DIGITS_PER_TOKEN = 3
+
+    def __init__(
+        self,
+        tokenizer: Optional[Callable[[str], Union[int, Sequence[int]]]] = None,
+        scale: float = 1.0,
+        calibrate_from_usage: bool = False,
+    ):
+        """
+        Initialize the token counter.
+
+        Args:
+            tokenizer: Optional callable returning either a token count or a
+                sequence of token ids for a text (e.g. a tiktoken encoder's encode)
+            scale: Multiplier applied to heuristic estimates
+            calibrate_from_usage: Whether record_usage calibrates the scale
+        """
+        if scale <= 0:
+            raise ValueError("scale must be positive")
+        self.tokenizer = tokenizer
+        self.scale = scale
+        self.calibrate_from_usage = calibrate_from_usage
+        self._calibration_estimate = 0.0
+        self._calibration_actual = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[Dict[str, Any]] = None, chars_per_token: float = 0
+    ) -> "TokenCounter":
+        """
+        Create a token counter from a token_counter configuration section.
+
+        Args:
+            config: Optional settings: scale (default 1.0), calibrate (default
+                True) and chars_per_token, which replaces the heuristic with a
+                flat characters-per-token ratio
+            chars_per_token: Characters-per-token ratio used when the
+                configuration does not set one (0 uses the heuristic)
+
+        Returns:
+            TokenCounter
+        """
+        from idp_common.utils import normalize_boolean_value
+
+        config = config or {}
+        chars_per_token = float(config.get("chars_per_token") or chars_per_token)
+        tokenizer = None
+        if chars_per_token > 0:
+
+            def tokenizer(text: str) -> int:
+                return int(math.ceil(len(text) / chars_per_token))
+
+        return cls(
+            tokenizer=tokenizer,
+            scale=float(config.get("scale", 1.0)),
+            calibrate_from_usage=normalize_boolean_value(config.get("calibrate", True)),
+        )
+
+    def _estimate(self, text: str) -> float:
+        """Unscaled heuristic token estimate."""
+        tokens = 0
+        for piece in _TOKEN_PIECE_PATTERN.findall(text):
+            if piece[0].isalpha():
+                tokens += math.ceil(len(piece) / self.WORD_CHARS_PER_TOKEN)
+            elif piece[0].isdigit():
+                tokens += math.ceil(len(piece) / self.DIGITS_PER_TOKEN)
+            else:
+                tokens += 1
+        return tokens
+
+    def count(self, text: str) -> int:
+        """
+        Count (or estimate) the number of tokens in a text.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Token count
+        """
+        if not text:
+            return 0
+        if self.tokenizer is not None:
+            result = self.tokenizer(text)
+            return result if isinstance(result, int) else len(result)
+        return int(math.ceil(self._estimate(text) * self.scale))
+
+    def calibrate(self, text: str, actual_tokens: int) -> float:
+        """
+        Adjust the heuristic scale from an observed token count.
+
+        The scale becomes the ratio of all observed token counts to the
+        heuristic estimates of their texts, so repeated calls converge on the
+        model's tokenizer.
+
+        Args:
+            text: Text that was sent to the model
+            actual_tokens: Token count reported by the model
+
+        Returns:
+            The updated scale
+        """
+        estimate = self._estimate(text)
+        if self.tokenizer is not None or estimate <= 0 or actual_tokens <= 0:
+            return self.scale
+        with self._lock:
+            self._calibration_estimate += estimate
+            self._calibration_actual += actual_tokens
+            self.scale = self._calibration_actual / self._calibration_estimate
+        logger.debug(f"Calibrated token counter scale to {self.scale:.3f}")
+        return self.scale
+
+    def record_usage(self, text: str, usage: Optional[Dict[str, Any]]) -> None:
+        """
+        Calibrate from the usage Bedrock reported for a prompt, if enabled.
+
+        Args:
+            text: Text of the prompt, including the system prompt
+            usage: Bedrock usage with inputTokens and, with prompt caching,
+                cacheReadInputTokens and cacheWriteInputTokens
+        """
+        if not self.calibrate_from_usage or not usage:
+            return
+        actual_tokens = sum(
+            int(usage.get(key) or 0)
+            for key in ("inputTokens", "cacheReadInputTokens", "cacheWriteInputTokens")
+        )
+        self.calibrate(text, actual_tokens)
+
+
+@dataclass
+class TextChunk:
+    """A chunk of document text produced by TextChunker."""
+
+    text: str
+    token_count: int
+    index: int
+    page_ids: List[str] = field(default_factory=list)
+    """Pages that contribute text to this chunk, in document order."""
+
+
+@dataclass
+class _Unit:
+    """Smallest piece of text that is never split across chunks."""
+
+    text: str
+    tokens: int
+    page_id: Optional[str]
+
+
+class TextChunker:
+    """
+    Split text into token-bounded chunks on natural boundaries.
+
+    Pages are kept whole when they fit in the remaining budget of a chunk,
+    otherwise chunks break between paragraphs. Paragraphs that exceed the
+    budget on their own are split by lines, then sentences, then words.
+    Consecutive chunks share trailing paragraphs of up to overlap_tokens,
+    so the overlap always starts on a boundary and is identical across runs.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        overlap_tokens: int = 0,
+        token_counter: Optional[TokenCounter] = None,
+        page_break_threshold: float = 0.5,
+    ):
+        """
+        Initialize the chunker.
+
+        Args:
+            max_tokens: Maximum tokens per chunk
+            overlap_tokens: Maximum tokens repeated from the end of one chunk at
+                the start of the next
+            token_counter: Token counter to use (defaults to the heuristic counter)
+            page_break_threshold: Fraction of max_tokens a chunk must already hold
+                before a page that does not fit is moved to the next chunk
+                instead of being split
+        """
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if overlap_tokens < 0 or overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens must be between 0 and max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.token_counter = token_counter or TokenCounter()
+        self.page_break_threshold = page_break_threshold
+
+    @classmethod
+    def from_overlap_percentage(
+        cls,
+        max_tokens: int,
+        overlap_percentage: float,
+        token_counter: Optional[TokenCounter] = None,
+    ) -> "TextChunker":
+        """
+        Create a chunker whose overlap is a percentage of the chunk size.
+
+        Args:
+            max_tokens: Maximum tokens per chunk
+            overlap_percentage: Overlap between chunks as a percentage of max_tokens
+            token_counter: Token counter to use
+
+        Returns:
+            TextChunker instance
+        """
+        overlap_tokens = int(max_tokens * (overlap_percentage / 100))
+        return cls(
+            max_tokens=max_tokens,
+            overlap_tokens=min(overlap_tokens, max_tokens - 1),
+            token_counter=token_counter,
+        )
+
+    @staticmethod
+    def split_pages(text: str) -> List[Tuple[Optional[str], str]]:
+        """
+        Split text on <page-number> markers into (page_id, page_text) pairs.
+
+        The marker stays at the start of its page text so joining the page texts
+        reproduces the input. Text without markers is returned as a single page.
+
+        Args:
+            text: Text to split
+
+        Returns:
+            List of (page_id, page_text) tuples
+        """
+        matches = list(PAGE_MARKER_PATTERN.finditer(text))
+        if not matches:
+            return [(None, text)] if text else []
+
+        pages = []
+        if matches[0].start() > 0:
+            pages.append((None, text[: matches[0].start()]))
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            pages.append((match.group(1).strip(), text[match.start() : end]))
+        return pages
+
+    def _split_oversized(
+        self, text: str, tokens: int, level: int = 0
+    ) -> List[Tuple[str, int]]:
+        """Split text that exceeds max_tokens using progressively finer separators."""
+        if tokens <= self.max_tokens:
+            return [(text, tokens)]
+
+        if level >= len(_SPLIT_PATTERNS):
+            # No boundary left: fall back to an even character split
+            pieces = math.ceil(tokens / self.max_tokens)
+            size = math.ceil(len(text) / pieces)
+            return [
+                (text[i : i + size], self.token_counter.count(text[i : i + size]))
+                for i in range(0, len(text), size)
+            ]
+
+        parts = [p for p in _SPLIT_PATTERNS[level].split(text) if p]
+        if len(parts) <= 1:
+            return self._split_oversized(text, tokens, level + 1)
+
+        # Greedily pack parts, summing per-part counts to stay linear in text size
+        pieces: List[Tuple[str, int]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for part in parts:
+            for sub_part, sub_tokens in self._split_oversized(
+                part, self.token_counter.count(part), level + 1
+            ):
+                if current and current_tokens + sub_tokens > self.max_tokens:
+                    pieces.append(("".join(current), current_tokens))
+                    current, current_tokens = [], 0
+                current.append(sub_part)
+                current_tokens += sub_tokens
+        if current:
+            pieces.append(("".join(current), current_tokens))
+        return pieces
+
+    def _page_units(self, page_id: Optional[str], text: str) -> List[_Unit]:
+        """Break a page into paragraph units that each fit within max_tokens."""
+        units = []
+        for paragraph in _PARAGRAPH_PATTERN.split(text):
+            if not paragraph:
+                continue
+            tokens = self.token_counter.count(paragraph)
+            for piece, piece_tokens in self._split_oversized(paragraph, tokens):
+                units.append(_Unit(text=piece, tokens=piece_tokens, page_id=page_id))
+        return units
+
+    def _overlap_units(self, units: List[_Unit]) -> List[_Unit]:
+        """Select the trailing units of a chunk to repeat in the next chunk."""
+        if not self.overlap_tokens:
+            return []
+        carried: List[_Unit] = []
+        total = 0
+        for unit in reversed(units):
+            if total + unit.tokens > self.overlap_tokens:
+                break
+            carried.insert(0, unit)
+            total += unit.tokens
+        # Never carry the whole chunk, or the next chunk would not advance
+        if len(carried) == len(units):
+            carried = carried[1:]
+        return carried
+
+    def iter_chunks(self, pages: Iterable[PageInput]) -> Iterator[TextChunk]:
+        """
+        Stream chunks from an iterable of pages.
+
+        Pages are consumed lazily, so a generator that fetches page text on
+        demand keeps at most about one chunk of text in memory.
+
+        Args:
+            pages: Iterable of page texts or (page_id, page_text) tuples
+
+        Yields:
+            TextChunk objects in document order
+        """
+        current: List[_Unit] = []
+        current_tokens = 0
+        # True while current holds only overlap carried from the last chunk
+        fresh = False
+        index = 0
+
+        def build_chunk() -> TextChunk:
+            page_ids: List[str] = []
+            for unit in current:
+                if unit.page_id is not None and unit.page_id not in page_ids:
+                    page_ids.append(unit.page_id)
+            return TextChunk(
+                text="".join(unit.text for unit in current),
+                token_count=current_tokens,
+                index=index,
+                page_ids=page_ids,
+            )
+
+        for page in pages:
+            page_id, page_text = page if isinstance(page, tuple) else (None, page)
+            if not page_text:
+                continue
+            units = self._page_units(page_id, page_text)
+            page_tokens = sum(unit.tokens for unit in units)
+
+            # Start the page in a new chunk rather than splitting it when the
+            # current chunk is already reasonably full
+            if (
+                current
+                and not fresh
+                and current_tokens + page_tokens > self.max_tokens
+                and page_tokens <= self.max_tokens - self.overlap_tokens
+                and current_tokens >= self.max_tokens * self.page_break_threshold
+            ):
+                yield build_chunk()
+                index += 1
+                current = self._overlap_units(current)
+                current_tokens = sum(unit.tokens for unit in current)
+                fresh = True
+
+            for unit in units:
+                # Tokens the current chunk may hold before the unit
+                room = self.max_tokens - unit.tokens
+                if current_tokens > room:
+                    if fresh:
+                        # Drop carried overlap until the new unit fits
+                        while current and current_tokens > room:
+                            current_tokens -= current.pop(0).tokens
+                    else:
+                        yield build_chunk()
+                        index += 1
+                        current = self._overlap_units(current)
+                        current_tokens = sum(u.tokens for u in current)
+                        while current and current_tokens > room:
+                            current_tokens -= current.pop(0).tokens
+                current.append(unit)
+                current_tokens += unit.tokens
+                fresh = False
+
+        if current and not fresh:
+            yield build_chunk()
+
+    def chunk_text(self, text: str) -> List[TextChunk]:
+        """
+        Chunk a complete text, honoring any <page-number> markers it contains.
+
+        Args:
+            text: Text to chunk
+
+        Returns:
+            List of TextChunk objects
+        """
+        return list(self.iter_chunks(self.split_pages(text)))
@@ -0,0 +1,168 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Micro-batching of page requests for model endpoints.
+
+Classification runs one thread per page. MicroBatcher collects the requests
+submitted by those threads into batches of up to max_batch_size, waiting at
+most max_wait_seconds after the first request, and sends each batch as a
+single multi-page endpoint request. The batch response is split back into
+per-page results. If the whole batch fails, or one page of it fails, the
+affected pages are retried individually with the single-page request.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WAIT_SECONDS = 0.05
+DEFAULT_MAX_CONCURRENT_BATCHES = 4
+
+
+class BatchResult(NamedTuple):
+    """Result of a page request and the endpoint request it was part of."""
+
+    result: Any
+    request_size: int  # Number of pages sent in the same endpoint request
+    request_index: int  # Position of the page within that request
+
+
+class MicroBatcher:
+    """Group concurrent single-item requests into batched endpoint requests."""
+
+    def __init__(
+        self,
+        invoke_batch: Callable[[List[Any]], List[Union[Any, Exception]]],
+        invoke_single: Callable[[Any], Any],
+        max_batch_size: int,
+        max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+        max_concurrent_batches: int = DEFAULT_MAX_CONCURRENT_BATCHES,
+    ):
+        """
+        Initialize the micro-batcher.
+
+        Args:
+            invoke_batch: Sends a list of items in one request and returns one
+                result per item, in order. Items that failed are returned as
+                Exception instances.
+            invoke_single: Sends a single item; used for batches of one and as
+                the fallback for failed batches or items
+            max_batch_size: Maximum number of items per batch
+            max_wait_seconds: Maximum time to wait for a batch to fill after
+                its first item arrives
+            max_concurrent_batches: Maximum number of batches in flight
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.invoke_batch = invoke_batch
+        self.invoke_single = invoke_single
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches, thread_name_prefix="micro-batch"
+        )
+        self._closed = False
+        self._dispatcher = threading.Thread(
+            target=self._collect, name="micro-batch-dispatcher", daemon=True
+        )
+        self._dispatcher.start()
+
+    def submit(self, item: Any) -> "Future[BatchResult]":
+        """
+        Queue an item for the next batch.
+
+        Args:
+            item: Request item (e.g. a single-page payload)
+
+        Returns:
+            Future resolving to a BatchResult, or raising the error of the
+            single-page fallback
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future: "Future[BatchResult]" = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the dispatcher after pending items have been sent."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def _collect(self) -> None:
+        """Collect queued items into batches and hand them to the executor."""
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+
+            batch = [entry]
+            deadline = time.monotonic() + self.max_wait_seconds
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            self._executor.submit(self._dispatch, batch)
+            if stop:
+                return
+
+    def _run_single(self, item: Any, future: Future) -> None:
+        """Send one item on its own and resolve its future."""
+        try:
+            future.set_result(BatchResult(self.invoke_single(item), 1, 0))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _dispatch(self, batch: List[tuple]) -> None:
+        """Send a batch and resolve the futures of its items."""
+        if len(batch) == 1:
+            self._run_single(*batch[0])
+            return
+
+        items = [item for item, _ in batch]
+        try:
+            results = self.invoke_batch(items)
+            if len(results) != len(items):
+                raise ValueError(
+                    f"Batch response has {len(results)} results for {len(items)} items"
+                )
+        except Exception as e:
+            logger.warning(
+                f"Batch request for {len(items)} items failed, "
+                f"falling back to single requests: {e}"
+            )
+            for item, future in batch:
+                self._run_single(item, future)
+            return
+
+        for index, ((item, future), result) in enumerate(zip(batch, results)):
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Item {index} of batch failed, retrying as single request: {result}"
+                )
+                self._run_single(item, future)
+            else:
+                future.set_result(BatchResult(result, len(items), index))
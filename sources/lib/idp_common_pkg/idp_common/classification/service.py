@@ -17,6 +17,7 @@ Classification methods:
   across the entire document packet at once.
 """
 
+import contextlib
 import json
 import logging
 import os
@@ -24,12 +25,13 @@ import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import boto3
 from botocore.exceptions import ClientError
 
-from idp_common import bedrock, image, s3, utils
+from idp_common import bedrock, image, s3, tracing, utils
+from idp_common.classification.batching import MicroBatcher
 from idp_common.classification.models import (
     ClassificationResult,
     DocumentClassification,
@@ -38,7 +40,11 @@ from idp_common.classification.models import (
     PageClassification,
 )
 from idp_common.models import Document, Section, Status
-from idp_common.utils import extract_json_from_text, extract_structured_data_from_text
+from idp_common.utils import (
+    extract_json_from_text,
+    extract_structured_data_from_text,
+    few_shot_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +61,15 @@ class ClassificationService:
     MULTIMODAL_PAGE_LEVEL = "multimodalPageLevelClassification"
     TEXTBASED_HOLISTIC = "textbasedHolisticClassification"
 
+    # Documents with more pages than this are classified holistically in
+    # overlapping page windows. Windowing is opt-in through the
+    # holisticWindowPages setting (0 disables windowing)
+    HOLISTIC_WINDOW_PAGES = 0
+    HOLISTIC_WINDOW_OVERLAP_PAGES = 5
+
+    # Maximum time a SageMaker page request waits for others to join its batch
+    SAGEMAKER_BATCH_MAX_WAIT_MS = 50
+
     def __init__(
         self,
         region: str = None,
@@ -127,6 +142,7 @@ class ClassificationService:
                 )
             self.sm_client = boto3.client("sagemaker-runtime", region_name=self.region)
             self.sagemaker_endpoint = endpoint_name
+            self._sagemaker_batcher: Optional[MicroBatcher] = None
             logger.info(
                 f"Initialized classification service with SageMaker backend using endpoint {endpoint_name}"
             )
@@ -383,13 +399,16 @@ class ClassificationService:
                     f"Found {len(cached_page_classifications)} cached page classifications, classifying {len(pages_to_classify)} remaining pages"
                 )
 
-                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                with (
+                    self._sagemaker_batching(),
+                    ThreadPoolExecutor(max_workers=self.max_workers) as executor,
+                ):
                     futures = {}
 
                     # Start processing only uncached pages
                     for page_id, page in pages_to_classify.items():
                         future = executor.submit(
-                            self.classify_page,
+                            tracing.wrap(self.classify_page),
                             page_id=page_id,
                             text_uri=page.parsed_text_uri,
                             image_uri=page.image_uri,
@@ -817,6 +836,7 @@ class ClassificationService:
 
         return content
 
+    @tracing.traced("prompt.build")
     def _build_content(
         self,
         task_prompt_template: str,
@@ -877,70 +897,26 @@ class ClassificationService:
         """
         Build content items for few-shot examples from the configuration.
 
+        Examples are static per configuration, so the content (text blocks and
+        resized example images) is built once per container and served from the
+        process-level few-shot cache on subsequent calls.
+
         Returns:
             List of content items containing text and image content for examples
         """
-        content = []
-        classes = self.config.get("classes", [])
-
-        for class_obj in classes:
-            examples = class_obj.get("examples", [])
-            for example in examples:
-                class_prompt = example.get("classPrompt")
-
-                # Only process this example if it has a non-empty class_prompt
-                if not class_prompt or not class_prompt.strip():
-                    logger.info(
-                        f"Skipping example with empty classPrompt: {example.get('name')}"
-                    )
-                    continue
-
-                content.append({"text": class_prompt})
-
-                image_path = example.get("imagePath")
-                if image_path:
-                    try:
-                        # Load image content from the path
-
-                        from idp_common import image, s3
-
-                        # Get list of image files from the path (supports directories/prefixes)
-                        image_files = self._get_image_files_from_path(image_path)
-
-                        # Process each image file
-                        for image_file_path in image_files:
-                            try:
-                                # Load image content
-                                if image_file_path.startswith("s3://"):
-                                    # Direct S3 URI
-                                    image_content = s3.get_binary_content(
-                                        image_file_path
-                                    )
-                                else:
-                                    # Local file
-                                    with open(image_file_path, "rb") as f:
-                                        image_content = f.read()
-
-                                # Prepare image content for Bedrock
-                                image_attachment = (
-                                    image.prepare_bedrock_image_attachment(
-                                        image_content
-                                    )
-                                )
-                                content.append(image_attachment)
-
-                            except Exception as e:
-                                logger.warning(
-                                    f"Failed to load image {image_file_path}: {e}"
-                                )
-                                continue
-
-                    except Exception as e:
-                        raise ValueError(
-                            f"Failed to load example images from {image_path}: {e}"
-                        )
-
-        return content
+        examples = [
+            example
+            for class_obj in self.config.get("classes", [])
+            for example in class_obj.get("examples", [])
+        ]
+        image_config = self.config.get("classification", {}).get("image", {})
+        return few_shot_cache.get_few_shot_content(
+            examples,
+            prompt_field="classPrompt",
+            resolve_image_files=self._get_image_files_from_path,
+            target_width=image_config.get("target_width"),
+            target_height=image_config.get("target_height"),
+        )
 
     def _get_image_files_from_path(self, image_path: str) -> List[str]:
         """
@@ -1178,6 +1154,185 @@ class ClassificationService:
             logger.error(f"Error classifying page {page_id}: {str(e)}")
             raise
 
+    @contextlib.contextmanager
+    def _sagemaker_batching(self):
+        """
+        Batch SageMaker page requests made within this context.
+
+        Pages classified concurrently by the thread pool are grouped into
+        multi-page endpoint requests when sagemakerBatchSize > 1. Does nothing
+        for the Bedrock backend.
+        """
+        if (
+            self.backend != "sagemaker"
+            or getattr(self, "_sagemaker_batcher", None) is not None
+        ):
+            yield
+            return
+
+        batch_size, max_wait_seconds = self._get_sagemaker_batch_config()
+        if batch_size <= 1:
+            yield
+            return
+
+        logger.info(
+            f"Batching SageMaker requests: up to {batch_size} pages per request, "
+            f"max wait {max_wait_seconds * 1000:.0f}ms"
+        )
+        self._sagemaker_batcher = MicroBatcher(
+            invoke_batch=self._invoke_sagemaker_batch,
+            invoke_single=self._invoke_sagemaker_single,
+            max_batch_size=batch_size,
+            max_wait_seconds=max_wait_seconds,
+        )
+        try:
+            yield
+        finally:
+            batcher, self._sagemaker_batcher = self._sagemaker_batcher, None
+            batcher.close()
+
+    def _get_sagemaker_batch_config(self) -> Tuple[int, float]:
+        """
+        Get the SageMaker micro-batching configuration.
+
+        Returns:
+            Tuple of (max pages per endpoint request, max wait in seconds).
+            A batch size of 1 disables batching.
+        """
+        classification_config = self.config.get("classification", {})
+        try:
+            batch_size = int(classification_config.get("sagemakerBatchSize", 1) or 1)
+        except (TypeError, ValueError):
+            logger.warning(
+                f"Invalid sagemakerBatchSize "
+                f"'{classification_config.get('sagemakerBatchSize')}', disabling batching"
+            )
+            batch_size = 1
+        try:
+            max_wait_ms = float(
+                classification_config.get(
+                    "sagemakerBatchMaxWaitMs", self.SAGEMAKER_BATCH_MAX_WAIT_MS
+                )
+            )
+        except (TypeError, ValueError):
+            max_wait_ms = self.SAGEMAKER_BATCH_MAX_WAIT_MS
+        return max(1, batch_size), max(0.0, max_wait_ms) / 1000
+
+    def _invoke_sagemaker_endpoint(
+        self, body: Dict[str, Any], description: str
+    ) -> Dict[str, Any]:
+        """
+        Invoke the SageMaker endpoint, retrying on throttling.
+
+        Args:
+            body: JSON request body
+            description: Description of the request for log messages
+
+        Returns:
+            Parsed JSON response body
+
+        Raises:
+            ClientError: For non-retryable endpoint errors
+            RuntimeError: If retries are exhausted
+        """
+        retryable_errors = [
+            "ThrottlingException",
+            "ServiceQuotaExceededException",
+            "RequestLimitExceeded",
+            "TooManyRequestsException",
+        ]
+
+        retry_count = 0
+        while True:
+            try:
+                logger.info(
+                    f"Classifying {description} with SageMaker UDOP model. Payload: {json.dumps(body)}"
+                )
+                t0 = time.time()
+
+                response = self.sm_client.invoke_endpoint(
+                    EndpointName=self.sagemaker_endpoint,
+                    ContentType="application/json",
+                    Body=json.dumps(body),
+                )
+                response_body = json.loads(response["Body"].read().decode())
+
+                duration = time.time() - t0
+                logger.info(
+                    f"Classification of {description} successful in {duration:.2f}s. Response: {response_body}"
+                )
+                return response_body
+
+            except ClientError as e:
+                error_code = e.response["Error"]["Code"]
+                error_message = e.response["Error"]["Message"]
+
+                if error_code not in retryable_errors:
+                    logger.error(
+                        f"Non-retryable SageMaker error for {description}: "
+                        f"{error_code} - {error_message}"
+                    )
+                    raise
+
+                retry_count += 1
+                if retry_count == self.MAX_RETRIES:
+                    logger.error(
+                        f"Max retries ({self.MAX_RETRIES}) exceeded for {description}"
+                    )
+                    raise RuntimeError(
+                        "Max retries exceeded for SageMaker classification"
+                    ) from e
+
+                backoff = utils.calculate_backoff(
+                    retry_count, self.INITIAL_BACKOFF, self.MAX_BACKOFF
+                )
+                logger.warning(
+                    f"SageMaker throttling occurred for {description} "
+                    f"(attempt {retry_count}/{self.MAX_RETRIES}). "
+                    f"Error: {error_message}. "
+                    f"Backing off for {backoff:.2f}s"
+                )
+
+                time.sleep(
+                    backoff
+                )  # semgrep-ignore: arbitrary-sleep - Intentional delay backoff/retry. Duration is algorithmic and not user-controlled.
+
+    def _invoke_sagemaker_single(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a single-page request to the SageMaker endpoint."""
+        return self._invoke_sagemaker_endpoint(
+            payload, f"page image {payload['input_image']}"
+        )
+
+    def _invoke_sagemaker_batch(
+        self, payloads: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Send a multi-page request to the SageMaker endpoint.
+
+        The endpoint accepts {"instances": [<page payload>, ...]} and returns
+        {"predictions": [...]} with one entry per instance, in order. Entries
+        with an "error" key are returned as exceptions so the batcher retries
+        those pages individually.
+
+        Args:
+            payloads: Single-page payloads
+
+        Returns:
+            One response body or exception per payload
+        """
+        response_body = self._invoke_sagemaker_endpoint(
+            {"instances": payloads}, f"batch of {len(payloads)} pages"
+        )
+        predictions = response_body.get("predictions")
+        if not isinstance(predictions, list):
+            raise ValueError("SageMaker batch response has no 'predictions' list")
+        return [
+            RuntimeError(str(prediction.get("error")))
+            if not isinstance(prediction, dict) or "error" in prediction
+            else prediction
+            for prediction in predictions
+        ]
+
     def classify_page_sagemaker(
         self,
         page_id: str,
@@ -1188,6 +1343,9 @@ class ClassificationService:
         """
         Classify a single page using SageMaker UDOP model endpoint.
 
+        While a document is being classified with sagemakerBatchSize > 1, the
+        page is sent to the endpoint as part of a multi-page request.
+
         Args:
             page_id: ID of the page
             image_uri: URI of the page image
@@ -1208,9 +1366,6 @@ class ClassificationService:
                 error_message="Missing required image_uri or raw_text_uri",
             )
 
-        # Use the stored endpoint name
-        endpoint_name = self.sagemaker_endpoint
-
         # Prepare payload
         payload = {
             "input_image": image_uri,
@@ -1219,124 +1374,70 @@ class ClassificationService:
             "debug": 0,
         }
 
-        # Implement retry logic
-        retry_count = 0
-        metering = {}
-
-        while retry_count < self.MAX_RETRIES:
-            try:
-                logger.info(
-                    f"Classifying page {page_id} with SageMaker UDOP model. Payload: {json.dumps(payload)}"
-                )
-                t0 = time.time()
-
-                # Invoke endpoint
-                response = self.sm_client.invoke_endpoint(
-                    EndpointName=endpoint_name,
-                    ContentType="application/json",
-                    Body=json.dumps(payload),
-                )
-
-                duration = time.time() - t0
-
-                # Parse response
-                response_body = json.loads(response["Body"].read().decode())
-                doc_type = response_body.get("prediction", "unclassified")
-
-                # Log success metrics
-                logger.info(
-                    f"Page {page_id} classification successful in {duration:.2f}s. Response: {response_body}"
-                )
-
-                # Add some metering data for consistency with Bedrock
-                metering = {
-                    "Classification/sagemaker/invoke_endpoint": {
-                        "invocations": 1,
-                    }
-                }
-
-                # Create and return classification result
-                return PageClassification(
-                    page_id=page_id,
-                    classification=DocumentClassification(
-                        doc_type=doc_type,
-                        confidence=1.0,  # Default confidence since SageMaker doesn't provide it
-                        metadata={
-                            "metering": metering,
-                            "document_boundary": "continue",
-                        },
-                    ),
-                    image_uri=image_uri,
-                    text_uri=text_uri,
-                    raw_text_uri=raw_text_uri,
-                )
-
-            except ClientError as e:
-                error_code = e.response["Error"]["Code"]
-                error_message = e.response["Error"]["Message"]
-
-                retryable_errors = [
-                    "ThrottlingException",
-                    "ServiceQuotaExceededException",
-                    "RequestLimitExceeded",
-                    "TooManyRequestsException",
-                ]
-
-                if error_code in retryable_errors:
-                    retry_count += 1
-
-                    if retry_count == self.MAX_RETRIES:
-                        logger.error(
-                            f"Max retries ({self.MAX_RETRIES}) exceeded for page {page_id}"
-                        )
-                        break
+        try:
+            batcher = getattr(self, "_sagemaker_batcher", None)
+            if batcher is not None:
+                batch_result = batcher.submit(payload).result()
+                response_body = batch_result.result
+                request_size = batch_result.request_size
+                is_first_in_request = batch_result.request_index == 0
+            else:
+                response_body = self._invoke_sagemaker_single(payload)
+                request_size = 1
+                is_first_in_request = True
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            error_message = e.response["Error"]["Message"]
+            return self._create_unclassified_result(
+                page_id=page_id,
+                image_uri=image_uri,
+                text_uri=text_uri,
+                raw_text_uri=raw_text_uri,
+                error_message=f"{error_code}: {error_message}",
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error classifying page {page_id}: {str(e)}")
+            # Return unclassified with error
+            return self._create_unclassified_result(
+                page_id=page_id,
+                image_uri=image_uri,
+                text_uri=text_uri,
+                raw_text_uri=raw_text_uri,
+                error_message=str(e),
+            )
 
-                    backoff = utils.calculate_backoff(
-                        retry_count, self.INITIAL_BACKOFF, self.MAX_BACKOFF
-                    )
-                    logger.warning(
-                        f"SageMaker throttling occurred for page {page_id} "
-                        f"(attempt {retry_count}/{self.MAX_RETRIES}). "
-                        f"Error: {error_message}. "
-                        f"Backing off for {backoff:.2f}s"
-                    )
+        doc_type = response_body.get("prediction", "unclassified")
+        logger.info(
+            f"Page {page_id} classified as {doc_type} "
+            f"(endpoint request of {request_size} pages)"
+        )
 
-                    time.sleep(
-                        backoff
-                    )  # semgrep-ignore: arbitrary-sleep - Intentional delay backoff/retry. Duration is algorithmic and not user-controlled.
-                else:
-                    logger.error(
-                        f"Non-retryable SageMaker error for page {page_id}: "
-                        f"{error_code} - {error_message}"
-                    )
-                    # Return unclassified with error
-                    return self._create_unclassified_result(
-                        page_id=page_id,
-                        image_uri=image_uri,
-                        text_uri=text_uri,
-                        raw_text_uri=raw_text_uri,
-                        error_message=f"{error_code}: {error_message}",
-                    )
-            except Exception as e:
-                logger.error(f"Unexpected error classifying page {page_id}: {str(e)}")
-                # Return unclassified with error
-                return self._create_unclassified_result(
-                    page_id=page_id,
-                    image_uri=image_uri,
-                    text_uri=text_uri,
-                    raw_text_uri=raw_text_uri,
-                    error_message=str(e),
-                )
+        # Add some metering data for consistency with Bedrock. Each endpoint
+        # request is counted once, on the first page it carried.
+        metering = {
+            "Classification/sagemaker/invoke_endpoint": {
+                "invocations": 1 if is_first_in_request else 0,
+                "pages": 1,
+            }
+        }
 
-        # If we've reached here after max retries, return error
-        return self._create_unclassified_result(
+        # Create and return classification result
+        return PageClassification(
             page_id=page_id,
+            classification=DocumentClassification(
+                doc_type=doc_type,
+                confidence=1.0,  # Default confidence since SageMaker doesn't provide it
+                metadata={
+                    "metering": metering,
+                    "document_boundary": "continue",
+                },
+            ),
             image_uri=image_uri,
             text_uri=text_uri,
             raw_text_uri=raw_text_uri,
-            error_message="Max retries exceeded for SageMaker classification",
         )
 
+    @tracing.traced("classification.page")
     def classify_page(
         self,
         page_id: str,
@@ -1357,6 +1458,7 @@ class ClassificationService:
         Returns:
             PageClassification: Classification result for the page
         """
+        tracing.annotate(page_id=page_id)
         if self.backend == "bedrock":
             return self.classify_page_bedrock(
                 page_id=page_id,
@@ -1601,6 +1703,7 @@ class ClassificationService:
                 f"Failed to cache page classifications for document {document.id}: {e}"
             )
 
+    @tracing.traced("classification.document")
     def classify_document(self, document: Document) -> Document:
         """
         Classify a document's pages and update the Document object with sections.
@@ -1623,6 +1726,7 @@ class ClassificationService:
         Returns:
             Document: Updated Document object with classifications and sections
         """
+        tracing.annotate(document_id=document.id)
         if not document.pages:
             logger.warning("Document has no pages to classify")
             return self._update_document_status(
@@ -1737,10 +1841,13 @@ class ClassificationService:
         futures = []
         metering = {}
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        with (
+            self._sagemaker_batching(),
+            ThreadPoolExecutor(max_workers=self.max_workers) as executor,
+        ):
             for page_num, page_data in pages.items():
                 future = executor.submit(
-                    self.classify_page,
+                    tracing.wrap(self.classify_page),
                     page_id=page_num,
                     text_uri=page_data.get("parsedTextUri"),
                     image_uri=page_data.get("imageUri"),
@@ -1945,23 +2052,392 @@ class ClassificationService:
             Dictionary mapping page_id to text content
         """
         pages_content = {}
+        future_to_page = {}
 
-        for page_id, page in document.pages.items():
-            # Fetch page text content from S3 if available
-            if page.parsed_text_uri:
+        # Fetch page text content from S3 concurrently
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for page_id, page in document.pages.items():
+                if page.parsed_text_uri:
+                    future = executor.submit(
+                        tracing.wrap(s3.get_text_content), page.parsed_text_uri
+                    )
+                    future_to_page[future] = page_id
+                else:
+                    # Page has no text content
+                    pages_content[page_id] = f"[No text content for page {page_id}]"
+
+            for future in as_completed(future_to_page):
+                page_id = future_to_page[future]
                 try:
-                    pages_content[page_id] = s3.get_text_content(page.parsed_text_uri)
+                    pages_content[page_id] = future.result()
                 except Exception as e:
                     logger.warning(
-                        f"Failed to load text content from {page.parsed_text_uri}: {e}"
+                        f"Failed to load text content from {document.pages[page_id].parsed_text_uri}: {e}"
                     )
                     # Continue with empty content
                     pages_content[page_id] = f"[Error loading page {page_id} content]"
+
+        # Preserve document page order
+        return {page_id: pages_content[page_id] for page_id in document.pages}
+
+    def _get_holistic_window_config(self) -> Tuple[int, int]:
+        """
+        Get the page window size and overlap for windowed holistic classification.
+
+        Returns:
+            Tuple of (window pages, overlap pages). Window pages of 0 disables windowing.
+        """
+        classification_config = self.config.get("classification", {})
+        window_pages = int(
+            classification_config.get("holisticWindowPages", self.HOLISTIC_WINDOW_PAGES)
+            or 0
+        )
+        overlap_pages = int(
+            classification_config.get(
+                "holisticWindowOverlapPages", self.HOLISTIC_WINDOW_OVERLAP_PAGES
+            )
+            or 0
+        )
+        if window_pages <= 0:
+            return 0, 0
+        # Keep overlaps within half a window so every window owns some pages
+        return window_pages, max(0, min(overlap_pages, window_pages // 2))
+
+    @staticmethod
+    def _build_holistic_windows(
+        page_ids: List[str], window_pages: int, overlap_pages: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Split ordered pages into overlapping windows of equal size.
+
+        The last window is aligned with the end of the document, so it may
+        overlap its predecessor by more than overlap_pages.
+
+        Args:
+            page_ids: Page IDs in document order
+            window_pages: Number of pages per window
+            overlap_pages: Number of pages shared by consecutive windows
+
+        Returns:
+            List of (start, end) positions into page_ids, end exclusive
+        """
+        total = len(page_ids)
+        if total <= window_pages:
+            return [(0, total)]
+
+        step = window_pages - overlap_pages
+        windows = []
+        start = 0
+        while start + window_pages < total:
+            windows.append((start, start + window_pages))
+            start += step
+        windows.append((total - window_pages, total))
+        return windows
+
+    def _parse_holistic_segments(
+        self,
+        classification_text: str,
+        resolve_page: Callable[[int], Optional[str]],
+    ) -> List[Tuple[int, str, List[str]]]:
+        """
+        Parse the segments of a holistic classification response.
+
+        Args:
+            classification_text: Model response text
+            resolve_page: Maps a one-based ordinal page number from the response
+                to a document page ID (None if the page does not exist)
+
+        Returns:
+            List of (segment index, document type, page IDs) for valid segments
+
+        Raises:
+            ValueError: If the response contains no segments
+        """
+        classification_json = extract_json_from_text(classification_text)
+        classification_data = json.loads(classification_json)
+        segments = classification_data.get("segments", [])
+
+        if not segments:
+            raise ValueError("No segments found in the classification result")
+
+        parsed = []
+        for i, segment in enumerate(segments):
+            # Validate segment data
+            if not all(
+                k in segment for k in ["ordinal_start_page", "ordinal_end_page", "type"]
+            ):
+                logger.warning(f"Segment {i} is missing required fields")
+                continue
+
+            start_page = segment["ordinal_start_page"]
+            end_page = segment["ordinal_end_page"]
+            doc_type = segment["type"]
+
+            # Check if the doc_type is valid
+            if doc_type not in self.valid_doc_types:
+                logger.warning(f"Unknown document type '{doc_type}', using anyway")
+
+            # Find corresponding page IDs
+            page_ids = []
+            try:
+                for page_idx in range(start_page, end_page + 1):
+                    page_id = resolve_page(page_idx)
+                    if page_id is not None:
+                        page_ids.append(page_id)
+            except Exception as e:
+                logger.error(f"Error processing segment {i}: {e}")
+                continue
+
+            if not page_ids:
+                logger.warning(f"No valid pages found for segment {i}")
+                continue
+
+            parsed.append((i, doc_type, page_ids))
+
+        return parsed
+
+    def _classify_holistic_window(
+        self,
+        window_page_ids: List[str],
+        pages_content: Dict[str, str],
+        config: Dict[str, Any],
+        classes_table: str,
+    ) -> Tuple[List[Tuple[int, str, List[str]]], Dict[str, Any]]:
+        """
+        Classify one page window holistically.
+
+        Pages are numbered 1..N within the window so the model's ordinal page
+        numbers map unambiguously back to document page IDs.
+
+        Args:
+            window_page_ids: Page IDs in the window, in document order
+            pages_content: Page text keyed by page ID
+            config: Classification configuration
+            classes_table: Formatted class names and descriptions
+
+        Returns:
+            Tuple of (parsed segments, metering data)
+        """
+        doc_text = ""
+        for ordinal, page_id in enumerate(window_page_ids, start=1):
+            doc_text += (
+                f"<page-number>{ordinal}</page-number>\n{pages_content[page_id]}\n\n"
+            )
+
+        prepared_prompt = self._prepare_prompt_from_template(
+            config["task_prompt"],
+            {
+                "DOCUMENT_TEXT": doc_text,
+                "CLASS_NAMES_AND_DESCRIPTIONS": classes_table,
+            },
+            required_placeholders=[],
+        )
+
+        response_with_metering = self._invoke_bedrock_model(
+            content=[{"text": prepared_prompt}], config=config
+        )
+        response = response_with_metering["response"]
+        classification_text = response["output"]["message"]["content"][0].get(
+            "text", ""
+        )
+
+        def resolve_page(ordinal: int) -> Optional[str]:
+            if 1 <= ordinal <= len(window_page_ids):
+                return window_page_ids[ordinal - 1]
+            return None
+
+        segments = self._parse_holistic_segments(classification_text, resolve_page)
+        return segments, response_with_metering["metering"]
+
+    @staticmethod
+    def _merge_holistic_windows(
+        page_ids: List[str],
+        windows: List[Tuple[int, int]],
+        window_segments: List[List[Tuple[int, str, List[str]]]],
+    ) -> List[Tuple[str, List[str]]]:
+        """
+        Deterministically merge per-window segments into document sections.
+
+        Each page takes its label from the window where it is farthest from a
+        window edge (ties go to the earlier window), falling back to other
+        windows that labeled it. Consecutive pages with the same type are kept
+        in one section when a window that saw both pages put them in the same
+        segment, so documents that span a window boundary are not split. If
+        no window saw both pages (no overlap), same-type pages are joined.
+
+        Args:
+            page_ids: Page IDs in document order
+            windows: (start, end) positions of each window
+            window_segments: Parsed segments of each window
+
+        Returns:
+            List of (document type, page IDs) sections in document order
+        """
+        # label[w][position] = (segment index, type)
+        labels: List[Dict[int, Tuple[int, str]]] = []
+        position_of = {page_id: pos for pos, page_id in enumerate(page_ids)}
+        for segments in window_segments:
+            window_labels = {}
+            for segment_index, doc_type, segment_page_ids in segments:
+                for page_id in segment_page_ids:
+                    # First segment wins if the model returned overlapping segments
+                    window_labels.setdefault(
+                        position_of[page_id], (segment_index, doc_type)
+                    )
+            labels.append(window_labels)
+
+        def owner(pos: int) -> Optional[int]:
+            candidates = [
+                (min(pos - start, end - 1 - pos), -w)
+                for w, (start, end) in enumerate(windows)
+                if start <= pos < end and pos in labels[w]
+            ]
+            if not candidates:
+                return None
+            return -max(candidates)[1]
+
+        sections: List[Tuple[str, List[str]]] = []
+        previous = None  # (position, owner window, type)
+        for pos, page_id in enumerate(page_ids):
+            w = owner(pos)
+            if w is None:
+                previous = None
+                continue
+            doc_type = labels[w][pos][1]
+
+            continues = False
+            if previous is not None and previous[2] == doc_type:
+                prev_pos = previous[0]
+                shared = [
+                    window_labels
+                    for window_labels in labels
+                    if prev_pos in window_labels and pos in window_labels
+                ]
+                if shared:
+                    continues = any(
+                        window_labels[prev_pos] == window_labels[pos]
+                        for window_labels in shared
+                    )
+                else:
+                    continues = True
+
+            if continues:
+                sections[-1][1].append(page_id)
             else:
-                # Page has no text content
-                pages_content[page_id] = f"[No text content for page {page_id}]"
+                sections.append((doc_type, [page_id]))
+            previous = (pos, w, doc_type)
 
-        return pages_content
+        return sections
+
+    def _holistic_classify_windowed(
+        self,
+        document: Document,
+        page_ids: List[str],
+        pages_content: Dict[str, str],
+        config: Dict[str, Any],
+        classes_table: str,
+        window_pages: int,
+        overlap_pages: int,
+    ) -> Document:
+        """
+        Classify a long document holistically using overlapping page windows.
+
+        Windows are classified concurrently and merged with
+        _merge_holistic_windows into the same Section structure as a single
+        holistic call. If a window request fails, the metering of the windows
+        that returned is kept before the error is raised.
+
+        Args:
+            document: Document to classify
+            page_ids: Page IDs in document order
+            pages_content: Page text keyed by page ID
+            config: Classification configuration
+            classes_table: Formatted class names and descriptions
+            window_pages: Number of pages per window
+            overlap_pages: Number of pages shared by consecutive windows
+
+        Returns:
+            Document: Updated Document object with classifications and sections
+        """
+        windows = self._build_holistic_windows(page_ids, window_pages, overlap_pages)
+        logger.info(
+            f"Classifying {len(page_ids)} pages holistically in {len(windows)} windows "
+            f"of {window_pages} pages with {overlap_pages} pages overlap"
+        )
+
+        window_results: List[Optional[Tuple[Any, Dict[str, Any]]]] = [None] * len(
+            windows
+        )
+        parse_errors = []
+        request_error = None
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(windows))
+        ) as executor:
+            future_to_window = {
+                executor.submit(
+                    tracing.wrap(self._classify_holistic_window),
+                    page_ids[start:end],
+                    pages_content,
+                    config,
+                    classes_table,
+                ): w
+                for w, (start, end) in enumerate(windows)
+            }
+            for future in as_completed(future_to_window):
+                w = future_to_window[future]
+                try:
+                    window_results[w] = future.result()
+                except (ValueError, KeyError, TypeError) as e:
+                    start, end = windows[w]
+                    parse_errors.append(
+                        f"pages {page_ids[start]}-{page_ids[end - 1]}: {str(e)}"
+                    )
+                except Exception as e:
+                    # Raised after the metering of the other windows is merged
+                    if request_error is None:
+                        request_error = e
+
+        # Merge metering of all windows that returned
+        for result in window_results:
+            if result is not None:
+                document.metering = utils.merge_metering_data(
+                    document.metering, result[1]
+                )
+
+        if request_error is not None:
+            raise request_error
+
+        if parse_errors:
+            error_msg = "Error parsing holistic classification result: " + "; ".join(
+                parse_errors
+            )
+            return self._update_document_status(
+                document, success=False, error_message=error_msg
+            )
+
+        merged = self._merge_holistic_windows(
+            page_ids, windows, [result[0] for result in window_results]
+        )
+
+        document.sections = []
+        for i, (doc_type, section_page_ids) in enumerate(merged):
+            for page_id in section_page_ids:
+                document.pages[page_id].classification = doc_type
+                document.pages[page_id].confidence = 1.0
+            document.sections.append(
+                Section(
+                    section_id=str(i + 1),
+                    classification=doc_type,
+                    confidence=1.0,
+                    page_ids=section_page_ids,
+                )
+            )
+
+        document = self._update_document_status(document)
+        logger.info(
+            f"Document classified with {len(document.sections)} sections using windowed holistic method"
+        )
+        return document
 
     def holistic_classify_document(self, document: Document) -> Document:
         """
@@ -2025,6 +2501,23 @@ class ClassificationService:
             # Get classification configuration
             config = self._get_classification_config()
 
+            # Classify long documents in overlapping page windows
+            window_pages, overlap_pages = self._get_holistic_window_config()
+            if window_pages and len(pages_content) > window_pages:
+                sorted_page_ids = sorted(
+                    pages_content.keys(),
+                    key=lambda x: int(x) if x.isdigit() else float("inf"),
+                )
+                return self._holistic_classify_windowed(
+                    document,
+                    sorted_page_ids,
+                    pages_content,
+                    config,
+                    self._format_classes_and_descriptions(),
+                    window_pages,
+                    overlap_pages,
+                )
+
             # Prepare paged document text
             doc_text = ""
             for page_id, page_text in sorted(
@@ -2068,52 +2561,21 @@ class ClassificationService:
 
             # Try to extract JSON from the response
             try:
-                classification_json = extract_json_from_text(classification_text)
-                classification_data = json.loads(classification_json)
-                segments = classification_data.get("segments", [])
-
-                if not segments:
-                    raise ValueError("No segments found in the classification result")
+                # Normalize page IDs (convert from 1-based to actual page IDs in the document)
+                segments = self._parse_holistic_segments(
+                    classification_text,
+                    lambda page_idx: (
+                        str(page_idx) if str(page_idx) in document.pages else None
+                    ),
+                )
 
                 # Update the document with sections based on the segments
                 document.sections = []
-                for i, segment in enumerate(segments):
-                    # Validate segment data
-                    if not all(
-                        k in segment
-                        for k in ["ordinal_start_page", "ordinal_end_page", "type"]
-                    ):
-                        logger.warning(f"Segment {i} is missing required fields")
-                        continue
-
-                    # Normalize page IDs (convert from 1-based to actual page IDs in the document)
-                    start_page = segment["ordinal_start_page"]
-                    end_page = segment["ordinal_end_page"]
-                    doc_type = segment["type"]
-
-                    # Check if the doc_type is valid
-                    if doc_type not in self.valid_doc_types:
-                        logger.warning(
-                            f"Unknown document type '{doc_type}', using anyway"
-                        )
-
-                    # Find corresponding page IDs
-                    page_ids = []
-                    try:
-                        for page_idx in range(start_page, end_page + 1):
-                            page_id = str(page_idx)
-                            if page_id in document.pages:
-                                page_ids.append(page_id)
-                                # Update page classification
-                                document.pages[page_id].classification = doc_type
-                                document.pages[page_id].confidence = 1.0
-                    except Exception as e:
-                        logger.error(f"Error processing segment {i}: {e}")
-                        continue
-
-                    if not page_ids:
-                        logger.warning(f"No valid pages found for segment {i}")
-                        continue
+                for i, doc_type, page_ids in segments:
+                    # Update page classification
+                    for page_id in page_ids:
+                        document.pages[page_id].classification = doc_type
+                        document.pages[page_id].confidence = 1.0
 
                     # Create and add the section
                     section = Section(
@@ -20,6 +20,8 @@ from typing import Any, Dict, List, Optional
 import s3fs
 
 from idp_common import bedrock, s3, utils
+from idp_common.bedrock import AsyncBedrockClient
+from idp_common.chunking import TextChunker, TokenCounter
 from idp_common.criteria_validation.models import (
     CriteriaValidationResult,
     LLMResponse,
@@ -64,15 +66,21 @@ class CriteriaValidationService:
             "criteria_processing_time": [],
         }
 
-        # Get async processing config
-        self.semaphore = asyncio.Semaphore(
-            self.config.get("criteria_validation", {}).get("semaphore", 5)
+        # Get async processing config. The semaphore setting bounds the number of
+        # concurrent Bedrock requests made through the shared async client.
+        self.max_concurrency = self.config.get("criteria_validation", {}).get(
+            "semaphore", 5
         )
+        self._bedrock_client: Optional[AsyncBedrockClient] = None
         self.max_chunk_size = self.config.get("criteria_validation", {}).get(
             "max_chunk_size", 10000
         )
-        self.token_size = self.config.get("criteria_validation", {}).get(
-            "token_size", 4
+        # token_size is the legacy characters-per-token setting
+        self.token_counter = TokenCounter.from_config(
+            self.config.get("criteria_validation", {}).get("token_counter"),
+            chars_per_token=self.config.get("criteria_validation", {}).get(
+                "token_size", 0
+            ),
         )
         self.overlap_percentage = self.config.get("criteria_validation", {}).get(
             "overlap_percentage", 10
@@ -82,48 +90,29 @@ class CriteriaValidationService:
         self,
         text: str,
         max_chunk_size: int,
-        token_size: int,
         overlap_percentage: int,
     ) -> List[str]:
         """
         Chunk text with overlap for better context preservation.
 
+        Chunks break on page and paragraph boundaries and overlap by whole
+        paragraphs, see idp_common.chunking.TextChunker.
+
         Args:
             text: Text to chunk
             max_chunk_size: Maximum chunk size in tokens
-            token_size: Average token size
             overlap_percentage: Percentage of overlap between chunks
 
         Returns:
             List of text chunks
         """
-        # Simple token estimation
-        estimated_tokens = len(text) // token_size
-
-        if estimated_tokens <= max_chunk_size:
-            return [text]
-
-        # Calculate chunk size in characters
-        chunk_size_chars = max_chunk_size * token_size
-        overlap_chars = int(chunk_size_chars * (overlap_percentage / 100))
-
-        chunks = []
-        start = 0
-
-        while start < len(text):
-            end = start + chunk_size_chars
-            if end > len(text):
-                end = len(text)
-
-            chunk = text[start:end]
-            chunks.append(chunk)
-
-            # Move start position with overlap
-            start = end - overlap_chars
-            if start >= len(text):
-                break
-
-        return chunks
+        chunker = TextChunker.from_overlap_percentage(
+            max_tokens=max_chunk_size,
+            overlap_percentage=overlap_percentage,
+            token_counter=self.token_counter,
+        )
+        chunks = [chunk.text for chunk in chunker.chunk_text(text)]
+        return chunks or [text]
 
     def _prepare_prompt(
         self,
@@ -158,28 +147,48 @@ class CriteriaValidationService:
         context: str = "CriteriaValidation",
     ) -> Dict[str, Any]:
         """
-        Async wrapper for bedrock.invoke_model.
+        Invoke a Bedrock model through the shared async client.
 
-        Since the common bedrock client is synchronous, we run it in an executor
-        to maintain async compatibility.
+        The client bounds concurrency across all files, chunks and criteria of a
+        request and backs off on throttling without blocking a worker thread.
         """
-        loop = asyncio.get_event_loop()
-
-        # Run the synchronous bedrock.invoke_model in an executor
-        response = await loop.run_in_executor(
-            None,
-            bedrock.invoke_model,
-            model_id,
-            system_prompt,
-            [{"text": content}],  # content as list
-            temperature,
-            top_k,
-            top_p,
-            max_tokens,
-            context,
+        if self._bedrock_client is None:
+            self._bedrock_client = AsyncBedrockClient(
+                region=self.region, max_concurrency=self.max_concurrency
+            )
+
+        return await self._bedrock_client.invoke_model(
+            model_id=model_id,
+            system_prompt=system_prompt,
+            content=[{"text": content}],
+            temperature=temperature,
+            top_k=top_k,
+            top_p=top_p,
+            max_tokens=max_tokens,
+            context=context,
         )
 
-        return response
+    async def _load_criteria_questions(
+        self, criteria_type: str, config: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Load the criteria questions for a criteria type from S3.
+
+        Args:
+            criteria_type: The criteria type to load
+            config: Configuration for the validation
+
+        Returns:
+            List of criteria questions
+        """
+        criteria_bucket = config.get("criteria_bucket")
+        criteria_uri = f"s3://{criteria_bucket}/{criteria_type}.json"
+
+        criteria_data = await asyncio.to_thread(s3.get_json_content, criteria_uri)
+        if not criteria_data or "criteria" not in criteria_data:
+            raise ValueError(f"Invalid criteria file: {criteria_uri}")
+
+        return criteria_data["criteria"]
 
     async def _process_criteria_question(
         self,
@@ -202,101 +211,103 @@ class CriteriaValidationService:
         Returns:
             Validated response dictionary
         """
-        async with self.semaphore:
+        try:
+            # Prepare the prompt
+            prompt = self._prepare_prompt(
+                config["task_prompt"],
+                {
+                    "content": user_history,
+                    "question": question,
+                    "source_filepath": txt_file_uri,
+                    "criteria_type": criteria_type,
+                    "recommendation_options": config["recommendation_options"],
+                },
+            )
+
+            # Invoke the model
+            response = await self._invoke_model_async(
+                model_id=config["model_id"],
+                system_prompt=config["system_prompt"],
+                content=prompt,
+                temperature=config.get("temperature", 0.0),
+                top_k=config.get("top_k", 5),
+                top_p=config.get("top_p", 0.1),
+                max_tokens=config.get("max_tokens"),
+                context="CriteriaValidation",
+            )
+
+            self.token_counter.record_usage(
+                config["system_prompt"] + prompt,
+                response.get("response", {}).get("usage"),
+            )
+
+            # Extract and parse response
+            response_text = bedrock.extract_text_from_response(response)
+
+            # Parse JSON response
             try:
-                # Prepare the prompt
-                prompt = self._prepare_prompt(
-                    config["task_prompt"],
-                    {
-                        "content": user_history,
-                        "question": question,
-                        "source_filepath": txt_file_uri,
-                        "criteria_type": criteria_type,
-                        "recommendation_options": config["recommendation_options"],
-                    },
-                )
+                if "```json" in response_text:
+                    start_idx = response_text.find("```json") + 7
+                    end_idx = response_text.find("```", start_idx)
+                    response_text = response_text[start_idx:end_idx].strip()
+
+                response_dict = json.loads(response_text)
+            except json.JSONDecodeError:
+                logger.error(f"Failed to parse response as JSON: {response_text}")
+                response_dict = {
+                    "criteria_type": criteria_type,
+                    "question": question,
+                    "source_file": [txt_file_uri],
+                    "Recommendation": "Information Not Found",
+                    "Reasoning": f"Failed to parse response: {response_text}",
+                }
 
-                # Invoke the model
-                response = await self._invoke_model_async(
-                    model_id=config["model_id"],
-                    system_prompt=config["system_prompt"],
-                    content=prompt,
-                    temperature=config.get("temperature", 0.0),
-                    top_k=config.get("top_k", 5),
-                    top_p=config.get("top_p", 0.1),
-                    max_tokens=config.get("max_tokens"),
-                    context="CriteriaValidation",
-                )
+            # Update with required fields
+            response_dict.update(
+                {
+                    "criteria_type": criteria_type,
+                    "question": question,
+                    "source_file": [txt_file_uri],
+                }
+            )
 
-                # Extract and parse response
-                response_text = bedrock.extract_text_from_response(response)
-
-                # Parse JSON response
-                try:
-                    if "```json" in response_text:
-                        start_idx = response_text.find("```json") + 7
-                        end_idx = response_text.find("```", start_idx)
-                        response_text = response_text[start_idx:end_idx].strip()
-
-                    response_dict = json.loads(response_text)
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse response as JSON: {response_text}")
-                    response_dict = {
-                        "criteria_type": criteria_type,
-                        "question": question,
-                        "source_file": [txt_file_uri],
-                        "Recommendation": "Information Not Found",
-                        "Reasoning": f"Failed to parse response: {response_text}",
-                    }
-
-                # Update with required fields
-                response_dict.update(
-                    {
-                        "criteria_type": criteria_type,
-                        "question": question,
-                        "source_file": [txt_file_uri],
-                    }
-                )
+            # Validate response
+            validated_response = LLMResponse(**response_dict)
 
-                # Validate response
-                validated_response = LLMResponse(**response_dict)
+            # Track metering using the same approach as extraction service
+            metering = response.get("metering", {})
 
-                # Track metering using the same approach as extraction service
-                metering = response.get("metering", {})
+            # Add comprehensive logging for debugging
+            logger.info(
+                f"DEBUG: Raw response keys: {list(response.keys()) if response else 'None'}"
+            )
+            logger.info(f"DEBUG: Metering data from response: {metering}")
+            logger.info(
+                f"DEBUG: Current token_metrics before merge: {self.token_metrics}"
+            )
 
-                # Add comprehensive logging for debugging
-                logger.info(
-                    f"DEBUG: Raw response keys: {list(response.keys()) if response else 'None'}"
+            # Merge metering data using the same utility as extraction service with synchronization
+            async with self.metrics_lock:
+                old_metrics = self.token_metrics.copy()
+                self.token_metrics = utils.merge_metering_data(
+                    self.token_metrics, metering or {}
                 )
-                logger.info(f"DEBUG: Metering data from response: {metering}")
+                logger.info(f"DEBUG: Token metrics after merge: {self.token_metrics}")
                 logger.info(
-                    f"DEBUG: Current token_metrics before merge: {self.token_metrics}"
+                    f"DEBUG: Metrics changed: {old_metrics != self.token_metrics}"
                 )
 
-                # Merge metering data using the same utility as extraction service with synchronization
-                async with self.metrics_lock:
-                    old_metrics = self.token_metrics.copy()
-                    self.token_metrics = utils.merge_metering_data(
-                        self.token_metrics, metering or {}
-                    )
-                    logger.info(
-                        f"DEBUG: Token metrics after merge: {self.token_metrics}"
-                    )
-                    logger.info(
-                        f"DEBUG: Metrics changed: {old_metrics != self.token_metrics}"
-                    )
-
-                return validated_response.dict()
+            return validated_response.dict()
 
-            except Exception as e:
-                logger.error(f"Error processing criteria question: {str(e)}")
-                return {
-                    "criteria_type": criteria_type,
-                    "question": question,
-                    "source_file": [txt_file_uri],
-                    "Recommendation": "Information Not Found",
-                    "Reasoning": f"Error during processing: {str(e)}",
-                }
+        except Exception as e:
+            logger.error(f"Error processing criteria question: {str(e)}")
+            return {
+                "criteria_type": criteria_type,
+                "question": question,
+                "source_file": [txt_file_uri],
+                "Recommendation": "Information Not Found",
+                "Reasoning": f"Error during processing: {str(e)}",
+            }
 
     async def _process_criteria_type(
         self,
@@ -304,6 +315,7 @@ class CriteriaValidationService:
         user_history: str,
         txt_file_uri: str,
         config: Dict[str, Any],
+        questions: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Process all criteria questions for a specific criteria type.
@@ -313,6 +325,7 @@ class CriteriaValidationService:
             user_history: The user history text
             txt_file_uri: Source file URI
             config: Configuration for the validation
+            questions: Pre-loaded criteria questions (loaded from S3 if not provided)
 
         Returns:
             List of validation responses
@@ -321,17 +334,12 @@ class CriteriaValidationService:
 
         try:
             # Get criteria questions
-            criteria_bucket = config.get("criteria_bucket")
-            criteria_uri = f"s3://{criteria_bucket}/{criteria_type}.json"
-
-            # Read criteria file
-            criteria_data = s3.get_json_content(criteria_uri)
-            if not criteria_data or "criteria" not in criteria_data:
-                raise ValueError(f"Invalid criteria file: {criteria_uri}")
+            if questions is None:
+                questions = await self._load_criteria_questions(criteria_type, config)
 
             # Process all questions concurrently
             tasks = []
-            for question in criteria_data["criteria"]:
+            for question in questions:
                 task = self._process_criteria_question(
                     question=question,
                     user_history=user_history,
@@ -377,49 +385,63 @@ class CriteriaValidationService:
         if not summary_config:
             return responses
 
+        async def summarize_question(
+            criteria_type: str, question: str, question_responses: List[Any]
+        ) -> Optional[Dict[str, Any]]:
+            # Prepare summary prompt
+            prompt = self._prepare_prompt(
+                summary_config["task_prompt"],
+                {
+                    "initial_response": json.dumps(question_responses),
+                    "question": question,
+                    "criteria_type": criteria_type,
+                    "recommendation_options": config["recommendation_options"],
+                },
+            )
+
+            # Invoke model for summary
+            response = await self._invoke_model_async(
+                model_id=config["model_id"],
+                system_prompt=summary_config["system_prompt"],
+                content=prompt,
+                temperature=summary_config.get("temperature", 0.0),
+                context="CriteriaValidationSummary",
+            )
+
+            # Parse response
+            response_text = bedrock.extract_text_from_response(response)
+            try:
+                if "```json" in response_text:
+                    start_idx = response_text.find("```json") + 7
+                    end_idx = response_text.find("```", start_idx)
+                    response_text = response_text[start_idx:end_idx].strip()
+
+                summary_dict = json.loads(response_text)
+                validated_summary = LLMResponse(**summary_dict)
+                return validated_summary.dict()
+            except Exception as e:
+                logger.error(f"Error parsing summary response: {str(e)}")
+                return None
+
         try:
             final_responses = {}
 
-            for criteria_type, criteria_content in responses.items():
-                criteria_summaries = []
-
-                for question, question_responses in criteria_content.items():
-                    # Prepare summary prompt
-                    prompt = self._prepare_prompt(
-                        summary_config["task_prompt"],
-                        {
-                            "initial_response": json.dumps(question_responses),
-                            "question": question,
-                            "criteria_type": criteria_type,
-                            "recommendation_options": config["recommendation_options"],
-                        },
-                    )
-
-                    # Invoke model for summary
-                    response = await self._invoke_model_async(
-                        model_id=config["model_id"],
-                        system_prompt=summary_config["system_prompt"],
-                        content=prompt,
-                        temperature=summary_config.get("temperature", 0.0),
-                        context="CriteriaValidationSummary",
-                    )
-
-                    # Parse response
-                    response_text = bedrock.extract_text_from_response(response)
-                    try:
-                        if "```json" in response_text:
-                            start_idx = response_text.find("```json") + 7
-                            end_idx = response_text.find("```", start_idx)
-                            response_text = response_text[start_idx:end_idx].strip()
-
-                        summary_dict = json.loads(response_text)
-                        validated_summary = LLMResponse(**summary_dict)
-                        criteria_summaries.append(validated_summary.dict())
-                    except Exception as e:
-                        logger.error(f"Error parsing summary response: {str(e)}")
-
-                if criteria_type not in final_responses:
-                    final_responses[criteria_type] = criteria_summaries
+            # Summarize every question of every criteria type concurrently
+            criteria_tasks = {
+                criteria_type: asyncio.gather(
+                    *[
+                        summarize_question(criteria_type, question, question_responses)
+                        for question, question_responses in criteria_content.items()
+                    ]
+                )
+                for criteria_type, criteria_content in responses.items()
+            }
+            criteria_results = await asyncio.gather(*criteria_tasks.values())
+
+            for criteria_type, summaries in zip(criteria_tasks, criteria_results):
+                final_responses[criteria_type] = [
+                    summary for summary in summaries if summary is not None
+                ]
 
             return final_responses
 
@@ -459,54 +481,72 @@ class CriteriaValidationService:
             if not txt_files:
                 raise ValueError(f"No text files found for request {request_id}")
 
-            # Process each file
             all_responses = {}
             multiple_files = len(txt_files) > 1
+            criteria_types = config.get("criteria_types", [])
+
+            # Read all files and criteria definitions concurrently
+            contents, criteria_questions = await asyncio.gather(
+                asyncio.gather(
+                    *[
+                        asyncio.to_thread(s3.get_text_content, txt_file)
+                        for txt_file in txt_files
+                    ]
+                ),
+                asyncio.gather(
+                    *[
+                        self._load_criteria_questions(criteria_type, config)
+                        for criteria_type in criteria_types
+                    ]
+                ),
+            )
 
-            for txt_file in txt_files:
-                # Read file content
-                content = s3.get_text_content(txt_file)
-
+            # Build one task per file x chunk x criteria type so that all model
+            # calls for the request share the client's concurrency limit
+            work_items = []
+            tasks = []
+            for txt_file, content in zip(txt_files, contents):
                 # Check if chunking is needed
                 chunks = self._chunk_text_with_overlap(
                     content,
                     self.max_chunk_size,
-                    self.token_size,
                     self.overlap_percentage,
                 )
 
-                for chunk_idx, chunk in enumerate(chunks):
-                    # Process each criteria type concurrently
-                    tasks = []
-                    for criteria_type in config.get("criteria_types", []):
-                        task = self._process_criteria_type(
-                            criteria_type=criteria_type,
-                            user_history=chunk,
-                            txt_file_uri=txt_file,
-                            config=config,
+                for chunk in chunks:
+                    for criteria_type, questions in zip(
+                        criteria_types, criteria_questions
+                    ):
+                        work_items.append((txt_file, criteria_type))
+                        tasks.append(
+                            self._process_criteria_type(
+                                criteria_type=criteria_type,
+                                user_history=chunk,
+                                txt_file_uri=txt_file,
+                                config=config,
+                                questions=questions,
+                            )
                         )
-                        tasks.append(task)
 
-                    # Wait for all criteria types to complete
-                    responses = await asyncio.gather(*tasks)
-
-                    # Organize responses
-                    for criteria_idx, criteria_type in enumerate(
-                        config.get("criteria_types", [])
-                    ):
-                        if criteria_type not in all_responses:
-                            all_responses[criteria_type] = {} if multiple_files else []
-
-                        if multiple_files:
-                            # For multiple files, organize by question
-                            for response in responses[criteria_idx]:
-                                question = response["question"]
-                                if question not in all_responses[criteria_type]:
-                                    all_responses[criteria_type][question] = []
-                                all_responses[criteria_type][question].append(response)
-                        else:
-                            # For single file, just append
-                            all_responses[criteria_type].extend(responses[criteria_idx])
+            results = await asyncio.gather(*tasks)
+
+            # Organize responses in file, chunk and criteria type order
+            for (txt_file, criteria_type), criteria_responses in zip(
+                work_items, results
+            ):
+                if criteria_type not in all_responses:
+                    all_responses[criteria_type] = {} if multiple_files else []
+
+                if multiple_files:
+                    # For multiple files, organize by question
+                    for response in criteria_responses:
+                        question = response["question"]
+                        if question not in all_responses[criteria_type]:
+                            all_responses[criteria_type][question] = []
+                        all_responses[criteria_type][question].append(response)
+                else:
+                    # For single file, just append
+                    all_responses[criteria_type].extend(criteria_responses)
 
             # Summarize if multiple files
             if multiple_files and config.get("summary"):
@@ -563,6 +603,12 @@ class CriteriaValidationService:
             logger.error(f"Error validating request {request_id}: {str(e)}")
             raise
 
+        finally:
+            # Release the shared Bedrock connection pool for this event loop
+            if self._bedrock_client is not None:
+                await self._bedrock_client.close()
+                self._bedrock_client = None
+
     def validate_request(
         self, request_id: str, config: Dict[str, Any]
     ) -> CriteriaValidationResult:
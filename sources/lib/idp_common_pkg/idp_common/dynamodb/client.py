@@ -92,6 +92,7 @@ class DynamoDBClient:
         expression_attribute_names: Optional[Dict[str, str]] = None,
         expression_attribute_values: Optional[Dict[str, Any]] = None,
         return_values: str = "ALL_NEW",
+        condition_expression: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Update an item in the DynamoDB table.
@@ -102,6 +103,7 @@ class DynamoDBClient:
             expression_attribute_names: Optional attribute name mappings
             expression_attribute_values: Optional attribute value mappings
             return_values: What to return after the update
+            condition_expression: Optional condition that must hold for the update
 
         Returns:
             Dict containing the response from DynamoDB
@@ -122,12 +124,18 @@ class DynamoDBClient:
             if expression_attribute_values:
                 update_params["ExpressionAttributeValues"] = expression_attribute_values
 
+            if condition_expression:
+                update_params["ConditionExpression"] = condition_expression
+
             response = self.table.update_item(**update_params)
             logger.debug(f"Successfully updated item with key: {key}")
             return response
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
             error_message = e.response["Error"]["Message"]
+            if error_code == "ConditionalCheckFailedException":
+                logger.debug(f"DynamoDB update_item condition not met for key: {key}")
+                raise DynamoDBError(f"Update item failed: {error_message}", error_code)
             logger.error(f"DynamoDB update_item failed: {error_code} - {error_message}")
             raise DynamoDBError(f"Update item failed: {error_message}", error_code)
         except BotoCoreError as e:
@@ -210,6 +218,45 @@ class DynamoDBClient:
             logger.error(f"BotoCore error during transact_write_items: {str(e)}")
             raise DynamoDBError(f"BotoCore error: {str(e)}")
 
+    def batch_write_items(
+        self,
+        put_items: List[Dict[str, Any]],
+        delete_keys: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Write and delete items in batches.
+
+        Items are sent in BatchWriteItem requests of up to 25 items and
+        unprocessed items are retried.
+
+        Args:
+            put_items: Items to put
+            delete_keys: Optional primary keys of items to delete
+
+        Raises:
+            DynamoDBError: If the DynamoDB operation fails
+        """
+        try:
+            with self.table.batch_writer() as batch:
+                for item in put_items:
+                    batch.put_item(Item=item)
+                for key in delete_keys or []:
+                    batch.delete_item(Key=key)
+            logger.debug(
+                f"Successfully batch wrote {len(put_items)} items and deleted "
+                f"{len(delete_keys or [])} items"
+            )
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            error_message = e.response["Error"]["Message"]
+            logger.error(
+                f"DynamoDB batch_write_items failed: {error_code} - {error_message}"
+            )
+            raise DynamoDBError(f"Batch write failed: {error_message}", error_code)
+        except BotoCoreError as e:
+            logger.error(f"BotoCore error during batch_write_items: {str(e)}")
+            raise DynamoDBError(f"BotoCore error: {str(e)}")
+
     def scan(
         self,
         filter_expression: Optional[str] = None,
@@ -6,19 +6,42 @@ DynamoDB service for handling document operations directly.
 
 This module provides the DocumentDynamoDBService class for managing document
 storage and retrieval through direct DynamoDB operations, bypassing AppSync.
+
+By default pages and sections are stored as separate items in the document's
+partition (SK page#{id} and section#{id}) rather than as lists on the document
+item. Updating a document then rewrites only the small document item, and the
+page and section items are written in batches only when they change.
 """
 
 import datetime
+import hashlib
 import json
 import logging
+import os
+from concurrent.futures import Future
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from idp_common.dynamodb.client import DynamoDBClient
+from idp_common.dynamodb.client import DynamoDBClient, DynamoDBError
 from idp_common.models import Document, Page, Section, Status
+from idp_common.utils.status_updates import (
+    CONDITIONAL_CHECK_FAILED,
+    build_status_update,
+    get_coalescing_key,
+    status_update_coalescer,
+)
 
 logger = logging.getLogger(__name__)
 
+# Tracking record layouts
+SPLIT_LAYOUT = "split"  # Pages and sections stored as separate items
+EMBEDDED_LAYOUT = "embedded"  # Pages and sections stored as lists on the document item
+SUPPORTED_LAYOUTS = [SPLIT_LAYOUT, EMBEDDED_LAYOUT]
+
+DOCUMENT_SK = "none"
+PAGE_SK_PREFIX = "page#"
+SECTION_SK_PREFIX = "section#"
+
 
 def convert_floats_to_decimal(obj):
     """
@@ -40,6 +63,12 @@ def convert_floats_to_decimal(obj):
         return obj
 
 
+def _section_sort_key(section: Section) -> tuple:
+    """Sort numeric section IDs numerically and any others after them."""
+    section_id = str(section.section_id)
+    return (0, int(section_id), "") if section_id.isdigit() else (1, 0, section_id)
+
+
 class DocumentDynamoDBService:
     """
     Service for interacting directly with DynamoDB to manage Documents.
@@ -52,6 +81,7 @@ class DocumentDynamoDBService:
         self,
         dynamodb_client: Optional[DynamoDBClient] = None,
         table_name: Optional[str] = None,
+        record_layout: Optional[str] = None,
     ):
         """
         Initialize the DocumentDynamoDBService.
@@ -59,8 +89,22 @@ class DocumentDynamoDBService:
         Args:
             dynamodb_client: Optional DynamoDBClient instance. If not provided, a new one will be created.
             table_name: Optional DynamoDB table name. Used only if dynamodb_client is not provided.
+            record_layout: Optional layout of page and section records, 'split' or
+                'embedded'. Defaults to the TRACKING_RECORD_LAYOUT environment
+                variable, or 'split'.
+
+        Raises:
+            ValueError: If an unsupported record layout is specified
         """
         self.client = dynamodb_client or DynamoDBClient(table_name=table_name)
+        self.record_layout = (
+            record_layout or os.environ.get("TRACKING_RECORD_LAYOUT", SPLIT_LAYOUT)
+        ).lower()
+        if self.record_layout not in SUPPORTED_LAYOUTS:
+            raise ValueError(
+                f"Unsupported tracking record layout: '{self.record_layout}'. "
+                f"Supported layouts are: {', '.join(SUPPORTED_LAYOUTS)}"
+            )
 
     def _generate_shard_info(self, queued_time: str) -> tuple[str, str]:
         """
@@ -117,13 +161,15 @@ class DocumentDynamoDBService:
         return item
 
     def _document_to_update_expressions(
-        self, document: Document
+        self, document: Document, include_records: bool = True
     ) -> tuple[str, Dict[str, str], Dict[str, Any]]:
         """
         Convert a Document object to DynamoDB update expressions.
 
         Args:
             document: The Document object to convert
+            include_records: Whether to set the Pages and Sections lists on the
+                document item (embedded layout)
 
         Returns:
             Tuple of (update_expression, expression_attribute_names, expression_attribute_values)
@@ -175,69 +221,14 @@ class DocumentDynamoDBService:
             expression_names["#PageCount"] = "PageCount"
             expression_values[":PageCount"] = document.num_pages
 
-        # Convert pages
-        if document.pages:
-            pages_data = []
-            for page_id, page in document.pages.items():
-                # In the DynamoDB schema, page IDs are integers
-                try:
-                    page_id_int = int(page_id)
-                except ValueError:
-                    logger.warning(f"Skipping page {page_id} - ID is not an integer")
-                    continue
-
-                page_data = {
-                    "Id": page_id_int,
-                    "Class": page.classification or "",
-                    "ImageUri": page.image_uri or "",
-                    "TextUri": page.parsed_text_uri or page.raw_text_uri or "",
-                }
-                pages_data.append(page_data)
-
+        if include_records:
+            pages_data = self._page_records(document)
             if pages_data:
                 set_expressions.append("#Pages = :Pages")
                 expression_names["#Pages"] = "Pages"
                 expression_values[":Pages"] = pages_data
 
-        # Convert sections
-        if document.sections:
-            sections_data = []
-            for section in document.sections:
-                # Convert page IDs to integers for DynamoDB
-                page_ids = []
-                for page_id in section.page_ids:
-                    try:
-                        page_ids.append(int(page_id))
-                    except ValueError:
-                        logger.warning(
-                            f"Skipping page ID {page_id} in section {section.section_id} - not an integer"
-                        )
-
-                section_data = {
-                    "Id": section.section_id,
-                    "PageIds": page_ids,
-                    "Class": section.classification,
-                    "OutputJSONUri": section.extraction_result_uri or "",
-                }
-
-                # Convert confidence threshold alerts (matching current AppSync interface)
-                if section.confidence_threshold_alerts:
-                    alerts_data = []
-                    for alert in section.confidence_threshold_alerts:
-                        alert_data = convert_floats_to_decimal(
-                            {
-                                "attributeName": alert.get("attribute_name"),
-                                "confidence": alert.get("confidence"),
-                                "confidenceThreshold": alert.get(
-                                    "confidence_threshold"
-                                ),
-                            }
-                        )
-                        alerts_data.append(alert_data)
-                    section_data["ConfidenceThresholdAlerts"] = alerts_data
-
-                sections_data.append(section_data)
-
+            sections_data = self._section_records(document)
             if sections_data:
                 set_expressions.append("#Sections = :Sections")
                 expression_names["#Sections"] = "Sections"
@@ -272,6 +263,137 @@ class DocumentDynamoDBService:
 
         return update_expression, expression_names, expression_values
 
+    def _page_records(self, document: Document) -> List[Dict[str, Any]]:
+        """
+        Convert the pages of a document to tracking records.
+
+        Args:
+            document: The Document object to convert
+
+        Returns:
+            List of page records, in page order
+        """
+        pages_data = []
+        for page_id, page in document.pages.items():
+            # In the DynamoDB schema, page IDs are integers
+            try:
+                page_id_int = int(page_id)
+            except ValueError:
+                logger.warning(f"Skipping page {page_id} - ID is not an integer")
+                continue
+
+            pages_data.append(
+                {
+                    "Id": page_id_int,
+                    "Class": page.classification or "",
+                    "ImageUri": page.image_uri or "",
+                    "TextUri": page.parsed_text_uri or page.raw_text_uri or "",
+                }
+            )
+        return sorted(pages_data, key=lambda page_data: page_data["Id"])
+
+    def _section_records(self, document: Document) -> List[Dict[str, Any]]:
+        """
+        Convert the sections of a document to tracking records.
+
+        Args:
+            document: The Document object to convert
+
+        Returns:
+            List of section records, in document order
+        """
+        sections_data = []
+        for section in document.sections:
+            # Convert page IDs to integers for DynamoDB
+            page_ids = []
+            for page_id in section.page_ids:
+                try:
+                    page_ids.append(int(page_id))
+                except ValueError:
+                    logger.warning(
+                        f"Skipping page ID {page_id} in section {section.section_id} - not an integer"
+                    )
+
+            section_data = {
+                "Id": section.section_id,
+                "PageIds": page_ids,
+                "Class": section.classification,
+                "OutputJSONUri": section.extraction_result_uri or "",
+            }
+
+            # Convert confidence threshold alerts (matching current AppSync interface)
+            if section.confidence_threshold_alerts:
+                alerts_data = []
+                for alert in section.confidence_threshold_alerts:
+                    alert_data = convert_floats_to_decimal(
+                        {
+                            "attributeName": alert.get("attribute_name"),
+                            "confidence": alert.get("confidence"),
+                            "confidenceThreshold": alert.get("confidence_threshold"),
+                        }
+                    )
+                    alerts_data.append(alert_data)
+                section_data["ConfidenceThresholdAlerts"] = alerts_data
+
+            sections_data.append(section_data)
+        return sections_data
+
+    def _record_to_page(self, page_data: Dict[str, Any]) -> Page:
+        """Convert a page record to a Page object."""
+        page_id = str(page_data.get("Id"))
+        text_uri = page_data.get("TextUri")
+        return Page(
+            page_id=page_id,
+            image_uri=page_data.get("ImageUri"),
+            raw_text_uri=text_uri,
+            parsed_text_uri=text_uri,  # Set both raw and parsed to same URI
+            text_confidence_uri=page_data.get("TextConfidenceUri"),
+            classification=page_data.get("Class"),
+        )
+
+    def _record_to_section(self, section_data: Dict[str, Any]) -> Section:
+        """Convert a section record to a Section object."""
+        # Convert page IDs to strings
+        page_ids = [str(page_id) for page_id in section_data.get("PageIds", [])]
+
+        # Convert confidence threshold alerts (matching current AppSync interface)
+        confidence_threshold_alerts = []
+        alerts_data = section_data.get("ConfidenceThresholdAlerts", [])
+        if alerts_data:
+            for alert in alerts_data:
+                confidence_threshold_alerts.append(
+                    {
+                        "attribute_name": alert.get("attributeName"),
+                        "confidence": alert.get("confidence"),
+                        "confidence_threshold": alert.get("confidenceThreshold"),
+                    }
+                )
+
+        return Section(
+            section_id=section_data.get("Id", ""),
+            classification=section_data.get("Class", ""),
+            page_ids=page_ids,
+            extraction_result_uri=section_data.get("OutputJSONUri"),
+            confidence_threshold_alerts=confidence_threshold_alerts,
+        )
+
+    @staticmethod
+    def _records_digest(records: List[Dict[str, Any]]) -> str:
+        """Get a digest of records, used to skip rewriting unchanged records."""
+        return hashlib.sha256(
+            json.dumps(records, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def _page_sk(page_data: Dict[str, Any]) -> str:
+        """Get the sort key of a page record (zero padded, so pages sort in order)."""
+        return f"{PAGE_SK_PREFIX}{int(page_data['Id']):05d}"
+
+    @staticmethod
+    def _section_sk(section_data: Dict[str, Any]) -> str:
+        """Get the sort key of a section record."""
+        return f"{SECTION_SK_PREFIX}{section_data['Id']}"
+
     def _dynamodb_item_to_document(self, item: Dict[str, Any]) -> Document:
         """
         Convert DynamoDB item data to a Document object.
@@ -288,6 +410,7 @@ class DocumentDynamoDBService:
             input_key=item.get("ObjectKey"),
             num_pages=int(item.get("PageCount", 0)),  # Ensure PageCount is integer
             queued_time=item.get("QueuedTime"),
+            initial_event_time=item.get("InitialEventTime"),
             start_time=item.get("WorkflowStartTime"),
             completion_time=item.get("CompletionTime"),
             workflow_execution_arn=item.get("WorkflowExecutionArn"),
@@ -328,16 +451,8 @@ class DocumentDynamoDBService:
         pages_data = item.get("Pages", [])
         if pages_data is not None:  # Ensure pages_data is not None before iterating
             for page_data in pages_data:
-                page_id = str(page_data.get("Id"))
-                text_uri = page_data.get("TextUri")
-                doc.pages[page_id] = Page(
-                    page_id=page_id,
-                    image_uri=page_data.get("ImageUri"),
-                    raw_text_uri=text_uri,
-                    parsed_text_uri=text_uri,  # Set both raw and parsed to same URI
-                    text_confidence_uri=page_data.get("TextConfidenceUri"),
-                    classification=page_data.get("Class"),
-                )
+                page = self._record_to_page(page_data)
+                doc.pages[page.page_id] = page
 
         # Convert sections
         sections_data = item.get("Sections", [])
@@ -345,33 +460,7 @@ class DocumentDynamoDBService:
             sections_data is not None
         ):  # Ensure sections_data is not None before iterating
             for section_data in sections_data:
-                # Convert page IDs to strings
-                page_ids = [str(page_id) for page_id in section_data.get("PageIds", [])]
-
-                # Convert confidence threshold alerts (matching current AppSync interface)
-                confidence_threshold_alerts = []
-                alerts_data = section_data.get("ConfidenceThresholdAlerts", [])
-                if alerts_data:
-                    for alert in alerts_data:
-                        confidence_threshold_alerts.append(
-                            {
-                                "attribute_name": alert.get("attributeName"),
-                                "confidence": alert.get("confidence"),
-                                "confidence_threshold": alert.get(
-                                    "confidenceThreshold"
-                                ),
-                            }
-                        )
-
-                doc.sections.append(
-                    Section(
-                        section_id=section_data.get("Id", ""),
-                        classification=section_data.get("Class", ""),
-                        page_ids=page_ids,
-                        extraction_result_uri=section_data.get("OutputJSONUri"),
-                        confidence_threshold_alerts=confidence_threshold_alerts,
-                    )
-                )
+                doc.sections.append(self._record_to_section(section_data))
 
         return doc
 
@@ -431,45 +520,211 @@ class DocumentDynamoDBService:
         """
         Update an existing document in DynamoDB.
 
+        With the split record layout only the document item is updated, and
+        page and section records are written in batches when they differ from
+        the stored ones. With the embedded layout the Pages and Sections lists
+        of the document item are rewritten. With either layout, pages or
+        sections are left as stored when the document has none, as when only
+        the status and timestamps of a document are updated.
+
         Args:
             document: The Document object to update
 
         Returns:
-            Updated Document object with any data returned from DynamoDB
+            Updated Document object with the stored attributes of the document
+            item, such as QueuedTime and WorkflowStartTime. With the split
+            layout its pages and sections are those of the given document.
 
         Raises:
             DynamoDBError: If the DynamoDB operation fails
         """
-        key = {
-            "PK": f"doc#{document.input_key}",
-            "SK": "none",
-        }
+        key = self._document_key(document.input_key)
+
+        if self.record_layout == EMBEDDED_LAYOUT:
+            update_expression, expression_names, expression_values = (
+                self._document_to_update_expressions(document)
+            )
+
+            response = self.client.update_item(
+                key=key,
+                update_expression=update_expression,
+                expression_attribute_names=expression_names,
+                expression_attribute_values=expression_values,
+                return_values="ALL_NEW",
+            )
+
+            # Convert the response back to a Document object
+            updated_item = response.get("Attributes", {})
+            updated_document = self._dynamodb_item_to_document(updated_item)
+
+            logger.info(f"Successfully updated document: {document.input_key}")
+            return updated_document
 
         update_expression, expression_names, expression_values = (
-            self._document_to_update_expressions(document)
+            self._document_to_update_expressions(document, include_records=False)
         )
 
+        # Store a digest of the records on the document item, so records are
+        # only rewritten when they change
+        page_records = convert_floats_to_decimal(self._page_records(document))
+        section_records = convert_floats_to_decimal(self._section_records(document))
+        record_types = [
+            ("PagesDigest", PAGE_SK_PREFIX, page_records, self._page_sk),
+            ("SectionsDigest", SECTION_SK_PREFIX, section_records, self._section_sk),
+        ]
+        record_types = [record_type for record_type in record_types if record_type[2]]
+        digests = {
+            name: self._records_digest(records) for name, _, records, _ in record_types
+        }
+        for name, digest in digests.items():
+            update_expression += f", #{name} = :{name}"
+            expression_names[f"#{name}"] = name
+            expression_values[f":{name}"] = digest
+
         response = self.client.update_item(
             key=key,
             update_expression=update_expression,
             expression_attribute_names=expression_names,
             expression_attribute_values=expression_values,
-            return_values="ALL_NEW",
+            return_values="ALL_OLD",
         )
+        previous_item = response.get("Attributes", {})
+        # The update only sets attributes, so the stored item is the previous
+        # item with the set attributes replaced
+        updated_item = {
+            **previous_item,
+            **{
+                expression_names[name]: expression_values[f":{name[1:]}"]
+                for name in expression_names
+            },
+        }
+
+        put_items = []
+        delete_keys = []
+        for name, sk_prefix, records, record_sk in record_types:
+            if previous_item.get(name) == digests[name]:
+                continue
+            record_sks = set()
+            for record in records:
+                record_sks.add(record_sk(record))
+                put_items.append(
+                    self._record_item(key, record_sk(record), record, previous_item)
+                )
+            # Remove records of pages and sections that no longer exist, e.g.
+            # when a document is reprocessed into fewer pages
+            delete_keys.extend(
+                {"PK": item["PK"], "SK": item["SK"]}
+                for item in self._query_all_records(document.input_key, sk_prefix)
+                if item["SK"] not in record_sks
+            )
+
+        if put_items or delete_keys:
+            try:
+                self.client.batch_write_items(put_items, delete_keys)
+            except Exception:
+                # Clear the digests so the records are written by the next update
+                self.client.update_item(
+                    key=key,
+                    update_expression="REMOVE "
+                    + ", ".join(f"#{name}" for name in digests),
+                    expression_attribute_names={f"#{name}": name for name in digests},
+                    return_values="NONE",
+                )
+                raise
+            logger.info(
+                f"Wrote {len(put_items)} and deleted {len(delete_keys)} tracking "
+                f"records for document: {document.input_key}"
+            )
 
-        # Convert the response back to a Document object
-        updated_item = response.get("Attributes", {})
         updated_document = self._dynamodb_item_to_document(updated_item)
+        updated_document.pages = document.pages
+        updated_document.sections = document.sections
 
         logger.info(f"Successfully updated document: {document.input_key}")
         return updated_document
 
-    def get_document(self, object_key: str) -> Optional[Document]:
+    def update_document_status(
+        self,
+        document: Document,
+        status: Optional[Status] = None,
+        wait: bool = True,
+    ) -> Union[bool, "Future[bool]"]:
+        """
+        Update only the status of a document.
+
+        Unlike update_document, this writes only ObjectStatus, WorkflowStatus
+        and WorkflowExecutionArn. The update is skipped if the document already
+        has the status or a later in-progress status, so concurrent Map
+        iterations reporting the same status result in a single write.
+
+        Args:
+            document: The document to update
+            status: The new status. Defaults to document.status.
+            wait: If False, the update is sent on a background thread and a
+                Future is returned; failures are logged instead of raised.
+
+        Returns:
+            Whether the stored status was changed, or a Future of it
+
+        Raises:
+            DynamoDBError: If the DynamoDB operation fails and wait is True
+        """
+        status = status or document.status
+        object_key = document.input_key
+        workflow_execution_arn = document.workflow_execution_arn
+
+        def send() -> bool:
+            update_expression, condition_expression, names, values = (
+                build_status_update(status, workflow_execution_arn)
+            )
+            try:
+                self.client.update_item(
+                    key=self._document_key(object_key),
+                    update_expression=update_expression,
+                    expression_attribute_names=names,
+                    expression_attribute_values=values,
+                    return_values="NONE",
+                    condition_expression=condition_expression,
+                )
+            except DynamoDBError as e:
+                if e.error_code == CONDITIONAL_CHECK_FAILED:
+                    logger.info(
+                        f"Skipped status update of document {object_key}: status is "
+                        f"already {status.value} or later, or the document does not exist"
+                    )
+                    return False
+                raise
+            logger.info(f"Updated status of document {object_key} to {status.value}")
+            return True
+
+        return status_update_coalescer.update(
+            get_coalescing_key(document), status, send, wait
+        )
+
+    def flush_status_updates(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for status updates sent with wait=False to finish.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+        """
+        status_update_coalescer.flush(timeout)
+
+    def get_document(
+        self, object_key: str, load_records: bool = True
+    ) -> Optional[Document]:
         """
         Get a document from DynamoDB by its object key.
 
+        Page and section records are read with paginated queries and take
+        precedence over Pages and Sections lists on the document item, which
+        are written by the embedded layout and by AppSync.
+
         Args:
             object_key: The object key of the document to retrieve
+            load_records: Whether to load the page and section records. When
+                False only the document item is read; use get_pages and
+                get_sections to page through the records.
 
         Returns:
             Document object if found, None otherwise
@@ -477,15 +732,131 @@ class DocumentDynamoDBService:
         Raises:
             DynamoDBError: If the DynamoDB operation fails
         """
-        key = {
-            "PK": f"doc#{object_key}",
-            "SK": "none",
+        item = self.client.get_item(self._document_key(object_key))
+        if not item:
+            return None
+
+        document = self._dynamodb_item_to_document(item)
+        if load_records:
+            for record in self._query_all_records(object_key, PAGE_SK_PREFIX):
+                page = self._record_to_page(record)
+                document.pages[page.page_id] = page
+            section_records = self._query_all_records(object_key, SECTION_SK_PREFIX)
+            if section_records:
+                sections = [
+                    self._record_to_section(record) for record in section_records
+                ]
+                document.sections = sorted(sections, key=_section_sort_key)
+        return document
+
+    def get_pages(
+        self,
+        object_key: str,
+        limit: Optional[int] = None,
+        exclusive_start_key: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get one page of the page records of a document.
+
+        Args:
+            object_key: The object key of the document
+            limit: Optional limit on number of records to return
+            exclusive_start_key: Optional key to start from (nextToken of the previous call)
+
+        Returns:
+            Dict containing Page objects in page order and pagination info
+
+        Raises:
+            DynamoDBError: If the DynamoDB operation fails
+        """
+        response = self._query_records(
+            object_key, PAGE_SK_PREFIX, limit, exclusive_start_key
+        )
+        return {
+            "Pages": [self._record_to_page(item) for item in response.get("Items", [])],
+            "nextToken": response.get("LastEvaluatedKey"),
+        }
+
+    def get_sections(
+        self,
+        object_key: str,
+        limit: Optional[int] = None,
+        exclusive_start_key: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get one page of the section records of a document.
+
+        Args:
+            object_key: The object key of the document
+            limit: Optional limit on number of records to return
+            exclusive_start_key: Optional key to start from (nextToken of the previous call)
+
+        Returns:
+            Dict containing Section objects and pagination info
+
+        Raises:
+            DynamoDBError: If the DynamoDB operation fails
+        """
+        response = self._query_records(
+            object_key, SECTION_SK_PREFIX, limit, exclusive_start_key
+        )
+        return {
+            "Sections": [
+                self._record_to_section(item) for item in response.get("Items", [])
+            ],
+            "nextToken": response.get("LastEvaluatedKey"),
         }
 
-        item = self.client.get_item(key)
-        if item:
-            return self._dynamodb_item_to_document(item)
-        return None
+    @staticmethod
+    def _document_key(object_key: str) -> Dict[str, str]:
+        """Get the primary key of a document item."""
+        return {"PK": f"doc#{object_key}", "SK": DOCUMENT_SK}
+
+    @staticmethod
+    def _record_item(
+        key: Dict[str, str],
+        sk: str,
+        record: Dict[str, Any],
+        document_item: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Build a page or section item, expiring together with its document."""
+        item = {"PK": key["PK"], "SK": sk, **record}
+        if document_item.get("ExpiresAfter"):
+            item["ExpiresAfter"] = document_item["ExpiresAfter"]
+        return item
+
+    def _query_records(
+        self,
+        object_key: str,
+        sk_prefix: str,
+        limit: Optional[int] = None,
+        exclusive_start_key: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Query one page of the records of a document with a sort key prefix."""
+        return self.client.query(
+            key_condition_expression="PK = :pk AND begins_with(SK, :sk_prefix)",
+            expression_attribute_values={
+                ":pk": f"doc#{object_key}",
+                ":sk_prefix": sk_prefix,
+            },
+            limit=limit,
+            exclusive_start_key=exclusive_start_key,
+        )
+
+    def _query_all_records(
+        self, object_key: str, sk_prefix: str
+    ) -> List[Dict[str, Any]]:
+        """Query all records of a document with a sort key prefix."""
+        items = []
+        exclusive_start_key = None
+        while True:
+            response = self._query_records(
+                object_key, sk_prefix, exclusive_start_key=exclusive_start_key
+            )
+            items.extend(response.get("Items", []))
+            exclusive_start_key = response.get("LastEvaluatedKey")
+            if not exclusive_start_key:
+                return items
 
     def list_documents(
         self,
@@ -509,25 +880,31 @@ class DocumentDynamoDBService:
         Raises:
             DynamoDBError: If the DynamoDB operation fails
         """
-        filter_expression = None
-        expression_attribute_values = {}
+        # Skip the page and section records stored next to each document
+        filter_expression = (
+            "NOT begins_with(SK, :page_prefix) AND NOT begins_with(SK, :section_prefix)"
+        )
+        expression_attribute_values = {
+            ":page_prefix": PAGE_SK_PREFIX,
+            ":section_prefix": SECTION_SK_PREFIX,
+        }
 
         if start_date_time and end_date_time:
-            filter_expression = "InitialEventTime BETWEEN :start_date AND :end_date"
+            filter_expression += (
+                " AND InitialEventTime BETWEEN :start_date AND :end_date"
+            )
             expression_attribute_values[":start_date"] = start_date_time
             expression_attribute_values[":end_date"] = end_date_time
         elif start_date_time:
-            filter_expression = "InitialEventTime >= :start_date"
+            filter_expression += " AND InitialEventTime >= :start_date"
             expression_attribute_values[":start_date"] = start_date_time
         elif end_date_time:
-            filter_expression = "InitialEventTime <= :end_date"
+            filter_expression += " AND InitialEventTime <= :end_date"
             expression_attribute_values[":end_date"] = end_date_time
 
         response = self.client.scan(
             filter_expression=filter_expression,
-            expression_attribute_values=expression_attribute_values
-            if expression_attribute_values
-            else None,
+            expression_attribute_values=expression_attribute_values,
             limit=limit or 50,
             exclusive_start_key=exclusive_start_key,
         )
@@ -643,6 +1020,41 @@ class DocumentDynamoDBService:
             "nextToken": response.get("LastEvaluatedKey"),
         }
 
+    def list_object_keys_for_date(self, date: str) -> List[str]:
+        """
+        List the object keys of all documents queued on a date.
+
+        Reads every shard of the date's list partition to the end.
+
+        Args:
+            date: Date in YYYY-MM-DD format
+
+        Returns:
+            Sorted, de-duplicated object keys
+
+        Raises:
+            DynamoDBError: If the DynamoDB operation fails
+        """
+        shards_in_day = 6
+        object_keys = set()
+        for shard in range(shards_in_day):
+            exclusive_start_key = None
+            while True:
+                response = self.client.query(
+                    key_condition_expression="PK = :pk",
+                    expression_attribute_values={":pk": f"list#{date}#s#{shard:02d}"},
+                    exclusive_start_key=exclusive_start_key,
+                )
+                object_keys.update(
+                    item["ObjectKey"]
+                    for item in response.get("Items", [])
+                    if item.get("ObjectKey")
+                )
+                exclusive_start_key = response.get("LastEvaluatedKey")
+                if not exclusive_start_key:
+                    break
+        return sorted(object_keys)
+
     def calculate_ttl(self, days: int = 30) -> int:
         """
         Calculate a TTL timestamp for document expiration.
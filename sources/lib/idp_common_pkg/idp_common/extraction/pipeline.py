@@ -0,0 +1,127 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Prefetch pipeline for section extraction.
+
+Extracting a section means reading its page texts and images from S3 and then
+calling Bedrock. Bedrock latency dominates, so when several sections are
+processed in one invocation, the S3 reads for the next sections can run while
+the current section's model call is in flight. SectionPrefetcher loads inputs
+up to prefetch_depth sections ahead, and stops prefetching while the images
+already loaded but not yet consumed exceed a memory budget.
+"""
+
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREFETCH_DEPTH = 1
+DEFAULT_MAX_PREFETCH_IMAGE_MB = 256
+
+
+@dataclass
+class SectionInputs:
+    """S3 inputs of a section, loaded before its model call."""
+
+    section_id: str
+    page_ids: List[str]
+    """IDs of the pages that were loaded, in page order."""
+
+    document_text: str
+    page_images: List[bytes]
+    errors: List[str] = field(default_factory=list)
+    """Errors for pages that could not be loaded (e.g. missing from the document)."""
+
+    @property
+    def image_bytes(self) -> int:
+        """Total size of the loaded page images."""
+        return sum(len(img) for img in self.page_images if img)
+
+
+class SectionPrefetcher:
+    """Iterate over sections with their inputs loaded ahead of time."""
+
+    def __init__(
+        self,
+        loader: Callable[[str], SectionInputs],
+        section_ids: Iterable[str],
+        prefetch_depth: int = DEFAULT_PREFETCH_DEPTH,
+        max_prefetch_bytes: int = DEFAULT_MAX_PREFETCH_IMAGE_MB * 1024 * 1024,
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            loader: Loads the inputs of a section given its ID
+            section_ids: IDs of the sections, in processing order
+            prefetch_depth: Number of sections loaded ahead of the one being
+                processed (0 disables prefetching)
+            max_prefetch_bytes: Stop prefetching while loaded but unconsumed
+                images exceed this size. The next section is always loaded.
+        """
+        self.loader = loader
+        self.section_ids = list(section_ids)
+        self.prefetch_depth = max(0, prefetch_depth)
+        self.max_prefetch_bytes = max_prefetch_bytes
+
+    def _buffered_bytes(self, pending: Deque[Tuple[str, Future]]) -> int:
+        """Size of images loaded for sections that have not been consumed yet."""
+        total = 0
+        for _, future in pending:
+            if future.done() and future.exception() is None:
+                total += future.result().image_bytes
+        return total
+
+    def __iter__(
+        self,
+    ) -> Iterator[Tuple[str, Optional[SectionInputs], Optional[Exception]]]:
+        """
+        Yield (section_id, inputs, error) in order.
+
+        Loading errors are returned rather than raised, so the caller can
+        decide whether to continue with the remaining sections.
+        """
+        pending: Deque[Tuple[str, Future]] = deque()
+        remaining = iter(self.section_ids)
+
+        with ThreadPoolExecutor(
+            max_workers=self.prefetch_depth + 1, thread_name_prefix="section-prefetch"
+        ) as executor:
+
+            def fill(ahead: int) -> None:
+                while len(pending) < ahead:
+                    if (
+                        pending
+                        and self._buffered_bytes(pending) >= self.max_prefetch_bytes
+                    ):
+                        logger.info(
+                            "Prefetched section images exceed the memory budget, "
+                            "pausing prefetch"
+                        )
+                        return
+                    section_id = next(remaining, None)
+                    if section_id is None:
+                        return
+                    pending.append(
+                        (section_id, executor.submit(self.loader, section_id))
+                    )
+
+            fill(1)
+            while pending:
+                section_id, future = pending.popleft()
+                try:
+                    inputs, error = future.result(), None
+                except Exception as e:
+                    inputs, error = None, e
+
+                # Start loading the next sections before the caller makes
+                # the model call for this one
+                fill(self.prefetch_depth)
+                yield section_id, inputs, error
+                if not pending:
+                    fill(1)
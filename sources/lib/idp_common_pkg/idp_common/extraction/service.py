@@ -12,14 +12,24 @@ import json
 import logging
 import os
 import time
-from typing import Any, Dict, List
-
-from idp_common import bedrock, image, metrics, s3, utils
-from idp_common.models import Document
-from idp_common.utils import extract_json_from_text
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from idp_common import bedrock, image, metrics, s3, tracing, utils
+from idp_common.extraction.pipeline import (
+    DEFAULT_MAX_PREFETCH_IMAGE_MB,
+    DEFAULT_PREFETCH_DEPTH,
+    SectionInputs,
+    SectionPrefetcher,
+)
+from idp_common.models import Document, Section
+from idp_common.utils import extract_json_from_text, few_shot_cache
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of page texts and images read concurrently for a section
+DEFAULT_MAX_WORKERS = 20
+
 
 class ExtractionService:
     """Service for extracting fields from documents using LLMs."""
@@ -143,6 +153,7 @@ class ExtractionService:
 
         return format_prompt(prompt_template, substitutions, required_placeholders)
 
+    @tracing.traced("prompt.build")
     def _build_content_with_or_without_image_placeholder(
         self,
         prompt_template: str,
@@ -310,6 +321,7 @@ class ExtractionService:
 
         return content
 
+    @tracing.traced("prompt.build")
     def _build_content_with_few_shot_examples(
         self,
         task_prompt_template: str,
@@ -391,7 +403,6 @@ class ExtractionService:
         Returns:
             List of content items containing text and image content for examples
         """
-        content = []
         classes = self.config.get("classes", [])
 
         # Find the specific class that matches the class_label
@@ -405,62 +416,18 @@ class ExtractionService:
             logger.warning(
                 f"No class found matching '{class_label}' for few-shot examples"
             )
-            return content
-
-        # Get examples from the target class only
-        examples = target_class.get("examples", [])
-        for example in examples:
-            attributes_prompt = example.get("attributesPrompt")
-
-            # Only process this example if it has a non-empty attributesPrompt
-            if not attributes_prompt or not attributes_prompt.strip():
-                logger.info(
-                    f"Skipping example with empty attributesPrompt: {example.get('name')}"
-                )
-                continue
-
-            content.append({"text": attributes_prompt})
-
-            image_path = example.get("imagePath")
-            if image_path:
-                try:
-                    # Load image content from the path
-
-                    from idp_common import image, s3
-
-                    # Get list of image files from the path (supports directories/prefixes)
-                    image_files = self._get_image_files_from_path(image_path)
-
-                    # Process each image file
-                    for image_file_path in image_files:
-                        try:
-                            # Load image content
-                            if image_file_path.startswith("s3://"):
-                                # Direct S3 URI
-                                image_content = s3.get_binary_content(image_file_path)
-                            else:
-                                # Local file
-                                with open(image_file_path, "rb") as f:
-                                    image_content = f.read()
-
-                            # Prepare image content for Bedrock
-                            image_attachment = image.prepare_bedrock_image_attachment(
-                                image_content
-                            )
-                            content.append(image_attachment)
-
-                        except Exception as e:
-                            logger.warning(
-                                f"Failed to load image {image_file_path}: {e}"
-                            )
-                            continue
-
-                except Exception as e:
-                    raise ValueError(
-                        f"Failed to load example images from {image_path}: {e}"
-                    )
+            return []
 
-        return content
+        # Examples are static per configuration, so their content is built once
+        # per container and served from the process-level few-shot cache
+        image_config = self.config.get("extraction", {}).get("image", {})
+        return few_shot_cache.get_few_shot_content(
+            target_class.get("examples", []),
+            prompt_field="attributesPrompt",
+            resolve_image_files=self._get_image_files_from_path,
+            target_width=image_config.get("target_width"),
+            target_height=image_config.get("target_height"),
+        )
 
     def _get_image_files_from_path(self, image_path: str) -> List[str]:
         """
@@ -709,13 +676,181 @@ class ExtractionService:
             logger.error(error_msg)
             raise Exception(error_msg)
 
-    def process_document_section(self, document: Document, section_id: str) -> Document:
+    def _get_max_workers(self) -> int:
+        """Get the maximum number of pages loaded concurrently."""
+        try:
+            return max(
+                1,
+                int(
+                    self.config.get("extraction", {}).get(
+                        "max_workers", DEFAULT_MAX_WORKERS
+                    )
+                ),
+            )
+        except (TypeError, ValueError):
+            return DEFAULT_MAX_WORKERS
+
+    def load_section_inputs(
+        self, document: Document, section: Section
+    ) -> SectionInputs:
+        """
+        Read the page texts and images of a section from S3.
+
+        Pages are loaded concurrently. Images are resized to the configured
+        extraction image dimensions.
+
+        Args:
+            document: Document containing the section
+            section: Section to load
+
+        Returns:
+            SectionInputs with the joined page text and page images in page order
+
+        Raises:
+            Exception: If a page text or image cannot be read
+        """
+        sorted_page_ids = sorted(section.page_ids, key=int)
+        errors = []
+        pages = []
+        for page_id in sorted_page_ids:
+            if page_id not in document.pages:
+                error_msg = f"Page {page_id} not found in document"
+                logger.error(error_msg)
+                errors.append(error_msg)
+                continue
+            pages.append(document.pages[page_id])
+
+        # Read page images with configurable dimensions
+        image_config = self.config.get("extraction", {}).get("image", {})
+        target_width = image_config.get("target_width")
+        target_height = image_config.get("target_height")
+
+        def load_image(page):
+            # Just pass the values directly - prepare_image handles empty strings/None
+            return image.prepare_image(page.image_uri, target_width, target_height)
+
+        t0 = time.time()
+        if pages:
+            with ThreadPoolExecutor(
+                max_workers=min(self._get_max_workers(), 2 * len(pages))
+            ) as executor:
+                text_futures = [
+                    executor.submit(
+                        tracing.wrap(s3.get_text_content), page.parsed_text_uri
+                    )
+                    for page in pages
+                ]
+                image_futures = [
+                    executor.submit(tracing.wrap(load_image), page) for page in pages
+                ]
+                document_texts = [future.result() for future in text_futures]
+                page_images = [future.result() for future in image_futures]
+        else:
+            document_texts, page_images = [], []
+        logger.info(
+            f"Time taken to read text and images for {len(pages)} pages: "
+            f"{time.time() - t0:.2f} seconds"
+        )
+
+        return SectionInputs(
+            section_id=section.section_id,
+            page_ids=[page.page_id for page in pages],
+            document_text="\n".join(document_texts),
+            page_images=page_images,
+            errors=errors,
+        )
+
+    def process_document_sections(
+        self,
+        document: Document,
+        section_ids: Optional[List[str]] = None,
+        prefetch_depth: Optional[int] = None,
+        max_prefetch_image_mb: Optional[float] = None,
+    ) -> Document:
+        """
+        Process several sections of a Document, prefetching section inputs.
+
+        While a section's Bedrock call is in flight, the page texts and
+        images of the next sections are read from S3 in the background.
+        Use this from entry points that handle several sections in one
+        invocation. A failed section is recorded in document.errors and the
+        remaining sections are still processed.
+
+        Args:
+            document: Document object containing the sections to process
+            section_ids: IDs of the sections to process (default: all sections)
+            prefetch_depth: Number of sections loaded ahead of the current one
+                (default: extraction.prefetch_depth, or 1)
+            max_prefetch_image_mb: Memory budget for prefetched page images
+                (default: extraction.max_prefetch_image_mb, or 256)
+
+        Returns:
+            Document: Updated Document object with extraction results
+        """
+        extraction_config = self.config.get("extraction", {})
+        if section_ids is None:
+            section_ids = [section.section_id for section in document.sections]
+        if prefetch_depth is None:
+            prefetch_depth = int(
+                extraction_config.get("prefetch_depth", DEFAULT_PREFETCH_DEPTH)
+            )
+        if max_prefetch_image_mb is None:
+            max_prefetch_image_mb = float(
+                extraction_config.get(
+                    "max_prefetch_image_mb", DEFAULT_MAX_PREFETCH_IMAGE_MB
+                )
+            )
+
+        sections_by_id = {section.section_id: section for section in document.sections}
+
+        def loader(section_id: str) -> SectionInputs:
+            with tracing.span(
+                "extraction.load_section",
+                document_id=document.id,
+                section_id=section_id,
+            ):
+                return self.load_section_inputs(document, sections_by_id[section_id])
+
+        # Unknown sections are reported by process_document_section
+        prefetcher = SectionPrefetcher(
+            loader,
+            [sid for sid in section_ids if sid in sections_by_id],
+            prefetch_depth=prefetch_depth,
+            max_prefetch_bytes=int(max_prefetch_image_mb * 1024 * 1024),
+        )
+        for section_id in section_ids:
+            if section_id not in sections_by_id:
+                self.process_document_section(document, section_id)
+
+        for section_id, inputs, error in prefetcher:
+            if error is not None:
+                error_msg = f"Error processing section {section_id}: {str(error)}"
+                logger.error(error_msg)
+                document.errors.append(error_msg)
+                continue
+            try:
+                self.process_document_section(document, section_id, inputs=inputs)
+            except Exception:
+                # Already recorded in document.errors
+                continue
+
+        return document
+
+    @tracing.traced("extraction.section")
+    def process_document_section(
+        self,
+        document: Document,
+        section_id: str,
+        inputs: Optional[SectionInputs] = None,
+    ) -> Document:
         """
         Process a single section from a Document object.
 
         Args:
             document: Document object containing section to process
             section_id: ID of the section to process
+            inputs: Optional section inputs already loaded with
+                load_section_inputs (e.g. by a prefetch pipeline)
 
         Returns:
             Document: Updated Document object with extraction results for the section
@@ -725,6 +860,7 @@ class ExtractionService:
             logger.error("No document provided")
             return document
 
+        tracing.annotate(document_id=document.id, section_id=section_id)
         if not document.sections:
             logger.error("Document has no sections to process")
             document.errors.append("Document has no sections to process")
@@ -770,46 +906,15 @@ class ExtractionService:
         metrics.put_metric("InputDocumentPages", len(section.page_ids))
 
         try:
-            # Read document text from all pages in order
             t0 = time.time()
-            document_texts = []
-            for page_id in sorted_page_ids:
-                if page_id not in document.pages:
-                    error_msg = f"Page {page_id} not found in document"
-                    logger.error(error_msg)
-                    document.errors.append(error_msg)
-                    continue
-
-                page = document.pages[page_id]
-                text_path = page.parsed_text_uri
-                page_text = s3.get_text_content(text_path)
-                document_texts.append(page_text)
-
-            document_text = "\n".join(document_texts)
-            t1 = time.time()
-            logger.info(f"Time taken to read text content: {t1 - t0:.2f} seconds")
-
-            # Read page images with configurable dimensions
             extraction_config = self.config.get("extraction", {})
-            image_config = extraction_config.get("image", {})
-            target_width = image_config.get("target_width")
-            target_height = image_config.get("target_height")
-
-            page_images = []
-            for page_id in sorted_page_ids:
-                if page_id not in document.pages:
-                    continue
-
-                page = document.pages[page_id]
-                image_uri = page.image_uri
-                # Just pass the values directly - prepare_image handles empty strings/None
-                image_content = image.prepare_image(
-                    image_uri, target_width, target_height
-                )
-                page_images.append(image_content)
-
-            t2 = time.time()
-            logger.info(f"Time taken to read images: {t2 - t1:.2f} seconds")
+            if inputs is None:
+                inputs = self.load_section_inputs(document, section)
+            else:
+                logger.info(f"Using prefetched inputs for section {section_id}")
+            document.errors.extend(inputs.errors)
+            document_text = inputs.document_text
+            page_images = inputs.page_images
 
             # Get extraction configuration
             model_id = self.config.get("model_id") or extraction_config.get("model")
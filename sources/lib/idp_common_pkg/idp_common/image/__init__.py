@@ -5,11 +5,13 @@ from PIL import Image, ImageFilter, ImageChops, ImageOps
 import io
 import logging
 from typing import Tuple, Optional, Dict, Any, Union
+from .. import tracing
 from ..s3 import get_binary_content
 from ..utils import parse_s3_uri
 
 logger = logging.getLogger(__name__)
 
+@tracing.traced('image.resize')
 def resize_image(image_data: bytes, 
                 target_width: Optional[int] = None, 
                 target_height: Optional[int] = None,
@@ -95,6 +97,7 @@ def resize_image(image_data: bytes,
         logger.info(f"Image {current_width}x{current_height} already fits within {target_width}x{target_height}, returning original")
         return image_data
 
+@tracing.traced('image.prepare')
 def prepare_image(image_source: Union[str, bytes],
                  target_width: Optional[int] = None, 
                  target_height: Optional[int] = None,
@@ -1,23 +1,67 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
+"""
+Buffered CloudWatch metrics.
+
+put_metric only appends the datapoint to an in-memory buffer; it never makes an
+API call or takes a lock, so it can be called freely from worker threads. The
+buffer is aggregated and published by a background flusher thread and by
+explicit calls to flush(), either as batched PutMetricData requests (default)
+or as CloudWatch Embedded Metric Format (EMF) log lines.
+
+Lambda functions freeze background threads between invocations, so handlers
+must flush before returning, e.g. with the flush_on_exit decorator:
+
+    @metrics.flush_on_exit
+    def handler(event, context):
+        ...
+
+Environment variables:
+    METRIC_NAMESPACE: Default metric namespace (default: GENAIDP)
+    METRICS_MODE: 'api' for batched PutMetricData or 'emf' for EMF log lines
+    METRICS_FLUSH_INTERVAL: Seconds between background flushes; 0 disables the
+        background flusher (default: 10)
+"""
+
+import atexit
 import boto3
+import functools
+import json
 import os
 import logging
 import threading
-from typing import List, Dict, Any, Optional
+import time
+from collections import deque
+from typing import List, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# PutMetricData accepts up to 1000 metric datums per request
+MAX_DATUMS_PER_REQUEST = 1000
+# EMF allows up to 100 metrics per document and 100 values per metric
+MAX_EMF_METRICS = 100
+MAX_EMF_VALUES = 100
+# Wake the background flusher early when this many datapoints are buffered
+FLUSH_THRESHOLD = 5000
+DEFAULT_FLUSH_INTERVAL = 10
+
 # Initialize clients
 _cloudwatch_client = None
 _client_lock = threading.Lock()
-_metric_lock = threading.Lock()
+
+# Buffered datapoints: (namespace, name, unit, dimensions, value).
+# deque.append and deque.popleft are atomic, so no lock is needed.
+_buffer = deque()
+_flusher_lock = threading.Lock()
+_flusher_thread = None
+_flush_event = threading.Event()
+
 
 def get_cloudwatch_client():
     """
     Get or initialize the CloudWatch client in a thread-safe manner
-    
+
     Returns:
         boto3 CloudWatch client
     """
@@ -27,12 +71,61 @@ def get_cloudwatch_client():
             _cloudwatch_client = boto3.client('cloudwatch')
         return _cloudwatch_client
 
-def put_metric(name: str, value: float, unit: str = 'Count', 
+def _get_mode() -> str:
+    """Get the metric publishing mode ('api' or 'emf')."""
+    mode = os.environ.get('METRICS_MODE', 'api').lower()
+    if mode not in ('api', 'emf'):
+        logger.warning(f"Unknown METRICS_MODE '{mode}', using 'api'")
+        mode = 'api'
+    return mode
+
+def _get_flush_interval() -> float:
+    """Get the background flush interval in seconds."""
+    try:
+        return float(os.environ.get('METRICS_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL))
+    except ValueError:
+        return DEFAULT_FLUSH_INTERVAL
+
+def _flusher_loop(interval: float) -> None:
+    """Periodically flush buffered metrics until the process exits."""
+    while True:
+        _flush_event.wait(interval)
+        _flush_event.clear()
+        if _flusher_thread is not threading.current_thread():
+            # The flusher was replaced or disabled
+            return
+        try:
+            flush()
+        except Exception as e:
+            logger.error(f"Error flushing metrics: {e}")
+
+def _ensure_flusher() -> None:
+    """Start the background flusher thread on first use."""
+    global _flusher_thread
+    if _flusher_thread is not None:
+        return
+    with _flusher_lock:
+        if _flusher_thread is not None:
+            return
+        interval = _get_flush_interval()
+        if interval <= 0:
+            # Mark as started so we do not check again
+            _flusher_thread = False
+            return
+        _flusher_thread = threading.Thread(
+            target=_flusher_loop, args=(interval,), name='metrics-flusher', daemon=True
+        )
+        _flusher_thread.start()
+
+def put_metric(name: str, value: float, unit: str = 'Count',
               dimensions: Optional[List[Dict[str, str]]] = None,
               namespace: Optional[str] = None) -> None:
     """
-    Publish a metric to CloudWatch in a thread-safe manner
-    
+    Record a metric datapoint for publishing to CloudWatch.
+
+    The datapoint is buffered and published by the next flush, so this call
+    does not block on the CloudWatch API.
+
     Args:
         name: The name of the metric
         value: The value of the metric
@@ -40,87 +133,169 @@ def put_metric(name: str, value: float, unit: str = 'Count',
         dimensions: Optional list of dimensions
         namespace: Optional metric namespace, defaults to environment variable
     """
-    dimensions = dimensions or []
-    
     # Get namespace from environment if not provided
     if namespace is None:
         namespace = os.environ.get('METRIC_NAMESPACE', 'GENAIDP')
-    
-    # Use thread lock to ensure thread safety when publishing metrics
-    with _metric_lock:
-        logger.debug(f"Publishing metric {name}: {value}")
+
+    dimension_key = tuple(
+        sorted((d['Name'], d['Value']) for d in (dimensions or []))
+    )
+    _buffer.append((namespace, name, unit, dimension_key, value))
+    logger.debug(f"Buffered metric {name}: {value}")
+
+    _ensure_flusher()
+    if len(_buffer) >= FLUSH_THRESHOLD:
+        _flush_event.set()
+
+def _drain() -> Dict[Tuple[str, str, str, Tuple], List[float]]:
+    """Remove all buffered datapoints and group their values by metric."""
+    aggregated = {}
+    while True:
         try:
-            cloudwatch = get_cloudwatch_client()
-            cloudwatch.put_metric_data(
-                Namespace=namespace,
-                MetricData=[{
-                    'MetricName': name,
-                    'Value': value,
-                    'Unit': unit,
-                    'Dimensions': dimensions
-                }]
-            )
-        except Exception as e:
-            logger.error(f"Error publishing metric {name}: {e}")
+            namespace, name, unit, dimension_key, value = _buffer.popleft()
+        except IndexError:
+            break
+        aggregated.setdefault((namespace, name, unit, dimension_key), []).append(value)
+    return aggregated
+
+def _publish_api(aggregated: Dict[Tuple[str, str, str, Tuple], List[float]]) -> None:
+    """Publish aggregated metrics with batched PutMetricData calls."""
+    by_namespace = {}
+    for (namespace, name, unit, dimension_key), values in aggregated.items():
+        by_namespace.setdefault(namespace, []).append({
+            'MetricName': name,
+            'Unit': unit,
+            'Dimensions': [{'Name': k, 'Value': v} for k, v in dimension_key],
+            'StatisticValues': {
+                'SampleCount': float(len(values)),
+                'Sum': float(sum(values)),
+                'Minimum': float(min(values)),
+                'Maximum': float(max(values)),
+            },
+        })
+
+    try:
+        cloudwatch = get_cloudwatch_client()
+    except Exception as e:
+        logger.error(f"Error creating CloudWatch client, dropping metrics: {e}")
+        return
+
+    for namespace, metric_data in by_namespace.items():
+        for start in range(0, len(metric_data), MAX_DATUMS_PER_REQUEST):
+            batch = metric_data[start:start + MAX_DATUMS_PER_REQUEST]
+            try:
+                cloudwatch.put_metric_data(Namespace=namespace, MetricData=batch)
+            except Exception as e:
+                names = sorted({datum['MetricName'] for datum in batch})
+                logger.error(f"Error publishing metrics {', '.join(names)}: {e}")
+
+def _publish_emf(aggregated: Dict[Tuple[str, str, str, Tuple], List[float]]) -> None:
+    """Publish aggregated metrics as Embedded Metric Format log lines on stdout."""
+    groups = {}
+    for (namespace, name, unit, dimension_key), values in aggregated.items():
+        groups.setdefault((namespace, dimension_key), []).append((name, unit, values))
+
+    timestamp = int(time.time() * 1000)
+    for (namespace, dimension_key), metrics in groups.items():
+        # Split values so each metric has at most MAX_EMF_VALUES per document
+        entries = [
+            (name, unit, values[start:start + MAX_EMF_VALUES])
+            for name, unit, values in metrics
+            for start in range(0, len(values), MAX_EMF_VALUES)
+        ]
+        while entries:
+            document_entries, remaining = [], []
+            seen = set()
+            for entry in entries:
+                if entry[0] in seen or len(document_entries) >= MAX_EMF_METRICS:
+                    remaining.append(entry)
+                else:
+                    seen.add(entry[0])
+                    document_entries.append(entry)
+            entries = remaining
+
+            document = {
+                '_aws': {
+                    'Timestamp': timestamp,
+                    'CloudWatchMetrics': [{
+                        'Namespace': namespace,
+                        'Dimensions': [[k for k, _ in dimension_key]],
+                        'Metrics': [
+                            {'Name': name, 'Unit': unit}
+                            for name, unit, _ in document_entries
+                        ],
+                    }],
+                },
+            }
+            document.update(dict(dimension_key))
+            for name, _, values in document_entries:
+                document[name] = values if len(values) > 1 else values[0]
+            print(json.dumps(document), flush=True)
+
+def flush() -> int:
+    """
+    Publish all buffered metrics.
+
+    Call this before a Lambda handler returns (or use flush_on_exit), since the
+    background flusher does not run while the function is frozen.
+
+    Returns:
+        Number of datapoints flushed
+    """
+    aggregated = _drain()
+    if not aggregated:
+        return 0
+
+    count = sum(len(values) for values in aggregated.values())
+    if _get_mode() == 'emf':
+        _publish_emf(aggregated)
+    else:
+        _publish_api(aggregated)
+    logger.debug(f"Flushed {count} datapoints for {len(aggregated)} metrics")
+    return count
+
+def flush_on_exit(handler):
+    """
+    Decorator that flushes buffered metrics when a Lambda handler returns or raises.
+
+    Args:
+        handler: Lambda handler function
 
-def create_client_performance_metrics(name: str, duration_ms: float, 
-                                     is_success: bool = True, 
+    Returns:
+        Wrapped handler
+    """
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            try:
+                flush()
+            except Exception as e:
+                logger.error(f"Error flushing metrics: {e}")
+    return wrapper
+
+def create_client_performance_metrics(name: str, duration_ms: float,
+                                     is_success: bool = True,
                                      error_type: Optional[str] = None) -> None:
     """
-    Helper to publish standardized client performance metrics in a thread-safe manner
-    
+    Helper to record standardized client performance metrics
+
     Args:
         name: Base name for the metric group
         duration_ms: Duration in milliseconds
         is_success: Whether the operation succeeded
         error_type: Optional error type for failures
     """
-    # Use a single lock for all metrics to ensure they are published as a group
-    with _metric_lock:
-        # Get namespace from environment
-        namespace = os.environ.get('METRIC_NAMESPACE', 'GENAIDP')
-        dimensions = []
-        cloudwatch = get_cloudwatch_client()
-        
-        # Build metric data array for all metrics we want to publish
-        metric_data = [
-            {
-                'MetricName': f"{name}Latency",
-                'Value': duration_ms,
-                'Unit': 'Milliseconds',
-                'Dimensions': dimensions
-            }
-        ]
-        
-        # Add success/failure metrics
-        if is_success:
-            metric_data.append({
-                'MetricName': f"{name}Success",
-                'Value': 1,
-                'Unit': 'Count',
-                'Dimensions': dimensions
-            })
-        else:
-            metric_data.append({
-                'MetricName': f"{name}Failure",
-                'Value': 1,
-                'Unit': 'Count',
-                'Dimensions': dimensions
-            })
-            if error_type:
-                metric_data.append({
-                    'MetricName': f"{name}Error.{error_type}",
-                    'Value': 1,
-                    'Unit': 'Count',
-                    'Dimensions': dimensions
-                })
-        
-        # Publish all metrics in a single API call for efficiency
-        try:
-            cloudwatch.put_metric_data(
-                Namespace=namespace,
-                MetricData=metric_data
-            )
-            logger.debug(f"Published {len(metric_data)} metrics for {name}")
-        except Exception as e:
-            logger.error(f"Error publishing performance metrics for {name}: {e}")
\ No newline at end of file
+    put_metric(f"{name}Latency", duration_ms, 'Milliseconds')
+
+    # Add success/failure metrics
+    if is_success:
+        put_metric(f"{name}Success", 1)
+    else:
+        put_metric(f"{name}Failure", 1)
+        if error_type:
+            put_metric(f"{name}Error.{error_type}", 1)
+
+# Publish anything still buffered when a (non-Lambda) process exits
+atexit.register(flush)
@@ -692,3 +692,156 @@ class Document:
                     f"Document size ({document_size} bytes) is under {size_threshold_kb}KB threshold, returning as JSON"
                 )
             return self.to_dict()
+
+    def get_section_delta(self, section_id: str) -> "SectionDelta":
+        """
+        Get the per-section result of a section processing step.
+
+        Args:
+            section_id: ID of the processed section
+
+        Returns:
+            SectionDelta with the section record, metering, errors and status
+
+        Raises:
+            ValueError: If the document has no section with this ID
+        """
+        for section in self.sections:
+            if section.section_id == section_id:
+                return SectionDelta(
+                    document_id=self.id,
+                    section=section,
+                    status=self.status,
+                    metering=self.metering,
+                    errors=list(self.errors),
+                )
+        raise ValueError(f"Section {section_id} not found in document {self.id}")
+
+    def apply_section_delta(self, delta: "SectionDelta") -> None:
+        """
+        Merge a per-section result into this document.
+
+        The section replaces any section with the same ID (or is appended)
+        and the metering of the delta is added to the document metering.
+        Errors are left to the caller, since whether they fail the document
+        depends on the status of the delta.
+
+        Args:
+            delta: Result of processing one section
+        """
+        from idp_common.utils import merge_metering_data
+
+        for i, section in enumerate(self.sections):
+            if section.section_id == delta.section.section_id:
+                self.sections[i] = delta.section
+                break
+        else:
+            self.sections.append(delta.section)
+        self.metering = merge_metering_data(self.metering, delta.metering)
+
+
+@dataclass
+class SectionDelta:
+    """
+    Result of processing one section of a document.
+
+    Section steps that run inside a Step Functions Map (extraction, assessment)
+    change only their own section, the metering and the errors. Returning just
+    those fields, instead of a full document snapshot per section, lets the
+    results step merge all sections into the base document without loading
+    one document per section.
+    """
+
+    document_id: Optional[str]
+    section: Section
+    status: Status = Status.QUEUED
+    metering: Dict[str, Any] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the delta to dictionary representation."""
+        return {
+            "document_id": self.document_id,
+            "section": self.section.to_dict(),
+            "status": self.status.value,
+            "metering": self.metering,
+            "errors": self.errors,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SectionDelta":
+        """Create a SectionDelta from a dictionary representation."""
+        try:
+            status = Status(data.get("status", Status.QUEUED.value))
+        except ValueError:
+            status = Status.QUEUED
+        return cls(
+            document_id=data.get("document_id"),
+            section=Section.from_dict(data.get("section", {})),
+            status=status,
+            metering=data.get("metering", {}),
+            errors=data.get("errors", []),
+        )
+
+    def serialize(self, working_bucket, step_name, logger=None) -> Dict[str, Any]:
+        """
+        Prepare the delta for a Lambda response.
+
+        The delta is stored in the working bucket and a small reference is
+        returned, so the results of a Map over many sections stay within the
+        Step Functions payload limit. Without a working bucket the delta is
+        returned inline.
+
+        Args:
+            working_bucket: S3 bucket for the delta
+            step_name: Name of the processing step (for S3 key generation)
+            logger: Optional logger for debug messages
+
+        Returns:
+            dict: Reference to the stored delta, or the delta itself
+        """
+        if not working_bucket:
+            return self.to_dict()
+
+        from idp_common import s3
+
+        timestamp = str(int(time.time() * 1000))
+        s3_key = (
+            f"compressed_documents/{self.document_id}/"
+            f"{timestamp}_{step_name}_delta.json"
+        )
+        s3.write_content(
+            json.dumps(self.to_dict(), default=str),
+            working_bucket,
+            s3_key,
+            content_type="application/json",
+        )
+        s3_uri = f"s3://{working_bucket}/{s3_key}"
+        if logger:
+            logger.info(f"Stored section {self.section.section_id} delta at {s3_uri}")
+        return {
+            "document_id": self.document_id,
+            "section_id": self.section.section_id,
+            "status": self.status.value,
+            "s3_uri": s3_uri,
+        }
+
+    @classmethod
+    def load(cls, event_data: Dict[str, Any], logger=None) -> "SectionDelta":
+        """
+        Load a delta returned by serialize.
+
+        Args:
+            event_data: Reference to a stored delta, or an inline delta
+            logger: Optional logger for debug messages
+
+        Returns:
+            SectionDelta: The delta
+        """
+        if "s3_uri" in event_data:
+            from idp_common import s3
+
+            if logger:
+                logger.info(f"Loading section delta from {event_data['s3_uri']}")
+            return cls.from_dict(s3.get_json_content(event_data["s3_uri"]))
+        return cls.from_dict(event_data)
@@ -0,0 +1,152 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Memory budget for concurrent page rendering.
+
+OcrService renders up to max_workers pages at once. A typical letter page at
+150 DPI needs a ~6 MB pixmap, but a 36x48 inch engineering drawing needs
+~110 MB, so a few large pages rendered together can exceed the Lambda memory
+limit. RenderBudget admits pages against a byte budget using the pixmap size
+estimated from the page rectangle and render scale before rendering. Pages
+wait while the budget is in use. A page that is larger than the whole budget
+is rendered at a lower resolution and on its own.
+"""
+
+import logging
+import math
+import os
+import resource
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Share of the Lambda function memory used for concurrent pixmaps by default
+DEFAULT_LAMBDA_MEMORY_FRACTION = 0.5
+DEFAULT_MIN_RENDER_DPI = 72
+
+# RGB pixmap samples
+PIXMAP_CHANNELS = 3
+
+
+def estimate_pixmap_bytes(
+    width: float, height: float, scale: float, channels: int = PIXMAP_CHANNELS
+) -> int:
+    """
+    Estimate the memory used by a rendered pixmap.
+
+    Args:
+        width: Page width in page units (points for PDF, pixels for images)
+        height: Page height in page units
+        scale: Pixels per page unit
+        channels: Number of color channels
+
+    Returns:
+        Size of the pixmap samples in bytes
+    """
+    # Allow for floating point error, e.g. 612 * (150 / 72) = 1275.0000000000002
+    pixel_width = math.ceil(width * scale - 1e-6)
+    pixel_height = math.ceil(height * scale - 1e-6)
+    return pixel_width * pixel_height * channels
+
+
+def fit_scale_to_budget(
+    width: float, height: float, scale: float, max_bytes: int, min_scale: float
+) -> float:
+    """
+    Reduce a render scale so the pixmap fits within max_bytes.
+
+    Args:
+        width: Page width in page units
+        height: Page height in page units
+        scale: Requested pixels per page unit
+        max_bytes: Maximum pixmap size
+        min_scale: Lowest acceptable scale
+
+    Returns:
+        The requested scale if it fits, otherwise the largest scale that fits,
+        but never less than min_scale (or the requested scale if that is lower)
+    """
+    estimate = estimate_pixmap_bytes(width, height, scale)
+    if estimate <= max_bytes:
+        return scale
+    fitted = scale * math.sqrt(max_bytes / estimate)
+    return max(fitted, min(min_scale, scale))
+
+
+def get_default_budget_mb() -> Optional[float]:
+    """
+    Get the default render memory budget.
+
+    Returns:
+        Half of the Lambda function memory when running in Lambda, otherwise
+        None (no budget)
+    """
+    memory_size = os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE")
+    if not memory_size:
+        return None
+    try:
+        return float(memory_size) * DEFAULT_LAMBDA_MEMORY_FRACTION
+    except ValueError:
+        return None
+
+
+def get_peak_rss_mb() -> float:
+    """Get the peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+class RenderBudget:
+    """Thread-safe admission control for pixmap memory."""
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the budget.
+
+        Args:
+            max_bytes: Maximum total size of pixmaps rendered concurrently
+        """
+        self.max_bytes = max_bytes
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+    @property
+    def in_use(self) -> int:
+        """Bytes currently reserved."""
+        return self._in_use
+
+    @contextmanager
+    def reserve(self, nbytes: int) -> Iterator[None]:
+        """
+        Reserve memory for a render, waiting until it fits in the budget.
+
+        A reservation larger than the whole budget is admitted once nothing
+        else is reserved, so it is rendered on its own.
+
+        Args:
+            nbytes: Estimated pixmap size
+        """
+        with self._condition:
+            waited = False
+            while self._in_use and self._in_use + nbytes > self.max_bytes:
+                if not waited:
+                    logger.info(
+                        f"Waiting for render memory: need {nbytes / 1048576:.1f} MB, "
+                        f"{self._in_use / 1048576:.1f} of {self.max_bytes / 1048576:.1f} MB in use"
+                    )
+                    waited = True
+                self._condition.wait()
+            self._in_use += nbytes
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_use -= nbytes
+                self._condition.notify_all()
@@ -10,6 +10,7 @@ processing of multiple pages.
 """
 
 import concurrent.futures
+import contextlib
 import logging
 import os
 import time
@@ -19,12 +20,24 @@ import boto3
 import fitz  # PyMuPDF
 from botocore.config import Config
 
-from idp_common import bedrock, image, s3, utils
+from idp_common import bedrock, image, metrics, s3, tracing, utils
 from idp_common.models import Document, Page, Status
+from idp_common.ocr import textract_async, textract_blocks
 from idp_common.ocr.document_converter import DocumentConverter
+from idp_common.ocr.render_budget import (
+    DEFAULT_MIN_RENDER_DPI,
+    RenderBudget,
+    estimate_pixmap_bytes,
+    fit_scale_to_budget,
+    get_default_budget_mb,
+    get_peak_rss_mb,
+)
 
 logger = logging.getLogger(__name__)
 
+# Minimum page count for asynchronous Textract jobs with textract_mode 'auto'
+DEFAULT_ASYNC_PAGE_THRESHOLD = 100
+
 
 class OcrService:
     """Service for OCR processing of documents using AWS Textract or Amazon Bedrock."""
@@ -220,6 +233,11 @@ class OcrService:
             else:
                 self.bedrock_config = None
 
+        # Memory budget for concurrently rendered page images
+        render_config = getattr(self, "config", None) or {}
+        self._init_render_budget(render_config.get("ocr", {}))
+        self._init_textract_mode(render_config.get("ocr", {}))
+
         # Log DPI and sizing configuration together for clarity
         if self.resize_config:
             logger.info(
@@ -313,6 +331,7 @@ class OcrService:
         # Initialize document converter for non-PDF formats
         self.document_converter = DocumentConverter(dpi=self.dpi or 150)
 
+    @tracing.traced("ocr.process_document")
     def process_document(self, document: Document) -> Document:
         """
         Process a document with OCR and update the Document model.
@@ -325,13 +344,18 @@ class OcrService:
             Updated Document object with OCR results
         """
         t0 = time.time()
+        tracing.annotate(document_id=document.id)
 
         # Get the document from S3
         try:
-            response = self.s3_client.get_object(
-                Bucket=document.input_bucket, Key=document.input_key
-            )
-            file_content = response["Body"].read()
+            with tracing.span(
+                "s3.get_object", bucket=document.input_bucket, key=document.input_key
+            ) as span:
+                response = self.s3_client.get_object(
+                    Bucket=document.input_bucket, Key=document.input_key
+                )
+                file_content = response["Body"].read()
+                span.set_attribute("bytes", len(file_content))
             t1 = time.time()
             logger.debug(f"Time taken for S3 GetObject: {t1 - t0:.6f} seconds")
         except Exception as e:
@@ -393,23 +417,42 @@ class OcrService:
                 num_pages = len(pdf_document)
                 document.num_pages = num_pages
 
+                # Large PDFs can be OCRed with one asynchronous Textract job
+                # instead of one synchronous request per page
+                page_responses = None
+                if pdf_document.is_pdf and self._use_async_textract(num_pages):
+                    page_responses = self._run_async_textract(document, num_pages)
+
                 with concurrent.futures.ThreadPoolExecutor(
                     max_workers=self.max_workers
                 ) as executor:
                     # Pass original file content for image files
                     original_content = file_content if not pdf_document.is_pdf else None
 
-                    future_to_page = {
-                        executor.submit(
-                            self._process_single_page,
-                            i,
-                            pdf_document,
-                            document.output_bucket,
-                            document.input_key,
-                            original_content,
-                        ): i
-                        for i in range(num_pages)
-                    }
+                    if page_responses is not None:
+                        future_to_page = {
+                            executor.submit(
+                                tracing.wrap(self._process_single_page_textract),
+                                i,
+                                pdf_document,
+                                document.output_bucket,
+                                document.input_key,
+                                textract_result=page_responses[i + 1],
+                            ): i
+                            for i in range(num_pages)
+                        }
+                    else:
+                        future_to_page = {
+                            executor.submit(
+                                tracing.wrap(self._process_single_page),
+                                i,
+                                pdf_document,
+                                document.output_bucket,
+                                document.input_key,
+                                original_content,
+                            ): i
+                            for i in range(num_pages)
+                        }
 
                     # Start memory monitoring in background thread
                     memory_monitor_shutdown = self._start_memory_monitoring()
@@ -578,6 +621,7 @@ class OcrService:
                 page_index, pdf_document, output_bucket, prefix
             )
 
+    @tracing.traced("ocr.page")
     def _process_image_file_direct(
         self,
         pdf_document: fitz.Document,
@@ -599,6 +643,7 @@ class OcrService:
         """
         t0 = time.time()
         page_id = 1
+        tracing.annotate(page_id=str(page_id))
 
         # If we have the original file content, use it directly to avoid PyMuPDF processing
         if original_file_content:
@@ -925,12 +970,13 @@ class OcrService:
                 logger.debug("Applied adaptive binarization preprocessing for OCR")
 
             # Process with OCR
-            if isinstance(self.enhanced_features, list) and self.enhanced_features:
-                textract_result = self._analyze_document(ocr_img_data, page_id)
-            else:
-                textract_result = self.textract_client.detect_document_text(
-                    Document={"Bytes": ocr_img_data}
-                )
+            with tracing.span(f"textract.{self._get_api_name()}"):
+                if isinstance(self.enhanced_features, list) and self.enhanced_features:
+                    textract_result = self._analyze_document(ocr_img_data, page_id)
+                else:
+                    textract_result = self.textract_client.detect_document_text(
+                        Document={"Bytes": ocr_img_data}
+                    )
 
             # Extract metering data
             feature_combo = self._feature_combo()
@@ -949,8 +995,13 @@ class OcrService:
                 content_type="application/json",
             )
 
+            # Text confidence data reads the LINE blocks; the block index is
+            # only built if result.json falls back to plain text
+            page_content = textract_blocks.process_textract_response(textract_result)
+
             # Generate and store text confidence data
-            text_confidence_data = self._generate_text_confidence_data(textract_result)
+            with tracing.span("textract.parse"):
+                text_confidence_data = page_content.text_confidence
             text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
             s3.write_content(
                 text_confidence_data,
@@ -960,7 +1011,9 @@ class OcrService:
             )
 
             # Parse and store text content
-            parsed_result = self._parse_textract_response(textract_result, page_id)
+            parsed_result = self._parse_textract_response(
+                textract_result, page_id, page_content
+            )
             parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
             s3.write_content(
                 parsed_result,
@@ -982,6 +1035,200 @@ class OcrService:
 
         return result, metering
 
+    def _init_render_budget(self, ocr_config: Dict[str, Any]) -> None:
+        """
+        Set up the render memory budget from configuration.
+
+        Args:
+            ocr_config: The 'ocr' configuration section
+        """
+        budget_mb = ocr_config.get("render_memory_budget_mb")
+        if budget_mb is None or (isinstance(budget_mb, str) and not budget_mb.strip()):
+            budget_mb = get_default_budget_mb()
+        try:
+            budget_mb = float(budget_mb) if budget_mb is not None else None
+        except (TypeError, ValueError):
+            logger.warning(
+                f"Invalid render_memory_budget_mb '{budget_mb}', using default"
+            )
+            budget_mb = get_default_budget_mb()
+
+        try:
+            self.min_render_dpi = int(
+                ocr_config.get("min_render_dpi", DEFAULT_MIN_RENDER_DPI)
+            )
+        except (TypeError, ValueError):
+            self.min_render_dpi = DEFAULT_MIN_RENDER_DPI
+
+        if budget_mb and budget_mb > 0:
+            self.render_budget = RenderBudget(int(budget_mb * 1024 * 1024))
+            logger.info(
+                f"Page rendering memory budget: {budget_mb:.0f} MB "
+                f"(minimum DPI {self.min_render_dpi})"
+            )
+        else:
+            self.render_budget = None
+
+    def _init_textract_mode(self, ocr_config: Dict[str, Any]) -> None:
+        """
+        Set up synchronous or asynchronous Textract processing from configuration.
+
+        Args:
+            ocr_config: The 'ocr' configuration section
+        """
+        mode = str(ocr_config.get("textract_mode", "sync") or "sync").lower()
+        if mode not in ("sync", "async", "auto"):
+            logger.warning(f"Invalid textract_mode '{mode}', using 'sync'")
+            mode = "sync"
+        self.textract_mode = mode
+
+        def number(key, default, cast):
+            try:
+                return cast(ocr_config.get(key, default))
+            except (TypeError, ValueError):
+                logger.warning(
+                    f"Invalid {key} '{ocr_config.get(key)}', using {default}"
+                )
+                return default
+
+        self.async_page_threshold = number(
+            "async_page_threshold", DEFAULT_ASYNC_PAGE_THRESHOLD, int
+        )
+        self.async_poll_interval = number(
+            "async_poll_interval", textract_async.DEFAULT_POLL_INTERVAL, float
+        )
+        self.async_timeout = number(
+            "async_timeout", textract_async.DEFAULT_JOB_TIMEOUT, float
+        )
+
+    def _use_async_textract(self, num_pages: int) -> bool:
+        """
+        Check whether a PDF should be processed with an asynchronous Textract job.
+
+        Args:
+            num_pages: Number of pages in the PDF
+
+        Returns:
+            True for textract_mode 'async', or 'auto' with at least
+            async_page_threshold pages
+        """
+        if self.backend != "textract":
+            return False
+        if self.textract_mode == "async":
+            return True
+        return self.textract_mode == "auto" and num_pages >= self.async_page_threshold
+
+    def _run_async_textract(
+        self, document: Document, num_pages: int
+    ) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        OCR a PDF with one asynchronous Textract job.
+
+        Args:
+            document: Document whose input PDF is in S3
+            num_pages: Number of pages in the PDF
+
+        Returns:
+            Mapping from 1-based page number to a single-page Textract
+            response, or None if the job failed (pages are then processed with
+            the synchronous API)
+        """
+        feature_types = (
+            self.enhanced_features
+            if isinstance(self.enhanced_features, list) and self.enhanced_features
+            else None
+        )
+        logger.info(
+            f"Processing {num_pages} pages with an asynchronous Textract job "
+            f"(features: {feature_types or 'none'})"
+        )
+        try:
+            return textract_async.analyze_document_async(
+                self.textract_client,
+                document.input_bucket,
+                document.input_key,
+                num_pages,
+                feature_types=feature_types,
+                poll_interval=self.async_poll_interval,
+                timeout=self.async_timeout,
+            )
+        except Exception as e:
+            logger.warning(
+                f"Asynchronous Textract job failed, falling back to per-page "
+                f"synchronous requests: {str(e)}"
+            )
+            return None
+
+    def _get_render_scale(self, page: fitz.Page, is_pdf: bool) -> float:
+        """
+        Get the render scale (pixels per page unit) for a page.
+
+        PDF pages are rendered at the configured DPI and images at their own
+        size. With a resize config, the scale is reduced so the page fits the
+        target dimensions (preserving aspect ratio, never upscaling).
+
+        Args:
+            page: PyMuPDF page object
+            is_pdf: Whether the document is a PDF file
+
+        Returns:
+            Render scale
+        """
+        base_scale = (self.dpi or 150) / 72 if is_pdf else 1.0
+
+        if self.resize_config:
+            target_width = self.resize_config.get("target_width")
+            target_height = self.resize_config.get("target_height")
+
+            if target_width and target_height:
+                # Get page dimensions at the base scale
+                page_rect = page.rect
+                original_width = int(page_rect.width * base_scale)
+                original_height = int(page_rect.height * base_scale)
+
+                # Apply same logic as image.resize_image - preserve aspect ratio, never upscale
+                scale_factor = min(
+                    target_width / original_width, target_height / original_height
+                )
+                if scale_factor < 1.0:
+                    return base_scale * scale_factor
+
+        return base_scale
+
+    def _fit_render_budget(
+        self, page: fitz.Page, is_pdf: bool, scale: float, page_id: int
+    ) -> Tuple[float, int]:
+        """
+        Lower the render scale of a page whose pixmap alone exceeds the budget.
+
+        Args:
+            page: PyMuPDF page object
+            is_pdf: Whether the document is a PDF file
+            scale: Requested render scale
+            page_id: Page number for logging
+
+        Returns:
+            Tuple of (render scale, estimated pixmap bytes at that scale)
+        """
+        page_rect = page.rect
+        min_scale = self.min_render_dpi / 72 if is_pdf else 0.0
+        fitted = fit_scale_to_budget(
+            page_rect.width,
+            page_rect.height,
+            scale,
+            self.render_budget.max_bytes,
+            min_scale,
+        )
+        if fitted < scale:
+            unit = 72 if is_pdf else 100
+            label = "DPI" if is_pdf else "% scale"
+            logger.warning(
+                f"Page {page_id} ({page_rect.width:.0f}x{page_rect.height:.0f}) exceeds the "
+                f"render memory budget at {scale * unit:.0f}{label}, "
+                f"rendering at {fitted * unit:.0f}{label}"
+            )
+        return fitted, estimate_pixmap_bytes(page_rect.width, page_rect.height, fitted)
+
     def _start_memory_monitoring(self):
         """
         Start background memory monitoring that logs usage every 5 seconds.
@@ -1027,12 +1274,14 @@ class OcrService:
 
         return shutdown_event
 
+    @tracing.traced("ocr.page")
     def _process_single_page_textract(
         self,
         page_index: int,
         pdf_document: fitz.Document,
         output_bucket: str,
         prefix: str,
+        textract_result: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Dict[str, str], Dict[str, Any]]:
         """
         Process a single page using AWS Textract.
@@ -1042,12 +1291,15 @@ class OcrService:
             pdf_document: PyMuPDF document object
             output_bucket: S3 bucket to store results
             prefix: S3 prefix for storing results
+            textract_result: Textract response for the page from an
+                asynchronous job; when given, no synchronous request is made
 
         Returns:
             Tuple of (page_result_dict, metering_data)
         """
         t0 = time.time()
         page_id = page_index + 1
+        tracing.annotate(page_id=str(page_id))
 
         # Extract page image - now returns image at optimal size directly
         page = pdf_document.load_page(page_index)
@@ -1065,22 +1317,24 @@ class OcrService:
         # Use the extracted image directly for OCR (no additional resize needed)
         ocr_img_bytes = img_bytes
 
-        # Apply preprocessing if enabled (only for OCR processing, not saved image)
-        if self.preprocessing_config and self.preprocessing_config.get("enabled"):
-            from idp_common.image import apply_adaptive_binarization
+        if textract_result is None:
+            # Apply preprocessing if enabled (only for OCR processing, not saved image)
+            if self.preprocessing_config and self.preprocessing_config.get("enabled"):
+                from idp_common.image import apply_adaptive_binarization
 
-            ocr_img_bytes = apply_adaptive_binarization(ocr_img_bytes)
-            logger.debug(
-                f"Applied adaptive binarization preprocessing for OCR processing (page {page_id})"
-            )
+                ocr_img_bytes = apply_adaptive_binarization(ocr_img_bytes)
+                logger.debug(
+                    f"Applied adaptive binarization preprocessing for OCR processing (page {page_id})"
+                )
 
-        # Process with OCR using potentially resized image
-        if isinstance(self.enhanced_features, list) and self.enhanced_features:
-            textract_result = self._analyze_document(ocr_img_bytes, page_id)
-        else:
-            textract_result = self.textract_client.detect_document_text(
-                Document={"Bytes": ocr_img_bytes}
-            )
+            # Process with OCR using potentially resized image
+            with tracing.span(f"textract.{self._get_api_name()}"):
+                if isinstance(self.enhanced_features, list) and self.enhanced_features:
+                    textract_result = self._analyze_document(ocr_img_bytes, page_id)
+                else:
+                    textract_result = self.textract_client.detect_document_text(
+                        Document={"Bytes": ocr_img_bytes}
+                    )
 
         # Aggressive memory cleanup - clear large image variables immediately after OCR
         img_bytes = None
@@ -1108,8 +1362,13 @@ class OcrService:
             content_type="application/json",
         )
 
+        # Text confidence data reads the LINE blocks; the block index is only
+        # built if result.json falls back to plain text
+        page_content = textract_blocks.process_textract_response(textract_result)
+
         # Generate and store text confidence data for efficient assessment
-        text_confidence_data = self._generate_text_confidence_data(textract_result)
+        with tracing.span("textract.parse"):
+            text_confidence_data = page_content.text_confidence
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
         s3.write_content(
             text_confidence_data,
@@ -1119,7 +1378,9 @@ class OcrService:
         )
 
         # Parse and store text content with markdown
-        parsed_result = self._parse_textract_response(textract_result, page_id)
+        parsed_result = self._parse_textract_response(
+            textract_result, page_id, page_content
+        )
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
         s3.write_content(
             parsed_result,
@@ -1141,12 +1402,15 @@ class OcrService:
 
         return result, metering
 
+    @tracing.traced("image.render")
     def _extract_page_image(self, page: fitz.Page, is_pdf: bool, page_id: int) -> bytes:
         """
         Extract image bytes from a page at optimal size to prevent memory issues.
 
         If resize config is provided, images are extracted directly at target dimensions
-        to avoid creating oversized images that cause OutOfMemory errors.
+        to avoid creating oversized images that cause OutOfMemory errors. With a render
+        memory budget, the render waits until its estimated pixmap fits in the budget,
+        and pages too large for the whole budget are rendered at a lower resolution.
 
         Args:
             page: PyMuPDF page object
@@ -1156,101 +1420,48 @@ class OcrService:
         Returns:
             Image bytes in JPEG format (at target size if resize config exists)
         """
-        pix = None
-        try:
-            # Check if we should extract at target size to avoid memory issues
-            if self.resize_config:
-                target_width = self.resize_config.get("target_width")
-                target_height = self.resize_config.get("target_height")
-
-                if target_width and target_height:
-                    # Get page dimensions to calculate scaling
-                    page_rect = page.rect
-
-                    if is_pdf:
-                        # For PDF files, calculate dimensions at specified DPI (default to 150 if None)
-                        dpi = self.dpi or 150
-                        original_width = int(page_rect.width * (dpi / 72))
-                        original_height = int(page_rect.height * (dpi / 72))
-                    else:
-                        # For image files, use actual dimensions
-                        original_width = int(page_rect.width)
-                        original_height = int(page_rect.height)
-
-                    # Apply same logic as image.resize_image - preserve aspect ratio, never upscale
-                    width_ratio = target_width / original_width
-                    height_ratio = target_height / original_height
-                    scale_factor = min(
-                        width_ratio, height_ratio
-                    )  # Preserve aspect ratio
-
-                    # Only resize if scale_factor < 1.0 (never upscale)
-                    if scale_factor < 1.0:
-                        # Extract at reduced size using matrix transformation
-                        if is_pdf:
-                            # For PDF, combine DPI scaling with size reduction
-                            dpi = self.dpi or 150
-                            base_scale = dpi / 72  # Convert PDF points to pixels
-                            final_scale = base_scale * scale_factor
-                            matrix = fitz.Matrix(final_scale, final_scale)
-                        else:
-                            # For images, just apply the scale factor
-                            matrix = fitz.Matrix(scale_factor, scale_factor)
-
-                        pix = page.get_pixmap(matrix=matrix)
-
-                        actual_width, actual_height = pix.width, pix.height
-                        logger.info(
-                            f"Extracted page {page_id} at target size: {actual_width}x{actual_height} (scale: {scale_factor:.3f})"
-                        )
-
-                    else:
-                        # No resize needed - image is already smaller than targets
-                        if is_pdf:
-                            dpi = self.dpi or 150
-                            pix = page.get_pixmap(dpi=dpi)
-                        else:
-                            pix = page.get_pixmap()
-
-                        # Log actual extracted dimensions
-                        actual_width, actual_height = pix.width, pix.height
-                        logger.info(
-                            f"Page {page_id} already fits target size, extracted at: {actual_width}x{actual_height}"
-                        )
-                else:
-                    # No valid target dimensions - use original extraction
-                    if is_pdf:
-                        dpi = self.dpi or 150
-                        pix = page.get_pixmap(dpi=dpi)
-                    else:
-                        pix = page.get_pixmap()
+        dpi = self.dpi or 150
+        base_scale = dpi / 72 if is_pdf else 1.0
+        scale = self._get_render_scale(page, is_pdf)
+
+        reservation = contextlib.nullcontext()
+        if self.render_budget is not None:
+            scale, estimated_bytes = self._fit_render_budget(
+                page, is_pdf, scale, page_id
+            )
+            reservation = self.render_budget.reserve(estimated_bytes)
 
-                    # Log actual extracted dimensions
-                    actual_width, actual_height = pix.width, pix.height
+        pix = None
+        with reservation:
+            t0 = time.time()
+            try:
+                if scale == base_scale:
+                    # No resize needed - extract at original size
+                    pix = page.get_pixmap(dpi=dpi) if is_pdf else page.get_pixmap()
                     logger.info(
-                        f"Page {page_id} extracted at original size: {actual_width}x{actual_height}"
+                        f"Page {page_id} extracted at original size: {pix.width}x{pix.height}"
                     )
-            else:
-                # No resize config - extract at original size
-                if is_pdf:
-                    dpi = self.dpi or 150
-                    pix = page.get_pixmap(dpi=dpi)
                 else:
-                    pix = page.get_pixmap()
+                    # Extract at reduced size using matrix transformation
+                    matrix = fitz.Matrix(scale, scale)
+                    pix = page.get_pixmap(matrix=matrix)
+                    logger.info(
+                        f"Extracted page {page_id} at target size: {pix.width}x{pix.height} "
+                        f"(scale: {scale / base_scale:.3f})"
+                    )
 
-                # Log actual extracted dimensions
-                actual_width, actual_height = pix.width, pix.height
-                logger.info(
-                    f"Page {page_id} extracted at original size: {actual_width}x{actual_height}"
-                )
+                image_bytes = pix.tobytes("jpeg")
+            finally:
+                # Aggressive cleanup of PyMuPDF pixmap to prevent memory leaks
+                if pix is not None:
+                    pix = None
+            render_ms = (time.time() - t0) * 1000
 
-            image_bytes = pix.tobytes("jpeg")
-            return image_bytes
-        finally:
-            # Aggressive cleanup of PyMuPDF pixmap to prevent memory leaks
-            if pix is not None:
-                pix = None
+        metrics.put_metric("OcrPageRenderTime", render_ms, "Milliseconds")
+        metrics.put_metric("OcrPeakMemory", get_peak_rss_mb(), "Megabytes")
+        return image_bytes
 
+    @tracing.traced("ocr.page")
     def _process_single_page_bedrock(
         self,
         page_index: int,
@@ -1272,6 +1483,7 @@ class OcrService:
         """
         t0 = time.time()
         page_id = page_index + 1
+        tracing.annotate(page_id=str(page_id))
 
         # Extract page image - now returns image at optimal size directly
         page = pdf_document.load_page(page_index)
@@ -1366,6 +1578,7 @@ class OcrService:
 
         return result, metering
 
+    @tracing.traced("ocr.page")
     def _process_single_page_none(
         self,
         page_index: int,
@@ -1387,6 +1600,7 @@ class OcrService:
         """
         t0 = time.time()
         page_id = page_index + 1
+        tracing.annotate(page_id=str(page_id))
 
         # Extract page image at specified DPI (consistent with other backends)
         page = pdf_document.load_page(page_index)
@@ -1532,31 +1746,13 @@ class OcrService:
         Returns:
             Text confidence data as markdown table with ~80-90% token reduction
         """
-        # Start building the markdown table with explicit left alignment
-        markdown_lines = ["| Text | Confidence |", "|:-----|:-----------|"]
-
-        blocks = raw_ocr_data.get("Blocks", [])
-
-        for block in blocks:
-            if block.get("BlockType") == "LINE" and block.get("Text"):
-                text = block.get("Text", "").replace(
-                    "|", "\\|"
-                )  # Escape pipe characters
-                confidence = round(block.get("Confidence", 0.0), 1)
-
-                # Add text type indicator if it's handwriting
-                if block.get("TextType") == "HANDWRITING":
-                    markdown_lines.append(f"| {text} (HANDWRITING) | {confidence} |")
-                else:
-                    markdown_lines.append(f"| {text} | {confidence} |")
-
-        # Join all lines into a single markdown string
-        markdown_table = "\n".join(markdown_lines)
-
-        return {"text": markdown_table}
+        return textract_blocks.generate_text_confidence_data(raw_ocr_data)
 
     def _parse_textract_response(
-        self, response: Dict[str, Any], page_id: int = None
+        self,
+        response: Dict[str, Any],
+        page_id: int = None,
+        page_content: Optional[textract_blocks.TextractPageContent] = None,
     ) -> Dict[str, str]:
         """
         Parse Textract response into text.
@@ -1564,6 +1760,8 @@ class OcrService:
         Args:
             response: Raw Textract API response
             page_id: Optional page number for logging purposes
+            page_content: Lazily computed content of the response, used for
+                the plain text fallback
 
         Returns:
             Dictionary with 'text' key containing extracted text
@@ -1613,14 +1811,9 @@ class OcrService:
             logger.warning(
                 f"Falling back to basic text extraction from blocks{page_info}"
             )
-            blocks = response.get("Blocks", [])
-
-            text_lines = []
-            for block in blocks:
-                if block.get("BlockType") == "LINE" and "Text" in block:
-                    text_lines.append(block["Text"])
-
-            text = "\n".join(text_lines)
+            if page_content is None:
+                page_content = textract_blocks.process_textract_response(response)
+            text = page_content.text
             if not text:
                 text = f"Error extracting text from document{page_info}. No text content found."
                 logger.error(f"No text content found in document{page_info}")
@@ -1727,6 +1920,7 @@ class OcrService:
                 )
             ]
 
+    @tracing.traced("ocr.page")
     def _process_converted_page(
         self,
         page_index: int,
@@ -1750,6 +1944,7 @@ class OcrService:
         """
         t0 = time.time()
         page_id = page_index + 1
+        tracing.annotate(page_id=str(page_id))
 
         # Upload image to S3
         image_key = f"{prefix}/pages/{page_id}/image.jpg"
@@ -0,0 +1,209 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Asynchronous Textract jobs for multi-page PDFs.
+
+The synchronous DetectDocumentText/AnalyzeDocument APIs accept one page image
+per request, so a 500-page PDF costs 500 requests against the account's TPS
+quota. The asynchronous job APIs process the whole PDF from S3 in one job.
+This module starts a job, waits for it, pages through its results, and
+splits the blocks into one Textract-style response per page. Each per-page
+response has the same shape as a synchronous single-page response, so it can
+be written to the usual rawText.json, result.json and textConfidence.json
+outputs.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 5  # seconds
+DEFAULT_JOB_TIMEOUT = 840  # seconds, within the 15 minute Lambda limit
+MAX_RESULTS_PER_REQUEST = 1000
+
+
+class TextractJobError(Exception):
+    """Raised when an asynchronous Textract job fails or does not finish in time."""
+
+
+def start_job(
+    textract_client,
+    bucket: str,
+    key: str,
+    feature_types: Optional[List[str]] = None,
+) -> str:
+    """
+    Start an asynchronous Textract job for a document in S3.
+
+    Args:
+        textract_client: boto3 Textract client
+        bucket: S3 bucket of the document
+        key: S3 key of the document (PDF or TIFF)
+        feature_types: Analysis features (TABLES, FORMS, ...); text detection
+            is used when empty
+
+    Returns:
+        Textract job ID
+    """
+    location = {"S3Object": {"Bucket": bucket, "Name": key}}
+    if feature_types:
+        response = textract_client.start_document_analysis(
+            DocumentLocation=location, FeatureTypes=feature_types
+        )
+    else:
+        response = textract_client.start_document_text_detection(
+            DocumentLocation=location
+        )
+    job_id = response["JobId"]
+    logger.info(f"Started Textract job {job_id} for s3://{bucket}/{key}")
+    return job_id
+
+
+def _get_results_page(
+    textract_client,
+    job_id: str,
+    analysis: bool,
+    next_token: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Get one page of job results."""
+    kwargs = {"JobId": job_id, "MaxResults": MAX_RESULTS_PER_REQUEST}
+    if next_token:
+        kwargs["NextToken"] = next_token
+    if analysis:
+        return textract_client.get_document_analysis(**kwargs)
+    return textract_client.get_document_text_detection(**kwargs)
+
+
+def get_job_results(
+    textract_client,
+    job_id: str,
+    analysis: bool,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    timeout: float = DEFAULT_JOB_TIMEOUT,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Wait for a Textract job to finish and collect all of its blocks.
+
+    Args:
+        textract_client: boto3 Textract client
+        job_id: Textract job ID
+        analysis: Whether the job is a document analysis (vs. text detection) job
+        poll_interval: Seconds between status checks
+        timeout: Maximum seconds to wait for the job
+
+    Returns:
+        Tuple of (all blocks, DocumentMetadata)
+
+    Raises:
+        TextractJobError: If the job fails or does not finish within the timeout
+    """
+    deadline = time.time() + timeout
+    while True:
+        response = _get_results_page(textract_client, job_id, analysis)
+        status = response.get("JobStatus")
+        if status != "IN_PROGRESS":
+            break
+        if time.time() >= deadline:
+            raise TextractJobError(
+                f"Textract job {job_id} did not finish within {timeout:.0f} seconds"
+            )
+        time.sleep(
+            poll_interval
+        )  # semgrep-ignore: arbitrary-sleep - Intentional polling delay. Duration is from configuration.
+
+    if status not in ("SUCCEEDED", "PARTIAL_SUCCESS"):
+        raise TextractJobError(
+            f"Textract job {job_id} finished with status {status}: "
+            f"{response.get('StatusMessage', '')}"
+        )
+    for warning in response.get("Warnings", []):
+        logger.warning(
+            f"Textract job {job_id} warning {warning.get('ErrorCode')} "
+            f"on pages {warning.get('Pages')}"
+        )
+
+    metadata = response.get("DocumentMetadata", {})
+    blocks = list(response.get("Blocks", []))
+    next_token = response.get("NextToken")
+    while next_token:
+        response = _get_results_page(textract_client, job_id, analysis, next_token)
+        blocks.extend(response.get("Blocks", []))
+        next_token = response.get("NextToken")
+
+    logger.info(
+        f"Textract job {job_id} returned {len(blocks)} blocks "
+        f"for {metadata.get('Pages', 0)} pages"
+    )
+    return blocks, metadata
+
+
+def split_blocks_by_page(
+    blocks: List[Dict[str, Any]], num_pages: int
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Split the blocks of a multi-page job into single-page responses.
+
+    Each response looks like a synchronous single-page response: its
+    DocumentMetadata reports one page and every block has Page 1.
+
+    Args:
+        blocks: Blocks returned by the job
+        num_pages: Number of pages in the document
+
+    Returns:
+        Mapping from 1-based page number to a Textract-style response. Pages
+        without blocks get a response with no blocks.
+    """
+    blocks_by_page: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for block in blocks:
+        page_number = block.get("Page", 1)
+        blocks_by_page[page_number].append({**block, "Page": 1})
+
+    return {
+        page_number: {
+            "DocumentMetadata": {"Pages": 1},
+            "Blocks": blocks_by_page.get(page_number, []),
+        }
+        for page_number in range(1, num_pages + 1)
+    }
+
+
+def analyze_document_async(
+    textract_client,
+    bucket: str,
+    key: str,
+    num_pages: int,
+    feature_types: Optional[List[str]] = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    timeout: float = DEFAULT_JOB_TIMEOUT,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Run an asynchronous Textract job for a document and split its results by page.
+
+    Args:
+        textract_client: boto3 Textract client
+        bucket: S3 bucket of the document
+        key: S3 key of the document
+        num_pages: Number of pages in the document
+        feature_types: Analysis features; text detection is used when empty
+        poll_interval: Seconds between status checks
+        timeout: Maximum seconds to wait for the job
+
+    Returns:
+        Mapping from 1-based page number to a single-page Textract response
+    """
+    t0 = time.time()
+    job_id = start_job(textract_client, bucket, key, feature_types)
+    blocks, _ = get_job_results(
+        textract_client,
+        job_id,
+        analysis=bool(feature_types),
+        poll_interval=poll_interval,
+        timeout=timeout,
+    )
+    logger.info(f"Textract job {job_id} completed in {time.time() - t0:.2f} seconds")
+    return split_blocks_by_page(blocks, num_pages)
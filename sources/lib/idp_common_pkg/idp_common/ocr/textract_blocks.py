@@ -0,0 +1,266 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Single-pass processing of Textract blocks.
+
+A Textract response is a flat list of blocks linked by CHILD, VALUE and other
+relationships. Resolving a table cell or form field by scanning the block list
+for each related ID is quadratic, which is noticeable on table-heavy pages
+with thousands of blocks. TextractBlockIndex walks the blocks once, indexing
+them by ID and collecting lines, tables and key-value sets, and then resolves
+each relationship with a dictionary lookup. process_textract_response returns
+the plain text, text confidence table, tables and form fields of a page,
+computed on first access: the text confidence table OCR writes for every page
+only loops over the LINE blocks, and the index is built when text, tables or
+form fields are read.
+"""
+
+import logging
+from collections import Counter
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TEXT_CONFIDENCE_HEADER = ["| Text | Confidence |", "|:-----|:-----------|"]
+
+
+def text_confidence_table(lines: Iterable[Dict[str, Any]]) -> str:
+    """
+    Get the text and OCR confidence of LINE blocks as a markdown table.
+
+    Args:
+        lines: LINE blocks
+
+    Returns:
+        Markdown table with one row per LINE block with text
+    """
+    markdown_lines = list(TEXT_CONFIDENCE_HEADER)
+    for line in lines:
+        if not line.get("Text"):
+            continue
+        text = line["Text"].replace("|", "\\|")  # Escape pipe characters
+        confidence = round(line.get("Confidence", 0.0), 1)
+        if line.get("TextType") == "HANDWRITING":
+            markdown_lines.append(f"| {text} (HANDWRITING) | {confidence} |")
+        else:
+            markdown_lines.append(f"| {text} | {confidence} |")
+    return "\n".join(markdown_lines)
+
+
+class TextractBlockIndex:
+    """Index of the blocks of a Textract response by ID and type."""
+
+    def __init__(self, response: Dict[str, Any]):
+        """
+        Index the blocks of a Textract response.
+
+        Args:
+            response: Textract API response
+        """
+        self.blocks_by_id: Dict[str, Dict[str, Any]] = {}
+        self.lines: List[Dict[str, Any]] = []
+        self.tables: List[Dict[str, Any]] = []
+        self.keys: List[Dict[str, Any]] = []
+        counts: Counter = Counter()
+
+        for block in response.get("Blocks", []):
+            block_type = block.get("BlockType")
+            counts[block_type] += 1
+            block_id = block.get("Id")
+            if block_id:
+                self.blocks_by_id[block_id] = block
+            if block_type == "LINE":
+                self.lines.append(block)
+            elif block_type == "TABLE":
+                self.tables.append(block)
+            elif block_type == "KEY_VALUE_SET" and "KEY" in block.get(
+                "EntityTypes", []
+            ):
+                self.keys.append(block)
+
+        self.block_counts = dict(counts)
+
+    def related(self, block: Dict[str, Any], relationship_type: str) -> List[Dict]:
+        """
+        Get the blocks related to a block by a relationship type.
+
+        Args:
+            block: Source block
+            relationship_type: Relationship type, e.g. CHILD or VALUE
+
+        Returns:
+            Related blocks, in relationship order
+        """
+        related = []
+        for relationship in block.get("Relationships", []):
+            if relationship.get("Type") != relationship_type:
+                continue
+            for block_id in relationship.get("Ids", []):
+                child = self.blocks_by_id.get(block_id)
+                if child is not None:
+                    related.append(child)
+        return related
+
+    def block_text(self, block: Dict[str, Any]) -> str:
+        """
+        Get the text of a cell, key or value block from its child words.
+
+        Args:
+            block: Block with CHILD relationships to WORD or SELECTION_ELEMENT blocks
+
+        Returns:
+            Space-separated text of the children
+        """
+        words = []
+        for child in self.related(block, "CHILD"):
+            child_type = child.get("BlockType")
+            if child_type == "WORD":
+                words.append(child.get("Text", ""))
+            elif child_type == "SELECTION_ELEMENT":
+                selected = child.get("SelectionStatus") == "SELECTED"
+                words.append("[X]" if selected else "[ ]")
+        return " ".join(words)
+
+    def table_rows(self, table: Dict[str, Any]) -> List[List[str]]:
+        """
+        Get the cell text of a table as rows.
+
+        Merged cells repeat their text in every row and column they span.
+
+        Args:
+            table: TABLE block
+
+        Returns:
+            List of rows, each a list of cell text
+        """
+        grid: Dict[Tuple[int, int], str] = {}
+        num_rows = num_columns = 0
+        for cell in self.related(table, "CHILD"):
+            if cell.get("BlockType") != "CELL":
+                continue
+            row = cell.get("RowIndex", 1)
+            column = cell.get("ColumnIndex", 1)
+            row_span = cell.get("RowSpan", 1)
+            column_span = cell.get("ColumnSpan", 1)
+            text = self.block_text(cell)
+            for r in range(row, row + row_span):
+                for c in range(column, column + column_span):
+                    grid[(r, c)] = text
+            num_rows = max(num_rows, row + row_span - 1)
+            num_columns = max(num_columns, column + column_span - 1)
+
+        return [
+            [grid.get((r, c), "") for c in range(1, num_columns + 1)]
+            for r in range(1, num_rows + 1)
+        ]
+
+    def key_value_pairs(self) -> List[Tuple[str, str]]:
+        """
+        Get the form fields of the page.
+
+        Returns:
+            List of (key text, value text) pairs in block order
+        """
+        pairs = []
+        for key in self.keys:
+            value_text = " ".join(
+                self.block_text(value) for value in self.related(key, "VALUE")
+            )
+            pairs.append((self.block_text(key), value_text))
+        return pairs
+
+    def text_confidence_table(self) -> str:
+        """
+        Get the LINE text and OCR confidence as a markdown table.
+
+        Returns:
+            Markdown table with one row per LINE block
+        """
+        return text_confidence_table(self.lines)
+
+    def plain_text(self) -> str:
+        """Get the LINE text of the page, one line per LINE block."""
+        return "\n".join(line["Text"] for line in self.lines if "Text" in line)
+
+
+class TextractPageContent:
+    """
+    Content of one Textract page, computed on first access.
+
+    The text confidence table loops over the LINE blocks only. The block
+    index, which resolves tables and form fields, is built the first time
+    text, tables, key_values or block_counts is read, and then shared by them.
+    """
+
+    def __init__(self, response: Dict[str, Any]):
+        """
+        Wrap a Textract response.
+
+        Args:
+            response: Textract API response for a single page
+        """
+        self.response = response
+
+    @cached_property
+    def index(self) -> TextractBlockIndex:
+        return TextractBlockIndex(self.response)
+
+    @cached_property
+    def text_confidence(self) -> Dict[str, str]:
+        return generate_text_confidence_data(self.response, self.__dict__.get("index"))
+
+    @cached_property
+    def text(self) -> str:
+        return self.index.plain_text()
+
+    @cached_property
+    def tables(self) -> List[List[List[str]]]:
+        return [self.index.table_rows(table) for table in self.index.tables]
+
+    @cached_property
+    def key_values(self) -> List[Tuple[str, str]]:
+        return self.index.key_value_pairs()
+
+    @property
+    def block_counts(self) -> Dict[str, int]:
+        return self.index.block_counts
+
+
+def generate_text_confidence_data(
+    raw_ocr_data: Dict[str, Any], index: Optional[TextractBlockIndex] = None
+) -> Dict[str, str]:
+    """
+    Generate the text confidence data of a page from its Textract response.
+
+    Args:
+        raw_ocr_data: Textract API response
+        index: Block index of the response, if already built
+
+    Returns:
+        Dictionary with 'text' key containing the markdown confidence table
+    """
+    if index is not None:
+        return {"text": index.text_confidence_table()}
+    lines = (
+        block
+        for block in raw_ocr_data.get("Blocks", [])
+        if block.get("BlockType") == "LINE"
+    )
+    return {"text": text_confidence_table(lines)}
+
+
+def process_textract_response(response: Dict[str, Any]) -> TextractPageContent:
+    """
+    Get the text, text confidence data, tables and form fields of a page.
+
+    Nothing is computed until an attribute of the result is read.
+
+    Args:
+        response: Textract API response for a single page
+
+    Returns:
+        TextractPageContent of the response
+    """
+    return TextractPageContent(response)
@@ -5,6 +5,14 @@
 Reporting module for saving document data to reporting storage.
 """
 
+from .backfill import ReportingBackfill
+from .pricing import PricingIndex
 from .save_reporting_data import SaveReportingData
+from .schema_registry import SchemaRegistry
 
-__all__ = ["SaveReportingData"]
+__all__ = [
+    "PricingIndex",
+    "ReportingBackfill",
+    "SaveReportingData",
+    "SchemaRegistry",
+]
@@ -0,0 +1,448 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Bulk rebuild of the reporting tables for past documents.
+
+The save_reporting_data Lambda writes the reporting data of one document at a
+time, as documents complete. ReportingBackfill rebuilds the metering and
+document section tables for every document tracked in a date range, e.g. after
+a pricing change, a new class attribute or a fix to the section schema logic:
+
+    backfill = ReportingBackfill(
+        reporting_bucket="my-reporting-bucket",
+        tracking_table="my-tracking-table",
+        database_name="my-stack-reporting-db",
+        config=get_config(),
+        checkpoint_path="backfill-2025-01.json",
+    )
+    summary = backfill.run("2025-01-01", "2025-01-31")
+
+Documents are listed per day from the tracking table's list partitions, read
+from the tracking table and transformed with the same SaveReportingData code
+as the Lambda, in a process pool. Instead of one file per document and
+section, each day is written as a few partition-sized Parquet files per table,
+and the per-document files of the same documents are deleted. Glue tables of the
+section classes are updated once at the end. Finished days are recorded in a
+checkpoint file, so an interrupted backfill resumes with the first unfinished
+day.
+"""
+
+import concurrent.futures
+import datetime
+import json
+import logging
+import os
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pyarrow as pa
+
+from idp_common.dynamodb.service import DocumentDynamoDBService
+from idp_common.reporting.save_reporting_data import SaveReportingData
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_DATA = ("metering", "sections")
+DEFAULT_MAX_ROWS_PER_FILE = 100_000
+# Maximum number of keys per S3 DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+# Escaped document ID in the names of the per-document files written by
+# SaveReportingData, e.g. doc.pdf_20250101_100000_000_results.parquet and
+# doc.pdf_section_1.parquet
+METERING_FILE_PATTERN = re.compile(r"^(?P<doc>.+)_\d{8}_\d{6}_\d{3}_results\.parquet$")
+SECTION_FILE_PATTERN = re.compile(r"^(?P<doc>.+)_section_[^/]*\.parquet$")
+
+# Per-process state of the transform workers
+_worker_reporter: Optional[SaveReportingData] = None
+_worker_tracking: Optional[DocumentDynamoDBService] = None
+
+
+def _init_worker(
+    reporting_bucket: str,
+    config: Optional[Dict[str, Any]],
+    tracking_table: Optional[str],
+) -> None:
+    """Create the clients of a transform worker once per process."""
+    global _worker_reporter, _worker_tracking
+    _worker_reporter = SaveReportingData(reporting_bucket, config=config)
+    _worker_tracking = DocumentDynamoDBService(table_name=tracking_table)
+
+
+def _transform_document(object_key: str, data_to_save: Sequence[str]) -> Dict[str, Any]:
+    """
+    Build the reporting rows of one tracked document.
+
+    Args:
+        object_key: Object key of the document in the tracking table
+        data_to_save: Data types to build ("metering", "sections")
+
+    Returns:
+        Dictionary with the status, date partition, escaped document ID,
+        metering table and section records by class
+    """
+    result = {"object_key": object_key, "status": "ok", "section_errors": 0}
+    try:
+        document = _worker_tracking.get_document(object_key)
+        if document is None:
+            return {**result, "status": "missing"}
+        if not document.initial_event_time:
+            # The date partition and file names depend on the initial event time
+            return {**result, "status": "skipped"}
+
+        reporter = _worker_reporter
+        timestamp, date_partition = reporter._get_document_timestamp(document)
+        metering = None
+        if "metering" in data_to_save:
+            metering = reporter.build_metering_table(document, timestamp)
+
+        sections = defaultdict(list)
+        if "sections" in data_to_save:
+            for section in document.sections:
+                status, records = reporter.build_section_records(
+                    section, document.id, timestamp
+                )
+                if status == "error":
+                    result["section_errors"] += 1
+                if status != "ok" or not records:
+                    continue
+                sections[section.classification or "unknown"].extend(records)
+
+        return {
+            **result,
+            "date_partition": date_partition,
+            "escaped_doc_id": reporter._escape_document_id(document.id),
+            "metering": metering,
+            "sections": dict(sections),
+        }
+    except Exception as e:
+        logger.error(f"Error transforming document {object_key}: {str(e)}")
+        return {**result, "status": "error", "error": str(e)}
+
+
+def _date_range(start_date: str, end_date: str) -> List[str]:
+    """List the dates from start_date to end_date inclusive (YYYY-MM-DD)."""
+    start = datetime.date.fromisoformat(start_date)
+    end = datetime.date.fromisoformat(end_date)
+    if end < start:
+        raise ValueError(f"End date {end_date} is before start date {start_date}")
+    return [
+        (start + datetime.timedelta(days=offset)).isoformat()
+        for offset in range((end - start).days + 1)
+    ]
+
+
+class ReportingBackfill:
+    """
+    Rebuilds the reporting tables of the documents tracked in a date range.
+    """
+
+    def __init__(
+        self,
+        reporting_bucket: str,
+        tracking_table: Optional[str] = None,
+        database_name: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+        data_to_save: Iterable[str] = SUPPORTED_DATA,
+        checkpoint_path: Optional[str] = None,
+        job_id: str = "backfill",
+        max_workers: Optional[int] = None,
+        max_rows_per_file: int = DEFAULT_MAX_ROWS_PER_FILE,
+        use_processes: bool = True,
+        remove_document_files: bool = True,
+    ):
+        """
+        Initialize the backfill.
+
+        Args:
+            reporting_bucket: S3 bucket name for reporting data
+            tracking_table: Tracking table name (default: TRACKING_TABLE)
+            database_name: Glue database name for updating section tables
+                (optional)
+            config: Configuration dictionary with the pricing section
+            data_to_save: Data types to rebuild: "metering" and/or "sections"
+            checkpoint_path: Local JSON file recording finished days; the
+                backfill is not resumable without it
+            job_id: Name of the backfill, used in the names of the written
+                files so re-running a day overwrites its earlier output
+            max_workers: Number of transform workers (default: CPU count)
+            max_rows_per_file: Maximum rows per written Parquet file
+            use_processes: Transform in processes; threads are used otherwise
+            remove_document_files: Delete the per-document files of the
+                backfilled documents, so rows are not counted twice
+
+        Raises:
+            ValueError: If an unsupported data type is requested
+        """
+        self.data_to_save = list(data_to_save)
+        unsupported = [data for data in self.data_to_save if data not in SUPPORTED_DATA]
+        if unsupported:
+            raise ValueError(
+                f"Unsupported data types: {unsupported}. "
+                f"Supported data types are: {', '.join(SUPPORTED_DATA)}"
+            )
+        self.reporting_bucket = reporting_bucket
+        self.tracking_table = tracking_table
+        self.config = config
+        self.checkpoint_path = checkpoint_path
+        self.job_id = job_id
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_rows_per_file = max_rows_per_file
+        self.use_processes = use_processes
+        self.remove_document_files = remove_document_files
+        self.reporter = SaveReportingData(reporting_bucket, database_name, config)
+        self.tracking = DocumentDynamoDBService(table_name=tracking_table)
+        # Per-document files by escaped document ID, listed when a run starts
+        self._document_files: Dict[str, List[str]] = {}
+
+    def run(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """
+        Rebuild the reporting tables for documents queued from start_date to
+        end_date.
+
+        Args:
+            start_date: First day (YYYY-MM-DD), inclusive
+            end_date: Last day (YYYY-MM-DD), inclusive
+
+        Returns:
+            Summary with the checkpoint contents: finished days with their
+            document and file counts and failed documents, and the fields
+            of each section class
+        """
+        checkpoint = self._load_checkpoint()
+        if self.remove_document_files:
+            self._document_files = self._list_document_files(start_date)
+        executor_class = (
+            concurrent.futures.ProcessPoolExecutor
+            if self.use_processes
+            else concurrent.futures.ThreadPoolExecutor
+        )
+        with executor_class(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.reporting_bucket, self.config, self.tracking_table),
+        ) as executor:
+            for date in _date_range(start_date, end_date):
+                if date in checkpoint["completed_dates"]:
+                    logger.info(f"Skipping {date}, already backfilled")
+                    continue
+                checkpoint["completed_dates"][date] = self._backfill_date(
+                    date, executor, checkpoint["section_fields"]
+                )
+                self._save_checkpoint(checkpoint)
+
+        self._update_glue_tables(checkpoint["section_fields"])
+        return checkpoint
+
+    def _backfill_date(
+        self,
+        date: str,
+        executor: concurrent.futures.Executor,
+        section_fields: Dict[str, List[str]],
+    ) -> Dict[str, Any]:
+        """Transform and write the documents queued on one day."""
+        object_keys = self.tracking.list_object_keys_for_date(date)
+        logger.info(f"Backfilling {len(object_keys)} documents queued on {date}")
+        results = list(
+            executor.map(
+                _transform_document,
+                object_keys,
+                [self.data_to_save] * len(object_keys),
+                chunksize=max(1, len(object_keys) // (self.max_workers * 4)),
+            )
+        )
+
+        by_partition = defaultdict(list)
+        for result in results:
+            if result["status"] == "ok":
+                by_partition[result["date_partition"]].append(result)
+
+        files = 0
+        for date_partition, partition_results in sorted(by_partition.items()):
+            files += self._write_partition(
+                date, date_partition, partition_results, section_fields
+            )
+
+        summary = {
+            "documents": sum(1 for result in results if result["status"] == "ok"),
+            "files": files,
+            "failed": [
+                result["object_key"]
+                for result in results
+                if result["status"] == "error" or result["section_errors"]
+            ],
+            "skipped": [
+                result["object_key"]
+                for result in results
+                if result["status"] in ("missing", "skipped")
+            ],
+        }
+        logger.info(
+            f"Backfilled {date}: {summary['documents']} documents, "
+            f"{files} files, {len(summary['failed'])} failed, "
+            f"{len(summary['skipped'])} skipped"
+        )
+        return summary
+
+    def _write_partition(
+        self,
+        source_date: str,
+        date_partition: str,
+        results: List[Dict[str, Any]],
+        section_fields: Dict[str, List[str]],
+    ) -> int:
+        """Write one date partition of every table and remove replaced files."""
+        prefix = f"backfill_{self.job_id}_{source_date}"
+        files = 0
+
+        metering_tables = [
+            result["metering"] for result in results if result["metering"] is not None
+        ]
+        if metering_tables:
+            files += self._write_table(
+                pa.concat_tables(metering_tables),
+                f"metering/date={date_partition}/{prefix}",
+            )
+
+        records_by_type = defaultdict(list)
+        for result in results:
+            for section_type, records in result["sections"].items():
+                records_by_type[section_type].extend(records)
+        for section_type, records in sorted(records_by_type.items()):
+            # One schema for all sections of the class in the partition
+            schema = self.reporter._create_dynamic_schema(records)
+            records = self.reporter._sanitize_records_for_schema(records, schema)
+            files += self._write_table(
+                pa.Table.from_pylist(records, schema=schema),
+                f"document_sections/"
+                f"{self.reporter._section_type_prefix(section_type)}/"
+                f"date={date_partition}/{prefix}",
+            )
+            fields = set(section_fields.get(section_type, [])) | set(schema.names)
+            section_fields[section_type] = sorted(fields)
+
+        if self.remove_document_files:
+            self._delete_keys(
+                [
+                    key
+                    for result in results
+                    for key in self._document_files.pop(result["escaped_doc_id"], [])
+                ]
+            )
+        return files
+
+    def _list_document_files(self, start_date: str) -> Dict[str, List[str]]:
+        """
+        List the per-document files of the rebuilt tables by document.
+
+        The files are keyed on the time the document was saved when it had no
+        initial event time, so their names and date partitions cannot be
+        derived from the tracking table. Every partition from start_date on is
+        listed once instead; documents queued in the range were saved on or
+        after their queue date.
+
+        Args:
+            start_date: First day of the backfill (YYYY-MM-DD)
+
+        Returns:
+            S3 keys of the per-document files by escaped document ID
+        """
+        table_prefixes = []
+        if "metering" in self.data_to_save:
+            table_prefixes.append(("metering/", METERING_FILE_PATTERN))
+        if "sections" in self.data_to_save:
+            table_prefixes.extend(
+                (prefix, SECTION_FILE_PATTERN)
+                for prefix in self._list_prefixes("document_sections/")
+            )
+
+        document_files = defaultdict(list)
+        for table_prefix, pattern in table_prefixes:
+            for partition_prefix in self._list_prefixes(table_prefix):
+                partition = partition_prefix[len(table_prefix) :].rstrip("/")
+                if not partition.startswith("date=") or partition[5:] < start_date:
+                    continue
+                for page in self.reporter.s3_client.get_paginator(
+                    "list_objects_v2"
+                ).paginate(Bucket=self.reporting_bucket, Prefix=partition_prefix):
+                    for item in page.get("Contents", []):
+                        match = pattern.match(item["Key"][len(partition_prefix) :])
+                        if match:
+                            document_files[match.group("doc")].append(item["Key"])
+        logger.info(
+            f"Found {sum(len(keys) for keys in document_files.values())} "
+            f"per-document files of {len(document_files)} documents"
+        )
+        return dict(document_files)
+
+    def _list_prefixes(self, prefix: str) -> List[str]:
+        """List the sub-prefixes of a prefix of the reporting bucket."""
+        prefixes = []
+        for page in self.reporter.s3_client.get_paginator("list_objects_v2").paginate(
+            Bucket=self.reporting_bucket, Prefix=prefix, Delimiter="/"
+        ):
+            prefixes.extend(item["Prefix"] for item in page.get("CommonPrefixes", []))
+        return prefixes
+
+    def _write_table(self, table: pa.Table, key_prefix: str) -> int:
+        """Write a table as Parquet files of at most max_rows_per_file rows."""
+        files = 0
+        for offset in range(0, table.num_rows, self.max_rows_per_file):
+            self.reporter._save_table_as_parquet(
+                table.slice(offset, self.max_rows_per_file),
+                f"{key_prefix}_{files:04d}.parquet",
+            )
+            files += 1
+        return files
+
+    def _delete_keys(self, keys: List[str]) -> None:
+        """Delete S3 objects from the reporting bucket in batches."""
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start : start + DELETE_BATCH_SIZE]
+            response = self.reporter.s3_client.delete_objects(
+                Bucket=self.reporting_bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+            for error in response.get("Errors", []):
+                logger.warning(
+                    f"Could not delete s3://{self.reporting_bucket}/"
+                    f"{error.get('Key')}: {error.get('Message')}"
+                )
+
+    def _update_glue_tables(self, section_fields: Dict[str, List[str]]) -> None:
+        """Create or update the Glue table of each section class once."""
+        for section_type, fields in sorted(section_fields.items()):
+            schema = self.reporter._create_dynamic_schema(
+                [{field: None for field in fields}]
+            )
+            if self.reporter._create_or_update_glue_table(section_type, schema):
+                logger.info(
+                    f"Created/updated Glue table for section type: {section_type}"
+                )
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        """Load the checkpoint file, or start a new checkpoint."""
+        checkpoint = {
+            "job_id": self.job_id,
+            "completed_dates": {},
+            "section_fields": {},
+        }
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                checkpoint.update(json.load(f))
+            logger.info(
+                f"Resuming from {self.checkpoint_path} with "
+                f"{len(checkpoint['completed_dates'])} days done"
+            )
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        """Write the checkpoint file atomically."""
+        if not self.checkpoint_path:
+            return
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(temporary_path, self.checkpoint_path)
@@ -0,0 +1,117 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Compiled unit price lookup for metering records.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+logger = logging.getLogger(__name__)
+
+
+class PricingIndex:
+    """
+    Unit prices of (service_api, unit) pairs, resolved once per pair.
+
+    The pricing map ({service_api: {unit: price}}) is compiled into a dict
+    keyed by (service_api, unit) for exact matches, plus the lowercased
+    service and unit names in configuration order for partial matches, e.g. a
+    metered model ID with a context window suffix such as ":300k". Each pair
+    is resolved the first time it is seen (an exact match, else the first
+    configured service and unit whose lowercased names contain or are
+    contained in the metered ones), and the result, including a miss, is
+    kept. Pricing a month of metering records therefore costs one dictionary
+    lookup per record and one scan of the configuration per distinct pair.
+    """
+
+    def __init__(self, pricing_map: Dict[str, Dict[str, float]]):
+        """
+        Compile the pricing map.
+
+        Args:
+            pricing_map: Prices by service_api and unit, as returned by
+                SaveReportingData._get_pricing_from_config
+        """
+        self._prices: Dict[Tuple[str, str], float] = {
+            (service_api, unit): price
+            for service_api, units in pricing_map.items()
+            for unit, price in units.items()
+        }
+        self._patterns: List[Tuple[str, str, List[Tuple[str, str, float]]]] = [
+            (
+                service_api.lower(),
+                service_api,
+                [(unit.lower(), unit, price) for unit, price in units.items()],
+            )
+            for service_api, units in pricing_map.items()
+        ]
+
+    def unit_cost(self, service_api: str, unit: str) -> float:
+        """
+        Get the unit price of a service API and unit.
+
+        Args:
+            service_api: The AWS service API (e.g., 'bedrock/model-id')
+            unit: The unit of measurement (e.g., 'inputTokens', 'pages')
+
+        Returns:
+            Unit cost in USD, or 0.0 if not found
+        """
+        key = (service_api, unit)
+        price = self._prices.get(key)
+        if price is None:
+            price = self._prices[key] = self._resolve(service_api, unit)
+        return price
+
+    def _resolve(self, service_api: str, unit: str) -> float:
+        """Find the price of a pair without an exact match."""
+        service_api_lower = service_api.lower()
+        unit_lower = unit.lower()
+        for service_key_lower, service_key, units in self._patterns:
+            if not (
+                service_key_lower in service_api_lower
+                or service_api_lower in service_key_lower
+            ):
+                continue
+            for unit_key_lower, unit_key, price in units:
+                if unit_key_lower in unit_lower or unit_lower in unit_key_lower:
+                    logger.info(
+                        f"Using partial match for {service_api}/{unit}: {service_key}/{unit_key} = ${price}"
+                    )
+                    return price
+
+        logger.warning(
+            f"No unit cost mapping found for service_api='{service_api}', unit='{unit}'. Using $0.0"
+        )
+        return 0.0
+
+    def price(
+        self,
+        service_apis: Iterable[str],
+        units: Iterable[str],
+        values: pa.Array,
+    ) -> Tuple[pa.Array, pa.Array]:
+        """
+        Price metering records column by column.
+
+        Args:
+            service_apis: service_api of each record
+            units: unit of each record
+            values: float64 array with the value of each record
+
+        Returns:
+            Tuple of the unit_cost and estimated_cost arrays
+        """
+        unit_costs = pa.array(
+            [
+                self.unit_cost(service_api, unit)
+                for service_api, unit in zip(service_apis, units)
+            ],
+            type=pa.float64(),
+        )
+        return unit_costs, pc.multiply(values, unit_costs)
@@ -0,0 +1,745 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Cost and latency profiles of processed documents.
+
+A document profile joins a document's metering data, priced like
+SaveReportingData prices it, with the tracing spans recorded while the
+document was processed (see idp_common.tracing) and the retries and throttles
+among them. It breaks cost and time down by stage, page and section and lays
+the spans out as a waterfall, to show where a slow or expensive document spent
+its budget.
+
+Class profiles summarize the metering Parquet files written by
+SaveReportingData over a date range into percentile tables per document class.
+
+Both work on exported data: span records are read from exported log files
+(TRACING_MODE=log or emf), and Parquet files from a local copy of the
+reporting bucket, e.g. made with `aws s3 sync`.
+"""
+
+import glob
+import json
+import logging
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+# Children with the same name beyond this count are collapsed in the waterfall
+DEFAULT_MAX_REPEATED_SPANS = 3
+DEFAULT_TOP = 10
+
+# Metering contexts that belong to the same stage as a span name prefix
+STAGE_ALIASES = {"granularassessment": "assessment"}
+
+RETRY_SPAN = "retry.sleep"
+
+
+def parse_span_record(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a span record from an exported log line.
+
+    Accepts the JSON records written with TRACING_MODE=log, the EMF lines
+    written with TRACING_MODE=emf, and either of them wrapped in a log line
+    prefix or in the "message" field of a JSON-formatted log record.
+
+    Args:
+        line: One line of an exported log
+
+    Returns:
+        Span record with at least "span" and "duration_ms", or None
+    """
+    start = line.find("{")
+    if start < 0:
+        return None
+    try:
+        record = json.loads(line[start:])
+    except ValueError:
+        return None
+    if not isinstance(record, dict):
+        return None
+    if "span" in record and "duration_ms" in record:
+        return record
+    if "Span" in record and "SpanDuration" in record:
+        record = {key: value for key, value in record.items() if key != "_aws"}
+        record["span"] = record.pop("Span")
+        record["duration_ms"] = record.pop("SpanDuration")
+        return record
+    if isinstance(record.get("message"), str):
+        return parse_span_record(record["message"])
+    return None
+
+
+def load_span_records(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Read span records from exported log files.
+
+    Args:
+        paths: Log files; lines that are not span records are skipped
+
+    Returns:
+        List of span records
+    """
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                record = parse_span_record(line)
+                if record is not None:
+                    records.append(record)
+    return records
+
+
+def metering_records(
+    metering: Dict[str, Dict[str, Any]],
+    unit_cost: Optional[Callable[[str, str], float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Flatten Document.metering into priced records.
+
+    Keys are split into context and service_api the same way as in
+    SaveReportingData.save_metering_data.
+
+    Args:
+        metering: Document metering data, keyed by "context/service/api"
+        unit_cost: Function returning the price of (service_api, unit), e.g.
+            SaveReportingData(...)._get_unit_cost. Costs are 0 without it.
+
+    Returns:
+        Records with context, service_api, unit, value and estimated_cost
+    """
+    records = []
+    for key, units in (metering or {}).items():
+        context, service_api = key.split("/", 1) if "/" in key else ("", key)
+        for unit, value in units.items():
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                # Same fallback as save_metering_data
+                logger.warning(f"Could not convert metering value to float: {value}")
+                value = 1.0
+            cost = value * unit_cost(service_api, unit) if unit_cost else 0.0
+            records.append(
+                {
+                    "context": context,
+                    "service_api": service_api,
+                    "unit": unit,
+                    "value": value,
+                    "estimated_cost": cost,
+                }
+            )
+    return records
+
+
+def stage_key(name: str) -> str:
+    """
+    Get the stage of a metering context or span name.
+
+    Args:
+        name: Metering context (e.g. "GranularAssessment") or span name
+            (e.g. "assessment.section")
+
+    Returns:
+        Normalized stage key, e.g. "assessment"
+    """
+    key = re.split(r"[./]", name or "", maxsplit=1)[0].lower()
+    return STAGE_ALIASES.get(key, key)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Get a percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Values (need not be sorted)
+        q: Percentile between 0 and 100
+
+    Returns:
+        The percentile, or 0.0 for no values
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class _SpanNode:
+    """A span record with its children."""
+
+    __slots__ = ("record", "children", "start", "end")
+
+    def __init__(self, record: Dict[str, Any]):
+        self.record = record
+        self.children: List["_SpanNode"] = []
+        self.start = float(record.get("start_time") or 0.0)
+        self.end = self.start + float(record["duration_ms"]) / 1000
+
+    @property
+    def name(self) -> str:
+        return self.record["span"]
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def self_time(self) -> float:
+        """Duration not covered by any child, whichever thread ran it."""
+        covered = 0.0
+        current_start = current_end = None
+        for child in sorted(self.children, key=lambda node: node.start):
+            if current_end is None or child.start > current_end:
+                if current_end is not None:
+                    covered += current_end - current_start
+                current_start, current_end = child.start, child.end
+            else:
+                current_end = max(current_end, child.end)
+        if current_end is not None:
+            covered += current_end - current_start
+        return max(0.0, self.duration - covered)
+
+
+def _document_spans(
+    span_records: Iterable[Dict[str, Any]], document_id: str
+) -> List[Dict[str, Any]]:
+    """Select the spans of a document, including spans in its traces."""
+    records = list(span_records)
+    traces = {
+        record.get("trace_id")
+        for record in records
+        if record.get("document_id") == document_id
+    }
+    traces.discard(None)
+    return [
+        record
+        for record in records
+        if record.get("document_id") == document_id or record.get("trace_id") in traces
+    ]
+
+
+def _build_tree(
+    records: List[Dict[str, Any]],
+) -> Tuple[List[_SpanNode], List[_SpanNode]]:
+    """Link span records to their parents and return (roots, all nodes)."""
+    nodes = [_SpanNode(record) for record in records]
+    by_id = {node.record.get("span_id"): node for node in nodes}
+    roots = []
+    for node in nodes:
+        parent = by_id.get(node.record.get("parent_id"))
+        if parent is not None and parent is not node:
+            parent.children.append(node)
+        else:
+            roots.append(node)
+    for node in nodes:
+        node.children.sort(key=lambda child: child.start)
+    roots.sort(key=lambda node: node.start)
+    return roots, nodes
+
+
+def _breakdown_by(
+    nodes: List[_SpanNode], attribute: str, top: int
+) -> List[Dict[str, Any]]:
+    """Total the outermost spans of each page or section by stage."""
+    by_id = {node.record.get("span_id"): node for node in nodes}
+    totals: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for node in nodes:
+        value = node.record.get(attribute)
+        if value is None:
+            continue
+        parent = by_id.get(node.record.get("parent_id"))
+        if parent is not None and parent.record.get(attribute) == value:
+            continue
+        totals[str(value)][stage_key(node.name)] += node.duration
+    rows = [
+        {
+            attribute: value,
+            "seconds": sum(stages.values()),
+            "stages": dict(stages),
+        }
+        for value, stages in totals.items()
+    ]
+    rows.sort(key=lambda row: -row["seconds"])
+    return rows[:top]
+
+
+def _waterfall(
+    roots: List[_SpanNode], origin: float, max_repeated: int
+) -> List[Dict[str, Any]]:
+    """Flatten the span tree into waterfall rows, collapsing repeated spans."""
+    rows = []
+
+    def ids(node: _SpanNode) -> Dict[str, Any]:
+        return {
+            key: node.record[key]
+            for key in ("section_id", "page_id")
+            if node.record.get(key) is not None
+        }
+
+    def add(node: _SpanNode, depth: int) -> None:
+        row = {
+            "depth": depth,
+            "span": node.name,
+            "offset_s": node.start - origin,
+            "seconds": node.duration,
+            "count": 1,
+        }
+        row.update(ids(node))
+        if node.record.get("error"):
+            row["error"] = node.record["error"]
+        rows.append(row)
+        add_children(node.children, depth + 1)
+
+    def add_children(children: List[_SpanNode], depth: int) -> None:
+        groups: Dict[str, List[_SpanNode]] = defaultdict(list)
+        for child in children:
+            groups[child.name].append(child)
+        emitted = set()
+        for child in children:
+            group = groups[child.name]
+            if len(group) <= max_repeated:
+                add(child, depth)
+                continue
+            if child.name in emitted:
+                continue
+            emitted.add(child.name)
+            durations = [node.duration for node in group]
+            slowest = max(group, key=lambda node: node.duration)
+            rows.append(
+                {
+                    "depth": depth,
+                    "span": child.name,
+                    "offset_s": min(node.start for node in group) - origin,
+                    "seconds": max(node.end for node in group)
+                    - min(node.start for node in group),
+                    "count": len(group),
+                    "total_seconds": sum(durations),
+                    "p50_seconds": percentile(durations, 50),
+                    "max_seconds": max(durations),
+                    "errors": sum(1 for node in group if node.record.get("error")),
+                    "slowest": ids(slowest),
+                }
+            )
+            # Expand the slowest instance to show where its time went
+            add(slowest, depth + 1)
+
+    add_children(roots, 0)
+    return rows
+
+
+def build_document_profile(
+    document_id: str,
+    metering: List[Dict[str, Any]],
+    span_records: Optional[Iterable[Dict[str, Any]]] = None,
+    num_pages: Optional[int] = None,
+    top: int = DEFAULT_TOP,
+    max_repeated_spans: int = DEFAULT_MAX_REPEATED_SPANS,
+) -> Dict[str, Any]:
+    """
+    Build the cost and latency profile of one document.
+
+    Args:
+        document_id: Document ID (the input object key)
+        metering: Priced metering records, from metering_records() or rows
+            of the metering Parquet table
+        span_records: Span records of one or more documents
+        num_pages: Number of pages of the document
+        top: Number of slowest pages, sections and span names to keep
+        max_repeated_spans: Sibling spans with the same name beyond this
+            count are collapsed into one waterfall row
+
+    Returns:
+        Profile dictionary with totals, stages, services, self_time, pages,
+        sections, retries and waterfall
+    """
+    stages: Dict[str, Dict[str, Any]] = {}
+
+    def stage(name: str) -> Dict[str, Any]:
+        key = stage_key(name)
+        if key not in stages:
+            stages[key] = {
+                "stage": name or "(none)",
+                "cost": 0.0,
+                "input_tokens": 0.0,
+                "output_tokens": 0.0,
+                "lambda_gb_seconds": 0.0,
+                "span_seconds": 0.0,
+                "invocations": 0,
+            }
+        return stages[key]
+
+    services: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for record in metering:
+        entry = stage(record.get("context") or "")
+        cost = float(record.get("estimated_cost") or 0.0)
+        value = float(record.get("value") or 0.0)
+        unit = record.get("unit", "")
+        entry["cost"] += cost
+        if unit == "inputTokens":
+            entry["input_tokens"] += value
+        elif unit == "outputTokens":
+            entry["output_tokens"] += value
+        elif unit == "gb_seconds":
+            entry["lambda_gb_seconds"] += value
+        service = services.setdefault(
+            (record.get("service_api", ""), unit),
+            {"service_api": record.get("service_api", ""), "unit": unit},
+        )
+        service["value"] = service.get("value", 0.0) + value
+        service["cost"] = service.get("cost", 0.0) + cost
+
+    spans = _document_spans(span_records or [], document_id)
+    roots, nodes = _build_tree(spans)
+    for root in roots:
+        entry = stage(root.name.split(".", 1)[0])
+        entry["span_seconds"] += root.duration
+        entry["invocations"] += 1
+
+    self_time: Dict[str, Dict[str, float]] = defaultdict(
+        lambda: {"count": 0, "seconds": 0.0}
+    )
+    for node in nodes:
+        self_time[node.name]["count"] += 1
+        self_time[node.name]["seconds"] += node.self_time()
+
+    sleeps = [node for node in nodes if node.name == RETRY_SPAN]
+    errors = Counter(
+        (node.name, node.record["error"]) for node in nodes if node.record.get("error")
+    )
+    sleep_reasons: Dict[str, float] = defaultdict(float)
+    for node in sleeps:
+        sleep_reasons[str(node.record.get("reason", "unknown"))] += node.duration
+
+    total_cost = sum(entry["cost"] for entry in stages.values())
+    origin = min((node.start for node in nodes), default=0.0)
+    end = max((node.end for node in nodes), default=0.0)
+    return {
+        "document_id": document_id,
+        "num_pages": num_pages,
+        "total_cost": total_cost,
+        "cost_per_page": total_cost / num_pages if num_pages else None,
+        "span_wall_seconds": end - origin if nodes else 0.0,
+        "stages": sorted(stages.values(), key=lambda entry: -entry["cost"]),
+        "services": sorted(services.values(), key=lambda entry: -entry["cost"]),
+        "self_time": sorted(
+            ({"span": name, **entry} for name, entry in self_time.items()),
+            key=lambda entry: -entry["seconds"],
+        )[:top],
+        "pages": _breakdown_by(nodes, "page_id", top),
+        "sections": _breakdown_by(nodes, "section_id", top),
+        "retries": {
+            "sleeps": len(sleeps),
+            "sleep_seconds": sum(node.duration for node in sleeps),
+            "sleep_seconds_by_reason": dict(sleep_reasons),
+            "errors": [
+                {"span": name, "error": error, "count": count}
+                for (name, error), count in errors.most_common()
+            ],
+        },
+        "waterfall": _waterfall(roots, origin, max_repeated_spans),
+    }
+
+
+def _partition_files(
+    root: str, pattern: str, start: Optional[str], end: Optional[str]
+) -> List[str]:
+    """List the Parquet files of date partitions between start and end."""
+    files = []
+    for path in sorted(glob.glob(os.path.join(root, pattern, "*.parquet"))):
+        match = re.search(r"date=(\d{4}-\d{2}-\d{2})", path)
+        if match is None:
+            continue
+        date = match.group(1)
+        if (start and date < start) or (end and date > end):
+            continue
+        files.append(path)
+    return files
+
+
+def read_reporting_rows(
+    root: str,
+    table: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Read the rows of a reporting table from a local copy of the bucket.
+
+    Files are read one by one, so files written with different schemas (e.g.
+    sections of different classes) can be combined.
+
+    Args:
+        root: Local directory with the reporting bucket contents
+        table: "metering" or "document_sections"
+        start: First date partition to read (YYYY-MM-DD), inclusive
+        end: Last date partition to read (YYYY-MM-DD), inclusive
+        columns: Columns to read; columns missing from a file are skipped
+
+    Returns:
+        List of rows as dictionaries
+    """
+    import pyarrow.parquet as pq
+
+    pattern = "date=*" if table == "metering" else os.path.join("*", "date=*")
+    rows = []
+    for path in _partition_files(os.path.join(root, table), pattern, start, end):
+        file_columns = None
+        if columns:
+            names = set(pq.read_schema(path).names)
+            file_columns = [column for column in columns if column in names]
+        rows.extend(pq.read_table(path, columns=file_columns).to_pylist())
+    logger.info(f"Read {len(rows)} rows from {table}")
+    return rows
+
+
+def primary_classes(section_rows: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Get the class of each document: the class of most of its sections.
+
+    Args:
+        section_rows: Rows of the document_sections tables
+
+    Returns:
+        Dictionary of document ID to class
+    """
+    counts: Dict[str, Counter] = defaultdict(Counter)
+    for row in section_rows:
+        if row.get("document_id") and row.get("section_classification"):
+            counts[row["document_id"]][row["section_classification"]] += 1
+    return {
+        document_id: classes.most_common(1)[0][0]
+        for document_id, classes in counts.items()
+    }
+
+
+def build_class_profiles(
+    metering_rows: Iterable[Dict[str, Any]],
+    classes: Optional[Dict[str, str]] = None,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Summarize per-document cost and usage into percentiles per class.
+
+    Each processing run of a document (a document ID and its metering
+    timestamp) counts as one document, so reprocessed documents are not
+    double counted in one run.
+
+    Args:
+        metering_rows: Rows of the metering table
+        classes: Document ID to class, e.g. from primary_classes();
+            documents without a class are "unclassified"
+        percentiles: Percentiles to compute
+
+    Returns:
+        Dictionary of class to documents, total_cost and metrics, where
+        metrics maps each metric to {"p50": ..., "mean": ..., "max": ...}
+    """
+    classes = classes or {}
+    runs: Dict[Tuple[str, Any], Dict[str, float]] = defaultdict(
+        lambda: defaultdict(float)
+    )
+    for row in metering_rows:
+        run = runs[(row.get("document_id"), row.get("timestamp"))]
+        cost = float(row.get("estimated_cost") or 0.0)
+        value = float(row.get("value") or 0.0)
+        unit = row.get("unit")
+        run["cost"] += cost
+        run["pages"] = max(run["pages"], float(row.get("number_of_pages") or 0))
+        if unit == "inputTokens":
+            run["input_tokens"] += value
+        elif unit == "outputTokens":
+            run["output_tokens"] += value
+        elif unit == "gb_seconds":
+            run["lambda_gb_seconds"] += value
+        run[f"cost[{row.get('context') or '(none)'}]"] += cost
+
+    by_class: Dict[str, List[Dict[str, float]]] = defaultdict(list)
+    for (document_id, _), run in runs.items():
+        if run["pages"]:
+            run["cost_per_page"] = run["cost"] / run["pages"]
+        by_class[classes.get(document_id, "unclassified")].append(run)
+
+    profiles = {}
+    for name in sorted(by_class):
+        documents = by_class[name]
+        metrics = sorted({metric for run in documents for metric in run})
+        profiles[name] = {
+            "documents": len(documents),
+            "total_cost": sum(run["cost"] for run in documents),
+            "metrics": {
+                metric: _summarize(
+                    [run[metric] for run in documents if metric in run], percentiles
+                )
+                for metric in metrics
+            },
+        }
+    return profiles
+
+
+def _summarize(values: List[float], percentiles: Sequence[float]) -> Dict[str, float]:
+    summary = {f"p{q:g}": percentile(values, q) for q in percentiles}
+    summary["mean"] = sum(values) / len(values) if values else 0.0
+    summary["max"] = max(values, default=0.0)
+    return summary
+
+
+def _format_number(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if float(value).is_integer():
+        return f"{value:,.0f}"
+    return f"{value:,.6f}"
+
+
+def _format_table(header: List[str], rows: List[List[Any]]) -> List[str]:
+    """Render rows as a text table with the first column left-aligned."""
+    cells = [header] + [[_format_number(value) for value in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(header))]
+    return [
+        "  ".join(
+            cell.ljust(widths[i]) if i == 0 else cell.rjust(widths[i])
+            for i, cell in enumerate(row)
+        )
+        for row in cells
+    ]
+
+
+def format_document_profile(profile: Dict[str, Any]) -> str:
+    """
+    Render a document profile as text.
+
+    Args:
+        profile: Profile from build_document_profile()
+
+    Returns:
+        Multi-line report
+    """
+    lines = [f"Document: {profile['document_id']}"]
+    summary = f"Cost: ${profile['total_cost']:.6f}"
+    if profile["num_pages"]:
+        summary += (
+            f" for {profile['num_pages']} pages (${profile['cost_per_page']:.6f}/page)"
+        )
+    lines += [summary, f"Traced time: {profile['span_wall_seconds']:.3f}s", ""]
+
+    lines += _format_table(
+        ["stage", "cost", "input tok", "output tok", "GB-s", "span s", "runs"],
+        [
+            [
+                entry["stage"],
+                entry["cost"],
+                entry["input_tokens"],
+                entry["output_tokens"],
+                entry["lambda_gb_seconds"],
+                entry["span_seconds"],
+                entry["invocations"],
+            ]
+            for entry in profile["stages"]
+        ],
+    )
+    lines.append("")
+    lines += _format_table(
+        ["service_api", "unit", "value", "cost"],
+        [
+            [entry["service_api"], entry["unit"], entry["value"], entry["cost"]]
+            for entry in profile["services"]
+        ],
+    )
+
+    if profile["self_time"]:
+        lines += ["", "Self time by span:"]
+        lines += _format_table(
+            ["span", "count", "seconds"],
+            [
+                [entry["span"], entry["count"], entry["seconds"]]
+                for entry in profile["self_time"]
+            ],
+        )
+    for key, title in (("pages", "page_id"), ("sections", "section_id")):
+        if profile[key]:
+            lines += ["", f"Slowest {key}:"]
+            lines += _format_table(
+                [title, "seconds", "by stage"],
+                [
+                    [
+                        str(row[title]),
+                        row["seconds"],
+                        ", ".join(
+                            f"{stage}={seconds:.3f}"
+                            for stage, seconds in sorted(row["stages"].items())
+                        ),
+                    ]
+                    for row in profile[key]
+                ],
+            )
+
+    retries = profile["retries"]
+    if retries["sleeps"] or retries["errors"]:
+        lines += [
+            "",
+            f"Retries: {retries['sleeps']} sleeps, "
+            f"{retries['sleep_seconds']:.3f}s "
+            + " ".join(
+                f"{reason}={seconds:.3f}s"
+                for reason, seconds in retries["sleep_seconds_by_reason"].items()
+            ),
+        ]
+        for error in retries["errors"]:
+            lines.append(f"  {error['span']}: {error['error']} x{error['count']}")
+
+    if profile["waterfall"]:
+        lines += ["", "Waterfall (offset  duration  span):"]
+        for row in profile["waterfall"]:
+            label = "  " * row["depth"] + row["span"]
+            ids = " ".join(
+                f"{key}={row[key]}" for key in ("section_id", "page_id") if key in row
+            )
+            if ids:
+                label += f" [{ids}]"
+            if row["count"] > 1:
+                label += (
+                    f" x{row['count']} total={row['total_seconds']:.3f}s"
+                    f" p50={row['p50_seconds']:.3f}s max={row['max_seconds']:.3f}s"
+                    " (slowest below)"
+                )
+            if row.get("error"):
+                label += f" !{row['error']}"
+            lines.append(f"{row['offset_s']:9.3f}s {row['seconds']:9.3f}s  {label}")
+    return "\n".join(lines)
+
+
+def format_class_profiles(profiles: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Render class profiles as text.
+
+    Args:
+        profiles: Profiles from build_class_profiles()
+
+    Returns:
+        Multi-line report with one percentile table per class
+    """
+    lines = []
+    for name, profile in profiles.items():
+        if lines:
+            lines.append("")
+        lines.append(
+            f"{name}: {profile['documents']} documents, "
+            f"${profile['total_cost']:.4f} total"
+        )
+        metrics = profile["metrics"]
+        columns = list(next(iter(metrics.values()), {}))
+        lines += _format_table(
+            ["metric"] + columns,
+            [
+                [metric] + [summary[column] for column in columns]
+                for metric, summary in metrics.items()
+            ],
+        )
+    return "\n".join(lines)
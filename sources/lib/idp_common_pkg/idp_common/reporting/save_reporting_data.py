@@ -5,12 +5,14 @@
 Module for saving document data to reporting storage.
 """
 
+import concurrent.futures
 import datetime
+import functools
 import io
 import json
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import boto3
@@ -18,11 +20,77 @@ import pyarrow as pa
 import pyarrow.parquet as pq
 
 from idp_common.models import Document
+from idp_common.reporting.pricing import PricingIndex
+from idp_common.reporting.schema_registry import SchemaRegistry
 from idp_common.s3 import get_json_content
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Sections loaded, converted and uploaded concurrently
+DEFAULT_MAX_WORKERS = 8
+
+# Schema for metering data with cost fields
+METERING_SCHEMA = pa.schema(
+    [
+        ("document_id", pa.string()),
+        ("context", pa.string()),
+        ("service_api", pa.string()),
+        ("unit", pa.string()),
+        ("value", pa.float64()),
+        ("number_of_pages", pa.int32()),
+        ("unit_cost", pa.float64()),
+        ("estimated_cost", pa.float64()),
+        ("timestamp", pa.timestamp("ms")),
+    ]
+)
+
+# Fields of dynamic schemas that keep a timestamp type; all others are strings
+TIMESTAMP_FIELDS = frozenset({"timestamp", "evaluation_date"})
+
+# Distinct field sets whose schema and sanitizer are kept per process
+SCHEMA_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _schema_for_fields(fields: frozenset) -> pa.Schema:
+    """Build the dynamic schema of a set of flattened field names."""
+    return pa.schema(
+        [
+            (
+                field_name,
+                pa.timestamp("ms") if field_name in TIMESTAMP_FIELDS else pa.string(),
+            )
+            for field_name in sorted(fields)  # Sort for consistent ordering
+        ]
+    )
+
+
+@functools.lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _compile_sanitizer(
+    schema: pa.Schema,
+) -> Tuple[Tuple[Tuple[str, bool], ...], frozenset]:
+    """
+    Compile a schema into the (field name, is timestamp) pairs of the sanitizer.
+
+    Fields of any type other than timestamp are converted to strings.
+    """
+    fields = tuple((field.name, field.type == pa.timestamp("ms")) for field in schema)
+    return fields, frozenset(field.name for field in schema)
+
+
+def _to_timestamp(value: Any) -> Optional[datetime.datetime]:
+    """Convert a datetime or ISO string to a timestamp, or None."""
+    if isinstance(value, datetime.datetime):
+        return value
+    # Try to parse string timestamps
+    try:
+        if isinstance(value, str):
+            return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        pass
+    return None
+
 
 class SaveReportingData:
     """
@@ -37,6 +105,7 @@ class SaveReportingData:
         reporting_bucket: str,
         database_name: str = None,
         config: Dict[str, Any] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
     ):
         """
         Initialize the SaveReportingData class.
@@ -45,15 +114,24 @@ class SaveReportingData:
             reporting_bucket: S3 bucket name for reporting data
             database_name: Glue database name for creating tables (optional)
             config: Configuration dictionary containing pricing and other settings (optional)
+            max_workers: Maximum number of sections saved concurrently
         """
         self.reporting_bucket = reporting_bucket
         self.database_name = database_name
         self.config = config or {}
+        self.max_workers = max_workers
         self.s3_client = boto3.client("s3")
         self.glue_client = boto3.client("glue") if database_name else None
+        # Known Glue table columns, to skip Glue calls for unchanged schemas
+        self.schema_registry = (
+            SchemaRegistry(reporting_bucket, database_name, self.s3_client)
+            if database_name
+            else None
+        )
 
         # Cache for pricing data to avoid repeated processing
         self._pricing_cache = None
+        self._pricing_index = None
 
     def _serialize_value(self, value: Any) -> str:
         """
@@ -96,7 +174,16 @@ class SaveReportingData:
 
         # Create PyArrow table from records with explicit schema
         table = pa.Table.from_pylist(records, schema=schema)
+        self._save_table_as_parquet(table, s3_key)
+
+    def _save_table_as_parquet(self, table: pa.Table, s3_key: str) -> None:
+        """
+        Save a PyArrow table as a Parquet file to S3.
 
+        Args:
+            table: Table to save
+            s3_key: S3 key path
+        """
         # Create in-memory buffer
         buffer = io.BytesIO()
 
@@ -112,7 +199,7 @@ class SaveReportingData:
             ContentType="application/octet-stream",
         )
         logger.info(
-            f"Saved {len(records)} records as Parquet to s3://{self.reporting_bucket}/{s3_key}"
+            f"Saved {table.num_rows} records as Parquet to s3://{self.reporting_bucket}/{s3_key}"
         )
 
     def _parse_s3_uri(self, uri: str) -> tuple:
@@ -231,12 +318,6 @@ class SaveReportingData:
         Returns:
             PyArrow schema with conservative string typing
         """
-        # Define fields that should maintain specific types
-        TIMESTAMP_FIELDS = {
-            "timestamp",
-            "evaluation_date",
-        }
-
         if not records:
             # Return a minimal schema with just section_id
             return pa.schema([("section_id", pa.string())])
@@ -246,19 +327,8 @@ class SaveReportingData:
         for record in records:
             all_fields.update(record.keys())
 
-        # Create schema with conservative typing
-        schema_fields = []
-        for field_name in sorted(all_fields):  # Sort for consistent ordering
-            if field_name in TIMESTAMP_FIELDS:
-                # Keep timestamps as timestamps for proper time-based queries
-                pa_type = pa.timestamp("ms")
-            else:
-                # Default everything else to string to prevent type conflicts
-                pa_type = pa.string()
-
-            schema_fields.append((field_name, pa_type))
-
-        return pa.schema(schema_fields)
+        # Schemas are built once per distinct set of field names
+        return _schema_for_fields(frozenset(all_fields))
 
     def _sanitize_records_for_schema(
         self, records: List[Dict[str, Any]], schema: pa.Schema
@@ -273,46 +343,31 @@ class SaveReportingData:
         Returns:
             List of sanitized records
         """
+        # The field conversions are compiled once per schema
+        fields, field_names = _compile_sanitizer(schema)
+        convert = self._convert_value_to_string
         sanitized_records = []
 
         for record in records:
             sanitized_record = {}
 
             # Process each field in the schema
-            for field in schema:
-                field_name = field.name
+            for field_name, is_timestamp in fields:
                 value = record.get(field_name)
 
                 if value is None:
                     sanitized_record[field_name] = None
-                elif field.type == pa.string():
-                    # Convert all values to strings for string fields
-                    sanitized_record[field_name] = self._convert_value_to_string(value)
-                elif field.type == pa.timestamp("ms"):
-                    # Handle timestamp fields
-                    if isinstance(value, datetime.datetime):
-                        sanitized_record[field_name] = value
-                    else:
-                        # Try to parse string timestamps
-                        try:
-                            if isinstance(value, str):
-                                sanitized_record[field_name] = (
-                                    datetime.datetime.fromisoformat(
-                                        value.replace("Z", "+00:00")
-                                    )
-                                )
-                            else:
-                                sanitized_record[field_name] = None
-                        except (ValueError, TypeError):
-                            sanitized_record[field_name] = None
+                elif is_timestamp:
+                    sanitized_record[field_name] = _to_timestamp(value)
                 else:
-                    # For any other types, convert to string as fallback
-                    sanitized_record[field_name] = self._convert_value_to_string(value)
+                    # Convert all values to strings for string fields
+                    sanitized_record[field_name] = convert(value)
 
             # Add any fields from the record that aren't in the schema (shouldn't happen with dynamic schema)
-            for field_name, value in record.items():
-                if field_name not in sanitized_record:
-                    sanitized_record[field_name] = self._convert_value_to_string(value)
+            if not field_names.issuperset(record):
+                for field_name, value in record.items():
+                    if field_name not in field_names:
+                        sanitized_record[field_name] = convert(value)
 
             sanitized_records.append(sanitized_record)
 
@@ -355,6 +410,13 @@ class SaveReportingData:
 
         return columns
 
+    def _register_glue_table(
+        self, table_name: str, column_names: set, location: str
+    ) -> None:
+        """Record the columns a Glue table has, if a schema registry is used."""
+        if self.schema_registry:
+            self.schema_registry.register(table_name, column_names, location)
+
     def _create_or_update_glue_table(
         self, section_type: str, schema: pa.Schema, new_section_created: bool = False
     ) -> bool:
@@ -412,6 +474,15 @@ class SaveReportingData:
                 "storage.location.template": f"s3://{self.reporting_bucket}/document_sections/{section_type_prefix}/date=${{date}}/",
             },
         }
+        new_location = table_input["StorageDescriptor"]["Location"]
+        new_column_names = {col["Name"] for col in columns}
+
+        # Skip Glue when the table is known to have the columns already
+        if self.schema_registry and self.schema_registry.covers(
+            table_name, new_column_names, new_location
+        ):
+            logger.debug(f"Glue table {table_name} is registered with current schema")
+            return False
 
         try:
             # Try to get the existing table
@@ -426,7 +497,6 @@ class SaveReportingData:
                 .get("Columns", [])
             )
             existing_column_names = {col["Name"] for col in existing_columns}
-            new_column_names = {col["Name"] for col in columns}
 
             # Check if location has changed
             existing_location = (
@@ -434,7 +504,6 @@ class SaveReportingData:
                 .get("StorageDescriptor", {})
                 .get("Location", "")
             )
-            new_location = table_input["StorageDescriptor"]["Location"]
 
             # Check if columns or location have changed
             columns_changed = bool(new_column_names - existing_column_names)
@@ -449,14 +518,24 @@ class SaveReportingData:
                         f"Updating Glue table {table_name} with new location: {existing_location} -> {new_location}"
                     )
 
+                # Keep the existing columns, so sections without them stay covered
+                table_input["StorageDescriptor"]["Columns"] = existing_columns + [
+                    col for col in columns if col["Name"] not in existing_column_names
+                ]
                 self.glue_client.update_table(
                     DatabaseName=self.database_name, TableInput=table_input
                 )
+                self._register_glue_table(
+                    table_name, existing_column_names | new_column_names, new_location
+                )
                 return True
             else:
                 logger.debug(
                     f"Glue table {table_name} already exists with current schema and location"
                 )
+                self._register_glue_table(
+                    table_name, existing_column_names, existing_location
+                )
                 return False
 
         except Exception as get_table_error:
@@ -475,6 +554,9 @@ class SaveReportingData:
                         DatabaseName=self.database_name, TableInput=table_input
                     )
                     logger.info(f"Successfully created Glue table {table_name}")
+                    self._register_glue_table(
+                        table_name, new_column_names, new_location
+                    )
                     return True
                 except Exception as create_error:
                     # Check if it's an AlreadyExistsException
@@ -508,26 +590,30 @@ class SaveReportingData:
         Returns:
             List of results from each save operation
         """
-        results = []
-
         # Process each data type based on data_to_save
+        savers = []
         if "evaluation_results" in data_to_save:
             logger.info("Processing evaluation results")
-            result = self.save_evaluation_results(document)
-            if result:
-                results.append(result)
+            savers.append(self.save_evaluation_results)
 
         if "metering" in data_to_save:
             logger.info("Processing metering data")
-            result = self.save_metering_data(document)
-            if result:
-                results.append(result)
+            savers.append(self.save_metering_data)
 
         if "sections" in data_to_save:
             logger.info("Processing document sections")
-            result = self.save_document_sections(document)
-            if result:
-                results.append(result)
+            savers.append(self.save_document_sections)
+
+        # The data types are written to separate tables, so save them concurrently
+        if len(savers) > 1:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(savers)
+            ) as executor:
+                futures = [executor.submit(saver, document) for saver in savers]
+                results = [future.result() for future in futures]
+        else:
+            results = [saver(document) for saver in savers]
+        results = [result for result in results if result]
 
         # Add more data types here as needed
         # if 'document_metadata' in data_to_save:
@@ -958,40 +1044,18 @@ class SaveReportingData:
         Returns:
             Unit cost in USD, or 0.0 if not found
         """
-        # Get pricing from configuration dictionary
-        pricing_map = self._get_pricing_from_config()
-
-        # Try exact match first
-        if service_api in pricing_map and unit in pricing_map[service_api]:
-            return pricing_map[service_api][unit]
+        return self._get_pricing_index().unit_cost(service_api, unit)
 
-        # Try partial matches for common patterns
-        service_api_lower = service_api.lower()
-        unit_lower = unit.lower()
-
-        for service_key, service_costs in pricing_map.items():
-            service_key_lower = service_key.lower()
-            if (
-                service_key_lower in service_api_lower
-                or service_api_lower in service_key_lower
-            ):
-                for unit_key, cost in service_costs.items():
-                    unit_key_lower = unit_key.lower()
-                    if (
-                        unit_key_lower == unit_lower
-                        or unit_key_lower in unit_lower
-                        or unit_lower in unit_key_lower
-                    ):
-                        logger.info(
-                            f"Using partial match for {service_api}/{unit}: {service_key}/{unit_key} = ${cost}"
-                        )
-                        return cost
+    def _get_pricing_index(self) -> PricingIndex:
+        """
+        Get the pricing configuration compiled for lookups, building it once.
 
-        # Log when no cost mapping is found
-        logger.warning(
-            f"No unit cost mapping found for service_api='{service_api}', unit='{unit}'. Using $0.0"
-        )
-        return 0.0
+        Returns:
+            PricingIndex of the configuration's pricing
+        """
+        if self._pricing_index is None:
+            self._pricing_index = PricingIndex(self._get_pricing_from_config())
+        return self._pricing_index
 
     def clear_pricing_cache(self):
         """
@@ -999,76 +1063,132 @@ class SaveReportingData:
         Useful for testing or when configuration has been updated.
         """
         self._pricing_cache = None
+        self._pricing_index = None
         logger.info("Pricing cache cleared")
 
-    def save_metering_data(self, document: Document) -> Optional[Dict[str, Any]]:
+    def _get_document_timestamp(
+        self, document: Document
+    ) -> Tuple[datetime.datetime, str]:
         """
-        Save metering data for a document to the reporting bucket.
+        Get the timestamp and date partition of a document's reporting records.
 
         Args:
-            document: Document object containing metering data
+            document: Document with an initial_event_time
 
         Returns:
-            Dict with status and message, or None if no metering data
+            Tuple of (timestamp, date partition as YYYY-MM-DD). The current
+            time is used if the document has no valid initial_event_time.
         """
-        if not document.metering:
-            warning_msg = f"No metering data to save for document {document.id}"
-            logger.warning(warning_msg)
-            return None
-
-        # Define schema for metering data with new cost fields
-        metering_schema = pa.schema(
-            [
-                ("document_id", pa.string()),
-                ("context", pa.string()),
-                ("service_api", pa.string()),
-                ("unit", pa.string()),
-                ("value", pa.float64()),
-                ("number_of_pages", pa.int32()),
-                ("unit_cost", pa.float64()),
-                ("estimated_cost", pa.float64()),
-                ("timestamp", pa.timestamp("ms")),
-            ]
-        )
-
         # Use document.initial_event_time if available, otherwise use current time
         if document.initial_event_time:
             try:
                 # Try to parse the initial_event_time string into a datetime object
-                doc_time = datetime.datetime.fromisoformat(
+                timestamp = datetime.datetime.fromisoformat(
                     document.initial_event_time.replace("Z", "+00:00")
                 )
-                timestamp = doc_time
-                date_partition = doc_time.strftime("%Y-%m-%d")
                 logger.info(
                     f"Using document initial_event_time: {document.initial_event_time} for partitioning"
                 )
+                return timestamp, timestamp.strftime("%Y-%m-%d")
             except (ValueError, TypeError) as e:
                 logger.warning(
                     f"Could not parse document.initial_event_time: {document.initial_event_time}, using current time instead. Error: {str(e)}"
                 )
-                timestamp = datetime.datetime.now()
-                date_partition = timestamp.strftime("%Y-%m-%d")
         else:
             logger.warning(
                 "Document initial_event_time not available, using current time instead"
             )
-            timestamp = datetime.datetime.now()
-            date_partition = timestamp.strftime("%Y-%m-%d")
+        timestamp = datetime.datetime.now()
+        return timestamp, timestamp.strftime("%Y-%m-%d")
+
+    @staticmethod
+    def _escape_document_id(document_id: str) -> str:
+        """Escape a document ID for S3 keys by replacing slashes with underscores."""
+        return re.sub(r"[/\\]", "_", document_id)
+
+    @staticmethod
+    def _metering_key(
+        escaped_doc_id: str, timestamp: datetime.datetime, date_partition: str
+    ) -> str:
+        """Get the S3 key of a document's metering file."""
+        # Timestamp with milliseconds, to avoid overwrites if the same doc is processed multiple times
+        timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        return f"metering/date={date_partition}/{escaped_doc_id}_{timestamp_str}_results.parquet"
+
+    @staticmethod
+    def _section_type_prefix(section_type: str) -> str:
+        """Escape a section type to make it filesystem-safe and lowercase for consistency."""
+        return re.sub(r"[/\\:*?\"<>|]", "_", section_type.lower())
+
+    def _section_key(
+        self,
+        section_type: str,
+        date_partition: str,
+        escaped_doc_id: str,
+        section_id: str,
+    ) -> str:
+        """Get the S3 key of a section file, with a separate table per section type."""
+        # document_sections/{section_type}/date={date}/{escaped_doc_id}_section_{section_id}.parquet
+        return (
+            f"document_sections/"
+            f"{self._section_type_prefix(section_type)}/"
+            f"date={date_partition}/"
+            f"{escaped_doc_id}_section_{section_id}.parquet"
+        )
 
-        # Escape document ID by replacing slashes with underscores
-        document_id = document.id
-        escaped_doc_id = re.sub(r"[/\\]", "_", document_id)
+    def save_metering_data(self, document: Document) -> Optional[Dict[str, Any]]:
+        """
+        Save metering data for a document to the reporting bucket.
 
-        # Create timestamp string for unique filenames (to avoid overwrites if same doc processed multiple times)
-        timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S_%f")[
-            :-3
-        ]  # Include milliseconds
+        Args:
+            document: Document object containing metering data
 
-        # Process metering data
-        metering_records = []
+        Returns:
+            Dict with status and message, or None if no metering data
+        """
+        if not document.metering:
+            warning_msg = f"No metering data to save for document {document.id}"
+            logger.warning(warning_msg)
+            return None
 
-        for key, metrics in document.metering.items():
+        timestamp, date_partition = self._get_document_timestamp(document)
+        metering_table = self.build_metering_table(document, timestamp)
+
+        # Save metering data in Parquet format
+        if metering_table is None:
+            logger.warning("No metering records to save")
+        else:
+            metering_key = self._metering_key(
+                self._escape_document_id(document.id), timestamp, date_partition
+            )
+            self._save_table_as_parquet(metering_table, metering_key)
+            logger.info(f"Saved {metering_table.num_rows} metering records")
+
+        return {
+            "statusCode": 200,
+            "body": "Successfully saved metering data to reporting bucket",
+        }
+
+    def build_metering_table(
+        self, document: Document, timestamp: datetime.datetime
+    ) -> Optional[pa.Table]:
+        """
+        Build the priced metering records of a document.
+
+        Args:
+            document: Document object containing metering data
+            timestamp: Timestamp of the records
+
+        Returns:
+            Metering table, or None if the document has no metering records
+        """
+        # Process metering data column by column
+        contexts = []
+        service_apis = []
+        units = []
+        values = []
+
+        for key, metrics in (document.metering or {}).items():
             # Split the key into context and service_api
             parts = key.split("/", 1)
             if len(parts) == 2:
@@ -1088,41 +1208,62 @@ class SaveReportingData:
                     logger.warning(
                         f"Could not convert metering value to float: {value}, using 1.0 instead"
                     )
+                contexts.append(context)
+                service_apis.append(service_api)
+                units.append(unit)
+                values.append(float_value)
 
-                # Get the number of pages from the document
-                num_pages = document.num_pages if document.num_pages is not None else 0
+        if not values:
+            return None
 
-                # Calculate unit cost and estimated cost using pricing from configuration
-                unit_cost = self._get_unit_cost(service_api, unit)
-                estimated_cost = float_value * unit_cost
+        return self.price_metering_table(
+            pa.table(
+                {
+                    "document_id": [document.id] * len(values),
+                    "context": contexts,
+                    "service_api": service_apis,
+                    "unit": units,
+                    "value": values,
+                    # Get the number of pages from the document
+                    "number_of_pages": [document.num_pages or 0] * len(values),
+                    "unit_cost": pa.nulls(len(values), pa.float64()),
+                    "estimated_cost": pa.nulls(len(values), pa.float64()),
+                    "timestamp": [timestamp] * len(values),
+                },
+                schema=METERING_SCHEMA,
+            )
+        )
 
-                metering_record = {
-                    "document_id": document_id,
-                    "context": context,
-                    "service_api": service_api,
-                    "unit": unit,
-                    "value": float_value,
-                    "number_of_pages": num_pages,
-                    "unit_cost": unit_cost,
-                    "estimated_cost": estimated_cost,
-                    "timestamp": timestamp,
-                }
-                metering_records.append(metering_record)
+    def price_metering_table(self, table: pa.Table) -> pa.Table:
+        """
+        Calculate the unit_cost and estimated_cost columns of metering records.
 
-        # Save metering data in Parquet format
-        if metering_records:
-            metering_key = f"metering/date={date_partition}/{escaped_doc_id}_{timestamp_str}_results.parquet"
-            self._save_records_as_parquet(
-                metering_records, metering_key, metering_schema
-            )
-            logger.info(f"Saved {len(metering_records)} metering records")
-        else:
-            logger.warning("No metering records to save")
+        The unit price of each distinct service_api and unit is resolved once
+        from the pricing configuration, so whole tables of metering records
+        (e.g. a month of existing metering files) can be priced at once.
 
-        return {
-            "statusCode": 200,
-            "body": "Successfully saved metering data to reporting bucket",
-        }
+        Args:
+            table: Metering table with service_api, unit and value columns
+
+        Returns:
+            Table with its unit_cost and estimated_cost columns replaced, or
+            appended if missing
+        """
+        unit_costs, estimated_costs = self._get_pricing_index().price(
+            table.column("service_api").to_pylist(),
+            table.column("unit").to_pylist(),
+            table.column("value").cast(pa.float64()),
+        )
+        for name, column in (
+            ("unit_cost", unit_costs),
+            ("estimated_cost", estimated_costs),
+        ):
+            index = table.schema.get_field_index(name)
+            if index < 0:
+                table = table.append_column(name, column)
+            else:
+                table = table.set_column(index, name, column)
+        return table
 
     def save_document_sections(self, document: Document) -> Optional[Dict[str, Any]]:
         """
@@ -1143,36 +1284,10 @@ class SaveReportingData:
             logger.warning(warning_msg)
             return None
 
-        # Use document.initial_event_time if available, otherwise use current time
-        if document.initial_event_time:
-            try:
-                # Try to parse the initial_event_time string into a datetime object
-                doc_time = datetime.datetime.fromisoformat(
-                    document.initial_event_time.replace("Z", "+00:00")
-                )
-                timestamp = doc_time
-                date_partition = doc_time.strftime("%Y-%m-%d")
-                logger.info(
-                    f"Using document initial_event_time: {document.initial_event_time} for partitioning"
-                )
-            except (ValueError, TypeError) as e:
-                logger.warning(
-                    f"Could not parse document.initial_event_time: {document.initial_event_time}, using current time instead. Error: {str(e)}"
-                )
-                current_time = datetime.datetime.now()
-                timestamp = current_time
-                date_partition = current_time.strftime("%Y-%m-%d")
-        else:
-            logger.warning(
-                "Document initial_event_time not available, using current time instead"
-            )
-            current_time = datetime.datetime.now()
-            timestamp = current_time
-            date_partition = current_time.strftime("%Y-%m-%d")
+        timestamp, date_partition = self._get_document_timestamp(document)
 
-        # Escape document ID by replacing slashes with underscores
         document_id = document.id
-        escaped_doc_id = re.sub(r"[/\\]", "_", document_id)
+        escaped_doc_id = self._escape_document_id(document_id)
 
         sections_processed = 0
         sections_with_errors = 0
@@ -1183,138 +1298,38 @@ class SaveReportingData:
             f"Processing {len(document.sections)} sections for document {document_id}"
         )
 
-        for section in document.sections:
-            try:
-                # Skip sections without extraction results
-                if not section.extraction_result_uri:
-                    logger.warning(
-                        f"Section {section.section_id} has no extraction_result_uri, skipping"
-                    )
-                    continue
-
-                logger.info(
-                    f"Processing section {section.section_id} with classification '{section.classification}'"
-                )
-
-                # Load extraction results from S3
-                try:
-                    extraction_data = get_json_content(section.extraction_result_uri)
-                    if not extraction_data:
-                        logger.warning(
-                            f"Empty extraction results for section {section.section_id}, skipping"
-                        )
-                        continue
-                except Exception as e:
-                    logger.error(
-                        f"Error loading extraction results from {section.extraction_result_uri}: {str(e)}"
-                    )
-                    sections_with_errors += 1
-                    continue
-
-                # Prepare records for this section
-                section_records = []
-
-                # Handle different data structures
-                if isinstance(extraction_data, dict):
-                    # Flatten the JSON data
-                    flattened_data = self._flatten_json_data(extraction_data)
-
-                    # Add section metadata
-                    flattened_data["section_id"] = section.section_id
-                    flattened_data["document_id"] = document_id
-                    flattened_data["section_classification"] = section.classification
-                    flattened_data["section_confidence"] = section.confidence
-                    flattened_data["timestamp"] = timestamp
-
-                    section_records.append(flattened_data)
-
-                elif isinstance(extraction_data, list):
-                    # Handle list of records
-                    for i, item in enumerate(extraction_data):
-                        if isinstance(item, dict):
-                            flattened_item = self._flatten_json_data(item)
-                        else:
-                            flattened_item = {"value": str(item)}
-
-                        # Add section metadata and record index
-                        flattened_item["section_id"] = section.section_id
-                        flattened_item["document_id"] = document_id
-                        flattened_item["section_classification"] = (
-                            section.classification
-                        )
-                        flattened_item["section_confidence"] = section.confidence
-                        flattened_item["record_index"] = i
-
-                        section_records.append(flattened_item)
-                else:
-                    # Handle primitive types
-                    record = {
-                        "section_id": section.section_id,
-                        "document_id": document_id,
-                        "section_classification": section.classification,
-                        "section_confidence": section.confidence,
-                        "value": str(extraction_data),
-                    }
-                    section_records.append(record)
-
-                if not section_records:
-                    logger.warning(
-                        f"No records to save for section {section.section_id}"
-                    )
-                    continue
-
-                # Create dynamic schema for this section's data
-                schema = self._create_dynamic_schema(section_records)
-
-                # Sanitize all records to ensure robust type compatibility
-                section_records = self._sanitize_records_for_schema(
-                    section_records, schema
-                )
-
-                # Create S3 key with separate tables for each section type
-                # document_sections/{section_type}/date={date}/{escaped_doc_id}_section_{section_id}.parquet
-                section_type = (
-                    section.classification if section.classification else "unknown"
-                )
-                # Escape section_type to make it filesystem-safe and lowercase for consistency
-                section_type_prefix = re.sub(
-                    r"[/\\:*?\"<>|]", "_", section_type.lower()
-                )
-
-                s3_key = (
-                    f"document_sections/"
-                    f"{section_type_prefix}/"
-                    f"date={date_partition}/"
-                    f"{escaped_doc_id}_section_{section.section_id}.parquet"
+        # Load, convert and upload sections concurrently; results keep section order
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor:
+            section_results = list(
+                executor.map(
+                    lambda section: self._save_section(
+                        section, document_id, escaped_doc_id, timestamp, date_partition
+                    ),
+                    document.sections,
                 )
+            )
 
-                # Save the section data as Parquet
-                self._save_records_as_parquet(section_records, s3_key, schema)
-
-                sections_processed += 1
-                total_records_saved += len(section_records)
+        for status, section_type, schema, num_records in section_results:
+            if status == "error":
+                sections_with_errors += 1
+                continue
+            if status != "saved":
+                continue
 
-                logger.info(
-                    f"Saved {len(section_records)} records for section {section.section_id} "
-                    f"to s3://{self.reporting_bucket}/{s3_key}"
-                )
+            sections_processed += 1
+            total_records_saved += num_records
 
-                # Track this section type and create/update Glue table if needed
-                if section_type not in section_types_processed:
-                    section_types_processed.add(section_type)
-                    # Try to create or update the Glue table for this section type
-                    table_created = self._create_or_update_glue_table(
-                        section_type, schema
+            # Track this section type and create/update Glue table if needed
+            if section_type not in section_types_processed:
+                section_types_processed.add(section_type)
+                # Try to create or update the Glue table for this section type
+                table_created = self._create_or_update_glue_table(section_type, schema)
+                if table_created:
+                    logger.info(
+                        f"Created/updated Glue table for section type: {section_type}"
                     )
-                    if table_created:
-                        logger.info(
-                            f"Created/updated Glue table for section type: {section_type}"
-                        )
-
-            except Exception as e:
-                logger.error(f"Error processing section {section.section_id}: {str(e)}")
-                sections_with_errors += 1
-                continue
 
         # Log summary
         logger.info(
@@ -1335,3 +1350,152 @@ class SaveReportingData:
             "body": f"Successfully saved {sections_processed} document sections "
             f"with {total_records_saved} total records to reporting bucket",
         }
+
+    def _save_section(
+        self,
+        section,
+        document_id: str,
+        escaped_doc_id: str,
+        timestamp: datetime.datetime,
+        date_partition: str,
+    ) -> Tuple[str, Optional[str], Optional[pa.Schema], int]:
+        """
+        Save the extraction results of one section as a Parquet file.
+
+        The S3 key depends only on the document, section and date partition,
+        so saving the same section again overwrites the earlier file.
+
+        Args:
+            section: Section with an extraction result URI
+            document_id: Document ID
+            escaped_doc_id: Document ID with path separators replaced
+            timestamp: Timestamp for the records
+            date_partition: Date partition (YYYY-MM-DD)
+
+        Returns:
+            Tuple of (status, section_type, schema, number of records), where
+            status is "saved", "skipped" or "error"
+        """
+        try:
+            status, section_records = self.build_section_records(
+                section, document_id, timestamp
+            )
+            if status != "ok":
+                return status, None, None, 0
+
+            if not section_records:
+                logger.warning(f"No records to save for section {section.section_id}")
+                return "skipped", None, None, 0
+
+            # Create dynamic schema for this section's data
+            schema = self._create_dynamic_schema(section_records)
+
+            # Sanitize all records to ensure robust type compatibility
+            section_records = self._sanitize_records_for_schema(section_records, schema)
+
+            # Create S3 key with separate tables for each section type
+            section_type = (
+                section.classification if section.classification else "unknown"
+            )
+            s3_key = self._section_key(
+                section_type, date_partition, escaped_doc_id, section.section_id
+            )
+
+            # Save the section data as Parquet
+            self._save_records_as_parquet(section_records, s3_key, schema)
+
+            logger.info(
+                f"Saved {len(section_records)} records for section {section.section_id} "
+                f"to s3://{self.reporting_bucket}/{s3_key}"
+            )
+            return "saved", section_type, schema, len(section_records)
+
+        except Exception as e:
+            logger.error(f"Error processing section {section.section_id}: {str(e)}")
+            return "error", None, None, 0
+
+    def build_section_records(
+        self, section, document_id: str, timestamp: datetime.datetime
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Load the extraction results of a section and flatten them into records.
+
+        Args:
+            section: Section with an extraction result URI
+            document_id: Document ID
+            timestamp: Timestamp for the records
+
+        Returns:
+            Tuple of (status, records), where status is "ok", "skipped" or
+            "error"
+        """
+        # Skip sections without extraction results
+        if not section.extraction_result_uri:
+            logger.warning(
+                f"Section {section.section_id} has no extraction_result_uri, skipping"
+            )
+            return "skipped", []
+
+        logger.info(
+            f"Processing section {section.section_id} with classification '{section.classification}'"
+        )
+
+        # Load extraction results from S3
+        try:
+            extraction_data = get_json_content(section.extraction_result_uri)
+            if not extraction_data:
+                logger.warning(
+                    f"Empty extraction results for section {section.section_id}, skipping"
+                )
+                return "skipped", []
+        except Exception as e:
+            logger.error(
+                f"Error loading extraction results from {section.extraction_result_uri}: {str(e)}"
+            )
+            return "error", []
+
+        # Prepare records for this section
+        section_records = []
+
+        # Handle different data structures
+        if isinstance(extraction_data, dict):
+            # Flatten the JSON data
+            flattened_data = self._flatten_json_data(extraction_data)
+
+            # Add section metadata
+            flattened_data["section_id"] = section.section_id
+            flattened_data["document_id"] = document_id
+            flattened_data["section_classification"] = section.classification
+            flattened_data["section_confidence"] = section.confidence
+            flattened_data["timestamp"] = timestamp
+
+            section_records.append(flattened_data)
+
+        elif isinstance(extraction_data, list):
+            # Handle list of records
+            for i, item in enumerate(extraction_data):
+                if isinstance(item, dict):
+                    flattened_item = self._flatten_json_data(item)
+                else:
+                    flattened_item = {"value": str(item)}
+
+                # Add section metadata and record index
+                flattened_item["section_id"] = section.section_id
+                flattened_item["document_id"] = document_id
+                flattened_item["section_classification"] = section.classification
+                flattened_item["section_confidence"] = section.confidence
+                flattened_item["record_index"] = i
+
+                section_records.append(flattened_item)
+        else:
+            # Handle primitive types
+            record = {
+                "section_id": section.section_id,
+                "document_id": document_id,
+                "section_classification": section.classification,
+                "section_confidence": section.confidence,
+                "value": str(extraction_data),
+            }
+            section_records.append(record)
+
+        return "ok", section_records
@@ -0,0 +1,164 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Registry of the Glue table columns written by the reporting module.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import boto3
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the registry records in the reporting bucket, outside the table
+# locations and crawler targets
+SCHEMA_REGISTRY_PREFIX = "_schema_registry"
+
+# Registered tables are checked against Glue again after this many seconds, so
+# tables changed or deleted outside the reporting module are repaired
+DEFAULT_TTL_SECONDS = 3600
+
+
+class SchemaRegistry:
+    """
+    Columns and location of the Glue tables, as last checked against Glue.
+
+    Keeping the Glue table of a section class up to date takes a get_table
+    call per class and document, which bursts of documents get throttled on.
+    The registry keeps the columns of each table once it was created, updated
+    or found up to date: in memory, shared by all registries of the process
+    (a warm Lambda container keeps it across invocations), and as a small
+    JSON record in the reporting bucket that new processes load on first use.
+    A schema whose columns the table already has is then written without any
+    Glue call; only new columns, a changed location or an entry older than
+    the TTL go to Glue.
+
+    The registry is a cache, never the source of truth: a missing, stale or
+    unreadable record costs one Glue check.
+    """
+
+    # Tables by (bucket, database, table), shared by the registries of the process
+    _tables: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        reporting_bucket: str,
+        database_name: str,
+        s3_client=None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            reporting_bucket: S3 bucket holding the registry records
+            database_name: Glue database of the registered tables
+            s3_client: S3 client (optional, created if not given)
+            ttl_seconds: Age after which a table is checked against Glue again
+        """
+        self.reporting_bucket = reporting_bucket
+        self.database_name = database_name
+        self.s3_client = s3_client or boto3.client("s3")
+        self.ttl_seconds = ttl_seconds
+        # Tables whose record this registry already tried to load
+        self._loaded = set()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget the tables registered in this process."""
+        with cls._lock:
+            cls._tables.clear()
+
+    def _record_key(self, table_name: str) -> str:
+        return f"{SCHEMA_REGISTRY_PREFIX}/{self.database_name}/{table_name}.json"
+
+    def _get(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Get a table from memory, or from its record on first use."""
+        cache_key = (self.reporting_bucket, self.database_name, table_name)
+        with self._lock:
+            entry = self._tables.get(cache_key)
+        if entry is None and table_name not in self._loaded:
+            self._loaded.add(table_name)
+            entry = self._load(table_name)
+            if entry is not None:
+                with self._lock:
+                    entry = self._tables.setdefault(cache_key, entry)
+        return entry
+
+    def _load(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Load the record of a table from the reporting bucket."""
+        key = self._record_key(table_name)
+        try:
+            response = self.s3_client.get_object(Bucket=self.reporting_bucket, Key=key)
+            record = json.loads(response["Body"].read())
+            return {
+                "columns": frozenset(record["columns"]),
+                "location": record["location"],
+                "checked_at": float(record["checked_at"]),
+            }
+        except Exception as e:
+            if "NoSuchKey" in str(e):
+                logger.debug(f"No schema registry record for {table_name}")
+            else:
+                logger.warning(
+                    f"Could not load schema registry record "
+                    f"s3://{self.reporting_bucket}/{key}: {str(e)}"
+                )
+            return None
+
+    def covers(self, table_name: str, columns: Iterable[str], location: str) -> bool:
+        """
+        Check whether a table is known to have the columns and location.
+
+        Args:
+            table_name: Glue table name
+            columns: Column names of the schema to write
+            location: S3 location of the table
+
+        Returns:
+            True if the table was checked within the TTL and has all columns
+        """
+        entry = self._get(table_name)
+        return (
+            entry is not None
+            and time.time() - entry["checked_at"] <= self.ttl_seconds
+            and entry["location"] == location
+            and entry["columns"].issuperset(columns)
+        )
+
+    def register(self, table_name: str, columns: Iterable[str], location: str) -> None:
+        """
+        Record the columns and location a table has in Glue.
+
+        Args:
+            table_name: Glue table name
+            columns: Column names of the table
+            location: S3 location of the table
+        """
+        entry = {
+            "columns": frozenset(columns),
+            "location": location,
+            "checked_at": time.time(),
+        }
+        cache_key = (self.reporting_bucket, self.database_name, table_name)
+        with self._lock:
+            self._tables[cache_key] = entry
+        key = self._record_key(table_name)
+        try:
+            self.s3_client.put_object(
+                Bucket=self.reporting_bucket,
+                Key=key,
+                Body=json.dumps({**entry, "columns": sorted(entry["columns"])}),
+                ContentType="application/json",
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not save schema registry record "
+                f"s3://{self.reporting_bucket}/{key}: {str(e)}"
+            )
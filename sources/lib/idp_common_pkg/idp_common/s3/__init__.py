@@ -6,6 +6,7 @@ import json
 import logging
 import os
 from typing import Dict, Any, Optional, Union, List
+from .. import tracing
 from ..utils import parse_s3_uri
 
 logger = logging.getLogger(__name__)
@@ -25,6 +26,22 @@ def get_s3_client():
         _s3_client = boto3.client('s3')
     return _s3_client
 
+def _get_object_bytes(bucket: str, key: str) -> bytes:
+    """
+    Read an S3 object's content in a tracing span
+    
+    Args:
+        bucket: The S3 bucket
+        key: The S3 key
+        
+    Returns:
+        Content of the S3 object
+    """
+    with tracing.span('s3.get_object', bucket=bucket, key=key) as span:
+        body = get_s3_client().get_object(Bucket=bucket, Key=key)['Body'].read()
+        span.set_attribute('bytes', len(body))
+        return body
+
 def get_text_content(s3_uri: str) -> str:
     """
     Read text content from an S3 URI
@@ -37,9 +54,7 @@ def get_text_content(s3_uri: str) -> str:
     """
     try:
         bucket, key = parse_s3_uri(s3_uri)
-        s3 = get_s3_client()
-        response = s3.get_object(Bucket=bucket, Key=key)
-        content_str = response['Body'].read().decode('utf-8')
+        content_str = _get_object_bytes(bucket, key).decode('utf-8')
         
         # Check if the content is JSON or plain text
         if s3_uri.endswith('.json'):
@@ -68,9 +83,9 @@ def get_json_content(s3_uri: str) -> Dict[str, Any]:
     """
     try:
         bucket, key = parse_s3_uri(s3_uri)
-        s3 = get_s3_client()
-        response = s3.get_object(Bucket=bucket, Key=key)
-        return json.loads(response['Body'].read().decode('utf-8'))
+        content = _get_object_bytes(bucket, key)
+        with tracing.span('json.loads', bytes=len(content)):
+            return json.loads(content.decode('utf-8'))
     except Exception as e:
         logger.error(f"Error reading JSON from {s3_uri}: {e}")
         raise
@@ -87,9 +102,7 @@ def get_binary_content(s3_uri: str) -> bytes:
     """
     try:
         bucket, key = parse_s3_uri(s3_uri)
-        s3 = get_s3_client()
-        response = s3.get_object(Bucket=bucket, Key=key)
-        return response['Body'].read()
+        return _get_object_bytes(bucket, key)
     except Exception as e:
         logger.error(f"Error reading binary content from {s3_uri}: {e}")
         raise
@@ -111,7 +124,8 @@ def write_content(content: Union[str, bytes, Dict[str, Any], List[Any]],
         
         # Handle different content types
         if isinstance(content, (dict, list)):
-            body = json.dumps(content).encode('utf-8')
+            with tracing.span('json.dumps'):
+                body = json.dumps(content).encode('utf-8')
             if content_type is None:
                 content_type = 'application/json'
         elif isinstance(content, str):
@@ -128,12 +142,13 @@ def write_content(content: Union[str, bytes, Dict[str, Any], List[Any]],
         if content_type:
             extra_args['ContentType'] = content_type
             
-        s3.put_object(
-            Bucket=bucket,
-            Key=key,
-            Body=body,
-            **extra_args
-        )
+        with tracing.span('s3.put_object', bucket=bucket, key=key, bytes=len(body)):
+            s3.put_object(
+                Bucket=bucket,
+                Key=key,
+                Body=body,
+                **extra_args
+            )
         logger.info(f"Successfully wrote to s3://{bucket}/{key}")
     except Exception as e:
         logger.error(f"Error writing to s3://{bucket}/{key}: {e}")
@@ -8,6 +8,7 @@ This module provides functionality for summarizing documents using LLMs.
 """
 
 from idp_common.summarization.models import DocumentSummary
+from idp_common.summarization.page_index import PageIndex
 from idp_common.summarization.service import SummarizationService
 
-__all__ = ["SummarizationService", "DocumentSummary"]
+__all__ = ["SummarizationService", "DocumentSummary", "PageIndex"]
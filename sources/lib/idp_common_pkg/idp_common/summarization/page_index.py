@@ -0,0 +1,267 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Page-level BM25 retrieval index for chatting with a document.
+
+Chat sends the document text to the model with every question. For long
+documents most of those pages are irrelevant to the question and only add
+input tokens and latency. PageIndex keeps the text of each page together with
+BM25 term statistics, so the pages most relevant to a question can be selected
+without any model call or extra dependency. The index is JSON serializable and
+is stored next to summary/fulltext.txt, so it is built once per document.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    """
+    a an and are as at be by for from has have in is it its of on or that the
+    this to was were will with what which who whom when where why how do does
+    did can could would should i me my we our you your he she they them their
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase terms for indexing and querying.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms, without stopwords and single characters
+    """
+    return [
+        token
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def format_page(page_id: str, text: str) -> str:
+    """Format a page the way it appears in summary/fulltext.txt."""
+    return f"<page-number>{page_id}</page-number>\n{text}\n\n"
+
+
+def _page_sort_key(page_id: str) -> Tuple[int, Any]:
+    """Sort numeric page IDs numerically and any others after them."""
+    return (0, int(page_id)) if str(page_id).isdigit() else (1, str(page_id))
+
+
+class PageIndex:
+    """BM25 index over the pages of one document."""
+
+    def __init__(
+        self,
+        page_ids: List[str],
+        texts: List[str],
+        term_freqs: List[Dict[str, int]],
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+    ):
+        """
+        Initialize the index from per-page term frequencies.
+
+        Use from_pages or from_dict to create an index.
+
+        Args:
+            page_ids: Page IDs, in page order
+            texts: Text of each page
+            term_freqs: Term frequencies of each page
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+        """
+        self.page_ids = page_ids
+        self.texts = texts
+        self.term_freqs = term_freqs
+        self.k1 = k1
+        self.b = b
+        self.page_lengths = [sum(freqs.values()) for freqs in term_freqs]
+        self.avg_page_length = (
+            sum(self.page_lengths) / len(self.page_lengths) if term_freqs else 0.0
+        )
+        doc_freqs: Counter = Counter()
+        for freqs in term_freqs:
+            doc_freqs.update(freqs.keys())
+        self.doc_freqs = dict(doc_freqs)
+
+    @classmethod
+    def from_pages(
+        cls,
+        pages: Iterable[Tuple[str, str]],
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+    ) -> "PageIndex":
+        """
+        Build an index from page texts.
+
+        Args:
+            pages: (page ID, page text) pairs
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+
+        Returns:
+            PageIndex with pages in page order
+        """
+        ordered = sorted(pages, key=lambda page: _page_sort_key(page[0]))
+        page_ids = [str(page_id) for page_id, _ in ordered]
+        texts = [text for _, text in ordered]
+        term_freqs = [dict(Counter(tokenize(text))) for text in texts]
+        logger.info(f"Built page index for {len(page_ids)} pages")
+        return cls(page_ids, texts, term_freqs, k1=k1, b=b)
+
+    @property
+    def num_pages(self) -> int:
+        """Number of pages in the index."""
+        return len(self.page_ids)
+
+    @property
+    def num_chars(self) -> int:
+        """Total number of characters of page text."""
+        return sum(len(text) for text in self.texts)
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency of a term."""
+        n = self.doc_freqs.get(term, 0)
+        return math.log(1 + (self.num_pages - n + 0.5) / (n + 0.5))
+
+    def score(self, query: str) -> List[float]:
+        """
+        Score every page against a query.
+
+        Args:
+            query: Query text
+
+        Returns:
+            BM25 score of each page, in page order
+        """
+        scores = [0.0] * self.num_pages
+        for term in set(tokenize(query)):
+            if term not in self.doc_freqs:
+                continue
+            idf = self.idf(term)
+            for i, freqs in enumerate(self.term_freqs):
+                tf = freqs.get(term)
+                if not tf:
+                    continue
+                norm = (
+                    1
+                    - self.b
+                    + self.b * self.page_lengths[i] / (self.avg_page_length or 1)
+                )
+                scores[i] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return scores
+
+    def search(
+        self, query: str, top_k: int, max_chars: Optional[int] = None
+    ) -> List[str]:
+        """
+        Find the pages most relevant to a query.
+
+        Args:
+            query: Query text
+            top_k: Maximum number of pages to return
+            max_chars: Optional limit on the total text of the returned pages;
+                the best page is always returned
+
+        Returns:
+            Page IDs of the matching pages, in page order. Empty when no page
+            shares a term with the query.
+        """
+        scores = self.score(query)
+        ranked = sorted(
+            (i for i, score in enumerate(scores) if score > 0),
+            key=lambda i: (-scores[i], i),
+        )
+        selected = []
+        total_chars = 0
+        for i in ranked[:top_k]:
+            page_chars = len(self.texts[i])
+            if max_chars and selected and total_chars + page_chars > max_chars:
+                continue
+            selected.append(i)
+            total_chars += page_chars
+        return [self.page_ids[i] for i in sorted(selected)]
+
+    def leading_pages(self, max_chars: int) -> List[str]:
+        """
+        Find the first pages of the document that fit a text budget.
+
+        Args:
+            max_chars: Limit on the total text of the returned pages; the
+                first page is always returned
+
+        Returns:
+            Page IDs of the leading pages, in page order
+        """
+        selected = []
+        total_chars = 0
+        for page_id, text in zip(self.page_ids, self.texts):
+            if selected and total_chars + len(text) > max_chars:
+                break
+            selected.append(page_id)
+            total_chars += len(text)
+        return selected
+
+    def get_text(self, page_ids: Optional[List[str]] = None) -> str:
+        """
+        Get the text of pages in the summary/fulltext.txt format.
+
+        Args:
+            page_ids: Pages to include (defaults to all pages)
+
+        Returns:
+            Text of the pages, in page order
+        """
+        wanted = None if page_ids is None else set(page_ids)
+        return "".join(
+            format_page(page_id, text)
+            for page_id, text in zip(self.page_ids, self.texts)
+            if wanted is None or page_id in wanted
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the index to a JSON serializable dictionary."""
+        return {
+            "version": INDEX_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "pages": [
+                {"id": page_id, "text": text, "terms": freqs}
+                for page_id, text, freqs in zip(
+                    self.page_ids, self.texts, self.term_freqs
+                )
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PageIndex":
+        """
+        Create an index from a dictionary produced by to_dict.
+
+        Raises:
+            ValueError: If the dictionary was written by an unsupported version
+        """
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported page index version: {data.get('version')}")
+        pages = data.get("pages", [])
+        return cls(
+            [page["id"] for page in pages],
+            [page["text"] for page in pages],
+            [page["terms"] for page in pages],
+            k1=data.get("k1", DEFAULT_K1),
+            b=data.get("b", DEFAULT_B),
+        )
@@ -16,10 +16,12 @@ import copy
 import json
 import logging
 import os
+import threading
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
-from idp_common import bedrock, s3, utils
+from idp_common import bedrock, s3, tracing, utils
+from idp_common.chunking import TextChunk, TextChunker, TokenCounter
 from idp_common.models import Document, Status
 from idp_common.summarization.markdown_formatter import SummaryMarkdownFormatter
 from idp_common.summarization.models import DocumentSummarizationResult, DocumentSummary
@@ -27,6 +29,22 @@ from idp_common.utils import extract_json_from_text
 
 logger = logging.getLogger(__name__)
 
+# Default number of sections summarized concurrently (also used for page prefetch)
+DEFAULT_MAX_WORKERS = 20
+
+# Defaults for hierarchical (map-reduce) summarization of very large documents
+DEFAULT_HIERARCHICAL_THRESHOLD_TOKENS = 100000
+DEFAULT_HIERARCHICAL_CHUNK_TOKENS = 40000
+DEFAULT_HIERARCHICAL_FAN_OUT = 8
+DEFAULT_HIERARCHICAL_MAX_WORKERS = 10
+
+# Preamble added to the document text of reduce calls
+REDUCE_PREAMBLE = (
+    "The document is too long to include in full. Below are summaries of "
+    "consecutive parts of the document, in document order. Combine them into "
+    "a single summary of the whole document.\n\n"
+)
+
 
 class SummarizationService:
     """Service for summarizing documents using various backends."""
@@ -71,6 +89,15 @@ class SummarizationService:
         else:
             raise ValueError(f"Unsupported backend: {self.backend}")
 
+        self.token_counter = TokenCounter.from_config(
+            self.config.get("summarization", {}).get("token_counter")
+        )
+        # Map and reduce calls of all sections summarized concurrently share
+        # this limit, so large sections do not multiply the Bedrock calls
+        self._hierarchical_slots = threading.BoundedSemaphore(
+            self._get_hierarchical_config()["max_workers"]
+        )
+
     def _get_summarization_config(self) -> Dict[str, Any]:
         """
         Get and validate the summarization configuration.
@@ -108,6 +135,127 @@ class SummarizationService:
 
         return config
 
+    def _get_hierarchical_config(self) -> Dict[str, Any]:
+        """
+        Get the hierarchical (map-reduce) summarization configuration.
+
+        Returns:
+            Dict with hierarchical summarization parameters
+        """
+        from idp_common.utils import normalize_boolean_value
+
+        hierarchical_config = (
+            self.config.get("summarization", {}).get("hierarchical") or {}
+        )
+        chunk_tokens = int(
+            hierarchical_config.get("chunk_tokens", DEFAULT_HIERARCHICAL_CHUNK_TOKENS)
+        )
+        return {
+            "enabled": normalize_boolean_value(
+                hierarchical_config.get("enabled", True)
+            ),
+            "threshold_tokens": int(
+                hierarchical_config.get(
+                    "threshold_tokens", DEFAULT_HIERARCHICAL_THRESHOLD_TOKENS
+                )
+            ),
+            "chunk_tokens": chunk_tokens,
+            "overlap_tokens": int(hierarchical_config.get("overlap_tokens", 0)),
+            "fan_out": max(
+                2, int(hierarchical_config.get("fan_out", DEFAULT_HIERARCHICAL_FAN_OUT))
+            ),
+            "max_workers": max(
+                1,
+                int(
+                    hierarchical_config.get(
+                        "max_workers", DEFAULT_HIERARCHICAL_MAX_WORKERS
+                    )
+                ),
+            ),
+            "map_task_prompt": hierarchical_config.get("map_task_prompt"),
+            "reduce_task_prompt": hierarchical_config.get("reduce_task_prompt"),
+        }
+
+    def _get_max_workers(self) -> int:
+        """
+        Get the number of concurrent workers for section summarization.
+
+        Returns:
+            int: Configured summarization.max_workers (at least 1)
+        """
+        summarization_config = self.config.get("summarization", {})
+        return max(1, int(summarization_config.get("max_workers", DEFAULT_MAX_WORKERS)))
+
+    def _prefetch_page_texts(
+        self, document: Document, page_ids: Optional[List[str]] = None
+    ) -> Dict[str, str]:
+        """
+        Read the text of many pages from S3 concurrently.
+
+        Pages that cannot be read are left out of the result and logged, so
+        callers can fall back to reading them individually.
+
+        Args:
+            document: Document containing the pages
+            page_ids: Pages to read (defaults to all pages of the document)
+
+        Returns:
+            Dict mapping page ID to page text
+        """
+        if page_ids is None:
+            page_ids = list(document.pages.keys())
+
+        uris = {}
+        for page_id in page_ids:
+            page = document.pages.get(page_id)
+            if page and page.parsed_text_uri and page_id not in uris:
+                uris[page_id] = page.parsed_text_uri
+
+        if not uris:
+            return {}
+
+        page_texts = {}
+        max_workers = min(self._get_max_workers(), len(uris))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_page = {
+                executor.submit(tracing.wrap(s3.get_text_content), uri): page_id
+                for page_id, uri in uris.items()
+            }
+            for future in concurrent.futures.as_completed(future_to_page):
+                page_id = future_to_page[future]
+                try:
+                    page_texts[page_id] = future.result()
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to prefetch text content from {uris[page_id]}: {e}"
+                    )
+
+        logger.info(f"Prefetched text for {len(page_texts)}/{len(uris)} pages")
+        return page_texts
+
+    def _should_summarize_hierarchically(self, text: str) -> bool:
+        """
+        Check whether text is large enough to need map-reduce summarization.
+
+        Args:
+            text: Text to summarize
+
+        Returns:
+            True if hierarchical summarization is enabled and the text exceeds
+            the configured token threshold
+        """
+        hierarchical_config = self._get_hierarchical_config()
+        if not hierarchical_config["enabled"]:
+            return False
+        token_count = self.token_counter.count(text)
+        if token_count > hierarchical_config["threshold_tokens"]:
+            logger.info(
+                f"Text has ~{token_count} tokens, above the hierarchical threshold of "
+                f"{hierarchical_config['threshold_tokens']}; using map-reduce summarization"
+            )
+            return True
+        return False
+
     def _invoke_bedrock_model(
         self, content: List[Dict[str, Any]], config: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -147,12 +295,16 @@ class SummarizationService:
             metadata={"error": error_message},
         )
 
-    def process_text(self, text: str) -> DocumentSummary:
+    def process_text(
+        self, text: str, task_prompt_template: Optional[str] = None
+    ) -> DocumentSummary:
         """
         Summarize text content using the configured backend.
 
         Args:
             text: Text content to summarize
+            task_prompt_template: Optional task prompt overriding the configured one
+                (must contain {DOCUMENT_TEXT})
 
         Returns:
             DocumentSummary: Summary of the text content with flexible structure
@@ -166,7 +318,7 @@ class SummarizationService:
 
         # Use common function to prepare prompt with required placeholder validation
         task_prompt = bedrock.format_prompt(
-            config["task_prompt"],
+            task_prompt_template or config["task_prompt"],
             {"DOCUMENT_TEXT": text},
             required_placeholders=["DOCUMENT_TEXT"],
         )
@@ -183,6 +335,9 @@ class SummarizationService:
 
             response = response_with_metering["response"]
             metering = response_with_metering["metering"]
+            self.token_counter.record_usage(
+                config["system_prompt"] + task_prompt, response.get("usage")
+            )
 
             # Extract summarization result
             summary_text = response["output"]["message"]["content"][0].get("text", "")
@@ -225,8 +380,222 @@ class SummarizationService:
             logger.error(f"Error summarizing text: {str(e)}")
             raise
 
+    @staticmethod
+    def _describe_pages(page_ids: List[str]) -> str:
+        """Describe an ordered list of page ids as a page range for reduce prompts."""
+        if not page_ids:
+            return ""
+        if page_ids[0] == page_ids[-1]:
+            return f"page {page_ids[0]}"
+        return f"pages {page_ids[0]}-{page_ids[-1]}"
+
+    def _process_text_hierarchical(
+        self, text: str, task_prompt_template: Optional[str]
+    ) -> DocumentSummary:
+        """Run a map or reduce call within the shared hierarchical call limit."""
+        with self._hierarchical_slots:
+            return self.process_text(text, task_prompt_template)
+
+    def _map_chunks(
+        self, chunks: List[TextChunk], hierarchical_config: Dict[str, Any]
+    ) -> List[DocumentSummary]:
+        """
+        Summarize text chunks concurrently (the map step).
+
+        Args:
+            chunks: Text chunks to summarize
+            hierarchical_config: Hierarchical summarization configuration
+
+        Returns:
+            List of summaries in chunk order
+        """
+        logger.info(
+            f"Summarizing {len(chunks)} chunks with "
+            f"{hierarchical_config['max_workers']} workers"
+        )
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=hierarchical_config["max_workers"]
+        ) as executor:
+            return list(
+                executor.map(
+                    lambda chunk: self._process_text_hierarchical(
+                        chunk.text, hierarchical_config["map_task_prompt"]
+                    ),
+                    chunks,
+                )
+            )
+
+    def _render_partial_summaries(
+        self, partials: List[Tuple[List[str], DocumentSummary]]
+    ) -> str:
+        """Render partial summaries as document text for a reduce call."""
+        parts = []
+        for index, (page_ids, summary) in enumerate(partials, start=1):
+            pages = self._describe_pages(page_ids)
+            pages_attribute = f' pages="{pages}"' if pages else ""
+            parts.append(
+                f'<part index="{index}"{pages_attribute}>\n'
+                f"{json.dumps(summary.content, default=str)}\n"
+                "</part>"
+            )
+        return REDUCE_PREAMBLE + "\n\n".join(parts)
+
+    def _reduce_summaries(
+        self,
+        partials: List[Tuple[List[str], DocumentSummary]],
+        hierarchical_config: Dict[str, Any],
+    ) -> Tuple[DocumentSummary, int]:
+        """
+        Combine partial summaries into a single summary (the reduce step).
+
+        Partial summaries are grouped by fan-out and token budget and each group
+        is reduced concurrently, level by level, until one summary remains.
+
+        Args:
+            partials: (page ids, summary) tuples in document order
+            hierarchical_config: Hierarchical summarization configuration
+
+        Returns:
+            Tuple of the final summary and the number of reduce levels used
+        """
+        fan_out = hierarchical_config["fan_out"]
+        budget = hierarchical_config["chunk_tokens"]
+        level = 0
+
+        while len(partials) > 1:
+            # Group consecutive partials within the fan-out and token budget
+            groups: List[List[Tuple[List[str], DocumentSummary]]] = []
+            group_tokens = 0
+            for partial in partials:
+                partial_tokens = self.token_counter.count(
+                    json.dumps(partial[1].content, default=str)
+                )
+                if (
+                    groups
+                    and len(groups[-1]) < fan_out
+                    and (len(groups[-1]) < 2 or group_tokens + partial_tokens <= budget)
+                ):
+                    groups[-1].append(partial)
+                    group_tokens += partial_tokens
+                else:
+                    groups.append([partial])
+                    group_tokens = partial_tokens
+
+            level += 1
+            logger.info(
+                f"Reduce level {level}: combining {len(partials)} summaries in "
+                f"{len(groups)} groups"
+            )
+
+            def reduce_group(group):
+                if len(group) == 1:
+                    return group[0]
+                page_ids = [page_id for ids, _ in group for page_id in ids]
+                summary = self._process_text_hierarchical(
+                    self._render_partial_summaries(group),
+                    hierarchical_config["reduce_task_prompt"],
+                )
+                # Carry metering from the partial summaries up the tree
+                metering = summary.metadata.get("metering", {})
+                for _, partial_summary in group:
+                    metering = utils.merge_metering_data(
+                        metering, partial_summary.metadata.get("metering", {})
+                    )
+                summary.metadata["metering"] = metering
+                return page_ids[:1] + page_ids[-1:], summary
+
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=hierarchical_config["max_workers"]
+            ) as executor:
+                partials = list(executor.map(reduce_group, groups))
+
+        return partials[0][1], level
+
+    def _summarize_hierarchically(self, chunks: List[TextChunk]) -> DocumentSummary:
+        """
+        Summarize chunks with map-reduce.
+
+        Args:
+            chunks: Text chunks in document order
+
+        Returns:
+            DocumentSummary for the whole text
+        """
+        if not chunks:
+            return self._create_error_summary("No text content to summarize")
+
+        hierarchical_config = self._get_hierarchical_config()
+        mapped = self._map_chunks(chunks, hierarchical_config)
+        ordered = [(chunk.page_ids, summary) for chunk, summary in zip(chunks, mapped)]
+
+        summary, levels = self._reduce_summaries(ordered, hierarchical_config)
+        summary.metadata["hierarchical"] = {
+            "chunks": len(chunks),
+            "reduce_levels": levels,
+        }
+        return summary
+
+    def _chunk_for_hierarchical(self, pages) -> List[TextChunk]:
+        """Chunk page texts using the hierarchical chunk size."""
+        hierarchical_config = self._get_hierarchical_config()
+        chunker = TextChunker(
+            max_tokens=hierarchical_config["chunk_tokens"],
+            overlap_tokens=hierarchical_config["overlap_tokens"],
+            token_counter=self.token_counter,
+        )
+        return list(chunker.iter_chunks(pages))
+
+    def summarize_text_hierarchically(self, text: str) -> DocumentSummary:
+        """
+        Summarize a large text by summarizing page windows concurrently and reducing.
+
+        Args:
+            text: Text to summarize, optionally with <page-number> markers
+
+        Returns:
+            DocumentSummary: Summary of the whole text
+        """
+        if not text:
+            logger.warning("Empty text provided for summarization")
+            return self._create_error_summary("Empty text provided")
+        return self._summarize_hierarchically(
+            self._chunk_for_hierarchical(TextChunker.split_pages(text))
+        )
+
+    def summarize_document_hierarchically(
+        self, document: Document, all_text: Optional[str] = None
+    ) -> DocumentSummary:
+        """
+        Summarize a large document with map-reduce.
+
+        The pages are summarized in windows of chunk_tokens concurrently, then
+        the partial summaries are reduced with the configured fan-out.
+
+        Args:
+            document: Document to summarize
+            all_text: Optional pre-loaded document text with <page-number> markers
+
+        Returns:
+            DocumentSummary: Summary of the whole document
+        """
+        if all_text is not None:
+            pages = TextChunker.split_pages(all_text)
+        else:
+            pages = (
+                (page_id, s3.get_text_content(page.parsed_text_uri))
+                for page_id, page in sorted(
+                    document.pages.items(), key=lambda item: int(item[0])
+                )
+                if page.parsed_text_uri
+            )
+
+        return self._summarize_hierarchically(self._chunk_for_hierarchical(pages))
+
     def process_document_section(
-        self, document: Document, section_id: str
+        self,
+        document: Document,
+        section_id: str,
+        page_texts: Optional[Dict[str, str]] = None,
     ) -> Tuple[Document, Dict[str, Any]]:
         """
         Summarize a specific section of a document and update the Document object with the summary.
@@ -234,19 +603,46 @@ class SummarizationService:
         Args:
             document: Document object containing the section to summarize
             section_id: ID of the section to summarize
+            page_texts: Optional pre-loaded page texts keyed by page ID. Pages not
+                included are read from S3 concurrently.
 
         Returns:
             Tuple[Document, Dict[str, Any]]: Updated Document object with section summary and section-specific metering data
         """
+        document, section_metering, _ = self._summarize_section(
+            document, section_id, page_texts
+        )
+        return document, section_metering
+
+    @tracing.traced("summarization.section")
+    def _summarize_section(
+        self,
+        document: Document,
+        section_id: str,
+        page_texts: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Document, Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Summarize a section and return its summary content alongside the document.
+
+        Args:
+            document: Document object containing the section to summarize
+            section_id: ID of the section to summarize
+            page_texts: Optional pre-loaded page texts keyed by page ID
+
+        Returns:
+            Tuple of updated Document, section-specific metering data and the
+            section summary content (None if the section was not summarized)
+        """
         # Validate input document
         if not document:
             logger.error("No document provided")
-            return document, {}
+            return document, {}, None
 
+        tracing.annotate(section_id=section_id)
         if not document.sections:
             logger.error("Document has no sections to process")
             document.errors.append("Document has no sections to process")
-            return document, {}
+            return document, {}, None
 
         # Find the section with the given ID
         section = None
@@ -259,7 +655,7 @@ class SummarizationService:
             error_msg = f"Section {section_id} not found in document"
             logger.error(error_msg)
             document.errors.append(error_msg)
-            return document, {}
+            return document, {}, None
 
         # Extract information about the section
         class_label = section.classification
@@ -275,7 +671,7 @@ class SummarizationService:
             error_msg = f"Section {section_id} has no page IDs"
             logger.error(error_msg)
             document.errors.append(error_msg)
-            return document, {}
+            return document, {}, None
 
         # Sort pages by page number
         sorted_page_ids = sorted(section.page_ids, key=int)
@@ -290,7 +686,17 @@ class SummarizationService:
             # Start timing
             # start_time = time.time()
 
-            # Read document text from all pages in order
+            # Read page texts that were not prefetched concurrently
+            page_texts = dict(page_texts or {})
+            missing_page_ids = [
+                page_id
+                for page_id in sorted_page_ids
+                if page_id in document.pages and page_id not in page_texts
+            ]
+            if missing_page_ids:
+                page_texts.update(self._prefetch_page_texts(document, missing_page_ids))
+
+            # Combine document text from all pages in order
             all_text = ""
             for page_id in sorted_page_ids:
                 if page_id not in document.pages:
@@ -299,9 +705,12 @@ class SummarizationService:
                     document.errors.append(error_msg)
                     continue
 
-                page = document.pages[page_id]
-                text_path = page.parsed_text_uri
-                page_text = s3.get_text_content(text_path)
+                page_text = page_texts.get(page_id)
+                if page_text is None:
+                    # Prefetch failed, read directly so the error is reported
+                    page_text = s3.get_text_content(
+                        document.pages[page_id].parsed_text_uri
+                    )
                 all_text += f"<page-number>{page_id}</page-number>\n{page_text}\n\n"
 
             if not all_text:
@@ -311,10 +720,13 @@ class SummarizationService:
                     success=False,
                     error_message=f"No text content found in section {section_id}",
                 )
-                return document, {}
+                return document, {}, None
 
-            # Generate summary
-            summary = self.process_text(all_text)
+            # Generate summary, using map-reduce for very large sections
+            if self._should_summarize_hierarchically(all_text):
+                summary = self.summarize_text_hierarchically(all_text)
+            else:
+                summary = self.process_text(all_text)
 
             # TODO: Uncomment this when needed
             # Calculate execution time
@@ -336,8 +748,9 @@ class SummarizationService:
             )
 
             # Generate and store markdown report using our custom formatter
-            # Create a single-section document for the formatter
-            single_section = {section_id: summary.content}
+            # Create a single-section document for the formatter. The formatter
+            # edits content in place, so give it a copy of the summary.
+            single_section = {section_id: copy.deepcopy(summary.content)}
             formatter = SummaryMarkdownFormatter(
                 document, single_section, is_section=True, include_toc=True
             )
@@ -371,18 +784,45 @@ class SummarizationService:
             error_msg = f"Error summarizing section {section_id}: {str(e)}"
             logger.error(error_msg)
             document.errors.append(error_msg)
-            return document, {}
+            return document, {}, None
 
-        return document, section_metering
+        return document, section_metering, summary.content
+
+    @staticmethod
+    def _copy_document_for_section(document: Document) -> Document:
+        """
+        Create a lightweight per-thread copy of a document for section processing.
+
+        Sections, errors, status and metering are private to the copy; pages are
+        shared read-only so large documents are not deep-copied once per section.
 
+        Args:
+            document: Document to copy
+
+        Returns:
+            Document: Shallow copy safe to pass to _summarize_section
+        """
+        thread_document = copy.copy(document)
+        thread_document.sections = [copy.copy(section) for section in document.sections]
+        for section in thread_document.sections:
+            if section.attributes is not None:
+                section.attributes = dict(section.attributes)
+        thread_document.errors = []
+        # Reset metering data in the copy to avoid double-counting
+        thread_document.metering = {}
+        return thread_document
+
+    @tracing.traced("summarization.document")
     def process_document(
         self, document: Document, store_results: bool = True
     ) -> Document:
         """
         Summarize a document and update the Document object with the summary.
 
-        This method processes each section in parallel using ThreadPoolExecutor with 20 workers
-        and then combines the results into a single document summary.
+        Page texts for all sections are prefetched concurrently, then sections are
+        summarized in parallel using a ThreadPoolExecutor (summarization.max_workers,
+        default 20). Section summaries are combined in section order into a single
+        document summary and markdown report without re-reading them from S3.
 
         If no sections are defined, falls back to summarizing the entire document at once.
 
@@ -393,6 +833,7 @@ class SummarizationService:
         Returns:
             Document: Updated Document object with summary and summarization_result
         """
+        tracing.annotate(document_id=document.id)
         # Check if summarization is enabled in configuration
         summarization_config = self.config.get("summarization", {})
         from idp_common.utils import normalize_boolean_value
@@ -429,124 +870,50 @@ class SummarizationService:
             combined_metadata = {"section_summaries": {}}
             section_markdowns = {}  # Use dictionary instead of list for section markdowns
 
-            # Create a thread pool with 20 workers for parallel processing
-            max_workers = 20
+            max_workers = self._get_max_workers()
+
+            # Read the text of every page used by a section in one concurrent pass
+            section_page_ids = list(
+                dict.fromkeys(
+                    page_id
+                    for section in document.sections
+                    for page_id in (section.page_ids or [])
+                )
+            )
+            page_texts = self._prefetch_page_texts(document, section_page_ids)
+
             logger.info(
-                f"Processing document sections in parallel with {max_workers} workers"
+                f"Processing {len(document.sections)} document sections in parallel "
+                f"with {max_workers} workers"
             )
 
-            # Initialize a dictionary to collect all section-specific metering data
-            all_section_metering = {}
+            # Results are stored by position so they can be merged in section order
+            section_results: List[
+                Optional[Tuple[Document, Dict[str, Any], Optional[Dict[str, Any]]]]
+            ] = [None] * len(document.sections)
 
             # Process sections in parallel using ThreadPoolExecutor
             with concurrent.futures.ThreadPoolExecutor(
                 max_workers=max_workers
             ) as executor:
-                # Create a dictionary to track futures
-                future_to_section = {}
-
-                # Submit all section processing tasks to the executor
-                for section in document.sections:
+                future_to_index = {}
+                for index, section in enumerate(document.sections):
                     logger.info(
                         f"Submitting section {section.section_id} with classification {section.classification} for processing"
                     )
-                    # Create a deep copy of the document for thread safety, excluding metering data
-                    thread_document = copy.deepcopy(document)
-                    # Reset metering data in the copy to avoid double-counting
-                    thread_document.metering = {}
-
                     future = executor.submit(
-                        self.process_document_section,
-                        thread_document,
+                        tracing.wrap(self._summarize_section),
+                        self._copy_document_for_section(document),
                         section.section_id,
+                        page_texts,
                     )
-                    future_to_section[future] = section
+                    future_to_index[future] = index
 
-                # Process results as they complete
-                for future in concurrent.futures.as_completed(future_to_section):
-                    section = future_to_section[future]
+                for future in concurrent.futures.as_completed(future_to_index):
+                    index = future_to_index[future]
+                    section = document.sections[index]
                     try:
-                        # Get the result (updated document with processed section and section-specific metering)
-                        updated_document, section_metering = future.result()
-
-                        # Store section-specific metering data
-                        if section_metering:
-                            section_key = f"section_{section.section_id}"
-                            all_section_metering[section_key] = section_metering
-
-                        # Find the processed section in the updated document
-                        processed_section = None
-                        for s in updated_document.sections:
-                            if s.section_id == section.section_id:
-                                processed_section = s
-                                break
-
-                        if (
-                            processed_section
-                            and processed_section.attributes
-                            and "summary_uri" in processed_section.attributes
-                        ):
-                            # Get the section summary from S3
-                            summary_uri = processed_section.attributes["summary_uri"]
-                            summary_md_uri = processed_section.attributes.get(
-                                "summary_md_uri"
-                            )
-
-                            # Update the original document's section with the processed section's attributes
-                            for s in document.sections:
-                                if s.section_id == section.section_id:
-                                    s.attributes = processed_section.attributes
-                                    break
-
-                            # Merge any errors from the processed document
-                            for error in updated_document.errors:
-                                if error not in document.errors:
-                                    document.errors.append(error)
-
-                            # Load the summary content
-                            try:
-                                summary_content = s3.get_json_content(summary_uri)
-
-                                # Add to combined content under a unique key that includes section ID
-                                section_key = (
-                                    f"{section.classification}_{section.section_id}"
-                                    if section.classification
-                                    else f"section_{section.section_id}"
-                                )
-                                combined_content[section_key] = summary_content
-
-                                # Store section summary reference in metadata
-                                combined_metadata["section_summaries"][section_key] = {
-                                    "section_id": section.section_id,
-                                    "classification": section.classification,
-                                    "summary_uri": summary_uri,
-                                    "summary_md_uri": summary_md_uri,
-                                }
-
-                                # Get markdown content for combined markdown report
-                                if summary_md_uri:
-                                    try:
-                                        # Generate clean markdown directly from the summary content
-                                        section_title = (
-                                            section.classification
-                                            or f"Section {section.section_id}"
-                                        )
-                                        # Store section content with metadata
-                                        section_markdowns[section.section_id] = {
-                                            "content": summary_content,
-                                            "title": section_title,
-                                        }
-                                    except Exception as e:
-                                        logger.warning(
-                                            f"Failed to generate markdown for section {section.section_id}: {e}"
-                                        )
-                            except Exception as e:
-                                logger.warning(
-                                    f"Failed to load section summary from {summary_uri}: {e}"
-                                )
-                                document.errors.append(
-                                    f"Failed to load section summary: {str(e)}"
-                                )
+                        section_results[index] = future.result()
                     except Exception as e:
                         error_msg = (
                             f"Error processing section {section.section_id}: {str(e)}"
@@ -554,14 +921,69 @@ class SummarizationService:
                         logger.error(error_msg)
                         document.errors.append(error_msg)
 
-            # Calculate execution time
-            execution_time = time.time() - start_time
+            # Merge results in section order
+            for section, result in zip(document.sections, section_results):
+                if result is None:
+                    continue
+                updated_document, section_metering, summary_content = result
 
-            # Merge all section-specific metering data into the document's metering data
-            for section_metering in all_section_metering.values():
-                document.metering = utils.merge_metering_data(
-                    document.metering, section_metering
+                # Merge any errors from the processed document
+                for error in updated_document.errors:
+                    if error not in document.errors:
+                        document.errors.append(error)
+
+                if section_metering:
+                    document.metering = utils.merge_metering_data(
+                        document.metering, section_metering
+                    )
+
+                processed_section = next(
+                    (
+                        s
+                        for s in updated_document.sections
+                        if s.section_id == section.section_id
+                    ),
+                    None,
+                )
+                if (
+                    summary_content is None
+                    or not processed_section
+                    or not processed_section.attributes
+                    or "summary_uri" not in processed_section.attributes
+                ):
+                    continue
+
+                # Update the original document's section with the processed section's attributes
+                section.attributes = processed_section.attributes
+                summary_uri = section.attributes["summary_uri"]
+                summary_md_uri = section.attributes.get("summary_md_uri")
+
+                # Add to combined content under a unique key that includes section ID
+                section_key = (
+                    f"{section.classification}_{section.section_id}"
+                    if section.classification
+                    else f"section_{section.section_id}"
                 )
+                combined_content[section_key] = summary_content
+
+                # Store section summary reference in metadata
+                combined_metadata["section_summaries"][section_key] = {
+                    "section_id": section.section_id,
+                    "classification": section.classification,
+                    "summary_uri": summary_uri,
+                    "summary_md_uri": summary_md_uri,
+                }
+
+                # Store section content with metadata for the combined markdown report
+                if summary_md_uri:
+                    section_markdowns[section.section_id] = {
+                        "content": copy.deepcopy(summary_content),
+                        "title": section.classification
+                        or f"Section {section.section_id}",
+                    }
+
+            # Calculate execution time
+            execution_time = time.time() - start_time
 
             # Create a combined summary from all section summaries
             summary = DocumentSummary(
@@ -589,8 +1011,8 @@ class SummarizationService:
                     content_type="application/json",
                 )
 
-                # Store the full text for chat
-                all_text = self._get_all_text(document)
+                # Store the full text for chat, reusing the prefetched page texts
+                all_text = self._get_all_text(document, page_texts)
                 fulltext_key = f"{document.input_key}/summary/fulltext.txt"
                 s3.write_content(
                     content=all_text,
@@ -663,19 +1085,29 @@ class SummarizationService:
 
         return document
 
-    def _get_all_text(self, document: Document) -> str:
+    def _get_all_text(
+        self, document: Document, page_texts: Optional[Dict[str, str]] = None
+    ) -> str:
         """
         Retrieve all text content from a document's pages.
 
         Args:
             document: Document object to process
+            page_texts: Optional pre-loaded page texts keyed by page ID
 
         Returns:
             str: Combined text content from all pages
         """
+        page_texts = page_texts or {}
         all_text = ""
-        for page_id, page in sorted(document.pages.items()):
-            if page.parsed_text_uri:
+        for page_id, page in sorted(
+            document.pages.items(), key=lambda item: int(item[0])
+        ):
+            if page_id in page_texts:
+                all_text += (
+                    f"<page-number>{page_id}</page-number>\n{page_texts[page_id]}\n\n"
+                )
+            elif page.parsed_text_uri:
                 try:
                     page_text = s3.get_text_content(page.parsed_text_uri)
                     all_text += f"<page-number>{page_id}</page-number>\n{page_text}\n\n"
@@ -717,8 +1149,11 @@ class SummarizationService:
                     error_message="No text content found in document pages",
                 )
 
-            # Generate summary
-            summary = self.process_text(all_text)
+            # Generate summary, using map-reduce for very large documents
+            if self._should_summarize_hierarchically(all_text):
+                summary = self.summarize_document_hierarchically(document, all_text)
+            else:
+                summary = self.process_text(all_text)
 
             # Calculate execution time
             execution_time = time.time() - start_time
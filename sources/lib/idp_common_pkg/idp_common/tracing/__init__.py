@@ -0,0 +1,383 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Lightweight tracing spans for the hot paths of the idp_common services.
+
+A span times one step of processing (an S3 read, an image resize, a prompt
+build, a model call, a retry sleep, a JSON parse) and carries the document,
+section and page ids of the work it belongs to. Spans nest: a span started
+inside another becomes its child and inherits its trace and ids, so the time
+of a Lambda invocation can be broken down per document, section and page.
+
+    from idp_common import tracing
+
+    with tracing.span("s3.get_object", key=key) as span:
+        body = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+        span.set_attribute("bytes", len(body))
+
+    @tracing.traced("ocr.page")
+    def process_page(page_id):
+        tracing.annotate(page_id=page_id)
+        ...
+
+The current span is tracked per thread (with contextvars), so work submitted
+to a thread pool must be wrapped with wrap() to stay in the caller's trace:
+
+    executor.submit(tracing.wrap(process_page), page_id)
+
+Tracing is disabled by default. span() then returns a shared no-op span and
+traced() and wrap() return their function's result directly, so instrumented
+code costs one global check per call. Finished spans are exported according to
+the TRACING_MODE environment variable:
+
+    off: Spans are not recorded (default)
+    log: One JSON log record per span on the idp_common.tracing logger
+    emf: One CloudWatch Embedded Metric Format line per span on stdout, with a
+        SpanDuration metric per span name in the METRIC_NAMESPACE namespace
+        and the span's ids and attributes as searchable properties
+
+collect() records the spans finished in a block in memory, whatever the mode,
+for benchmarks and reports.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "log", "emf")
+
+# Attributes children inherit from their parent span
+CORRELATION_ATTRIBUTES = ("document_id", "section_id", "page_id")
+
+_mode = "off"
+_enabled = False
+_collectors: List[List["Span"]] = []
+_collectors_lock = threading.Lock()
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "idp_common_tracing_span", default=None
+)
+
+
+def _new_id() -> str:
+    return os.urandom(8).hex()
+
+
+class Span:
+    """A timed, named step of processing with attributes."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "start_time",
+        "duration_ms",
+        "error",
+        "thread",
+        "_start",
+        "_token",
+    )
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the span. The span is started by entering it.
+
+        Args:
+            name: Name of the step, e.g. "s3.get_object"
+            attributes: Optional attributes, e.g. document_id or key
+        """
+        self.name = name
+        self.attributes = attributes or {}
+        self.trace_id: Optional[str] = None
+        self.span_id: Optional[str] = None
+        self.parent_id: Optional[str] = None
+        self.start_time: Optional[float] = None
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        self.thread: Optional[str] = None
+        self._start = 0.0
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute of the span."""
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        """Set several attributes of the span."""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        if parent is not None:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            for key in CORRELATION_ATTRIBUTES:
+                if key in parent.attributes and key not in self.attributes:
+                    self.attributes[key] = parent.attributes[key]
+        else:
+            self.trace_id = _new_id()
+        self.span_id = _new_id()
+        self.thread = threading.current_thread().name
+        self._token = _current_span.set(self)
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        if exc_type is not None:
+            self.error = _error_name(exc_type, exc_value)
+        _current_span.reset(self._token)
+        self._token = None
+        _finish(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the span as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary with the span's name, ids, timing, error and attributes
+        """
+        record = {
+            "span": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms or 0.0, 3),
+            "thread": self.thread,
+        }
+        if self.error:
+            record["error"] = self.error
+        record.update(self.attributes)
+        return record
+
+
+def _error_name(exc_type, exc_value) -> str:
+    """Name an exception, using the error code of AWS client errors."""
+    response = getattr(exc_value, "response", None)
+    if isinstance(response, dict):
+        code = response.get("Error", {}).get("Code")
+        if code:
+            return code
+    return exc_type.__name__
+
+
+class _NoopSpan:
+    """Span returned while tracing is disabled; every operation does nothing."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _update_enabled() -> None:
+    global _enabled
+    _enabled = _mode != "off" or bool(_collectors)
+
+
+def configure(mode: Optional[str] = None) -> str:
+    """
+    Set the export mode.
+
+    Args:
+        mode: 'off', 'log' or 'emf'. Defaults to the TRACING_MODE environment
+            variable, or 'off'.
+
+    Returns:
+        The mode in effect
+    """
+    global _mode
+    if mode is None:
+        mode = os.environ.get("TRACING_MODE", "off")
+    mode = mode.lower()
+    if mode not in MODES:
+        logger.warning(f"Unknown TRACING_MODE '{mode}', using 'off'")
+        mode = "off"
+    _mode = mode
+    _update_enabled()
+    return _mode
+
+
+def is_enabled() -> bool:
+    """Whether spans are currently recorded."""
+    return _enabled
+
+
+def span(name: str, **attributes: Any):
+    """
+    Create a span to use as a context manager.
+
+    Args:
+        name: Name of the step, e.g. "bedrock.converse"
+        **attributes: Attributes of the span, e.g. document_id or model_id
+
+    Returns:
+        A Span, or the no-op span while tracing is disabled
+    """
+    if not _enabled:
+        return NOOP_SPAN
+    return Span(name, attributes)
+
+
+def current_span():
+    """
+    Get the innermost active span of the calling thread.
+
+    Returns:
+        The current Span, or the no-op span if there is none
+    """
+    if not _enabled:
+        return NOOP_SPAN
+    return _current_span.get() or NOOP_SPAN
+
+
+def annotate(**attributes: Any) -> None:
+    """
+    Set attributes on the current span.
+
+    Correlation ids set this way (document_id, section_id, page_id) are
+    inherited by spans started afterwards inside the current span.
+
+    Args:
+        **attributes: Attributes to set
+    """
+    if not _enabled:
+        return
+    current = _current_span.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """
+    Decorator that runs each call of a function in a span.
+
+    Args:
+        name: Span name (default: the function's qualified name)
+        **attributes: Attributes of every span
+
+    Returns:
+        Decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(span_name, dict(attributes)):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def wrap(func: Callable) -> Callable:
+    """
+    Bind a function to the caller's current span, for use in another thread.
+
+    Args:
+        func: Function to run in a worker thread
+
+    Returns:
+        Function that runs func as if called from the current span, or func
+        itself while tracing is disabled
+    """
+    if not _enabled:
+        return func
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # A context can only be entered by one thread at a time
+        return context.copy().run(func, *args, **kwargs)
+
+    return wrapper
+
+
+@contextlib.contextmanager
+def collect() -> Iterator[List[Span]]:
+    """
+    Record all spans finished in any thread while the block runs.
+
+    Tracing is enabled inside the block even if TRACING_MODE is 'off'.
+
+    Yields:
+        List that receives the finished spans in the order they finish
+    """
+    spans: List[Span] = []
+    with _collectors_lock:
+        _collectors.append(spans)
+        _update_enabled()
+    try:
+        yield spans
+    finally:
+        with _collectors_lock:
+            _collectors.remove(spans)
+            _update_enabled()
+
+
+def _finish(finished: Span) -> None:
+    """Export a finished span and hand it to the active collectors."""
+    for spans in list(_collectors):
+        spans.append(finished)
+    try:
+        if _mode == "log":
+            logger.info(json.dumps(finished.to_dict(), default=str))
+        elif _mode == "emf":
+            print(json.dumps(_to_emf(finished), default=str), flush=True)
+    except Exception as e:
+        logger.debug(f"Error exporting span {finished.name}: {e}")
+
+
+def _to_emf(finished: Span) -> Dict[str, Any]:
+    """Build the EMF document of a span."""
+    record = finished.to_dict()
+    duration_ms = record.pop("duration_ms")
+    document = {
+        "_aws": {
+            "Timestamp": int(finished.start_time * 1000),
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": os.environ.get("METRIC_NAMESPACE", "GENAIDP"),
+                    "Dimensions": [["Span"]],
+                    "Metrics": [{"Name": "SpanDuration", "Unit": "Milliseconds"}],
+                }
+            ],
+        },
+        "Span": record.pop("span"),
+        "SpanDuration": duration_ms,
+    }
+    document.update(record)
+    return document
+
+
+configure()
@@ -12,6 +12,8 @@ try:
 except ImportError:
     yaml = None
 
+from idp_common import tracing
+
 # Import Lambda metering utility
 from .lambda_metering import calculate_lambda_metering
 
@@ -112,6 +114,7 @@ def merge_metering_data(existing_metering: Dict[str, Any],
             
     return merged
 
+@tracing.traced('json.parse')
 def extract_json_from_text(text: str) -> str:
     """
     Extract JSON string from LLM response text with improved multi-line handling.
@@ -274,6 +277,7 @@ def normalize_boolean_value(value: Any) -> bool:
         return bool(value)
 
 
+@tracing.traced('yaml.parse')
 def extract_yaml_from_text(text: str) -> str:
     """
     Extract YAML string from LLM response text with robust multi-strategy handling.
@@ -0,0 +1,354 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Process-level cache for few-shot example prompt content.
+
+Few-shot examples (example prompts and their images) are static for a given
+configuration, but classification and extraction used to resolve and download
+every example image on each page or section they processed. This module builds
+the Bedrock content blocks for a set of examples once per container: images are
+loaded concurrently, resized to the configured dimensions and stored alongside
+the text blocks in a memory-bounded LRU cache keyed by a hash of the examples
+configuration.
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Maximum memory used by cached few-shot content (images plus text), in MB.
+# Set FEW_SHOT_CACHE_MAX_MB=0 to disable caching.
+DEFAULT_MAX_CACHE_MB = 64
+
+# Maximum number of example images loaded concurrently
+DEFAULT_MAX_WORKERS = 8
+
+
+def config_version(*parts: Any) -> str:
+    """
+    Compute a stable version hash for the configuration that defines examples.
+
+    Args:
+        *parts: JSON-serializable configuration values (e.g. the examples list and
+            image settings)
+
+    Returns:
+        Hex digest that changes whenever any of the parts change
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _content_size(content: List[Dict[str, Any]]) -> int:
+    """Approximate memory used by a list of Bedrock content blocks, in bytes."""
+    size = 0
+    for item in content:
+        if "text" in item:
+            size += len(item["text"])
+        elif "image" in item:
+            size += len(item["image"]["source"]["bytes"])
+    return size
+
+
+class FewShotContentCache:
+    """Thread-safe LRU cache of few-shot content bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total size of cached content. 0 disables caching.
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[List[Dict[str, Any]], int]]" = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    @property
+    def size(self) -> int:
+        """Total size of cached content in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached content and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Copy of the cached content list, or None if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return list(entry[0])
+
+    def put(self, key: str, content: List[Dict[str, Any]]) -> bool:
+        """
+        Store content, evicting least recently used entries to stay within budget.
+
+        Args:
+            key: Cache key
+            content: Content blocks to cache
+
+        Returns:
+            True if the content was cached
+        """
+        size = _content_size(content)
+        if size > self.max_bytes:
+            if self.max_bytes > 0:
+                logger.info(
+                    f"Few-shot content ({size} bytes) exceeds cache budget "
+                    f"({self.max_bytes} bytes), not caching"
+                )
+            return False
+
+        with self._lock:
+            existing = self._entries.pop(key, None)
+            if existing is not None:
+                self._size -= existing[1]
+            while self._entries and self._size + size > self.max_bytes:
+                evicted_key, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                logger.info(f"Evicted few-shot content {evicted_key[:12]} from cache")
+            self._entries[key] = (list(content), size)
+            self._size += size
+        return True
+
+    def get_or_build(
+        self, key: str, builder: Callable[[], Tuple[List[Dict[str, Any]], bool]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Return cached content, building it at most once concurrently per key.
+
+        Args:
+            key: Cache key
+            builder: Callable returning (content, complete). Incomplete content
+                (e.g. some images failed to load) is returned but not cached.
+
+        Returns:
+            Content blocks for the key
+        """
+        content = self.get(key)
+        if content is not None:
+            return content
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have built the content while we waited
+            content = self.get(key)
+            if content is not None:
+                return content
+
+            content, complete = builder()
+            if complete:
+                self.put(key, content)
+            else:
+                logger.warning(
+                    "Some few-shot example images failed to load, content will not be cached"
+                )
+
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return list(content)
+
+    def clear(self) -> None:
+        """Remove all cached content."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_cache: Optional[FewShotContentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> FewShotContentCache:
+    """
+    Get the process-level few-shot content cache.
+
+    Returns:
+        Shared FewShotContentCache sized from FEW_SHOT_CACHE_MAX_MB
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                max_mb = float(
+                    os.environ.get("FEW_SHOT_CACHE_MAX_MB", DEFAULT_MAX_CACHE_MB)
+                )
+                _cache = FewShotContentCache(max_bytes=int(max_mb * 1024 * 1024))
+    return _cache
+
+
+def _load_image_attachment(
+    image_file_path: str,
+    target_width: Optional[Any],
+    target_height: Optional[Any],
+) -> Dict[str, Any]:
+    """Load, resize and format a single example image for Bedrock."""
+    from idp_common import image, s3
+
+    if image_file_path.startswith("s3://"):
+        image_content = s3.get_binary_content(image_file_path)
+    else:
+        with open(image_file_path, "rb") as f:
+            image_content = f.read()
+
+    if target_width or target_height:
+        image_content = image.resize_image(image_content, target_width, target_height)
+
+    return image.prepare_bedrock_image_attachment(image_content)
+
+
+def build_few_shot_content(
+    examples: List[Dict[str, Any]],
+    prompt_field: str,
+    resolve_image_files: Callable[[str], List[str]],
+    target_width: Optional[Any] = None,
+    target_height: Optional[Any] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Build Bedrock content blocks for few-shot examples, loading images concurrently.
+
+    Args:
+        examples: Example configurations (each with the prompt field and an optional imagePath)
+        prompt_field: Name of the example prompt field (e.g. 'classPrompt')
+        resolve_image_files: Function resolving an imagePath to a list of image files/URIs
+        target_width: Optional width to resize example images to
+        target_height: Optional height to resize example images to
+        max_workers: Maximum number of images loaded concurrently
+
+    Returns:
+        Tuple of (content blocks in example order, whether every image loaded)
+
+    Raises:
+        ValueError: If an example imagePath cannot be resolved
+    """
+    # Resolve the layout first: text blocks and image slots in example order
+    layout: List[Any] = []
+    image_files: List[str] = []
+    for example in examples:
+        prompt = example.get(prompt_field)
+
+        # Only process this example if it has a non-empty prompt
+        if not prompt or not prompt.strip():
+            logger.info(
+                f"Skipping example with empty {prompt_field}: {example.get('name')}"
+            )
+            continue
+
+        layout.append({"text": prompt})
+
+        image_path = example.get("imagePath")
+        if image_path:
+            try:
+                files = resolve_image_files(image_path)
+            except Exception as e:
+                raise ValueError(
+                    f"Failed to load example images from {image_path}: {e}"
+                )
+            for image_file_path in files:
+                layout.append(len(image_files))
+                image_files.append(image_file_path)
+
+    attachments: List[Optional[Dict[str, Any]]] = [None] * len(image_files)
+    if image_files:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(max_workers, len(image_files))
+        ) as executor:
+            future_to_index = {
+                executor.submit(
+                    _load_image_attachment, path, target_width, target_height
+                ): index
+                for index, path in enumerate(image_files)
+            }
+            for future in concurrent.futures.as_completed(future_to_index):
+                index = future_to_index[future]
+                try:
+                    attachments[index] = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to load image {image_files[index]}: {e}")
+
+    content = []
+    for item in layout:
+        if isinstance(item, int):
+            if attachments[item] is not None:
+                content.append(attachments[item])
+        else:
+            content.append(item)
+
+    complete = all(attachment is not None for attachment in attachments)
+    return content, complete
+
+
+def get_few_shot_content(
+    examples: List[Dict[str, Any]],
+    prompt_field: str,
+    resolve_image_files: Callable[[str], List[str]],
+    target_width: Optional[Any] = None,
+    target_height: Optional[Any] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Get few-shot content blocks from the process-level cache, building them on first use.
+
+    The cache key covers the examples, prompt field, image dimensions and the
+    environment used to resolve relative image paths, so a configuration
+    change produces a new entry.
+
+    Args:
+        examples: Example configurations (each with the prompt field and an optional imagePath)
+        prompt_field: Name of the example prompt field (e.g. 'classPrompt')
+        resolve_image_files: Function resolving an imagePath to a list of image files/URIs
+        target_width: Optional width to resize example images to
+        target_height: Optional height to resize example images to
+
+    Returns:
+        List of content items containing text and image content for examples
+    """
+    if not examples:
+        return []
+
+    key = config_version(
+        examples,
+        prompt_field,
+        target_width,
+        target_height,
+        os.environ.get("CONFIGURATION_BUCKET"),
+        os.environ.get("ROOT_DIR"),
+    )
+
+    def builder():
+        return build_few_shot_content(
+            examples,
+            prompt_field,
+            resolve_image_files,
+            target_width=target_width,
+            target_height=target_height,
+        )
+
+    cache = get_cache()
+    if cache.max_bytes <= 0:
+        return builder()[0]
+    return cache.get_or_build(key, builder)
@@ -0,0 +1,211 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Lazy, size-capped rendering of large objects in log messages.
+
+Lambda handlers log events, configuration, documents and responses on every
+invocation. Formatting those with f-strings and json.dumps serializes them
+even when the log level filters the message out, and full dumps of large
+documents inflate CloudWatch Logs ingestion. LogPayload defers rendering until
+a handler actually emits the message and renders a compact summary (counts,
+ids, truncated strings) instead of the full object. A sample of messages can
+still carry the full JSON for troubleshooting.
+
+Example:
+    logger.info("Full document content: %s", LogPayload(document))
+"""
+
+import json
+import logging
+import os
+import random
+from typing import Any, Dict, Optional
+
+from idp_common.models import Document
+
+logger = logging.getLogger(__name__)
+
+# Maximum length of a summarized payload in a log message
+DEFAULT_MAX_CHARS = 2000
+# Maximum length of a full payload, kept below the 256 KB CloudWatch Logs event limit
+DEFAULT_FULL_MAX_CHARS = 200000
+# Summaries show this many entries of each dict or list
+DEFAULT_MAX_ITEMS = 10
+# Summaries truncate strings (e.g. prompts) to this length
+DEFAULT_MAX_STRING = 200
+# Nested dicts and lists deeper than this are replaced by their size
+DEFAULT_MAX_DEPTH = 3
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+def truncate(text: str, max_chars: int) -> str:
+    """
+    Truncate text, noting how long it was.
+
+    Args:
+        text: Text to truncate
+        max_chars: Maximum number of characters to keep
+
+    Returns:
+        The text, or its first max_chars characters followed by a marker
+    """
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}...<truncated, {len(text)} chars>"
+
+
+def summarize_document(
+    document: Document, max_items: int = DEFAULT_MAX_ITEMS
+) -> Dict[str, Any]:
+    """
+    Summarize a Document by its identifiers and counts.
+
+    Args:
+        document: The document to summarize
+        max_items: Maximum number of sections to list
+
+    Returns:
+        Dictionary with ids, status, page and section counts
+    """
+    summary = {
+        "id": document.id,
+        "input_key": document.input_key,
+        "status": document.status.value if document.status else None,
+        "num_pages": document.num_pages,
+        "pages": len(document.pages),
+        "sections": [
+            {
+                "id": section.section_id,
+                "class": section.classification,
+                "pages": len(section.page_ids),
+            }
+            for section in document.sections[:max_items]
+        ],
+        "metering_keys": len(document.metering or {}),
+        "errors": len(document.errors or []),
+    }
+    if len(document.sections) > max_items:
+        summary["sections"].append(f"<{len(document.sections) - max_items} more>")
+    if document.workflow_execution_arn:
+        summary["workflow_execution_arn"] = document.workflow_execution_arn
+    return summary
+
+
+def summarize(
+    obj: Any,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    max_items: int = DEFAULT_MAX_ITEMS,
+    max_string: int = DEFAULT_MAX_STRING,
+    _depth: int = 0,
+) -> Any:
+    """
+    Build a compact, JSON-serializable summary of an object.
+
+    Documents are summarized with summarize_document. Dicts and lists keep
+    their first max_items entries down to max_depth levels, deeper levels are
+    replaced by their size, and long strings are truncated.
+
+    Args:
+        obj: The object to summarize
+        max_depth: Maximum nesting depth to render
+        max_items: Maximum number of entries to render per dict or list
+        max_string: Maximum length of rendered strings
+
+    Returns:
+        Summary of the object
+    """
+    if isinstance(obj, Document):
+        return summarize_document(obj, max_items)
+    if obj is None or isinstance(obj, (bool, int, float)):
+        return obj
+    if isinstance(obj, str):
+        return truncate(obj, max_string)
+    if isinstance(obj, dict):
+        if _depth >= max_depth:
+            return f"<dict, {len(obj)} keys>"
+        summary = {
+            str(key): summarize(value, max_depth, max_items, max_string, _depth + 1)
+            for key, value in list(obj.items())[:max_items]
+        }
+        if len(obj) > max_items:
+            summary["..."] = f"<{len(obj) - max_items} more keys>"
+        return summary
+    if isinstance(obj, (list, tuple, set)):
+        if _depth >= max_depth:
+            return f"<list, {len(obj)} items>"
+        items = list(obj)
+        summary = [
+            summarize(item, max_depth, max_items, max_string, _depth + 1)
+            for item in items[:max_items]
+        ]
+        if len(items) > max_items:
+            summary.append(f"<{len(items) - max_items} more items>")
+        return summary
+    return truncate(str(obj), max_string)
+
+
+class LogPayload:
+    """
+    Renders an object for a log message only when the message is emitted.
+
+    Pass an instance as a logging argument rather than formatting it into the
+    message, so nothing is serialized when the level is disabled:
+
+        logger.info("Response: %s", LogPayload(response))
+
+    The payload is rendered as a size-capped summary. It is rendered as full
+    JSON when the root logger's level is DEBUG (LOG_LEVEL=DEBUG in the
+    Lambdas), or for a random sample of messages given by the
+    LOG_FULL_PAYLOAD_SAMPLE_RATE environment variable (0 to 1, default 0).
+    """
+
+    def __init__(
+        self,
+        obj: Any,
+        max_chars: Optional[int] = None,
+        full: Optional[bool] = None,
+    ):
+        """
+        Initialize the payload.
+
+        Args:
+            obj: The object to log
+            max_chars: Maximum length of the summary. Defaults to the
+                LOG_PAYLOAD_MAX_CHARS environment variable, or 2000.
+            full: Force (True) or disable (False) full rendering. By default
+                this is decided by the log level and sample rate.
+        """
+        self.obj = obj
+        self.max_chars = max_chars
+        self.full = full
+
+    def _render_full(self) -> bool:
+        if self.full is not None:
+            return self.full
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            return True
+        sample_rate = _env_float("LOG_FULL_PAYLOAD_SAMPLE_RATE", 0.0)
+        return sample_rate > 0 and random.random() < sample_rate
+
+    def __str__(self) -> str:
+        if self._render_full():
+            obj = self.obj.to_dict() if isinstance(self.obj, Document) else self.obj
+            max_chars = int(
+                _env_float("LOG_FULL_PAYLOAD_MAX_CHARS", DEFAULT_FULL_MAX_CHARS)
+            )
+            return truncate(json.dumps(obj, default=str), max_chars)
+
+        max_chars = self.max_chars or int(
+            _env_float("LOG_PAYLOAD_MAX_CHARS", DEFAULT_MAX_CHARS)
+        )
+        return truncate(json.dumps(summarize(self.obj), default=str), max_chars)
+
+    __repr__ = __str__
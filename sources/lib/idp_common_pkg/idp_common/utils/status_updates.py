@@ -0,0 +1,259 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Status-only document updates shared by the document services.
+
+Processing steps often update a document only to report a new status, and
+steps that run once per section inside a Step Functions Map all report the
+same status. This module provides the pieces the AppSync and DynamoDB document
+services use to send such updates cheaply:
+
+- a conditional DynamoDB update that only changes the status if the document
+  does not already have it (or a later in-progress status), so concurrent
+  invocations coalesce on the tracking table;
+- a process-wide coalescer that skips repeated updates within a warm Lambda
+  container and can send updates on a background thread.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from idp_common.models import Document, Status
+
+logger = logging.getLogger(__name__)
+
+# In-progress statuses in the order a workflow goes through them. A status-only
+# update never moves a document back to an earlier status in this list, so
+# that Map iterations running extraction and assessment side by side do not
+# flip the status back and forth.
+IN_PROGRESS_STATUS_ORDER = [
+    Status.RUNNING,
+    Status.OCR,
+    Status.CLASSIFYING,
+    Status.EXTRACTING,
+    Status.ASSESSING,
+    Status.POSTPROCESSING,
+    Status.HITL_IN_PROGRESS,
+    Status.SUMMARIZING,
+]
+
+CONDITIONAL_CHECK_FAILED = "ConditionalCheckFailedException"
+
+
+def get_workflow_status(status: Status) -> str:
+    """
+    Get the WorkflowStatus value stored for a document status.
+
+    Args:
+        status: Document status
+
+    Returns:
+        "FAILED", "SUCCEEDED" or "RUNNING"
+    """
+    if status == Status.FAILED:
+        return "FAILED"
+    if status == Status.COMPLETED:
+        return "SUCCEEDED"
+    return "RUNNING"
+
+
+def get_superseding_statuses(status: Status) -> List[Status]:
+    """
+    Get the in-progress statuses that come after the given status.
+
+    Args:
+        status: Document status
+
+    Returns:
+        Statuses a status-only update to ``status`` must not overwrite
+    """
+    if status not in IN_PROGRESS_STATUS_ORDER:
+        return []
+    return IN_PROGRESS_STATUS_ORDER[IN_PROGRESS_STATUS_ORDER.index(status) + 1 :]
+
+
+def build_status_update(
+    status: Status, workflow_execution_arn: Optional[str] = None
+) -> Tuple[str, str, Dict[str, str], Dict[str, Any]]:
+    """
+    Build a conditional DynamoDB update that sets only the document status.
+
+    The condition fails when the document item does not exist, already has
+    the status, or has a later in-progress status.
+
+    Args:
+        status: The new document status
+        workflow_execution_arn: Optional execution ARN to store with the status
+
+    Returns:
+        Tuple of (update_expression, condition_expression, expression_names,
+        expression_values)
+    """
+    expression_names = {
+        "#PK": "PK",
+        "#ObjectStatus": "ObjectStatus",
+        "#WorkflowStatus": "WorkflowStatus",
+    }
+    expression_values = {
+        ":ObjectStatus": status.value,
+        ":WorkflowStatus": get_workflow_status(status),
+    }
+    update_expression = (
+        "SET #ObjectStatus = :ObjectStatus, #WorkflowStatus = :WorkflowStatus"
+    )
+    if workflow_execution_arn:
+        update_expression += ", #WorkflowExecutionArn = :WorkflowExecutionArn"
+        expression_names["#WorkflowExecutionArn"] = "WorkflowExecutionArn"
+        expression_values[":WorkflowExecutionArn"] = workflow_execution_arn
+
+    condition_expression = "attribute_exists(#PK) AND #ObjectStatus <> :ObjectStatus"
+    superseding = get_superseding_statuses(status)
+    if superseding:
+        placeholders = []
+        for i, later_status in enumerate(superseding):
+            placeholders.append(f":Later{i}")
+            expression_values[f":Later{i}"] = later_status.value
+        condition_expression += f" AND NOT #ObjectStatus IN ({', '.join(placeholders)})"
+
+    return update_expression, condition_expression, expression_names, expression_values
+
+
+def get_coalescing_key(document: Document) -> Optional[Tuple[str, str]]:
+    """
+    Get the key used to coalesce status updates of a document in-process.
+
+    Updates are only coalesced in-process within one workflow execution, so a
+    reprocessed document reporting the same statuses again is never skipped.
+
+    Args:
+        document: The document being updated
+
+    Returns:
+        (object key, execution ARN), or None when the execution is unknown
+    """
+    if not document.input_key or not document.workflow_execution_arn:
+        return None
+    return (document.input_key, document.workflow_execution_arn)
+
+
+class StatusUpdateCoalescer:
+    """
+    Coalesces status-only document updates within a process.
+
+    The coalescer remembers the last status sent for each key and skips
+    updates that would send the same status again. Updates can be sent on the
+    calling thread or on a background thread (fire-and-forget).
+    """
+
+    def __init__(self, max_workers: int = 2, max_entries: int = 1000):
+        """
+        Initialize the coalescer.
+
+        Args:
+            max_workers: Number of background threads for fire-and-forget updates
+            max_entries: Maximum number of keys to remember
+        """
+        self.max_workers = max_workers
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._statuses: Dict[Hashable, Status] = {}
+        self._pending: set = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def update(
+        self,
+        key: Optional[Hashable],
+        status: Status,
+        send: Callable[[], bool],
+        wait: bool = True,
+    ) -> Union[bool, "Future[bool]"]:
+        """
+        Send a status update unless the same status was already sent for key.
+
+        Args:
+            key: Coalescing key, or None to never skip the update in-process
+            status: The new status
+            send: Function that sends the update and returns whether it
+                changed the stored status
+            wait: If True, send on the calling thread and return the result.
+                If False, send on a background thread and return a Future;
+                failures are logged instead of raised.
+
+        Returns:
+            Whether the stored status was changed, or a Future of it
+        """
+        with self._lock:
+            if key is not None and self._statuses.get(key) == status:
+                logger.debug(f"Status {status.value} already sent for {key}")
+                return False if wait else self._completed(False)
+            if key is not None:
+                self._statuses.pop(key, None)
+                self._statuses[key] = status
+                while len(self._statuses) > self.max_entries:
+                    self._statuses.pop(next(iter(self._statuses)))
+
+        def run() -> bool:
+            try:
+                return send()
+            except Exception:
+                # Allow the update to be retried
+                with self._lock:
+                    if key is not None and self._statuses.get(key) == status:
+                        del self._statuses[key]
+                raise
+
+        if wait:
+            return run()
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="status-update",
+                )
+            future = self._executor.submit(run)
+            self._pending.add(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for background updates to finish.
+
+        Lambda freezes background threads when the handler returns, so
+        handlers that must report the status before returning call this.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+        """
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait_futures(pending, timeout=timeout)
+
+    def reset(self) -> None:
+        """Forget all statuses sent so far."""
+        with self._lock:
+            self._statuses.clear()
+
+    def _on_done(self, future: "Future[bool]") -> None:
+        with self._lock:
+            self._pending.discard(future)
+        error = future.exception()
+        if error is not None:
+            logger.warning(f"Background status update failed: {error}")
+
+    @staticmethod
+    def _completed(result: bool) -> "Future[bool]":
+        future: Future = Future()
+        future.set_result(result)
+        return future
+
+
+# Shared by all document service instances, which Lambda handlers create per
+# invocation
+status_update_coalescer = StatusUpdateCoalescer()
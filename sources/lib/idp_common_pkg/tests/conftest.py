@@ -5,9 +5,14 @@
 Pytest configuration file for the IDP Common package tests.
 """
 
+import os
 import sys
 from unittest.mock import MagicMock
 
+# Metrics recorded by code under test are buffered in memory; do not start the
+# background flusher that would publish them to CloudWatch
+os.environ.setdefault("METRICS_FLUSH_INTERVAL", "0")
+
 # Mock external dependencies that may not be available in test environments
 # These mocks need to be set up before any imports that might use these packages
 
@@ -24,3 +29,10 @@ sys.modules["bedrock_agentcore.tools.code_interpreter_client"] = MagicMock()
 
 # PIL module is now used directly for document conversion functionality
 # No mocking needed as PIL is a required dependency for the OCR module
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Drop buffered metrics so they are not published when the process exits."""
+    metrics = sys.modules.get("idp_common.metrics")
+    if metrics is not None:
+        metrics._buffer.clear()
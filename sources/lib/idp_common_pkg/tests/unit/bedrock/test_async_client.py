@@ -0,0 +1,154 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the async Bedrock client.
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from idp_common.bedrock import AsyncBedrockClient
+
+
+def _converse_response(text="ok"):
+    return {
+        "output": {"message": {"content": [{"text": text}]}},
+        "usage": {"inputTokens": 10, "outputTokens": 5, "totalTokens": 15},
+    }
+
+
+def _client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "Converse")
+
+
+@pytest.mark.unit
+class TestAsyncBedrockClient:
+    """Tests for the AsyncBedrockClient class."""
+
+    @pytest.fixture
+    def client(self):
+        """Fixture providing a client that uses the thread pool transport."""
+        return AsyncBedrockClient(
+            region="us-west-2",
+            max_concurrency=3,
+            initial_backoff=0,
+            metrics_enabled=False,
+            use_aiobotocore=False,
+        )
+
+    def test_invalid_concurrency(self):
+        """Test that a non-positive concurrency limit is rejected."""
+        with pytest.raises(ValueError):
+            AsyncBedrockClient(max_concurrency=0, use_aiobotocore=False)
+
+    @patch("idp_common.bedrock.async_client.boto3.client")
+    def test_invoke_model_returns_metering(self, mock_boto_client, client):
+        """Test a successful invocation through the thread pool transport."""
+        mock_boto_client.return_value.converse.return_value = _converse_response()
+
+        async def run():
+            async with client:
+                return await client.invoke_model(
+                    model_id="us.amazon.nova-pro-v1:0",
+                    system_prompt="system",
+                    content=[{"text": "hello"}],
+                    context="Test",
+                )
+
+        result = asyncio.run(run())
+
+        assert client.extract_text_from_response(result) == "ok"
+        assert (
+            result["metering"]["Test/bedrock/us.amazon.nova-pro-v1:0"]["inputTokens"]
+            == 10
+        )
+        # The connection pool is sized to the concurrency limit
+        config = mock_boto_client.call_args.kwargs["config"]
+        assert config.max_pool_connections == 3
+        params = mock_boto_client.return_value.converse.call_args.kwargs
+        assert params["system"] == [{"text": "system"}]
+
+    def test_retries_throttling_with_async_sleep(self, client):
+        """Test that throttled requests are retried with backoff."""
+        calls = []
+
+        async def fake_converse(params):
+            calls.append(params)
+            if len(calls) < 3:
+                raise _client_error("ThrottlingException")
+            return _converse_response()
+
+        client._converse = fake_converse
+
+        with patch.object(
+            client._sync_client, "_calculate_backoff", return_value=0
+        ) as mock_backoff:
+            result = asyncio.run(
+                client.invoke_model("model", "system", [{"text": "hello"}])
+            )
+
+        assert len(calls) == 3
+        assert mock_backoff.call_count == 2
+        assert result["response"]["usage"]["totalTokens"] == 15
+
+    def test_max_retries_exceeded(self, client):
+        """Test that the last error is raised once retries are exhausted."""
+
+        async def fake_converse(params):
+            raise _client_error("ThrottlingException")
+
+        client._converse = fake_converse
+
+        with pytest.raises(ClientError):
+            asyncio.run(
+                client.invoke_model(
+                    "model", "system", [{"text": "hello"}], max_retries=2
+                )
+            )
+
+    def test_non_retryable_error(self, client):
+        """Test that non-retryable errors are raised immediately."""
+        calls = []
+
+        async def fake_converse(params):
+            calls.append(params)
+            raise _client_error("ValidationException")
+
+        client._converse = fake_converse
+
+        with pytest.raises(ClientError):
+            asyncio.run(client.invoke_model("model", "system", [{"text": "hello"}]))
+        assert len(calls) == 1
+
+    def test_concurrency_limit(self, client):
+        """Test that in-flight requests never exceed max_concurrency."""
+        state = {"in_flight": 0, "peak": 0}
+
+        async def fake_converse(params):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            return _converse_response()
+
+        client._converse = fake_converse
+
+        async def run():
+            return await asyncio.gather(
+                *[
+                    client.invoke_model("model", "system", [{"text": str(i)}])
+                    for i in range(10)
+                ]
+            )
+
+        results = asyncio.run(run())
+
+        assert len(results) == 10
+        assert state["peak"] == 3
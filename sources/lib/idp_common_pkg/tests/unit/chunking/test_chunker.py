@@ -0,0 +1,205 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the token counter and text chunker.
+"""
+
+import pytest
+from idp_common.chunking import TextChunker, TokenCounter
+
+# Prompt and input token counts recorded by notebooks/misc/bedrock_client_test.ipynb
+_RECORDED_PROMPT = (
+    "You are a helpful assistant that provides concise answers.What is Amazon Bedrock?"
+)
+_RECORDED_INPUT_TOKENS = {
+    "us.anthropic.claude-3-7-sonnet-20250219-v1:0": 25,
+    "us.amazon.nova-pro-v1:0": 16,
+}
+
+
+def _paged_text(pages=5, paragraphs=5, words=50):
+    text = ""
+    for page in range(1, pages + 1):
+        text += f"<page-number>{page}</page-number>\n"
+        text += "\n\n".join(
+            f"Paragraph {page}.{i} " + "word " * words for i in range(paragraphs)
+        )
+        text += "\n\n"
+    return text
+
+
+@pytest.mark.unit
+class TestTokenCounter:
+    """Tests for the TokenCounter class."""
+
+    def test_count_words_numbers_and_punctuation(self):
+        """Test the heuristic estimate on mixed content."""
+        counter = TokenCounter()
+        assert counter.count("") == 0
+        assert counter.count("the cat") == 2
+        # "authorization" is longer than one word piece
+        assert counter.count("authorization") == 3
+        # "2024" -> 2, "-" -> 1, "03" -> 1
+        assert counter.count("2024-03") == 4
+
+    def test_tokenizer_callable(self):
+        """Test that a real tokenizer overrides the heuristic."""
+        assert TokenCounter(tokenizer=lambda text: [1, 2, 3]).count("abc") == 3
+        assert TokenCounter(tokenizer=lambda text: 7).count("abc") == 7
+
+    def test_scale(self):
+        """Test that the scale multiplies heuristic estimates."""
+        text = "word " * 100
+        assert TokenCounter().count(text) == 100
+        assert TokenCounter(scale=1.5).count(text) == 150
+        with pytest.raises(ValueError):
+            TokenCounter(scale=0)
+
+    def test_from_config(self):
+        """Test creating a counter from a token_counter configuration section."""
+        text = "word " * 100
+        assert TokenCounter.from_config().count(text) == 100
+        assert TokenCounter.from_config().calibrate_from_usage
+        assert TokenCounter.from_config({"scale": "1.5"}).count(text) == 150
+        assert not TokenCounter.from_config({"calibrate": "false"}).calibrate_from_usage
+        # chars_per_token replaces the heuristic; the keyword is only a default
+        assert TokenCounter.from_config({"chars_per_token": 5}).count(text) == 100
+        assert TokenCounter.from_config(chars_per_token=4).count(text) == 125
+        assert (
+            TokenCounter.from_config({"chars_per_token": 5}, chars_per_token=4).count(
+                text
+            )
+            == 100
+        )
+
+    def test_calibrate(self):
+        """Test that calibration converges on the observed token counts."""
+        text = "word " * 100
+        counter = TokenCounter()
+        assert counter.calibrate(text, 120) == pytest.approx(1.2)
+        assert counter.count(text) == 120
+        assert counter.calibrate(text, 140) == pytest.approx(1.3)
+        # Missing counts and real tokenizers are left alone
+        assert counter.calibrate(text, 0) == pytest.approx(1.3)
+        assert TokenCounter(tokenizer=len).calibrate(text, 10) == 1.0
+
+    def test_record_usage(self):
+        """Test calibration from Bedrock usage including prompt cache tokens."""
+        text = "word " * 100
+        counter = TokenCounter(calibrate_from_usage=True)
+        counter.record_usage(text, None)
+        assert counter.scale == 1.0
+        counter.record_usage(
+            text,
+            {
+                "inputTokens": 10,
+                "cacheReadInputTokens": 120,
+                "cacheWriteInputTokens": 20,
+                "outputTokens": 500,
+            },
+        )
+        assert counter.count(text) == 150
+
+        disabled = TokenCounter()
+        disabled.record_usage(text, {"inputTokens": 200})
+        assert disabled.scale == 1.0
+
+    @pytest.mark.parametrize("model_id, input_tokens", _RECORDED_INPUT_TOKENS.items())
+    def test_estimate_against_recorded_usage(self, model_id, input_tokens):
+        """Test estimates against input token counts recorded from Bedrock."""
+        counter = TokenCounter(calibrate_from_usage=True)
+        # The uncalibrated heuristic is within 35% of each model's tokenizer
+        assert counter.count(_RECORDED_PROMPT) == pytest.approx(input_tokens, rel=0.35)
+        counter.record_usage(_RECORDED_PROMPT, {"inputTokens": input_tokens})
+        assert counter.count(_RECORDED_PROMPT) == input_tokens
+
+
+@pytest.mark.unit
+class TestTextChunker:
+    """Tests for the TextChunker class."""
+
+    def test_invalid_arguments(self):
+        """Test argument validation."""
+        with pytest.raises(ValueError):
+            TextChunker(max_tokens=0)
+        with pytest.raises(ValueError):
+            TextChunker(max_tokens=10, overlap_tokens=10)
+
+    def test_small_text_single_chunk(self):
+        """Test that text within budget is returned unchanged."""
+        chunks = TextChunker(max_tokens=100).chunk_text("short text")
+        assert len(chunks) == 1
+        assert chunks[0].text == "short text"
+
+    def test_chunks_respect_budget_and_reconstruct(self):
+        """Test that chunks fit the budget and cover the text exactly without overlap."""
+        text = _paged_text()
+        chunks = TextChunker(max_tokens=200).chunk_text(text)
+
+        assert len(chunks) > 1
+        assert all(chunk.token_count <= 200 for chunk in chunks)
+        assert "".join(chunk.text for chunk in chunks) == text
+        assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+
+    def test_chunks_break_on_paragraphs(self):
+        """Test that no paragraph is split across chunks."""
+        chunks = TextChunker(max_tokens=200).chunk_text(_paged_text())
+        for chunk in chunks:
+            body = chunk.text.split("</page-number>\n")[-1]
+            assert body.startswith("Paragraph ")
+
+    def test_page_moved_to_next_chunk(self):
+        """Test that a page that fits in a fresh chunk is not split."""
+        # Each page is ~160 tokens, so two pages never fit in 250 tokens
+        chunks = TextChunker(max_tokens=250).chunk_text(
+            _paged_text(pages=3, paragraphs=3)
+        )
+        assert [chunk.page_ids for chunk in chunks] == [["1"], ["2"], ["3"]]
+
+    def test_overlap_is_whole_paragraphs(self):
+        """Test that overlapping chunks repeat trailing paragraphs of the previous chunk."""
+        chunks = TextChunker(max_tokens=200, overlap_tokens=60).chunk_text(
+            _paged_text(pages=1, paragraphs=20)
+        )
+        assert len(chunks) > 1
+        for previous, current in zip(chunks, chunks[1:]):
+            first_paragraph = current.text.split("\n\n")[0] + "\n\n"
+            assert previous.text.endswith(first_paragraph)
+
+    def test_deterministic(self):
+        """Test that chunking the same text twice gives identical results."""
+        chunker = TextChunker(max_tokens=150, overlap_tokens=40)
+        text = _paged_text()
+        assert chunker.chunk_text(text) == chunker.chunk_text(text)
+
+    def test_oversized_paragraph_split_on_words(self):
+        """Test that a paragraph larger than the budget is split on word boundaries."""
+        text = "x " * 5000
+        chunks = TextChunker(max_tokens=300).chunk_text(text)
+        assert all(chunk.token_count <= 300 for chunk in chunks)
+        assert "".join(chunk.text for chunk in chunks) == text
+
+    def test_table_rows_kept_intact(self):
+        """Test that oversized tables are split between rows."""
+        table = "".join(f"| row {i} | value {i} |\n" for i in range(200))
+        chunks = TextChunker(max_tokens=100).chunk_text(table)
+        for chunk in chunks:
+            assert chunk.text.startswith("| row ")
+            assert chunk.text.endswith("|\n")
+
+    def test_iter_chunks_streams_pages(self):
+        """Test that pages are consumed lazily from a generator."""
+        consumed = []
+
+        def pages():
+            for page in range(1, 11):
+                consumed.append(page)
+                yield str(page), "word " * 100 + "\n\n"
+
+        iterator = TextChunker(max_tokens=150).iter_chunks(pages())
+        first = next(iterator)
+
+        assert first.page_ids == ["1"]
+        assert len(consumed) < 10
+        assert len(list(iterator)) == 9
@@ -12,6 +12,7 @@ import pytest
 
 # Import standard library modules first
 import json
+import re
 from textwrap import dedent
 from unittest.mock import ANY, MagicMock, patch
 
@@ -803,6 +804,239 @@ class TestClassificationService:
         assert result.pages["2"].classification == "receipt"
         assert result.pages["3"].classification == "receipt"
 
+    def test_build_holistic_windows(self, service):
+        """Windows overlap and the last window is aligned with the document end."""
+        page_ids = [str(i) for i in range(1, 11)]
+
+        assert service._build_holistic_windows(page_ids, 4, 1) == [
+            (0, 4),
+            (3, 7),
+            (6, 10),
+        ]
+        assert service._build_holistic_windows(page_ids, 4, 2) == [
+            (0, 4),
+            (2, 6),
+            (4, 8),
+            (6, 10),
+        ]
+        assert service._build_holistic_windows(page_ids, 20, 2) == [(0, 10)]
+
+    def test_merge_holistic_windows_respects_boundaries_in_overlap(self, service):
+        """Adjacent same-type documents stay separate when windows see the boundary."""
+        page_ids = [str(i) for i in range(1, 7)]
+        windows = [(0, 4), (2, 6)]
+        window_segments = [
+            [(0, "invoice", ["1", "2", "3"]), (1, "invoice", ["4"])],
+            [(0, "invoice", ["3"]), (1, "invoice", ["4", "5"]), (2, "letter", ["6"])],
+        ]
+
+        sections = service._merge_holistic_windows(page_ids, windows, window_segments)
+
+        assert sections == [
+            ("invoice", ["1", "2", "3"]),
+            ("invoice", ["4", "5"]),
+            ("letter", ["6"]),
+        ]
+
+    @patch("idp_common.s3.get_text_content")
+    @patch(
+        "idp_common.classification.service.ClassificationService._invoke_bedrock_model"
+    )
+    def test_holistic_classify_document_windowed(
+        self, mock_invoke, mock_get_text, mock_config
+    ):
+        """Long documents are classified in concurrent windows and merged."""
+        mock_config["classification"]["holisticWindowPages"] = 4
+        mock_config["classification"]["holisticWindowOverlapPages"] = 2
+        with patch("boto3.Session"):
+            service = ClassificationService(
+                region="us-west-2", config=mock_config, backend="bedrock"
+            )
+
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        for i in range(1, 11):
+            doc.pages[str(i)] = Page(
+                page_id=str(i), parsed_text_uri=f"s3://bucket/text{i}.txt"
+            )
+        mock_get_text.side_effect = lambda uri: (
+            f"Page {uri[len('s3://bucket/text') : -4]} content"
+        )
+
+        # Pages 1-6 are one invoice, pages 7-10 one receipt. The model sees
+        # window-relative page numbers.
+        def classify_window(content, config):
+            text = content[0]["text"]
+            pages = [int(n) for n in re.findall(r"Page (\d+) content", text)]
+            segments = []
+            for ordinal, page in enumerate(pages, start=1):
+                doc_type = "invoice" if page <= 6 else "receipt"
+                if segments and segments[-1]["type"] == doc_type:
+                    segments[-1]["ordinal_end_page"] = ordinal
+                else:
+                    segments.append(
+                        {
+                            "ordinal_start_page": ordinal,
+                            "ordinal_end_page": ordinal,
+                            "type": doc_type,
+                        }
+                    )
+            return {
+                "response": {
+                    "output": {
+                        "message": {
+                            "content": [{"text": json.dumps({"segments": segments})}]
+                        }
+                    }
+                },
+                "metering": {"model": {"inputTokens": 100}},
+            }
+
+        mock_invoke.side_effect = classify_window
+
+        result = service.holistic_classify_document(doc)
+
+        assert mock_invoke.call_count == 4
+        assert [(s.classification, s.page_ids) for s in result.sections] == [
+            ("invoice", ["1", "2", "3", "4", "5", "6"]),
+            ("receipt", ["7", "8", "9", "10"]),
+        ]
+        assert [s.section_id for s in result.sections] == ["1", "2"]
+        assert result.pages["6"].classification == "invoice"
+        assert result.pages["7"].classification == "receipt"
+        assert result.metering["model"]["inputTokens"] == 400
+        assert result.status != Status.FAILED
+
+    @patch("idp_common.s3.get_text_content")
+    @patch(
+        "idp_common.classification.service.ClassificationService._invoke_bedrock_model"
+    )
+    def test_holistic_classify_document_windowed_parse_error(
+        self, mock_invoke, mock_get_text, mock_config
+    ):
+        """A window without segments fails the document."""
+        mock_config["classification"]["holisticWindowPages"] = 2
+        mock_config["classification"]["holisticWindowOverlapPages"] = 0
+        with patch("boto3.Session"):
+            service = ClassificationService(
+                region="us-west-2", config=mock_config, backend="bedrock"
+            )
+
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        for i in range(1, 5):
+            doc.pages[str(i)] = Page(
+                page_id=str(i), parsed_text_uri=f"s3://bucket/text{i}.txt"
+            )
+        mock_get_text.return_value = "content"
+        mock_invoke.return_value = {
+            "response": {
+                "output": {"message": {"content": [{"text": '{"segments": []}'}]}}
+            },
+            "metering": {},
+        }
+
+        result = service.holistic_classify_document(doc)
+
+        assert result.status == Status.FAILED
+        assert any("No segments found" in error for error in result.errors)
+
+    @patch("idp_common.s3.get_text_content")
+    @patch(
+        "idp_common.classification.service.ClassificationService._invoke_bedrock_model"
+    )
+    def test_holistic_classify_document_windowed_client_error(
+        self, mock_invoke, mock_get_text, mock_config
+    ):
+        """A failed window request keeps the metering of the other windows."""
+        mock_config["classification"]["holisticWindowPages"] = 2
+        mock_config["classification"]["holisticWindowOverlapPages"] = 0
+        with patch("boto3.Session"):
+            service = ClassificationService(
+                region="us-west-2", config=mock_config, backend="bedrock"
+            )
+
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        for i in range(1, 7):
+            doc.pages[str(i)] = Page(
+                page_id=str(i), parsed_text_uri=f"s3://bucket/text{i}.txt"
+            )
+        mock_get_text.side_effect = lambda uri: (
+            f"Page {uri[len('s3://bucket/text') : -4]} content"
+        )
+        segments = [{"ordinal_start_page": 1, "ordinal_end_page": 2, "type": "invoice"}]
+
+        def classify_window(content, config):
+            if "Page 3 content" in content[0]["text"]:
+                raise ClientError(
+                    {"Error": {"Code": "ThrottlingException", "Message": "Slow down"}},
+                    "Converse",
+                )
+            return {
+                "response": {
+                    "output": {
+                        "message": {
+                            "content": [{"text": json.dumps({"segments": segments})}]
+                        }
+                    }
+                },
+                "metering": {"model": {"inputTokens": 100}},
+            }
+
+        mock_invoke.side_effect = classify_window
+
+        with pytest.raises(ClientError):
+            service.holistic_classify_document(doc)
+
+        assert mock_invoke.call_count == 3
+        assert doc.metering["model"]["inputTokens"] == 200
+        assert doc.status == Status.FAILED
+
+    @patch("idp_common.s3.get_text_content")
+    @patch(
+        "idp_common.classification.service.ClassificationService._invoke_bedrock_model"
+    )
+    def test_holistic_classify_document_not_windowed_by_default(
+        self, mock_invoke, mock_get_text, mock_config
+    ):
+        """Long documents use a single request unless windowing is configured."""
+        with patch("boto3.Session"):
+            service = ClassificationService(
+                region="us-west-2", config=mock_config, backend="bedrock"
+            )
+
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        for i in range(1, 151):
+            doc.pages[str(i)] = Page(
+                page_id=str(i), parsed_text_uri=f"s3://bucket/text{i}.txt"
+            )
+        mock_get_text.return_value = "content"
+        segments = [
+            {"ordinal_start_page": 1, "ordinal_end_page": 150, "type": "invoice"}
+        ]
+        mock_invoke.return_value = {
+            "response": {
+                "output": {
+                    "message": {
+                        "content": [{"text": json.dumps({"segments": segments})}]
+                    }
+                }
+            },
+            "metering": {},
+        }
+
+        result = service.holistic_classify_document(doc)
+
+        assert mock_invoke.call_count == 1
+        assert len(result.sections) == 1
+        assert len(result.sections[0].page_ids) == 150
+
     def test_group_consecutive_pages_with_boundary(self, service):
         """Pages with boundary flag start new sections even with same doc type."""
         results = [
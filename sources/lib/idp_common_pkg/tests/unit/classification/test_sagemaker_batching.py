@@ -0,0 +1,254 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for batched SageMaker classification requests.
+"""
+
+import io
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.classification.batching import MicroBatcher
+from idp_common.classification.service import ClassificationService
+from idp_common.models import Document, Page
+
+
+class MockUdopEndpoint:
+    """
+    Local stand-in for a sagemaker-runtime client serving the UDOP model.
+
+    Pages are classified from their image URI (s3://bucket/<class>-<n>.png).
+    Accepts single-page payloads and {"instances": [...]} batches, like the
+    pattern-3 inference handler.
+    """
+
+    def __init__(self, supports_batching=True, failing_images=(), latency=0.0):
+        self.supports_batching = supports_batching
+        self.failing_images = set(failing_images)
+        self.latency = latency
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def _predict(self, payload):
+        if payload["input_image"] in self.failing_images:
+            raise ValueError(f"Cannot read {payload['input_image']}")
+        name = payload["input_image"].rsplit("/", 1)[-1]
+        return {"prediction": name.split("-")[0]}
+
+    def invoke_endpoint(self, EndpointName, ContentType, Body):
+        request = json.loads(Body)
+        with self._lock:
+            self.requests.append(request)
+        time.sleep(self.latency)
+
+        if "instances" in request:
+            if not self.supports_batching:
+                raise ClientError(
+                    {
+                        "Error": {
+                            "Code": "ModelError",
+                            "Message": "KeyError: 'input_image'",
+                        }
+                    },
+                    "InvokeEndpoint",
+                )
+            predictions = []
+            for instance in request["instances"]:
+                try:
+                    predictions.append(self._predict(instance))
+                except Exception as e:
+                    predictions.append({"error": str(e)})
+            body = {"predictions": predictions}
+        else:
+            try:
+                body = self._predict(request)
+            except Exception as e:
+                raise ClientError(
+                    {"Error": {"Code": "ModelError", "Message": str(e)}},
+                    "InvokeEndpoint",
+                )
+        return {"Body": io.BytesIO(json.dumps(body).encode())}
+
+    @property
+    def batch_requests(self):
+        return [r for r in self.requests if "instances" in r]
+
+
+def _make_service(endpoint, batch_size, max_wait_ms=200):
+    config = {
+        "classes": [
+            {"name": "invoice", "description": "An invoice"},
+            {"name": "letter", "description": "A letter"},
+        ],
+        "classification": {
+            "sagemakerBatchSize": batch_size,
+            "sagemakerBatchMaxWaitMs": max_wait_ms,
+        },
+    }
+    with (
+        patch("boto3.client", return_value=endpoint),
+        patch.dict("os.environ", {"SAGEMAKER_ENDPOINT_NAME": "udop-endpoint"}),
+    ):
+        return ClassificationService(
+            region="us-east-1", config=config, backend="sagemaker"
+        )
+
+
+def _make_pages(doc_types):
+    return {
+        str(i + 1): {
+            "imageUri": f"s3://bucket/{doc_type}-{i + 1}.png",
+            "rawTextUri": f"s3://bucket/raw-{i + 1}.json",
+        }
+        for i, doc_type in enumerate(doc_types)
+    }
+
+
+def _all_pages(result):
+    pages = [page for section in result.sections for page in section.pages]
+    return sorted(pages, key=lambda page: int(page.page_id))
+
+
+@pytest.mark.unit
+class TestMicroBatcher:
+    """Tests for the generic micro-batcher."""
+
+    def test_groups_concurrent_items(self):
+        batches = []
+
+        def invoke_batch(items):
+            batches.append(list(items))
+            return [item * 10 for item in items]
+
+        batcher = MicroBatcher(
+            invoke_batch, lambda item: item * 10, max_batch_size=4, max_wait_seconds=1
+        )
+        try:
+            futures = [batcher.submit(i) for i in range(6)]
+            results = [future.result(timeout=5) for future in futures]
+        finally:
+            batcher.close()
+
+        assert [r.result for r in results] == [0, 10, 20, 30, 40, 50]
+        assert [len(batch) for batch in batches] == [4, 2]
+        assert [(r.request_size, r.request_index) for r in results[:4]] == [
+            (4, 0),
+            (4, 1),
+            (4, 2),
+            (4, 3),
+        ]
+
+    def test_max_wait_bounds_latency(self):
+        batcher = MicroBatcher(
+            lambda items: items,
+            lambda item: item,
+            max_batch_size=8,
+            max_wait_seconds=0.01,
+        )
+        try:
+            result = batcher.submit("a").result(timeout=1)
+        finally:
+            batcher.close()
+
+        assert result.result == "a"
+        assert result.request_size == 1
+
+    def test_mismatched_batch_response_falls_back(self):
+        singles = []
+
+        def invoke_single(item):
+            singles.append(item)
+            return item
+
+        batcher = MicroBatcher(
+            lambda items: items[:1], invoke_single, max_batch_size=2, max_wait_seconds=1
+        )
+        try:
+            futures = [batcher.submit(i) for i in range(2)]
+            results = [future.result(timeout=5).result for future in futures]
+        finally:
+            batcher.close()
+
+        assert results == [0, 1]
+        assert sorted(singles) == [0, 1]
+
+
+@pytest.mark.unit
+class TestBatchedSageMakerClassification:
+    """Tests for SageMaker classification with micro-batching."""
+
+    def test_pages_sent_in_batches(self):
+        endpoint = MockUdopEndpoint()
+        service = _make_service(endpoint, batch_size=4)
+
+        result = service.classify_pages(_make_pages(["invoice"] * 4 + ["letter"] * 4))
+
+        assert [p.classification.doc_type for p in _all_pages(result)] == [
+            "invoice"
+        ] * 4 + ["letter"] * 4
+        assert len(endpoint.requests) == 2
+        assert all(len(r["instances"]) == 4 for r in endpoint.requests)
+        metering = result.metadata["metering"][
+            "Classification/sagemaker/invoke_endpoint"
+        ]
+        assert metering == {"invocations": 2, "pages": 8}
+
+    def test_batching_disabled_by_default(self):
+        endpoint = MockUdopEndpoint()
+        service = _make_service(endpoint, batch_size=1)
+
+        service.classify_pages(_make_pages(["invoice", "letter"]))
+
+        assert len(endpoint.requests) == 2
+        assert not endpoint.batch_requests
+
+    def test_failed_page_retried_individually(self):
+        endpoint = MockUdopEndpoint(failing_images={"s3://bucket/letter-2.png"})
+        service = _make_service(endpoint, batch_size=3)
+
+        result = service.classify_pages(_make_pages(["invoice", "letter", "invoice"]))
+
+        pages = {p.page_id: p for p in _all_pages(result)}
+        assert pages["1"].classification.doc_type == "invoice"
+        assert pages["3"].classification.doc_type == "invoice"
+        assert pages["2"].classification.doc_type == "unclassified"
+        assert "ModelError" in pages["2"].classification.metadata["error"]
+        # One batch, then a single-page retry for the failed page only
+        assert len(endpoint.batch_requests) == 1
+        singles = [r for r in endpoint.requests if "instances" not in r]
+        assert [r["input_image"] for r in singles] == ["s3://bucket/letter-2.png"]
+
+    def test_endpoint_without_batch_support_falls_back(self):
+        endpoint = MockUdopEndpoint(supports_batching=False)
+        service = _make_service(endpoint, batch_size=2)
+
+        result = service.classify_pages(_make_pages(["invoice", "letter"]))
+
+        assert [p.classification.doc_type for p in _all_pages(result)] == [
+            "invoice",
+            "letter",
+        ]
+        assert len(endpoint.batch_requests) == 1
+        assert len(endpoint.requests) == 3
+
+    def test_classify_document_batches_and_closes_batcher(self):
+        endpoint = MockUdopEndpoint()
+        service = _make_service(endpoint, batch_size=4)
+        document = Document(id="doc", input_key="doc.pdf")
+        for page_id, page in _make_pages(["invoice"] * 4).items():
+            document.pages[page_id] = Page(
+                page_id=page_id,
+                image_uri=page["imageUri"],
+                raw_text_uri=page["rawTextUri"],
+            )
+
+        document = service.classify_document(document)
+
+        assert len(endpoint.requests) == 1
+        assert all(p.classification == "invoice" for p in document.pages.values())
+        assert service._sagemaker_batcher is None
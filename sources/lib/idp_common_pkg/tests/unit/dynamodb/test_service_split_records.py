@@ -0,0 +1,201 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Tests for the split tracking record layout of DocumentDynamoDBService.
+"""
+
+from unittest.mock import patch
+
+import boto3
+import pytest
+from idp_common.dynamodb.client import DynamoDBClient
+from idp_common.dynamodb.service import DocumentDynamoDBService
+from idp_common.models import Document, Page, Section, Status
+from moto import mock_aws
+
+TABLE_NAME = "tracking-table"
+
+
+@pytest.fixture
+def tracking_table():
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        table = dynamodb.create_table(
+            TableName=TABLE_NAME,
+            KeySchema=[
+                {"AttributeName": "PK", "KeyType": "HASH"},
+                {"AttributeName": "SK", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield table
+
+
+def make_document(num_pages=12, section_ids=("1", "2", "10")):
+    document = Document(
+        id="doc.pdf",
+        input_key="doc.pdf",
+        status=Status.EXTRACTING,
+        queued_time="2025-01-01T10:00:00Z",
+        num_pages=num_pages,
+        metering={"OCR/textract": {"pages": num_pages}},
+    )
+    for i in range(1, num_pages + 1):
+        document.pages[str(i)] = Page(
+            page_id=str(i),
+            image_uri=f"s3://output/doc.pdf/pages/{i}/image.jpg",
+            parsed_text_uri=f"s3://output/doc.pdf/pages/{i}/result.json",
+            classification="invoice",
+        )
+    for section_id in section_ids:
+        document.sections.append(
+            Section(
+                section_id=section_id,
+                classification="invoice",
+                page_ids=["1"],
+                confidence_threshold_alerts=[
+                    {
+                        "attribute_name": "total",
+                        "confidence": 0.5,
+                        "confidence_threshold": 0.9,
+                    }
+                ],
+            )
+        )
+    return document
+
+
+@pytest.mark.unit
+class TestSplitTrackingRecords:
+    """Tests for page and section records stored as separate items."""
+
+    def _service(self, **kwargs):
+        client = DynamoDBClient(table_name=TABLE_NAME, region="us-east-1")
+        return DocumentDynamoDBService(dynamodb_client=client, **kwargs)
+
+    def test_update_writes_records_once(self, tracking_table):
+        service = self._service()
+        document = make_document()
+        service.create_document(document)
+
+        with patch.object(
+            service.client,
+            "batch_write_items",
+            wraps=service.client.batch_write_items,
+        ) as batch_write:
+            service.update_document(document)
+            document.status = Status.ASSESSING
+            service.update_document(document)
+
+        assert batch_write.call_count == 1
+        assert len(batch_write.call_args.args[0]) == 15
+
+        item = tracking_table.get_item(Key={"PK": "doc#doc.pdf", "SK": "none"})["Item"]
+        assert item["ObjectStatus"] == "ASSESSING"
+        assert "Pages" not in item and "Sections" not in item
+
+    def test_get_document_loads_records(self, tracking_table):
+        service = self._service()
+        service.create_document(make_document())
+        service.update_document(make_document())
+
+        document = service.get_document("doc.pdf")
+
+        assert document.status == Status.EXTRACTING
+        assert list(document.pages) == [str(i) for i in range(1, 13)]
+        assert [s.section_id for s in document.sections] == ["1", "2", "10"]
+        assert document.sections[0].confidence_threshold_alerts[0]["confidence"] == (
+            pytest.approx(0.5)
+        )
+        assert service.get_document("doc.pdf", load_records=False).pages == {}
+
+    def test_get_pages_is_paginated(self, tracking_table):
+        service = self._service()
+        service.update_document(make_document())
+
+        first = service.get_pages("doc.pdf", limit=5)
+        second = service.get_pages(
+            "doc.pdf", limit=10, exclusive_start_key=first["nextToken"]
+        )
+
+        assert [p.page_id for p in first["Pages"]] == ["1", "2", "3", "4", "5"]
+        assert [p.page_id for p in second["Pages"]][0] == "6"
+
+    def test_removed_sections_are_deleted(self, tracking_table):
+        service = self._service()
+        service.update_document(make_document())
+
+        service.update_document(make_document(section_ids=("1",)))
+
+        sections = service.get_sections("doc.pdf")["Sections"]
+        assert [s.section_id for s in sections] == ["1"]
+
+    def test_removed_pages_are_deleted(self, tracking_table):
+        service = self._service()
+        service.create_document(make_document())
+        service.update_document(make_document())
+
+        # Reprocessing recreates the document item and finds fewer pages
+        service.create_document(make_document(num_pages=3))
+        service.update_document(make_document(num_pages=3))
+        assert list(service.get_document("doc.pdf").pages) == ["1", "2", "3"]
+
+        service.update_document(make_document(num_pages=2))
+        pages = service.get_pages("doc.pdf")["Pages"]
+        assert [p.page_id for p in pages] == ["1", "2"]
+
+    @pytest.mark.parametrize("record_layout", ["split", "embedded"])
+    def test_update_returns_stored_document(self, tracking_table, record_layout):
+        service = self._service(record_layout=record_layout)
+        document = make_document()
+        document.start_time = "2025-01-01T10:00:05Z"
+        service.create_document(document)
+        service.update_document(document)
+
+        # The workflow tracker completes a document it only knows the key of
+        completion = Document(
+            id="doc.pdf",
+            input_key="doc.pdf",
+            status=Status.COMPLETED,
+            completion_time="2025-01-01T10:05:00Z",
+        )
+        updated = service.update_document(completion)
+
+        assert updated.queued_time == "2025-01-01T10:00:00Z"
+        assert updated.start_time == "2025-01-01T10:00:05Z"
+        assert updated.completion_time == "2025-01-01T10:05:00Z"
+        assert updated.status == Status.COMPLETED
+        assert updated.metering == {"OCR/textract": {"pages": 12}}
+        # Pages and sections are kept when the update has none
+        stored = service.get_document("doc.pdf")
+        assert len(stored.pages) == 12
+        assert len(stored.sections) == 3
+
+    def test_list_documents_skips_records(self, tracking_table):
+        service = self._service()
+        document = make_document()
+        service.create_document(document)
+        service.update_document(document)
+
+        documents = service.list_documents(limit=100)["Documents"]
+
+        # The document item and its list partition item, but no page or
+        # section records
+        assert len(documents) == 2
+
+    def test_embedded_layout_reads_lists(self, tracking_table):
+        service = self._service(record_layout="embedded")
+        service.update_document(make_document())
+
+        item = tracking_table.get_item(Key={"PK": "doc#doc.pdf", "SK": "none"})["Item"]
+        assert len(item["Pages"]) == 12
+        assert len(self._service().get_document("doc.pdf").sections) == 3
+
+    def test_unsupported_layout(self):
+        with pytest.raises(ValueError, match="Unsupported tracking record layout"):
+            DocumentDynamoDBService(dynamodb_client=object(), record_layout="other")
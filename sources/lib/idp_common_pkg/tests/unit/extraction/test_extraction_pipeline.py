@@ -0,0 +1,187 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the section extraction prefetch pipeline.
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+from idp_common.extraction.pipeline import SectionInputs, SectionPrefetcher
+from idp_common.extraction.service import ExtractionService
+from idp_common.models import Document, Page, Section
+
+
+def _inputs(section_id, image_size=0):
+    return SectionInputs(
+        section_id=section_id,
+        page_ids=[section_id],
+        document_text=f"text {section_id}",
+        page_images=[b"x" * image_size] if image_size else [],
+    )
+
+
+@pytest.mark.unit
+class TestSectionPrefetcher:
+    """Tests for SectionPrefetcher."""
+
+    def test_yields_in_order(self):
+        prefetcher = SectionPrefetcher(_inputs, ["1", "2", "3"], prefetch_depth=2)
+
+        results = list(prefetcher)
+
+        assert [section_id for section_id, _, _ in results] == ["1", "2", "3"]
+        assert [inputs.document_text for _, inputs, _ in results] == [
+            "text 1",
+            "text 2",
+            "text 3",
+        ]
+
+    def test_next_section_loaded_while_current_is_processed(self):
+        loaded = {section_id: threading.Event() for section_id in ["1", "2"]}
+
+        def loader(section_id):
+            loaded[section_id].set()
+            return _inputs(section_id)
+
+        for section_id, _, _ in SectionPrefetcher(loader, ["1", "2"], prefetch_depth=1):
+            if section_id == "1":
+                # The caller is "calling the model" for section 1
+                assert loaded["2"].wait(timeout=5)
+
+    def test_no_prefetch_with_depth_zero(self):
+        started = []
+
+        def loader(section_id):
+            started.append(section_id)
+            return _inputs(section_id)
+
+        for section_id, _, _ in SectionPrefetcher(loader, ["1", "2"], prefetch_depth=0):
+            assert started[-1] == section_id
+
+    def test_memory_budget_limits_prefetch(self):
+        started = []
+
+        def loader(section_id):
+            started.append(section_id)
+            return _inputs(section_id, image_size=100)
+
+        # With no budget, only the next section is loaded ahead despite depth 3
+        prefetcher = SectionPrefetcher(
+            loader, ["1", "2", "3", "4"], prefetch_depth=3, max_prefetch_bytes=0
+        )
+        for index, (section_id, _, _) in enumerate(prefetcher):
+            assert len(started) <= index + 2
+
+        assert started == ["1", "2", "3", "4"]
+
+    def test_loader_errors_are_returned(self):
+        def loader(section_id):
+            if section_id == "2":
+                raise ValueError("NoSuchKey")
+            return _inputs(section_id)
+
+        results = list(SectionPrefetcher(loader, ["1", "2", "3"]))
+
+        assert [error is None for _, _, error in results] == [True, False, True]
+        assert "NoSuchKey" in str(results[1][2])
+
+
+@pytest.mark.unit
+class TestProcessDocumentSections:
+    """Tests for ExtractionService.process_document_sections."""
+
+    @pytest.fixture
+    def service(self):
+        config = {
+            "classes": [
+                {
+                    "name": "invoice",
+                    "attributes": [{"name": "total", "description": "The total"}],
+                }
+            ],
+            "extraction": {"model": "us.amazon.nova-pro-v1:0", "task_prompt": ""},
+        }
+        return ExtractionService(region="us-west-2", config=config)
+
+    @pytest.fixture
+    def document(self):
+        doc = Document(
+            id="doc",
+            input_key="doc.pdf",
+            output_bucket="output-bucket",
+        )
+        for page_id in ["1", "2", "3"]:
+            doc.pages[page_id] = Page(
+                page_id=page_id,
+                image_uri=f"s3://bucket/doc.pdf/pages/{page_id}/image.jpg",
+                parsed_text_uri=f"s3://bucket/doc.pdf/pages/{page_id}/result.json",
+            )
+            doc.sections.append(
+                Section(
+                    section_id=page_id, classification="invoice", page_ids=[page_id]
+                )
+            )
+        return doc
+
+    @patch("idp_common.metrics.put_metric")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.bedrock.invoke_model")
+    @patch("idp_common.image.prepare_bedrock_image_attachment")
+    @patch("idp_common.image.prepare_image")
+    @patch("idp_common.s3.get_text_content")
+    def test_processes_all_sections_and_isolates_failures(
+        self,
+        mock_get_text,
+        mock_prepare_image,
+        mock_attachment,
+        mock_invoke_model,
+        mock_write_content,
+        mock_put_metric,
+        service,
+        document,
+    ):
+        def get_text(uri):
+            if "/2/" in uri:
+                raise Exception("NoSuchKey")
+            return f"text of {uri}"
+
+        mock_get_text.side_effect = get_text
+        mock_prepare_image.return_value = b"image"
+        mock_attachment.return_value = {"image": "attachment"}
+        mock_invoke_model.return_value = {
+            "response": {
+                "output": {"message": {"content": [{"text": '{"total": 1}'}]}}
+            },
+            "metering": {},
+        }
+
+        result = service.process_document_sections(document, prefetch_depth=2)
+
+        assert mock_invoke_model.call_count == 2
+        uris = {s.section_id: s.extraction_result_uri for s in result.sections}
+        assert uris["1"] == "s3://output-bucket/doc.pdf/sections/1/result.json"
+        assert uris["2"] is None
+        assert uris["3"] == "s3://output-bucket/doc.pdf/sections/3/result.json"
+        assert len(result.errors) == 1
+        assert "Error processing section 2" in result.errors[0]
+
+    @patch("idp_common.image.prepare_image")
+    @patch("idp_common.s3.get_text_content")
+    def test_load_section_inputs_keeps_page_order(
+        self, mock_get_text, mock_prepare_image, service, document
+    ):
+        mock_get_text.side_effect = lambda uri: uri.split("/")[-2]
+        mock_prepare_image.side_effect = lambda uri, w, h: uri.split("/")[-2].encode()
+        section = Section(
+            section_id="all", classification="invoice", page_ids=["3", "1", "2", "9"]
+        )
+
+        inputs = service.load_section_inputs(document, section)
+
+        assert inputs.page_ids == ["1", "2", "3"]
+        assert inputs.document_text == "1\n2\n3"
+        assert inputs.page_images == [b"1", b"2", b"3"]
+        assert inputs.errors == ["Page 9 not found in document"]
@@ -0,0 +1,176 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for buffered metric publishing.
+"""
+
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_buffer(monkeypatch):
+    """Start each test with an empty buffer and no background flusher."""
+    monkeypatch.setenv("METRICS_FLUSH_INTERVAL", "0")
+    monkeypatch.delenv("METRICS_MODE", raising=False)
+    monkeypatch.setattr(metrics, "_flusher_thread", None)
+    # Keep flushers started by other tests from draining the buffer mid-test
+    monkeypatch.setattr(metrics, "FLUSH_THRESHOLD", 10**9)
+    metrics._buffer.clear()
+    yield
+    metrics._buffer.clear()
+
+
+@pytest.fixture
+def mock_cloudwatch():
+    client = MagicMock()
+    with patch.object(metrics, "get_cloudwatch_client", return_value=client):
+        yield client
+
+
+@pytest.mark.unit
+class TestBufferedMetrics:
+    """Tests for put_metric buffering and flush."""
+
+    def test_put_metric_does_not_call_api(self, mock_cloudwatch):
+        metrics.put_metric("BedrockRequestsTotal", 1)
+
+        mock_cloudwatch.put_metric_data.assert_not_called()
+        assert len(metrics._buffer) == 1
+
+    def test_flush_aggregates_statistic_values(self, mock_cloudwatch):
+        metrics.put_metric("BedrockRequestLatency", 100, "Milliseconds")
+        metrics.put_metric("BedrockRequestLatency", 300, "Milliseconds")
+        metrics.put_metric("InputTokens", 50)
+
+        assert metrics.flush() == 3
+
+        mock_cloudwatch.put_metric_data.assert_called_once()
+        kwargs = mock_cloudwatch.put_metric_data.call_args.kwargs
+        assert kwargs["Namespace"] == "GENAIDP"
+        datums = {d["MetricName"]: d for d in kwargs["MetricData"]}
+        assert datums["BedrockRequestLatency"]["StatisticValues"] == {
+            "SampleCount": 2.0,
+            "Sum": 400.0,
+            "Minimum": 100.0,
+            "Maximum": 300.0,
+        }
+        assert datums["BedrockRequestLatency"]["Unit"] == "Milliseconds"
+        assert datums["InputTokens"]["StatisticValues"]["Sum"] == 50.0
+        assert len(metrics._buffer) == 0
+
+    def test_flush_batches_by_request_limit(self, mock_cloudwatch):
+        for i in range(metrics.MAX_DATUMS_PER_REQUEST + 5):
+            metrics.put_metric(f"Metric{i}", 1)
+
+        metrics.flush()
+
+        assert mock_cloudwatch.put_metric_data.call_count == 2
+        sizes = [
+            len(call.kwargs["MetricData"])
+            for call in mock_cloudwatch.put_metric_data.call_args_list
+        ]
+        assert sizes == [metrics.MAX_DATUMS_PER_REQUEST, 5]
+
+    def test_dimensions_and_namespace_are_separate_metrics(self, mock_cloudwatch):
+        metrics.put_metric("Pages", 1, dimensions=[{"Name": "Pattern", "Value": "2"}])
+        metrics.put_metric("Pages", 1)
+        metrics.put_metric("Pages", 1, namespace="Other")
+
+        metrics.flush()
+
+        calls = {
+            call.kwargs["Namespace"]: call.kwargs["MetricData"]
+            for call in mock_cloudwatch.put_metric_data.call_args_list
+        }
+        assert len(calls["GENAIDP"]) == 2
+        assert len(calls["Other"]) == 1
+
+    def test_flush_empty_buffer(self, mock_cloudwatch):
+        assert metrics.flush() == 0
+        mock_cloudwatch.put_metric_data.assert_not_called()
+
+    def test_api_errors_are_logged(self, mock_cloudwatch):
+        mock_cloudwatch.put_metric_data.side_effect = Exception("AccessDenied")
+        metrics.put_metric("BedrockRequestsTotal", 1)
+
+        # Does not raise
+        assert metrics.flush() == 1
+
+    def test_concurrent_put_metric(self, mock_cloudwatch):
+        def worker():
+            for _ in range(1000):
+                metrics.put_metric("InputTokens", 1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert metrics.flush() == 8000
+        datum = mock_cloudwatch.put_metric_data.call_args.kwargs["MetricData"][0]
+        assert datum["StatisticValues"]["Sum"] == 8000.0
+
+    def test_emf_mode(self, monkeypatch, mock_cloudwatch, capsys):
+        monkeypatch.setenv("METRICS_MODE", "emf")
+        metrics.put_metric("BedrockRequestLatency", 100, "Milliseconds")
+        metrics.put_metric("BedrockRequestLatency", 200, "Milliseconds")
+        metrics.put_metric("InputTokens", 50)
+
+        metrics.flush()
+
+        mock_cloudwatch.put_metric_data.assert_not_called()
+        document = json.loads(capsys.readouterr().out.strip())
+        directive = document["_aws"]["CloudWatchMetrics"][0]
+        assert directive["Namespace"] == "GENAIDP"
+        assert directive["Dimensions"] == [[]]
+        assert {m["Name"] for m in directive["Metrics"]} == {
+            "BedrockRequestLatency",
+            "InputTokens",
+        }
+        assert document["BedrockRequestLatency"] == [100, 200]
+        assert document["InputTokens"] == 50
+
+    def test_emf_value_limit(self, monkeypatch, capsys):
+        monkeypatch.setenv("METRICS_MODE", "emf")
+        for _ in range(metrics.MAX_EMF_VALUES + 1):
+            metrics.put_metric("InputTokens", 1)
+
+        metrics.flush()
+
+        lines = capsys.readouterr().out.strip().splitlines()
+        assert len(lines) == 2
+        assert len(json.loads(lines[0])["InputTokens"]) == metrics.MAX_EMF_VALUES
+
+    def test_flush_on_exit(self, mock_cloudwatch):
+        @metrics.flush_on_exit
+        def handler(event, context):
+            metrics.put_metric("ProcessedDocuments", 1)
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            handler({}, None)
+
+        mock_cloudwatch.put_metric_data.assert_called_once()
+
+    def test_client_performance_metrics(self, mock_cloudwatch):
+        metrics.create_client_performance_metrics(
+            "Textract", 120, is_success=False, error_type="Throttling"
+        )
+        metrics.flush()
+
+        names = {
+            d["MetricName"]
+            for d in mock_cloudwatch.put_metric_data.call_args.kwargs["MetricData"]
+        }
+        assert names == {
+            "TextractLatency",
+            "TextractFailure",
+            "TextractError.Throttling",
+        }
@@ -0,0 +1,140 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the page rendering memory budget.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common.ocr.render_budget import (
+    RenderBudget,
+    estimate_pixmap_bytes,
+    fit_scale_to_budget,
+    get_default_budget_mb,
+)
+from idp_common.ocr.service import OcrService
+
+MB = 1024 * 1024
+
+
+@pytest.mark.unit
+class TestRenderBudgetHelpers:
+    """Tests for pixmap estimation and scale fitting."""
+
+    def test_estimate_letter_page(self):
+        # 8.5x11 in at 150 DPI -> 1275x1650 RGB
+        assert estimate_pixmap_bytes(612, 792, 150 / 72) == 1275 * 1650 * 3
+
+    def test_fit_scale_keeps_scale_that_fits(self):
+        assert fit_scale_to_budget(612, 792, 150 / 72, 100 * MB, 1.0) == 150 / 72
+
+    def test_fit_scale_reduces_large_page(self):
+        # 36x48 in engineering drawing at 150 DPI is ~112 MB
+        scale = fit_scale_to_budget(2592, 3456, 150 / 72, 32 * MB, 72 / 72)
+
+        assert scale < 150 / 72
+        assert estimate_pixmap_bytes(2592, 3456, scale) <= 32 * MB * 1.01
+
+    def test_fit_scale_respects_minimum(self):
+        scale = fit_scale_to_budget(2592, 3456, 150 / 72, 1 * MB, 72 / 72)
+
+        assert scale == 1.0
+
+    def test_default_budget_from_lambda_memory(self, monkeypatch):
+        monkeypatch.setenv("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", "4096")
+        assert get_default_budget_mb() == 2048
+
+        monkeypatch.delenv("AWS_LAMBDA_FUNCTION_MEMORY_SIZE")
+        assert get_default_budget_mb() is None
+
+
+@pytest.mark.unit
+class TestRenderBudget:
+    """Tests for RenderBudget admission."""
+
+    def test_reservations_wait_for_budget(self):
+        budget = RenderBudget(max_bytes=100)
+        peak = []
+        lock = threading.Lock()
+
+        def render():
+            with budget.reserve(60):
+                with lock:
+                    peak.append(budget.in_use)
+                time.sleep(0.02)
+
+        threads = [threading.Thread(target=render) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max(peak) == 60
+        assert budget.in_use == 0
+
+    def test_oversized_reservation_runs_alone(self):
+        budget = RenderBudget(max_bytes=100)
+
+        with budget.reserve(500):
+            assert budget.in_use == 500
+        assert budget.in_use == 0
+
+
+@pytest.mark.unit
+class TestOcrServiceRenderBudget:
+    """Tests for budgeted page rendering in OcrService."""
+
+    def _page(self, width, height):
+        page = MagicMock()
+        page.rect.width = width
+        page.rect.height = height
+        pixmap = MagicMock()
+        pixmap.tobytes.return_value = b"jpeg"
+        page.get_pixmap.return_value = pixmap
+        return page
+
+    def _service(self, budget_mb, **image_config):
+        config = {
+            "ocr": {
+                "image": {"dpi": 150, **image_config},
+                "render_memory_budget_mb": budget_mb,
+                "min_render_dpi": 72,
+            }
+        }
+        with patch("boto3.client"):
+            return OcrService(config=config)
+
+    def test_no_budget_outside_lambda(self, monkeypatch):
+        monkeypatch.delenv("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", raising=False)
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {}})
+
+        assert service.render_budget is None
+
+    @patch("idp_common.metrics.put_metric")
+    def test_page_within_budget_renders_at_dpi(self, mock_put_metric):
+        service = self._service(512, target_width="", target_height="2000")
+        page = self._page(612, 792)
+
+        assert service._extract_page_image(page, True, 1) == b"jpeg"
+
+        page.get_pixmap.assert_called_once_with(dpi=150)
+        names = {call.args[0] for call in mock_put_metric.call_args_list}
+        assert names == {"OcrPageRenderTime", "OcrPeakMemory"}
+
+    @patch("idp_common.metrics.put_metric")
+    @patch("fitz.Matrix")
+    def test_huge_page_rendered_at_lower_dpi(self, mock_matrix, mock_put_metric):
+        service = self._service(32, target_width="", target_height="20000")
+        page = self._page(2592, 3456)  # 36x48 in
+
+        service._extract_page_image(page, True, 1)
+
+        scale = mock_matrix.call_args.args[0]
+        assert 72 / 72 <= scale < 150 / 72
+        assert estimate_pixmap_bytes(2592, 3456, scale) <= 32 * MB * 1.01
+        page.get_pixmap.assert_called_once_with(matrix=mock_matrix.return_value)
@@ -0,0 +1,215 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for asynchronous Textract jobs.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common.models import Document
+from idp_common.ocr import textract_async
+from idp_common.ocr.service import OcrService
+from idp_common.ocr.textract_async import (
+    TextractJobError,
+    analyze_document_async,
+    get_job_results,
+    split_blocks_by_page,
+)
+
+
+def _line(page, text):
+    return {
+        "BlockType": "LINE",
+        "Id": f"{page}-{text}",
+        "Page": page,
+        "Text": text,
+        "Confidence": 99.0,
+        "Geometry": {"BoundingBox": {"Left": 0.1, "Top": 0.1}},
+    }
+
+
+class StubTextractClient:
+    """Local stand-in for the Textract asynchronous job APIs."""
+
+    def __init__(self, blocks, page_size=2, in_progress_polls=1, status="SUCCEEDED"):
+        self.blocks = blocks
+        self.page_size = page_size
+        self.in_progress_polls = in_progress_polls
+        self.status = status
+        self.started = []
+        self.get_calls = []
+
+    def start_document_analysis(self, **kwargs):
+        self.started.append(("analysis", kwargs))
+        return {"JobId": "job-1"}
+
+    def start_document_text_detection(self, **kwargs):
+        self.started.append(("text", kwargs))
+        return {"JobId": "job-1"}
+
+    def _get(self, **kwargs):
+        self.get_calls.append(kwargs)
+        if self.in_progress_polls:
+            self.in_progress_polls -= 1
+            return {"JobStatus": "IN_PROGRESS"}
+        if self.status == "FAILED":
+            return {"JobStatus": "FAILED", "StatusMessage": "Unsupported document"}
+        start = int(kwargs.get("NextToken", 0))
+        end = start + self.page_size
+        response = {
+            "JobStatus": self.status,
+            "DocumentMetadata": {"Pages": 3},
+            "Blocks": self.blocks[start:end],
+        }
+        if end < len(self.blocks):
+            response["NextToken"] = str(end)
+        return response
+
+    get_document_analysis = _get
+    get_document_text_detection = _get
+
+    def detect_document_text(self, **kwargs):
+        raise AssertionError("synchronous API should not be called")
+
+
+BLOCKS = [
+    {"BlockType": "PAGE", "Id": "p1", "Page": 1},
+    _line(1, "first"),
+    {"BlockType": "PAGE", "Id": "p3", "Page": 3},
+    _line(3, "third"),
+    _line(3, "last"),
+]
+
+
+@pytest.mark.unit
+class TestTextractAsyncHelpers:
+    """Tests for job polling, pagination and page splitting."""
+
+    def test_get_job_results_polls_and_paginates(self):
+        client = StubTextractClient(BLOCKS, page_size=2, in_progress_polls=2)
+
+        with patch("time.sleep") as mock_sleep:
+            blocks, metadata = get_job_results(client, "job-1", analysis=False)
+
+        assert blocks == BLOCKS
+        assert metadata == {"Pages": 3}
+        assert mock_sleep.call_count == 2
+        assert [call.get("NextToken") for call in client.get_calls] == [
+            None,
+            None,
+            None,
+            "2",
+            "4",
+        ]
+
+    def test_get_job_results_raises_on_failure(self):
+        client = StubTextractClient(BLOCKS, in_progress_polls=0, status="FAILED")
+
+        with pytest.raises(TextractJobError, match="Unsupported document"):
+            get_job_results(client, "job-1", analysis=True)
+
+    def test_get_job_results_times_out(self):
+        client = StubTextractClient(BLOCKS, in_progress_polls=100)
+
+        with pytest.raises(TextractJobError, match="did not finish"):
+            get_job_results(client, "job-1", analysis=False, timeout=0)
+
+    def test_split_blocks_by_page(self):
+        pages = split_blocks_by_page(BLOCKS, 3)
+
+        assert sorted(pages) == [1, 2, 3]
+        assert pages[2] == {"DocumentMetadata": {"Pages": 1}, "Blocks": []}
+        assert [b["Text"] for b in pages[3]["Blocks"] if "Text" in b] == [
+            "third",
+            "last",
+        ]
+        assert all(b["Page"] == 1 for b in pages[3]["Blocks"])
+        # The job results are not modified
+        assert BLOCKS[2]["Page"] == 3
+
+    def test_analyze_document_async_uses_analysis_for_features(self):
+        client = StubTextractClient(BLOCKS, in_progress_polls=0)
+
+        pages = analyze_document_async(
+            client, "bucket", "doc.pdf", 3, feature_types=["TABLES"]
+        )
+
+        kind, kwargs = client.started[0]
+        assert kind == "analysis"
+        assert kwargs == {
+            "DocumentLocation": {"S3Object": {"Bucket": "bucket", "Name": "doc.pdf"}},
+            "FeatureTypes": ["TABLES"],
+        }
+        assert len(pages) == 3
+
+
+@pytest.mark.unit
+class TestOcrServiceAsyncTextract:
+    """Tests for OcrService with asynchronous Textract jobs."""
+
+    def _service(self, **ocr_config):
+        config = {"ocr": {"features": [], "image": {"dpi": 72}, **ocr_config}}
+        with patch("boto3.client"):
+            return OcrService(config=config, backend="textract")
+
+    def test_auto_mode_uses_page_threshold(self):
+        service = self._service(textract_mode="auto", async_page_threshold=50)
+
+        assert not service._use_async_textract(49)
+        assert service._use_async_textract(50)
+        assert not self._service()._use_async_textract(1000)
+
+    @patch("idp_common.s3.write_content")
+    @patch("fitz.open")
+    def test_process_document_with_async_job(self, mock_fitz_open, mock_write):
+        service = self._service(textract_mode="async", async_poll_interval=0)
+        service.textract_client = StubTextractClient(BLOCKS, in_progress_polls=0)
+        body = MagicMock()
+        body.read.return_value = b"%PDF-1.4"
+        service.s3_client.get_object.return_value = {"Body": body}
+        pdf_document = MagicMock()
+        pdf_document.__len__.return_value = 3
+        pdf_document.is_pdf = True
+        mock_fitz_open.return_value = pdf_document
+        document = Document(
+            id="doc",
+            input_bucket="input",
+            input_key="doc.pdf",
+            output_bucket="output",
+        )
+
+        with (
+            patch.object(service, "_extract_page_image", return_value=b"jpeg"),
+            patch.object(
+                service, "_parse_textract_response", return_value={"text": ""}
+            ),
+        ):
+            result = service.process_document(document)
+
+        assert result.errors == []
+        assert sorted(result.pages) == ["1", "2", "3"]
+        assert result.pages["3"].raw_text_uri == (
+            "s3://output/doc.pdf/pages/3/rawText.json"
+        )
+        assert result.metering == {"OCR/textract/detect_document_text": {"pages": 3}}
+        raw_text = {
+            call.args[2]: call.args[0]
+            for call in mock_write.call_args_list
+            if call.args[2].endswith("rawText.json")
+        }
+        page3 = raw_text["doc.pdf/pages/3/rawText.json"]
+        assert [b["Id"] for b in page3["Blocks"]] == ["p3", "3-third", "3-last"]
+
+    @patch("idp_common.s3.write_content")
+    def test_failed_job_falls_back_to_sync(self, mock_write):
+        service = self._service(textract_mode="async")
+        document = Document(id="doc", input_bucket="input", input_key="doc.pdf")
+
+        with patch.object(
+            textract_async,
+            "analyze_document_async",
+            side_effect=TextractJobError("boom"),
+        ):
+            assert service._run_async_textract(document, 3) is None
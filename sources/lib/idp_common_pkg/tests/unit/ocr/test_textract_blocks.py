@@ -0,0 +1,126 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for single-pass Textract block processing.
+"""
+
+import json
+import os
+
+import pytest
+from idp_common.ocr.textract_blocks import (
+    TextractBlockIndex,
+    generate_text_confidence_data,
+    process_textract_response,
+)
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__), "fixtures", "textract_table_page.json"
+)
+
+
+@pytest.fixture
+def table_page():
+    with open(FIXTURE) as f:
+        return json.load(f)
+
+
+def make_table_page(rows, columns):
+    """Build a synthetic analyze_document response with one large table."""
+    blocks = []
+    cell_ids = []
+    for r in range(1, rows + 1):
+        for c in range(1, columns + 1):
+            word_id = f"w-{r}-{c}"
+            cell_id = f"c-{r}-{c}"
+            blocks.append({"BlockType": "WORD", "Id": word_id, "Text": f"r{r}c{c}"})
+            blocks.append(
+                {
+                    "BlockType": "CELL",
+                    "Id": cell_id,
+                    "RowIndex": r,
+                    "ColumnIndex": c,
+                    "Relationships": [{"Type": "CHILD", "Ids": [word_id]}],
+                }
+            )
+            cell_ids.append(cell_id)
+    blocks.append(
+        {
+            "BlockType": "TABLE",
+            "Id": "table",
+            "Relationships": [{"Type": "CHILD", "Ids": cell_ids}],
+        }
+    )
+    return {"DocumentMetadata": {"Pages": 1}, "Blocks": blocks}
+
+
+@pytest.mark.unit
+class TestTextractBlocks:
+    """Tests for TextractBlockIndex and process_textract_response."""
+
+    def test_text_confidence_table(self, table_page):
+        result = generate_text_confidence_data(table_page)
+
+        assert result["text"].split("\n") == [
+            "| Text | Confidence |",
+            "|:-----|:-----------|",
+            "| Invoice Number: INV-1001 | 99.5 |",
+            "| Item \\| Amount | 98.1 |",
+            "| Paid by check (HANDWRITING) | 87.4 |",
+        ]
+
+    def test_tables_and_forms(self, table_page):
+        content = process_textract_response(table_page)
+
+        assert content.tables == [
+            [["Item", "Amount"], ["Widget", "12.50"], ["Total 12.50", "Total 12.50"]]
+        ]
+        assert content.key_values == [
+            ("Invoice Number:", "INV-1001"),
+            ("Paid", "[X]"),
+        ]
+        assert content.text == "Invoice Number: INV-1001\nItem | Amount\nPaid by check"
+        assert content.block_counts["CELL"] == 5
+
+    def test_missing_related_blocks_are_skipped(self):
+        index = TextractBlockIndex(
+            {
+                "Blocks": [
+                    {
+                        "BlockType": "KEY_VALUE_SET",
+                        "Id": "key",
+                        "EntityTypes": ["KEY"],
+                        "Relationships": [{"Type": "VALUE", "Ids": ["missing"]}],
+                    }
+                ]
+            }
+        )
+
+        assert index.key_value_pairs() == [("", "")]
+
+    def test_text_confidence_does_not_build_index(self, table_page):
+        content = process_textract_response(table_page)
+
+        assert content.text_confidence == generate_text_confidence_data(
+            table_page, TextractBlockIndex(table_page)
+        )
+        # Tables, form fields and the block index are only built on access
+        assert "index" not in content.__dict__
+        assert content.key_values
+        assert "index" in content.__dict__
+
+    def test_large_table(self):
+        content = process_textract_response(make_table_page(100, 20))
+
+        assert len(content.tables[0]) == 100
+        assert content.tables[0][99][19] == "r100c20"
+
+    def test_empty_response(self):
+        content = process_textract_response({})
+
+        assert content.text == ""
+        assert content.tables == []
+        assert content.text_confidence == {
+            "text": "| Text | Confidence |\n|:-----|:-----------|"
+        }
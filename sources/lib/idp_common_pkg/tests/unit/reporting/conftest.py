@@ -0,0 +1,17 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Pytest configuration for the reporting tests.
+"""
+
+import pytest
+from idp_common.reporting.schema_registry import SchemaRegistry
+
+
+@pytest.fixture(autouse=True)
+def clear_schema_registry():
+    """Start each test without Glue tables registered by earlier tests."""
+    SchemaRegistry.clear_cache()
+    yield
+    SchemaRegistry.clear_cache()
@@ -0,0 +1,203 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+"""
+Unit tests for the reporting backfill.
+"""
+
+import io
+import json
+
+import boto3
+import pyarrow.parquet as pq
+import pytest
+from idp_common import s3 as s3_module
+from idp_common.dynamodb.service import DocumentDynamoDBService
+from idp_common.models import Document, Section, Status
+from idp_common.reporting.backfill import ReportingBackfill
+from moto import mock_aws
+
+TABLE_NAME = "tracking-table"
+REPORTING_BUCKET = "reporting-bucket"
+OUTPUT_BUCKET = "output-bucket"
+PRICING = {
+    "pricing": [
+        {
+            "name": "textract/detect_document_text",
+            "units": [{"name": "pages", "price": "0.0015"}],
+        }
+    ]
+}
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    # Extraction results are read with the shared client, created under the mock
+    monkeypatch.setattr(s3_module, "_s3_client", None)
+    with mock_aws():
+        boto3.resource("dynamodb", region_name="us-east-1").create_table(
+            TableName=TABLE_NAME,
+            KeySchema=[
+                {"AttributeName": "PK", "KeyType": "HASH"},
+                {"AttributeName": "SK", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket=REPORTING_BUCKET)
+        s3.create_bucket(Bucket=OUTPUT_BUCKET)
+        yield s3
+
+
+def track_document(s3, document_id, queued_time, classes):
+    """Store a completed document in the tracking table with its results."""
+    document = Document(
+        id=document_id,
+        input_key=document_id,
+        status=Status.COMPLETED,
+        queued_time=queued_time,
+        initial_event_time=queued_time,
+        num_pages=len(classes),
+        metering={"OCR/textract/detect_document_text": {"pages": len(classes)}},
+    )
+    for i, classification in enumerate(classes, start=1):
+        key = f"{document_id}/sections/{i}/result.json"
+        s3.put_object(
+            Bucket=OUTPUT_BUCKET,
+            Key=key,
+            Body=json.dumps({"total": str(i * 10), "vendor": {"name": "ACME"}}),
+        )
+        document.sections.append(
+            Section(
+                section_id=str(i),
+                classification=classification,
+                page_ids=[str(i)],
+                extraction_result_uri=f"s3://{OUTPUT_BUCKET}/{key}",
+            )
+        )
+    service = DocumentDynamoDBService(table_name=TABLE_NAME)
+    service.create_document(document)
+    service.update_document(document)
+    return document
+
+
+def read_objects(s3, prefix):
+    """Read the Parquet objects under a prefix of the reporting bucket."""
+    response = s3.list_objects_v2(Bucket=REPORTING_BUCKET, Prefix=prefix)
+    return {
+        item["Key"]: pq.read_table(
+            io.BytesIO(
+                s3.get_object(Bucket=REPORTING_BUCKET, Key=item["Key"])["Body"].read()
+            )
+        ).to_pylist()
+        for item in response.get("Contents", [])
+    }
+
+
+def make_backfill(tmp_path, **kwargs):
+    return ReportingBackfill(
+        REPORTING_BUCKET,
+        tracking_table=TABLE_NAME,
+        config=PRICING,
+        checkpoint_path=str(tmp_path / "checkpoint.json"),
+        job_id="test",
+        max_workers=2,
+        use_processes=False,
+        **kwargs,
+    )
+
+
+@pytest.mark.unit
+def test_backfill_writes_partition_files(aws, tmp_path):
+    track_document(aws, "a.pdf", "2025-01-01T10:00:00Z", ["Invoice", "Letter"])
+    track_document(aws, "b.pdf", "2025-01-01T11:00:00Z", ["Invoice"])
+    track_document(aws, "c.pdf", "2025-01-03T09:00:00Z", ["Invoice"])
+    # A per-document file written earlier by the Lambda, with outdated costs
+    aws.put_object(
+        Bucket=REPORTING_BUCKET,
+        Key="metering/date=2025-01-01/a.pdf_20250101_100000_000_results.parquet",
+        Body=b"stale",
+    )
+
+    summary = make_backfill(tmp_path).run("2025-01-01", "2025-01-02")
+
+    assert summary["completed_dates"]["2025-01-01"] == {
+        "documents": 2,
+        "files": 3,
+        "failed": [],
+        "skipped": [],
+    }
+    assert summary["completed_dates"]["2025-01-02"]["documents"] == 0
+    metering = read_objects(aws, "metering/")
+    assert list(metering) == [
+        "metering/date=2025-01-01/backfill_test_2025-01-01_0000.parquet"
+    ]
+    rows = metering["metering/date=2025-01-01/backfill_test_2025-01-01_0000.parquet"]
+    assert [(row["document_id"], row["estimated_cost"]) for row in rows] == [
+        ("a.pdf", 2 * 0.0015),
+        ("b.pdf", 0.0015),
+    ]
+    invoices = read_objects(aws, "document_sections/invoice/")
+    (invoice_rows,) = invoices.values()
+    assert sorted(row["document_id"] for row in invoice_rows) == ["a.pdf", "b.pdf"]
+    assert invoice_rows[0]["vendor.name"] == "ACME"
+    assert "total" in summary["section_fields"]["Invoice"]
+    assert set(summary["section_fields"]) == {"Invoice", "Letter"}
+
+
+@pytest.mark.unit
+def test_backfill_replaces_files_saved_at_processing_time(aws, tmp_path):
+    track_document(aws, "in/a.pdf", "2025-01-01T10:00:00Z", ["Invoice"])
+    # Files saved without the initial event time were keyed on the save time
+    stale_keys = [
+        "metering/date=2025-01-02/in_a.pdf_20250102_083000_123_results.parquet",
+        "document_sections/invoice/date=2025-01-02/in_a.pdf_section_1.parquet",
+    ]
+    kept_keys = [
+        "metering/date=2025-01-02/other.pdf_20250102_090000_000_results.parquet",
+        "metering/date=2024-12-31/in_a.pdf_20241231_090000_000_results.parquet",
+    ]
+    for key in stale_keys + kept_keys:
+        aws.put_object(Bucket=REPORTING_BUCKET, Key=key, Body=b"stale")
+
+    make_backfill(tmp_path).run("2025-01-01", "2025-01-01")
+
+    response = aws.list_objects_v2(Bucket=REPORTING_BUCKET)
+    keys = {item["Key"] for item in response["Contents"]}
+    assert not keys & set(stale_keys)
+    # Other documents and partitions before the backfilled range are kept
+    assert set(kept_keys) <= keys
+    assert "metering/date=2025-01-01/backfill_test_2025-01-01_0000.parquet" in keys
+
+
+@pytest.mark.unit
+def test_backfill_resumes_from_checkpoint(aws, tmp_path):
+    track_document(aws, "a.pdf", "2025-01-01T10:00:00Z", ["Invoice"])
+    make_backfill(tmp_path).run("2025-01-01", "2025-01-01")
+    track_document(aws, "b.pdf", "2025-01-01T12:00:00Z", ["Invoice"])
+    track_document(aws, "c.pdf", "2025-01-02T12:00:00Z", ["Invoice"])
+
+    summary = make_backfill(tmp_path, data_to_save=["metering"]).run(
+        "2025-01-01", "2025-01-02"
+    )
+
+    # The first day was done before and is not rewritten with b.pdf
+    assert summary["completed_dates"]["2025-01-01"]["documents"] == 1
+    assert summary["completed_dates"]["2025-01-02"]["documents"] == 1
+    metering = read_objects(aws, "metering/date=2025-01-01/")
+    (rows,) = metering.values()
+    assert [row["document_id"] for row in rows] == ["a.pdf"]
+    assert not read_objects(aws, "document_sections/invoice/date=2025-01-02/")
+    with open(tmp_path / "checkpoint.json") as f:
+        assert sorted(json.load(f)["completed_dates"]) == ["2025-01-01", "2025-01-02"]
+
+
+@pytest.mark.unit
+def test_backfill_rejects_unknown_data(aws, tmp_path):
+    with pytest.raises(ValueError, match="evaluation_results"):
+        make_backfill(tmp_path, data_to_save=["evaluation_results"])
@@ -5,11 +5,18 @@
 Unit tests for cost calculation functionality
 """
 
+import io
+import logging
 from datetime import datetime
 
+import boto3
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from idp_common.models import Document
+from idp_common.reporting.pricing import PricingIndex
 from idp_common.reporting.save_reporting_data import SaveReportingData
+from moto import mock_aws
 
 
 @pytest.mark.unit
@@ -162,3 +169,86 @@ def test_cost_calculation_empty_metering():
     # This test verifies that empty metering data doesn't cause errors
     assert document.metering == {}, "Document should have empty metering data"
     assert document.num_pages == 1, "Document should have 1 page"
+
+
+@pytest.mark.unit
+def test_pricing_index_resolves_each_pair_once(caplog):
+    """Test that partial matches and misses are resolved once and remembered"""
+    index = PricingIndex(
+        {
+            "bedrock/us.amazon.nova-lite-v1:0": {"inputTokens": 0.00006},
+            "textract/detect_document_text": {"pages": 0.0015},
+        }
+    )
+
+    with caplog.at_level(logging.INFO, logger="idp_common.reporting.pricing"):
+        for _ in range(3):
+            assert (
+                index.unit_cost("bedrock/us.amazon.nova-lite-v1:0:300k", "inputTokens")
+                == 0.00006
+            )
+            assert index.unit_cost("unknown/service", "calls") == 0.0
+
+    assert index.unit_cost("textract/detect_document_text", "pages") == 0.0015
+    assert len(caplog.records) == 2
+
+    unit_costs, estimated_costs = index.price(
+        ["textract/detect_document_text", "unknown/service"],
+        ["pages", "calls"],
+        pa.array([4.0, 2.0]),
+    )
+    assert unit_costs.to_pylist() == [0.0015, 0.0]
+    assert estimated_costs.to_pylist() == [4.0 * 0.0015, 0.0]
+
+
+@pytest.mark.unit
+@mock_aws
+def test_save_metering_data_prices_records():
+    """Test that saved metering records carry unit and estimated costs"""
+    boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="test-bucket")
+    pricing_config = {
+        "pricing": [
+            {
+                "name": "bedrock/us.amazon.nova-lite-v1:0",
+                "units": [
+                    {"name": "inputTokens", "price": "0.00006"},
+                    {"name": "outputTokens", "price": "0.00024"},
+                ],
+            },
+        ]
+    }
+    document = Document(
+        id="folder/doc.pdf",
+        input_key="folder/doc.pdf",
+        num_pages=3,
+        metering={
+            "Extraction/bedrock/us.amazon.nova-lite-v1:0": {
+                "inputTokens": 1000,
+                "outputTokens": 100,
+            },
+            "OCR/textract/detect_document_text": {"pages": 3},
+        },
+        initial_event_time="2025-01-02T03:04:05Z",
+    )
+    reporter = SaveReportingData("test-bucket", config=pricing_config)
+
+    result = reporter.save_metering_data(document)
+
+    s3_client = boto3.client("s3", region_name="us-east-1")
+    (key,) = [
+        item["Key"]
+        for item in s3_client.list_objects_v2(Bucket="test-bucket")["Contents"]
+    ]
+    body = s3_client.get_object(Bucket="test-bucket", Key=key)["Body"].read()
+    rows = pq.read_table(io.BytesIO(body)).to_pylist()
+
+    assert result["statusCode"] == 200
+    assert key.startswith("metering/date=2025-01-02/folder_doc.pdf_")
+    assert [(row["context"], row["unit"], row["unit_cost"]) for row in rows] == [
+        ("Extraction", "inputTokens", 0.00006),
+        ("Extraction", "outputTokens", 0.00024),
+        ("OCR", "pages", 0.0),
+    ]
+    assert rows[0]["estimated_cost"] == 1000 * 0.00006
+    assert {row["number_of_pages"] for row in rows} == {3}
+    assert {row["document_id"] for row in rows} == {"folder/doc.pdf"}
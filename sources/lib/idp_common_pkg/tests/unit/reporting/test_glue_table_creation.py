@@ -417,10 +417,15 @@ class TestGlueTableCreation:
         # Verify successful processing
         assert result["statusCode"] == 200
 
-        # Verify S3 put_object was called with lowercase path
-        mock_s3.put_object.assert_called_once()
-        s3_call_args = mock_s3.put_object.call_args[1]
-        s3_key = s3_call_args["Key"]
+        # Verify S3 put_object was called once with lowercase path, besides
+        # the schema registry record of the new table
+        section_keys = [
+            call[1]["Key"]
+            for call in mock_s3.put_object.call_args_list
+            if not call[1]["Key"].startswith("_schema_registry/")
+        ]
+        assert len(section_keys) == 1
+        s3_key = section_keys[0]
 
         # Check that the S3 key uses lowercase 'w2' not 'W2'
         assert "/w2/" in s3_key
@@ -0,0 +1,284 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+"""
+Unit tests for the document and class cost and latency profiles.
+"""
+
+import datetime
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from idp_common import tracing
+from idp_common.reporting import profile
+
+
+def _span(name, span_id, parent_id, start, duration_ms, **attributes):
+    record = {
+        "span": name,
+        "trace_id": "t1",
+        "span_id": span_id,
+        "parent_id": parent_id,
+        "start_time": start,
+        "duration_ms": duration_ms,
+    }
+    record.update(attributes)
+    return record
+
+
+@pytest.mark.unit
+def test_parse_span_record_formats(caplog):
+    emf = {
+        "_aws": {"CloudWatchMetrics": []},
+        "Span": "image.resize",
+        "SpanDuration": 12.5,
+        "page_id": "1",
+    }
+    log = {"span": "s3.get_object", "duration_ms": 3.0}
+    lines = [
+        "2025-01-01T00:00:00Z\tabc-123\tINFO\t" + json.dumps(log),
+        json.dumps(emf),
+        json.dumps({"level": "INFO", "message": json.dumps(log)}),
+        "START RequestId: abc-123",
+        '{"not": "a span"}',
+    ]
+
+    records = [profile.parse_span_record(line) for line in lines]
+
+    assert records[0] == log
+    assert records[1] == {"span": "image.resize", "duration_ms": 12.5, "page_id": "1"}
+    assert records[2] == log
+    assert records[3] is None and records[4] is None
+
+
+@pytest.mark.unit
+def test_metering_records_are_priced():
+    metering = {
+        "Extraction/bedrock/us.amazon.nova-lite-v1:0": {
+            "inputTokens": 1000,
+            "outputTokens": 100,
+        },
+        "OCR/textract/detect_document_text": {"pages": 2},
+    }
+    prices = {("textract/detect_document_text", "pages"): 0.0015}
+
+    records = profile.metering_records(
+        metering, lambda service_api, unit: prices.get((service_api, unit), 0.0)
+    )
+
+    ocr = [record for record in records if record["context"] == "OCR"]
+    assert ocr == [
+        {
+            "context": "OCR",
+            "service_api": "textract/detect_document_text",
+            "unit": "pages",
+            "value": 2.0,
+            "estimated_cost": 0.003,
+        }
+    ]
+    assert sum(record["estimated_cost"] for record in records) == 0.003
+
+
+@pytest.mark.unit
+def test_document_profile_breakdown():
+    metering = [
+        {
+            "context": "OCR",
+            "service_api": "textract/detect_document_text",
+            "unit": "pages",
+            "value": 2,
+            "estimated_cost": 0.003,
+        },
+        {
+            "context": "GranularAssessment",
+            "service_api": "bedrock/model",
+            "unit": "inputTokens",
+            "value": 500,
+            "estimated_cost": 0.001,
+        },
+        {
+            "context": "Assessment",
+            "service_api": "lambda/duration",
+            "unit": "gb_seconds",
+            "value": 2.5,
+            "estimated_cost": 0.0,
+        },
+    ]
+    spans = [
+        _span("ocr.process_document", "a", None, 100.0, 3000, document_id="doc"),
+        _span("ocr.page", "b", "a", 100.5, 1000, document_id="doc", page_id="1"),
+        _span("image.render", "c", "b", 100.5, 400, document_id="doc", page_id="1"),
+        _span("ocr.page", "d", "a", 100.5, 2000, document_id="doc", page_id="2"),
+        _span("assessment.section", "e", None, 104.0, 1000, section_id="1"),
+        _span("bedrock.converse", "f", "e", 104.0, 200, error="ThrottlingException"),
+        _span("retry.sleep", "g", "e", 104.2, 500, reason="ThrottlingException"),
+        _span("ocr.process_document", "x", None, 100.0, 9000, document_id="other"),
+    ]
+    # The assessment spans belong to the document through their trace
+    spans[-1]["trace_id"] = "t2"
+
+    result = profile.build_document_profile("doc", metering, spans, num_pages=2)
+
+    assert result["total_cost"] == pytest.approx(0.004)
+    assert result["cost_per_page"] == pytest.approx(0.002)
+    assert result["span_wall_seconds"] == pytest.approx(5.0)
+    stages = {entry["stage"]: entry for entry in result["stages"]}
+    assert set(stages) == {"OCR", "GranularAssessment"}
+    assert stages["OCR"]["span_seconds"] == pytest.approx(3.0)
+    assert stages["GranularAssessment"]["input_tokens"] == 500
+    assert stages["GranularAssessment"]["lambda_gb_seconds"] == 2.5
+    assert stages["GranularAssessment"]["span_seconds"] == pytest.approx(1.0)
+
+    self_time = {entry["span"]: entry["seconds"] for entry in result["self_time"]}
+    # Both pages run in parallel from 100.5 to 102.5
+    assert self_time["ocr.process_document"] == pytest.approx(1.0)
+    assert self_time["ocr.page"] == pytest.approx(2.6)
+    assert [row["page_id"] for row in result["pages"]] == ["2", "1"]
+    assert result["pages"][1]["seconds"] == pytest.approx(1.0)
+
+    retries = result["retries"]
+    assert retries["sleeps"] == 1
+    assert retries["sleep_seconds_by_reason"] == {
+        "ThrottlingException": pytest.approx(0.5)
+    }
+    assert retries["errors"] == [
+        {"span": "bedrock.converse", "error": "ThrottlingException", "count": 1}
+    ]
+    assert [(row["depth"], row["span"]) for row in result["waterfall"]] == [
+        (0, "ocr.process_document"),
+        (1, "ocr.page"),
+        (2, "image.render"),
+        (1, "ocr.page"),
+        (0, "assessment.section"),
+        (1, "bedrock.converse"),
+        (1, "retry.sleep"),
+    ]
+    assert "ThrottlingException x1" in profile.format_document_profile(result)
+
+
+@pytest.mark.unit
+def test_waterfall_collapses_repeated_spans():
+    spans = [_span("extraction.section", "root", None, 0.0, 1000, document_id="d")]
+    for i in range(5):
+        spans.append(_span("s3.get_object", f"s{i}", "root", 0.1 * i, 10 * (i + 1)))
+
+    result = profile.build_document_profile("d", [], spans, max_repeated_spans=3)
+
+    root, aggregate, slowest = result["waterfall"]
+    assert aggregate["count"] == 5
+    assert aggregate["total_seconds"] == pytest.approx(0.15)
+    assert aggregate["max_seconds"] == pytest.approx(0.05)
+    assert slowest["seconds"] == pytest.approx(0.05)
+    assert slowest["depth"] == aggregate["depth"] + 1
+
+
+@pytest.mark.unit
+def test_document_profile_from_collected_spans():
+    with tracing.collect() as spans:
+        with tracing.span("classification.document", document_id="doc"):
+            with tracing.span("classification.page", page_id="1"):
+                pass
+
+    result = profile.build_document_profile(
+        "doc", [], [span.to_dict() for span in spans]
+    )
+
+    assert [row["span"] for row in result["waterfall"]] == [
+        "classification.document",
+        "classification.page",
+    ]
+    assert result["pages"][0]["page_id"] == "1"
+
+
+def _write(root, key, rows, schema):
+    path = os.path.join(root, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), path)
+
+
+@pytest.mark.unit
+def test_class_profiles_from_reporting_files(tmp_path):
+    metering_schema = pa.schema(
+        [
+            ("document_id", pa.string()),
+            ("context", pa.string()),
+            ("service_api", pa.string()),
+            ("unit", pa.string()),
+            ("value", pa.float64()),
+            ("number_of_pages", pa.int32()),
+            ("unit_cost", pa.float64()),
+            ("estimated_cost", pa.float64()),
+            ("timestamp", pa.timestamp("ms")),
+        ]
+    )
+    section_schema = pa.schema(
+        [("document_id", pa.string()), ("section_classification", pa.string())]
+    )
+
+    def metering(document_id, date, cost, pages):
+        timestamp = datetime.datetime.fromisoformat(date)
+        rows = [
+            {
+                "document_id": document_id,
+                "context": "Extraction",
+                "service_api": "bedrock/model",
+                "unit": "inputTokens",
+                "value": 1000.0,
+                "number_of_pages": pages,
+                "unit_cost": cost / 1000,
+                "estimated_cost": cost,
+                "timestamp": timestamp,
+            }
+        ]
+        _write(
+            tmp_path,
+            f"metering/date={date}/{document_id}_results.parquet",
+            rows,
+            metering_schema,
+        )
+
+    metering("a.pdf", "2025-01-01", 1.0, 2)
+    metering("b.pdf", "2025-01-02", 3.0, 1)
+    metering("c.pdf", "2025-01-02", 5.0, 5)
+    metering("d.pdf", "2025-02-01", 100.0, 1)
+    for document_id, classification in (
+        ("a.pdf", "Invoice"),
+        ("b.pdf", "Invoice"),
+        ("c.pdf", "Letter"),
+    ):
+        _write(
+            tmp_path,
+            f"document_sections/{classification.lower()}/date=2025-01-01/"
+            f"{document_id}_section_1.parquet",
+            [{"document_id": document_id, "section_classification": classification}],
+            section_schema,
+        )
+
+    rows = profile.read_reporting_rows(
+        str(tmp_path), "metering", "2025-01-01", "2025-01-31"
+    )
+    classes = profile.primary_classes(
+        profile.read_reporting_rows(str(tmp_path), "document_sections")
+    )
+    result = profile.build_class_profiles(rows, classes)
+
+    assert sorted(result) == ["Invoice", "Letter"]
+    invoice = result["Invoice"]
+    assert invoice["documents"] == 2
+    assert invoice["total_cost"] == pytest.approx(4.0)
+    assert invoice["metrics"]["cost"]["p50"] == pytest.approx(2.0)
+    assert invoice["metrics"]["cost"]["p90"] == pytest.approx(2.8)
+    assert invoice["metrics"]["cost_per_page"]["max"] == pytest.approx(3.0)
+    assert invoice["metrics"]["input_tokens"]["mean"] == 1000
+    assert result["Letter"]["metrics"]["cost[Extraction]"]["p99"] == 5.0
+    assert "Invoice: 2 documents" in profile.format_class_profiles(result)
+
+
+@pytest.mark.unit
+def test_percentile_interpolates():
+    assert profile.percentile([], 50) == 0.0
+    assert profile.percentile([3, 1, 2], 50) == 2
+    assert profile.percentile([1, 2], 90) == pytest.approx(1.9)
+    assert profile.percentile([5], 99) == 5
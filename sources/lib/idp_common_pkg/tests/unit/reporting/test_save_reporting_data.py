@@ -446,3 +446,48 @@ class TestSaveReportingDataSections:
         mock_save_metering.assert_called_once_with(document_with_sections)
         mock_save_sections.assert_called_once_with(document_with_sections)
         assert len(results) == 2
+
+    @patch.object(SaveReportingData, "_create_or_update_glue_table")
+    @patch("idp_common.reporting.save_reporting_data.get_json_content")
+    def test_save_document_sections_in_parallel(
+        self, mock_get_json, mock_glue, mock_s3_client
+    ):
+        """Test that sections are saved concurrently with one Glue update per type."""
+        from idp_common.models import Section
+
+        sections = [
+            Section(
+                section_id=str(i),
+                classification="invoice" if i % 2 else "receipt",
+                extraction_result_uri=f"s3://test-bucket/doc/sections/{i}/result.json",
+            )
+            for i in range(1, 7)
+        ]
+        document = Document(
+            id="doc",
+            initial_event_time="2024-01-15T10:30:00Z",
+            sections=sections,
+        )
+
+        def get_json(uri):
+            if "/3/" in uri:
+                raise Exception("S3 access denied")
+            return {"total": "10.00"}
+
+        mock_get_json.side_effect = get_json
+        reporter = SaveReportingData("test-bucket", max_workers=4)
+
+        result = reporter.save_document_sections(document)
+
+        assert "Successfully saved 5 document sections" in result["body"]
+        keys = sorted(
+            call.kwargs["Key"] for call in mock_s3_client.put_object.call_args_list
+        )
+        assert keys[0] == (
+            "document_sections/invoice/date=2024-01-15/doc_section_1.parquet"
+        )
+        assert len(keys) == 5
+        assert [call.args[0] for call in mock_glue.call_args_list] == [
+            "invoice",
+            "receipt",
+        ]
@@ -0,0 +1,146 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+"""
+Unit tests for the Glue schema registry of the reporting module.
+"""
+
+import datetime
+import json
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pyarrow as pa
+import pytest
+from idp_common.reporting.save_reporting_data import SaveReportingData
+from idp_common.reporting.schema_registry import SchemaRegistry
+from moto import mock_aws
+
+BUCKET = "reporting-bucket"
+DATABASE = "test_database"
+TABLE = "document_sections_invoice"
+LOCATION = f"s3://{BUCKET}/document_sections/invoice/"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def glue(s3):
+    """Patch the Glue client of new reporters, keeping the mocked S3 client."""
+    mock_glue = MagicMock()
+    mock_glue.get_table.side_effect = Exception("EntityNotFoundException")
+    create_client = boto3.client
+
+    def client_factory(service_name, *args, **kwargs):
+        if service_name == "glue":
+            return mock_glue
+        return create_client(service_name, *args, **kwargs)
+
+    with patch("boto3.client", side_effect=client_factory):
+        yield mock_glue
+
+
+def schema(*names):
+    return pa.schema([(name, pa.string()) for name in names])
+
+
+@pytest.mark.unit
+def test_unchanged_schema_skips_glue(s3, glue):
+    reporter = SaveReportingData(BUCKET, database_name=DATABASE)
+    assert reporter._create_or_update_glue_table("Invoice", schema("a", "b"))
+    glue.create_table.assert_called_once()
+
+    # Same or fewer columns: neither this reporter nor a later one calls Glue
+    assert not reporter._create_or_update_glue_table("Invoice", schema("a"))
+    later = SaveReportingData(BUCKET, database_name=DATABASE)
+    assert not later._create_or_update_glue_table("Invoice", schema("b", "a"))
+    assert glue.get_table.call_count == 1
+
+    # A new process loads the registry record from the reporting bucket
+    SchemaRegistry.clear_cache()
+    record = json.loads(
+        s3.get_object(Bucket=BUCKET, Key=f"_schema_registry/{DATABASE}/{TABLE}.json")[
+            "Body"
+        ].read()
+    )
+    assert record["columns"] == ["a", "b"]
+    assert record["location"] == LOCATION
+    new_process = SaveReportingData(BUCKET, database_name=DATABASE)
+    assert not new_process._create_or_update_glue_table("Invoice", schema("a"))
+    assert glue.get_table.call_count == 1
+
+
+@pytest.mark.unit
+def test_new_columns_update_table_with_existing_columns(s3, glue):
+    glue.get_table.side_effect = None
+    glue.get_table.return_value = {
+        "Table": {
+            "StorageDescriptor": {
+                "Columns": [
+                    {"Name": "a", "Type": "string"},
+                    {"Name": "b", "Type": "string"},
+                ],
+                "Location": LOCATION,
+            }
+        }
+    }
+    reporter = SaveReportingData(BUCKET, database_name=DATABASE)
+
+    # Up to date in Glue: registered without an update
+    assert not reporter._create_or_update_glue_table("Invoice", schema("a"))
+    assert not reporter._create_or_update_glue_table("Invoice", schema("b"))
+    assert glue.get_table.call_count == 1
+    glue.update_table.assert_not_called()
+
+    assert reporter._create_or_update_glue_table("Invoice", schema("a", "c"))
+    columns = glue.update_table.call_args[1]["TableInput"]["StorageDescriptor"][
+        "Columns"
+    ]
+    assert [col["Name"] for col in columns] == ["a", "b", "c"]
+    assert not reporter._create_or_update_glue_table("Invoice", schema("b", "c"))
+    assert glue.get_table.call_count == 2
+
+
+@pytest.mark.unit
+def test_expired_registration_is_checked_again(s3):
+    registry = SchemaRegistry(BUCKET, DATABASE, s3, ttl_seconds=60)
+    registry.register(TABLE, ["a"], LOCATION)
+    assert registry.covers(TABLE, ["a"], LOCATION)
+    assert not registry.covers(TABLE, ["a"], f"s3://{BUCKET}/other/")
+
+    with patch("idp_common.reporting.schema_registry.time.time") as mock_time:
+        mock_time.return_value = datetime.datetime.now().timestamp() + 120
+        assert not registry.covers(TABLE, ["a"], LOCATION)
+
+
+@pytest.mark.unit
+def test_schema_and_sanitizer_are_reused():
+    reporter = SaveReportingData(BUCKET)
+    records = [
+        {"b": 1, "timestamp": "2025-01-01T10:00:00Z"},
+        {"a": {"x": 1}, "timestamp": None},
+    ]
+    schema_ = reporter._create_dynamic_schema(records)
+    assert schema_.names == ["a", "b", "timestamp"]
+    assert reporter._create_dynamic_schema(list(reversed(records))) is schema_
+
+    sanitized = reporter._sanitize_records_for_schema(
+        [*records, {"b": True, "extra": 2.5}], schema_
+    )
+    assert sanitized == [
+        {
+            "a": None,
+            "b": "1",
+            "timestamp": datetime.datetime(
+                2025, 1, 1, 10, tzinfo=datetime.timezone.utc
+            ),
+        },
+        {"a": '{"x": 1}', "b": None, "timestamp": None},
+        {"a": None, "b": "True", "timestamp": None, "extra": "2.5"},
+    ]
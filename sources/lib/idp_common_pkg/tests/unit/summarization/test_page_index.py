@@ -0,0 +1,82 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the page retrieval index.
+"""
+
+import json
+
+import pytest
+from idp_common.summarization.page_index import PageIndex, tokenize
+
+PAGES = [
+    ("10", "Appendix: glossary of terms used in this agreement."),
+    ("2", "Payment terms: the invoice total of 12,500 USD is due in 30 days."),
+    ("1", "Master services agreement between Acme Corp and Example LLC."),
+    ("3", "Termination: either party may terminate with 60 days notice."),
+]
+
+
+@pytest.mark.unit
+class TestPageIndex:
+    """Tests for the PageIndex class."""
+
+    def test_tokenize(self):
+        assert tokenize("What is the Invoice TOTAL, in USD?") == [
+            "invoice",
+            "total",
+            "usd",
+        ]
+
+    def test_pages_are_in_page_order(self):
+        index = PageIndex.from_pages(PAGES)
+
+        assert index.page_ids == ["1", "2", "3", "10"]
+        assert index.get_text(["2"]) == (
+            "<page-number>2</page-number>\n" + dict(PAGES)["2"] + "\n\n"
+        )
+
+    def test_search_ranks_relevant_pages(self):
+        index = PageIndex.from_pages(PAGES)
+
+        assert index.search("When is the invoice total due?", top_k=1) == ["2"]
+        assert index.search("Can Acme terminate?", top_k=2) == ["1", "3"]
+        assert index.search("unrelated question", top_k=3) == []
+
+    def test_search_respects_character_budget(self):
+        index = PageIndex.from_pages(PAGES)
+
+        # The best page is always returned, further pages only if they fit
+        assert index.search("agreement terms", top_k=4, max_chars=10) == ["10"]
+        assert len(index.search("agreement terms", top_k=4)) == 3
+
+    def test_leading_pages_respect_character_budget(self):
+        index = PageIndex.from_pages(PAGES)
+        first_two = len(PAGES[2][1]) + len(PAGES[1][1])
+
+        # The first page is always returned, further pages only if they fit
+        assert index.leading_pages(10) == ["1"]
+        assert index.leading_pages(first_two) == ["1", "2"]
+        assert index.leading_pages(first_two + 1) == ["1", "2"]
+        assert index.leading_pages(10**6) == ["1", "2", "3", "10"]
+
+    def test_round_trip(self):
+        index = PageIndex.from_pages(PAGES)
+
+        restored = PageIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+
+        assert restored.page_ids == index.page_ids
+        assert restored.get_text() == index.get_text()
+        assert restored.score("invoice") == index.score("invoice")
+
+    def test_unsupported_version(self):
+        with pytest.raises(ValueError, match="version"):
+            PageIndex.from_dict({"version": 99, "pages": []})
+
+    def test_empty_index(self):
+        index = PageIndex.from_pages([])
+
+        assert index.num_pages == 0
+        assert index.search("invoice", top_k=5) == []
+        assert index.get_text() == ""
@@ -12,10 +12,12 @@ import pytest
 
 # Mock dependencies before importing modules
 import warnings
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 # Import standard library modules
 import json
+import threading
+import time
 
 # Import application modules
 from idp_common.summarization.service import SummarizationService
@@ -398,64 +400,103 @@ class TestSummarizationService:
         # Verify empty metering data was returned for error case
         assert section_metering == {}
 
-    @patch("concurrent.futures.ThreadPoolExecutor")
+    @patch("idp_common.s3.get_text_content")
     @patch("idp_common.s3.get_json_content")
     @patch("idp_common.s3.write_content")
+    @patch("idp_common.summarization.service.SummarizationService.process_text")
     def test_process_document(
         self,
+        mock_process_text,
         mock_write_content,
         mock_get_json_content,
-        mock_executor,
+        mock_get_text_content,
         service,
         sample_document,
     ):
         """Test processing a complete document."""
-        # Configure mocks
-        mock_executor_instance = MagicMock()
-        mock_executor.return_value.__enter__.return_value = mock_executor_instance
+        mock_get_text_content.side_effect = lambda uri: f"Text of {uri.split('/')[-2]}"
+
+        def summarize(text):
+            label = "invoice" if "<page-number>1</page-number>" in text else "receipt"
+            return DocumentSummary(
+                content={"summary": f"{label} summary"},
+                metadata={
+                    "metering": {
+                        "Summarization/bedrock/model": {
+                            "inputTokens": 100,
+                            "outputTokens": 50,
+                        }
+                    }
+                },
+            )
 
-        # Mock the future results
-        future1 = MagicMock()
-        future2 = MagicMock()
+        mock_process_text.side_effect = summarize
 
-        # Configure the futures to return (document, metering) tuples
-        doc1 = sample_document
-        doc1.sections[0].attributes = {
-            "summary_uri": "s3://output-bucket/test-document.pdf/sections/1/summary.json"
-        }
-        section1_metering = {"input_tokens": 100, "output_tokens": 50}
-        future1.result.return_value = (doc1, section1_metering)
+        result = service.process_document(sample_document)
 
-        doc2 = sample_document
-        doc2.sections[1].attributes = {
-            "summary_uri": "s3://output-bucket/test-document.pdf/sections/2/summary.json"
-        }
-        section2_metering = {"input_tokens": 150, "output_tokens": 75}
-        future2.result.return_value = (doc2, section2_metering)
+        # Each page is read once: prefetched for sections and reused for fulltext
+        assert mock_get_text_content.call_count == 3
+        # Section summaries are merged from memory, not re-read from S3
+        mock_get_json_content.assert_not_called()
+        assert mock_process_text.call_count == 2
+
+        # Section JSON + markdown for 2 sections, plus combined JSON, fulltext and markdown
+        assert mock_write_content.call_count == 7
+
+        # Combined content is in section order
+        content = result.summarization_result.summary.content
+        assert list(content.keys()) == ["invoice_1", "receipt_2"]
+        assert content["invoice_1"] == {"summary": "invoice summary"}
+        assert content["receipt_2"] == {"summary": "receipt summary"}
+
+        # Section attributes and metering are merged into the original document
+        assert all("summary_uri" in s.attributes for s in result.sections)
+        assert result.metering["Summarization/bedrock/model"]["inputTokens"] == 200
+        assert result.summary_report_uri is not None
+        assert result.status != Status.FAILED
+
+    @patch("idp_common.s3.get_text_content")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.summarization.service.SummarizationService.process_text")
+    def test_process_document_section_failure_is_isolated(
+        self,
+        mock_process_text,
+        mock_write_content,
+        mock_get_text_content,
+        service,
+        sample_document,
+    ):
+        """Test that a failing section does not fail the other sections."""
+        mock_get_text_content.side_effect = lambda uri: f"Text of {uri.split('/')[-2]}"
 
-        # Configure the executor to return the futures
-        mock_executor_instance.submit.side_effect = [future1, future2]
+        def summarize(text):
+            if "<page-number>3</page-number>" in text:
+                raise RuntimeError("Bedrock failure")
+            return DocumentSummary(content={"summary": "invoice summary"})
 
-        # Mock as_completed to return our futures in order
-        with patch("concurrent.futures.as_completed", return_value=[future1, future2]):
-            # Mock get_json_content to return summary content
-            mock_get_json_content.side_effect = [
-                {"summary": "Section 1 summary"},
-                {"summary": "Section 2 summary"},
-            ]
+        mock_process_text.side_effect = summarize
 
-            # Process document
-            result = service.process_document(sample_document)
+        result = service.process_document(sample_document)
+
+        content = result.summarization_result.summary.content
+        assert list(content.keys()) == ["invoice_1"]
+        assert any("Bedrock failure" in error for error in result.errors)
+        assert result.sections[1].attributes is None
+
+    @patch("idp_common.s3.get_text_content")
+    def test_prefetch_page_texts(self, mock_get_text_content, service, sample_document):
+        """Test bulk page text prefetch skips pages that cannot be read."""
 
-            # Verify executor was used to process sections in parallel
-            assert mock_executor_instance.submit.call_count == 2
+        def get_text(uri):
+            if "/2/" in uri:
+                raise Exception("NoSuchKey")
+            return f"Text of {uri.split('/')[-2]}"
 
-            # Verify write_content was called for combined results (JSON, fulltext, and markdown)
-            assert mock_write_content.call_count == 3
+        mock_get_text_content.side_effect = get_text
 
-            # Verify document has summarization_result
-            assert result.summarization_result is not None
-            assert result.summary_report_uri is not None
+        page_texts = service._prefetch_page_texts(sample_document, ["1", "2", "3"])
+
+        assert page_texts == {"1": "Text of 1", "3": "Text of 3"}
 
     @patch("idp_common.s3.get_text_content")
     @patch("idp_common.s3.write_content")
@@ -739,3 +780,161 @@ class TestSummarizationService:
         # Verify error was added and status set to FAILED
         assert "Document has no pages to summarize" in result.errors
         assert result.status == Status.FAILED
+
+
+@pytest.mark.unit
+class TestHierarchicalSummarization:
+    """Tests for map-reduce summarization of very large documents."""
+
+    @pytest.fixture
+    def service(self):
+        """Fixture providing a service with a small hierarchical threshold."""
+        config = {
+            "summarization": {
+                "model": "anthropic.claude-3-sonnet-20240229-v1:0",
+                "system_prompt": "You are a helpful assistant.",
+                "task_prompt": "Summarize: {DOCUMENT_TEXT}",
+                "hierarchical": {
+                    "threshold_tokens": 500,
+                    "chunk_tokens": 250,
+                    "fan_out": 2,
+                    "max_workers": 4,
+                },
+            }
+        }
+        return SummarizationService(region="us-west-2", config=config)
+
+    @staticmethod
+    def _paged_text(pages):
+        return "".join(
+            f"<page-number>{page}</page-number>\n" + "word " * 200 + "\n\n"
+            for page in range(1, pages + 1)
+        )
+
+    @staticmethod
+    def _fake_process_text(text, task_prompt_template=None):
+        return DocumentSummary(
+            content={"summary": f"summary of {len(text)} chars"},
+            metadata={"metering": {"Summarization/bedrock/model": {"inputTokens": 1}}},
+        )
+
+    def test_hierarchical_config_defaults(self, service):
+        """Test that missing hierarchical settings fall back to defaults."""
+        service.config["summarization"].pop("hierarchical")
+        config = service._get_hierarchical_config()
+        assert config["enabled"] is True
+        assert config["threshold_tokens"] == 100000
+        assert config["fan_out"] >= 2
+
+    def test_should_summarize_hierarchically(self, service):
+        """Test the size threshold for map-reduce summarization."""
+        assert not service._should_summarize_hierarchically("word " * 100)
+        assert service._should_summarize_hierarchically("word " * 1000)
+
+        service.config["summarization"]["hierarchical"]["enabled"] = False
+        assert not service._should_summarize_hierarchically("word " * 1000)
+
+    def test_summarize_text_hierarchically(self, service):
+        """Test that page windows are summarized and reduced with the fan-out."""
+        with patch.object(
+            service, "process_text", side_effect=self._fake_process_text
+        ) as mock_process_text:
+            summary = service.summarize_text_hierarchically(self._paged_text(4))
+
+        # 4 page windows mapped, then reduced 4 -> 2 -> 1
+        assert mock_process_text.call_count == 4 + 2 + 1
+        assert summary.metadata["hierarchical"] == {"chunks": 4, "reduce_levels": 2}
+        # Metering from every call is carried to the final summary
+        assert (
+            summary.metadata["metering"]["Summarization/bedrock/model"]["inputTokens"]
+            == 7
+        )
+
+        # Reduce prompts contain the partial summaries in page order
+        reduce_text = mock_process_text.call_args_list[-1][0][0]
+        assert 'pages="pages 1-2"' in reduce_text
+        assert 'pages="pages 3-4"' in reduce_text
+
+    @patch("idp_common.s3.get_text_content")
+    def test_document_pages_are_in_numeric_order(self, mock_get_text_content, service):
+        """Test that page windows follow page numbers, not string order."""
+        document = Document(id="doc", input_key="doc.pdf", output_bucket="bucket")
+        document.pages = {
+            str(i): Page(page_id=str(i), parsed_text_uri=f"s3://b/{i}.txt")
+            for i in range(1, 12)
+        }
+        mock_get_text_content.side_effect = lambda uri: f"text of {uri}"
+
+        all_text = service._get_all_text(document)
+
+        page_ids = [
+            int(line[len("<page-number>") : -len("</page-number>")])
+            for line in all_text.splitlines()
+            if line.startswith("<page-number>")
+        ]
+        assert page_ids == list(range(1, 12))
+
+    @patch("idp_common.s3.get_text_content")
+    @patch("idp_common.s3.write_content")
+    def test_process_document_as_whole_uses_hierarchical(
+        self, mock_write_content, mock_get_text_content, service
+    ):
+        """Test that large documents switch to map-reduce automatically."""
+        document = Document(id="doc", input_key="doc.pdf", output_bucket="bucket")
+        document.pages = {
+            str(i): Page(page_id=str(i), parsed_text_uri=f"s3://b/{i}.txt")
+            for i in range(1, 5)
+        }
+        mock_get_text_content.return_value = "word " * 200
+
+        with patch.object(
+            service, "process_text", side_effect=self._fake_process_text
+        ) as mock_process_text:
+            result = service._process_document_as_whole(document)
+
+        assert mock_process_text.call_count > 1
+        assert "hierarchical" in result.summarization_result.summary.metadata
+
+    @patch("idp_common.s3.get_text_content")
+    @patch("idp_common.s3.write_content")
+    def test_sections_share_hierarchical_call_limit(
+        self, mock_write_content, mock_get_text_content, service
+    ):
+        """Test that map-reduce calls of all sections stay within max_workers."""
+        service.config["summarization"]["hierarchical"]["max_workers"] = 2
+        service = SummarizationService(region="us-west-2", config=service.config)
+        document = Document(id="doc", input_key="doc.pdf", output_bucket="bucket")
+        document.pages = {
+            str(i): Page(page_id=str(i), parsed_text_uri=f"s3://b/{i}.txt")
+            for i in range(1, 13)
+        }
+        document.sections = [
+            Section(
+                section_id=str(s),
+                classification="invoice",
+                page_ids=[str(p) for p in range(4 * s - 3, 4 * s + 1)],
+            )
+            for s in range(1, 4)
+        ]
+        mock_get_text_content.return_value = "word " * 200
+
+        lock = threading.Lock()
+        calls = {"active": 0, "peak": 0, "total": 0}
+
+        def process_text(text, task_prompt_template=None):
+            with lock:
+                calls["active"] += 1
+                calls["total"] += 1
+                calls["peak"] = max(calls["peak"], calls["active"])
+            time.sleep(0.02)
+            with lock:
+                calls["active"] -= 1
+            return self._fake_process_text(text, task_prompt_template)
+
+        with patch.object(service, "process_text", side_effect=process_text):
+            result = service.process_document(document)
+
+        # Each section maps 4 page windows and reduces 4 -> 2 -> 1
+        assert calls["total"] == 3 * (4 + 2 + 1)
+        assert calls["peak"] == 2
+        assert result.status != Status.FAILED
@@ -0,0 +1,183 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the few-shot example content cache.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from idp_common.utils import few_shot_cache
+from idp_common.utils.few_shot_cache import (
+    FewShotContentCache,
+    build_few_shot_content,
+    get_few_shot_content,
+)
+
+
+def _attachment(image_data):
+    return {"image": {"format": "png", "source": {"bytes": image_data}}}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Use a fresh process-level cache for each test."""
+    with patch.object(
+        few_shot_cache, "_cache", FewShotContentCache(max_bytes=1024 * 1024)
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def mock_image():
+    """Avoid decoding images; attachments wrap the raw bytes."""
+    with (
+        patch(
+            "idp_common.image.prepare_bedrock_image_attachment", side_effect=_attachment
+        ),
+        patch("idp_common.image.resize_image") as mock_resize,
+    ):
+        mock_resize.side_effect = lambda data, width, height: b"resized:" + data
+        yield mock_resize
+
+
+EXAMPLES = [
+    {"name": "a", "classPrompt": "This is an invoice", "imagePath": "s3://b/a/"},
+    {"name": "b", "classPrompt": "", "imagePath": "s3://b/skip.png"},
+    {"name": "c", "classPrompt": "This is a letter", "imagePath": "s3://b/c.png"},
+]
+
+
+def _resolve(image_path):
+    if image_path == "s3://b/a/":
+        return ["s3://b/a/1.png", "s3://b/a/2.png"]
+    return [image_path]
+
+
+@pytest.mark.unit
+class TestBuildFewShotContent:
+    """Tests for building few-shot content."""
+
+    @patch("idp_common.s3.get_binary_content")
+    def test_preserves_example_order(self, mock_get_binary):
+        images = {
+            "s3://b/a/1.png": b"image-1",
+            "s3://b/a/2.png": b"image-2",
+            "s3://b/c.png": b"image-c",
+        }
+        mock_get_binary.side_effect = lambda uri: images[uri]
+
+        content, complete = build_few_shot_content(EXAMPLES, "classPrompt", _resolve)
+
+        assert complete
+        assert [list(item.keys())[0] for item in content] == [
+            "text",
+            "image",
+            "image",
+            "text",
+            "image",
+        ]
+        assert content[0]["text"] == "This is an invoice"
+        assert content[2]["image"]["source"]["bytes"] == images["s3://b/a/2.png"]
+        assert content[4]["image"]["source"]["bytes"] == images["s3://b/c.png"]
+
+    @patch("idp_common.s3.get_binary_content")
+    def test_resizes_images(self, mock_get_binary, mock_image):
+        mock_get_binary.return_value = b"image-c"
+
+        content, _ = build_few_shot_content(
+            EXAMPLES[2:], "classPrompt", _resolve, target_width=100, target_height=100
+        )
+
+        mock_image.assert_called_once_with(b"image-c", 100, 100)
+        assert content[1]["image"]["source"]["bytes"] == b"resized:image-c"
+
+    @patch("idp_common.s3.get_binary_content")
+    def test_no_resize_without_dimensions(self, mock_get_binary, mock_image):
+        mock_get_binary.return_value = b"image-c"
+
+        build_few_shot_content(EXAMPLES[2:], "classPrompt", _resolve)
+
+        mock_image.assert_not_called()
+
+    @patch("idp_common.s3.get_binary_content")
+    def test_failed_image_is_skipped_and_incomplete(self, mock_get_binary):
+        mock_get_binary.side_effect = Exception("AccessDenied")
+
+        content, complete = build_few_shot_content(
+            EXAMPLES[2:], "classPrompt", _resolve
+        )
+
+        assert content == [{"text": "This is a letter"}]
+        assert not complete
+
+    def test_unresolvable_path_raises(self):
+        def resolve(image_path):
+            raise ValueError("No CONFIGURATION_BUCKET or ROOT_DIR set")
+
+        with pytest.raises(ValueError, match="Failed to load example images"):
+            build_few_shot_content(EXAMPLES, "classPrompt", resolve)
+
+
+@pytest.mark.unit
+class TestGetFewShotContent:
+    """Tests for the cached few-shot content lookup."""
+
+    @patch("idp_common.s3.get_binary_content")
+    def test_images_loaded_once_per_config(self, mock_get_binary):
+        mock_get_binary.return_value = b"image"
+
+        first = get_few_shot_content(EXAMPLES, "classPrompt", _resolve)
+        second = get_few_shot_content(EXAMPLES, "classPrompt", _resolve)
+
+        assert first == second
+        assert mock_get_binary.call_count == 3
+
+        # A configuration change produces a new cache entry
+        changed = [dict(EXAMPLES[2], classPrompt="Changed prompt")]
+        get_few_shot_content(changed, "classPrompt", _resolve)
+        assert mock_get_binary.call_count == 4
+
+    @patch("idp_common.s3.get_binary_content")
+    def test_incomplete_content_not_cached(self, mock_get_binary):
+        mock_get_binary.side_effect = [Exception("Throttled"), b"image"]
+
+        first = get_few_shot_content(EXAMPLES[2:], "classPrompt", _resolve)
+        second = get_few_shot_content(EXAMPLES[2:], "classPrompt", _resolve)
+
+        assert len(first) == 1
+        assert len(second) == 2
+
+    def test_returned_list_is_a_copy(self):
+        content = get_few_shot_content(
+            [{"classPrompt": "text only"}], "classPrompt", _resolve
+        )
+        content.append({"text": "page"})
+
+        assert get_few_shot_content(
+            [{"classPrompt": "text only"}], "classPrompt", _resolve
+        ) == [{"text": "text only"}]
+
+
+@pytest.mark.unit
+class TestFewShotContentCache:
+    """Tests for the memory-bounded LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        cache = FewShotContentCache(max_bytes=10)
+        cache.put("a", [{"text": "aaaa"}])
+        cache.put("b", [{"text": "bbbb"}])
+        cache.get("a")
+        cache.put("c", [{"text": "cccc"}])
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.size == 8
+
+    def test_oversized_entry_not_cached(self):
+        cache = FewShotContentCache(max_bytes=4)
+
+        assert not cache.put("a", [{"text": "too large"}])
+        assert len(cache) == 0
@@ -0,0 +1,109 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the lazy log payload rendering.
+"""
+
+import json
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+from idp_common.models import Document, Page, Section, Status
+from idp_common.utils.log_utils import LogPayload, summarize, truncate
+
+
+def make_document(num_sections=12):
+    document = Document(
+        id="doc.pdf",
+        input_key="doc.pdf",
+        status=Status.EXTRACTING,
+        num_pages=2,
+        pages={"1": Page(page_id="1"), "2": Page(page_id="2")},
+        metering={"OCR/textract": {"pages": 2}},
+    )
+    for i in range(num_sections):
+        document.sections.append(
+            Section(section_id=str(i), classification="invoice", page_ids=["1"])
+        )
+    return document
+
+
+@pytest.fixture
+def info_root_logger():
+    root = logging.getLogger()
+    level = root.level
+    root.setLevel(logging.INFO)
+    yield root
+    root.setLevel(level)
+
+
+@pytest.mark.unit
+class TestLogPayload:
+    """Tests for LogPayload and the summary helpers."""
+
+    def test_truncate(self):
+        assert truncate("short", 10) == "short"
+        assert truncate("x" * 20, 5) == "xxxxx...<truncated, 20 chars>"
+
+    def test_summarize_nested_config(self):
+        config = {
+            "classes": [{"name": f"class{i}", "attributes": []} for i in range(15)],
+            "extraction": {"model": "model-id", "task_prompt": "p" * 1000},
+        }
+
+        summary = summarize(config)
+
+        assert len(summary["classes"]) == 11
+        assert summary["classes"][-1] == "<5 more items>"
+        assert summary["classes"][0] == {
+            "name": "class0",
+            "attributes": "<list, 0 items>",
+        }
+        assert summary["extraction"]["model"] == "model-id"
+        prompt = summary["extraction"]["task_prompt"]
+        assert prompt.endswith("<truncated, 1000 chars>")
+
+    def test_summarize_document(self):
+        summary = summarize(make_document())
+
+        assert summary["status"] == "EXTRACTING"
+        assert summary["pages"] == 2
+        assert summary["sections"][0] == {"id": "0", "class": "invoice", "pages": 1}
+        assert summary["sections"][-1] == "<2 more>"
+
+    def test_not_rendered_when_level_disabled(self, info_root_logger):
+        document = MagicMock(spec=Document)
+        logger = logging.getLogger("test_log_utils.disabled")
+        logger.setLevel(logging.WARNING)
+
+        logger.info("Document: %s", LogPayload(document))
+
+        document.to_dict.assert_not_called()
+
+    def test_summary_is_size_capped(self, info_root_logger, monkeypatch):
+        monkeypatch.delenv("LOG_FULL_PAYLOAD_SAMPLE_RATE", raising=False)
+
+        rendered = str(LogPayload({"key": "v" * 150}, max_chars=50))
+
+        assert rendered.startswith('{"key": "vvv')
+        assert rendered.endswith("...<truncated, 161 chars>")
+
+    def test_full_rendering_is_sampled(self, info_root_logger, monkeypatch):
+        document = make_document()
+
+        monkeypatch.setenv("LOG_FULL_PAYLOAD_SAMPLE_RATE", "1")
+        assert json.loads(str(LogPayload(document))) == json.loads(
+            json.dumps(document.to_dict(), default=str)
+        )
+
+        monkeypatch.setenv("LOG_FULL_PAYLOAD_SAMPLE_RATE", "0")
+        assert "metering_keys" in json.loads(str(LogPayload(document)))
+
+    def test_full_rendering_at_debug_level(self, info_root_logger):
+        info_root_logger.setLevel(logging.DEBUG)
+
+        rendered = json.loads(str(LogPayload(make_document(num_sections=1))))
+
+        assert rendered["sections"][0]["page_ids"] == ["1"]
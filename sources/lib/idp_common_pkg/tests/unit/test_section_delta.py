@@ -0,0 +1,97 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for per-section results (SectionDelta).
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from idp_common.models import Document, Section, SectionDelta, Status
+
+
+@pytest.mark.unit
+class TestSectionDelta:
+    """Test cases for SectionDelta and the Document delta methods."""
+
+    def setup_method(self):
+        """Set up a section document as returned by a section step."""
+        self.section = Section(
+            section_id="2",
+            classification="invoice",
+            page_ids=["3", "4"],
+            extraction_result_uri="s3://output/doc.pdf/sections/2/result.json",
+            confidence_threshold_alerts=[{"attribute_name": "total"}],
+        )
+        self.section_document = Document(
+            id="doc.pdf",
+            status=Status.ASSESSING,
+            sections=[self.section],
+            metering={"Assessment/bedrock/model": {"inputTokens": 100}},
+            errors=["warning"],
+        )
+
+    def test_get_section_delta(self):
+        delta = self.section_document.get_section_delta("2")
+
+        assert delta.document_id == "doc.pdf"
+        assert delta.section is self.section
+        assert delta.status == Status.ASSESSING
+        assert delta.errors == ["warning"]
+
+        with pytest.raises(ValueError, match="Section 9 not found"):
+            self.section_document.get_section_delta("9")
+
+    def test_serialize_and_load_round_trip(self):
+        stored = {}
+
+        def write_content(content, bucket, key, content_type=None):
+            stored[f"s3://{bucket}/{key}"] = json.loads(content)
+
+        with patch("idp_common.s3.write_content", side_effect=write_content):
+            reference = self.section_document.get_section_delta("2").serialize(
+                "working", "assessment_2"
+            )
+
+        assert reference["section_id"] == "2"
+        assert reference["status"] == "ASSESSING"
+        assert reference["s3_uri"].startswith(
+            "s3://working/compressed_documents/doc.pdf/"
+        )
+        assert reference["s3_uri"].endswith("_assessment_2_delta.json")
+
+        with patch("idp_common.s3.get_json_content", side_effect=stored.get):
+            delta = SectionDelta.load(reference)
+
+        assert delta.section.to_dict() == self.section.to_dict()
+        assert delta.metering == self.section_document.metering
+        assert delta.errors == ["warning"]
+
+    def test_serialize_without_bucket_is_inline(self):
+        delta = self.section_document.get_section_delta("2")
+
+        data = delta.serialize(None, "assessment_2")
+
+        assert "s3_uri" not in data
+        assert SectionDelta.load(data).section.page_ids == ["3", "4"]
+
+    def test_apply_section_delta(self):
+        document = Document(
+            id="doc.pdf",
+            sections=[Section(section_id="1", classification="letter")],
+            metering={"Assessment/bedrock/model": {"inputTokens": 50}},
+        )
+
+        document.apply_section_delta(self.section_document.get_section_delta("2"))
+        updated = Section(section_id="2", classification="receipt")
+        document.apply_section_delta(
+            SectionDelta(document_id="doc.pdf", section=updated)
+        )
+
+        assert [s.section_id for s in document.sections] == ["1", "2"]
+        assert document.sections[1].classification == "receipt"
+        assert document.metering == {"Assessment/bedrock/model": {"inputTokens": 150}}
+        # Errors are reported by the caller, not merged into the document
+        assert document.errors == []
@@ -0,0 +1,224 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for status-only document updates.
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import boto3
+import pytest
+from idp_common.appsync.mutations import UPDATE_DOCUMENT
+from idp_common.appsync.service import DocumentAppSyncService
+from idp_common.dynamodb.client import DynamoDBClient
+from idp_common.dynamodb.service import DocumentDynamoDBService
+from idp_common.models import Document, Status
+from idp_common.utils.status_updates import (
+    StatusUpdateCoalescer,
+    build_status_update,
+    get_superseding_statuses,
+    status_update_coalescer,
+)
+from moto import mock_aws
+
+TABLE_NAME = "tracking-table"
+EXECUTION_ARN = "arn:aws:states:us-east-1:123456789012:execution:sm:run-1"
+
+
+@pytest.fixture
+def tracking_table():
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        table = dynamodb.create_table(
+            TableName=TABLE_NAME,
+            KeySchema=[
+                {"AttributeName": "PK", "KeyType": "HASH"},
+                {"AttributeName": "SK", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        table.put_item(
+            Item={"PK": "doc#doc.pdf", "SK": "none", "ObjectStatus": "CLASSIFYING"}
+        )
+        yield table
+
+
+def make_document(status=Status.EXTRACTING, workflow_execution_arn=EXECUTION_ARN):
+    return Document(
+        id="doc.pdf",
+        input_key="doc.pdf",
+        status=status,
+        workflow_execution_arn=workflow_execution_arn,
+    )
+
+
+@pytest.mark.unit
+class TestStatusUpdateHelpers:
+    """Tests for the status update expressions and the coalescer."""
+
+    def test_superseding_statuses(self):
+        assert get_superseding_statuses(Status.SUMMARIZING) == []
+        assert get_superseding_statuses(Status.COMPLETED) == []
+        assert Status.ASSESSING in get_superseding_statuses(Status.EXTRACTING)
+        assert Status.OCR not in get_superseding_statuses(Status.EXTRACTING)
+
+    def test_build_status_update(self):
+        update, condition, names, values = build_status_update(
+            Status.COMPLETED, EXECUTION_ARN
+        )
+
+        assert "#WorkflowExecutionArn = :WorkflowExecutionArn" in update
+        assert condition == "attribute_exists(#PK) AND #ObjectStatus <> :ObjectStatus"
+        assert values[":WorkflowStatus"] == "SUCCEEDED"
+        assert "#WorkflowExecutionArn" in names
+
+    def test_coalescer_skips_repeated_status(self):
+        coalescer = StatusUpdateCoalescer()
+        send = MagicMock(return_value=True)
+
+        assert coalescer.update("key", Status.EXTRACTING, send) is True
+        assert coalescer.update("key", Status.EXTRACTING, send) is False
+        assert coalescer.update("key", Status.ASSESSING, send) is True
+        assert coalescer.update(None, Status.ASSESSING, send) is True
+        assert send.call_count == 3
+
+    def test_coalescer_retries_after_failure(self):
+        coalescer = StatusUpdateCoalescer()
+        send = MagicMock(side_effect=[RuntimeError("boom"), True])
+
+        with pytest.raises(RuntimeError):
+            coalescer.update("key", Status.EXTRACTING, send)
+
+        assert coalescer.update("key", Status.EXTRACTING, send) is True
+
+    def test_coalescer_fire_and_forget(self):
+        coalescer = StatusUpdateCoalescer()
+        started = threading.Event()
+
+        def send():
+            started.wait(timeout=5)
+            return True
+
+        future = coalescer.update("key", Status.EXTRACTING, send, wait=False)
+        repeated = coalescer.update("key", Status.EXTRACTING, send, wait=False)
+        assert repeated.result() is False
+
+        started.set()
+        coalescer.flush(timeout=5)
+        assert future.result() is True
+
+        failing_send = MagicMock(side_effect=RuntimeError("boom"))
+        failed = coalescer.update("other", Status.EXTRACTING, failing_send, wait=False)
+        coalescer.flush(timeout=5)
+        assert isinstance(failed.exception(), RuntimeError)
+
+
+@pytest.mark.unit
+class TestDynamoDBStatusUpdates:
+    """Tests for DocumentDynamoDBService.update_document_status."""
+
+    def setup_method(self):
+        status_update_coalescer.reset()
+
+    def _service(self):
+        client = DynamoDBClient(table_name=TABLE_NAME, region="us-east-1")
+        return DocumentDynamoDBService(dynamodb_client=client)
+
+    def _item(self, table):
+        return table.get_item(Key={"PK": "doc#doc.pdf", "SK": "none"})["Item"]
+
+    def test_updates_status_only(self, tracking_table):
+        service = self._service()
+
+        assert service.update_document_status(make_document()) is True
+
+        item = self._item(tracking_table)
+        assert item["ObjectStatus"] == "EXTRACTING"
+        assert item["WorkflowStatus"] == "RUNNING"
+        assert item["WorkflowExecutionArn"] == EXECUTION_ARN
+        assert "Pages" not in item and "Metering" not in item
+
+    def test_concurrent_updates_coalesce(self, tracking_table):
+        service = self._service()
+        # No execution ARN, so only the conditional write coalesces
+        document = make_document(workflow_execution_arn=None)
+
+        results = [service.update_document_status(document) for _ in range(3)]
+
+        assert results == [True, False, False]
+
+    def test_status_does_not_move_backwards(self, tracking_table):
+        service = self._service()
+        service.update_document_status(make_document(Status.ASSESSING))
+
+        extracting = make_document(Status.EXTRACTING)
+        assert service.update_document_status(extracting) is False
+        assert self._item(tracking_table)["ObjectStatus"] == "ASSESSING"
+
+    def test_missing_document_is_not_created(self, tracking_table):
+        service = self._service()
+        document = make_document()
+        document.input_key = "missing.pdf"
+
+        assert service.update_document_status(document) is False
+        assert "Item" not in tracking_table.get_item(
+            Key={"PK": "doc#missing.pdf", "SK": "none"}
+        )
+
+    def test_fire_and_forget(self, tracking_table):
+        service = self._service()
+
+        future = service.update_document_status(make_document(), wait=False)
+        service.flush_status_updates(timeout=5)
+
+        assert future.result() is True
+        assert self._item(tracking_table)["ObjectStatus"] == "EXTRACTING"
+
+
+@pytest.mark.unit
+class TestAppSyncStatusUpdates:
+    """Tests for DocumentAppSyncService.update_document_status."""
+
+    def setup_method(self):
+        status_update_coalescer.reset()
+
+    def test_sends_minimal_mutation_once(self, tracking_table, monkeypatch):
+        monkeypatch.setenv("AWS_REGION", "us-east-1")
+        appsync_client = MagicMock()
+        service = DocumentAppSyncService(
+            appsync_client=appsync_client, tracking_table=TABLE_NAME
+        )
+
+        # Two invocations without shared process state
+        assert service.update_document_status(make_document()) is True
+        status_update_coalescer.reset()
+        assert service.update_document_status(make_document()) is False
+
+        appsync_client.execute_mutation.assert_called_once_with(
+            UPDATE_DOCUMENT,
+            {
+                "input": {
+                    "ObjectKey": "doc.pdf",
+                    "ObjectStatus": "EXTRACTING",
+                    "WorkflowStatus": "RUNNING",
+                    "WorkflowExecutionArn": EXECUTION_ARN,
+                }
+            },
+        )
+
+    def test_without_tracking_table(self, monkeypatch):
+        monkeypatch.delenv("TRACKING_TABLE", raising=False)
+        appsync_client = MagicMock()
+        service = DocumentAppSyncService(appsync_client=appsync_client)
+
+        service.update_document_status(make_document(), Status.OCR)
+        service.update_document_status(make_document(), Status.OCR)
+
+        # Coalesced in-process only
+        appsync_client.execute_mutation.assert_called_once()
@@ -0,0 +1,123 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the tracing spans.
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common import tracing
+
+
+@pytest.fixture
+def tracing_mode():
+    yield tracing.configure
+    tracing.configure("off")
+
+
+@pytest.mark.unit
+class TestTracing:
+    """Tests for spans, propagation and export."""
+
+    def test_disabled_is_noop(self, tracing_mode):
+        tracing_mode("off")
+
+        def func():
+            return 42
+
+        assert not tracing.is_enabled()
+        assert tracing.span("step", key="value") is tracing.NOOP_SPAN
+        assert tracing.wrap(func) is func
+        assert tracing.traced("step")(func)() == 42
+        with tracing.span("step") as span:
+            span.set_attribute("bytes", 1)
+            tracing.annotate(page_id="1")
+
+    def test_nested_spans_inherit_ids(self):
+        with tracing.collect() as spans:
+            with tracing.span("document", document_id="doc.pdf"):
+                tracing.annotate(section_id="2")
+                with tracing.span("page", page_id="3") as page:
+                    page.set_attribute("bytes", 10)
+
+        page, document = spans
+        assert page.parent_id == document.span_id
+        assert page.trace_id == document.trace_id
+        assert document.parent_id is None
+        assert page.attributes == {
+            "page_id": "3",
+            "bytes": 10,
+            "document_id": "doc.pdf",
+            "section_id": "2",
+        }
+        assert document.duration_ms >= page.duration_ms
+        assert not tracing.is_enabled()
+
+    def test_wrap_propagates_to_threads(self):
+        @tracing.traced("page")
+        def process_page(page_id):
+            tracing.annotate(page_id=page_id)
+            with tracing.span("s3.get_object"):
+                return page_id
+
+        with tracing.collect() as spans:
+            with tracing.span("document", document_id="doc.pdf") as document:
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    list(executor.map(tracing.wrap(process_page), ["1", "2"]))
+
+        reads = [span for span in spans if span.name == "s3.get_object"]
+        assert len(reads) == 2
+        assert {span.attributes["page_id"] for span in reads} == {"1", "2"}
+        assert all(span.trace_id == document.trace_id for span in spans)
+        assert all(span.attributes["document_id"] == "doc.pdf" for span in reads)
+
+    def test_error_is_recorded(self):
+        error = ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": "slow down"}},
+            "Converse",
+        )
+        with tracing.collect() as spans:
+            with pytest.raises(ClientError):
+                with tracing.span("bedrock.converse"):
+                    raise error
+            with pytest.raises(ValueError):
+                with tracing.span("json.parse"):
+                    raise ValueError("bad json")
+
+        assert [span.error for span in spans] == ["ThrottlingException", "ValueError"]
+
+    def test_log_export(self, tracing_mode, caplog):
+        tracing_mode("log")
+
+        with caplog.at_level(logging.INFO, logger="idp_common.tracing"):
+            with tracing.span("s3.put_object", document_id="doc.pdf", bytes=5):
+                pass
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record["span"] == "s3.put_object"
+        assert record["document_id"] == "doc.pdf"
+        assert record["bytes"] == 5
+        assert record["duration_ms"] >= 0
+
+    def test_emf_export(self, tracing_mode, capsys, monkeypatch):
+        monkeypatch.setenv("METRIC_NAMESPACE", "TestNamespace")
+        tracing_mode("emf")
+
+        with tracing.span("image.resize", page_id="1"):
+            pass
+
+        document = json.loads(capsys.readouterr().out.strip())
+        metric = document["_aws"]["CloudWatchMetrics"][0]
+        assert metric["Namespace"] == "TestNamespace"
+        assert metric["Dimensions"] == [["Span"]]
+        assert document["Span"] == "image.resize"
+        assert document["SpanDuration"] >= 0
+        assert document["page_id"] == "1"
+
+    def test_unknown_mode(self, tracing_mode):
+        assert tracing_mode("verbose") == "off"
@@ -20,6 +20,7 @@ from idp_common.config import get_config
 from idp_common.models import Document, HitlMetadata, Page, Section, Status
 from idp_common.s3 import get_s3_client, write_content
 from idp_common.utils import build_s3_uri
+from idp_common.utils.log_utils import LogPayload
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
@@ -986,7 +987,7 @@ def process_segments(
         document.hitl_metadata.append(hitl_metadata)
 
         if table_name:
-            logger.info(f"Saving to DynamoDB: {json.dumps(item, default=str)}")
+            logger.info("Saving to DynamoDB: %s", LogPayload(item))
             try:
                 table.put_item(Item=item)
             except Exception as e:
@@ -994,6 +995,7 @@ def process_segments(
     
     return document, overall_hitl_triggered
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Process the BDA results and build a Document object with pages and sections.
@@ -1006,7 +1008,7 @@ def handler(event, context):
     Returns:
         Dict containing the processed document
     """
-    logger.info(f"Processing event: {json.dumps(event)}")
+    logger.info("Processing event: %s", LogPayload(event))
     
     # Check if we have a single BDA response or an array of responses
     bda_responses = []
@@ -1058,7 +1060,7 @@ def handler(event, context):
     # Update document status
     document_service = create_document_service()
     logger.info(f"Updating document status to {document.status}")
-    document_service.update_document(document)
+    document_service.update_document_status(document)
    
     # Create page images (only need to do this once)
     try:
@@ -1207,5 +1209,5 @@ def handler(event, context):
         "bda_response_count": len(bda_responses)
     }
     
-    logger.info(f"Response: {json.dumps(response, default=str)}")
+    logger.info("Response: %s", LogPayload(response))
     return response
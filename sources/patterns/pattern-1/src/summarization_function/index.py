@@ -4,16 +4,16 @@
 """
 Lambda function to summarize document content using the SummarizationService from idp_common.
 """
-import json
 import os
 import logging
 import time
 
 # Import the SummarizationService from idp_common
-from idp_common import get_config, summarization
+from idp_common import get_config, summarization, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common.utils import calculate_lambda_metering, merge_metering_data
+from idp_common.utils.log_utils import LogPayload
 
 # Configuration will be loaded in handler function
 
@@ -21,6 +21,7 @@ logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Lambda handler for document summarization using the SummarizationService.
@@ -32,7 +33,7 @@ def handler(event, context):
     Returns:
         Dictionary with the summarization result
     """
-    logger.info(f"Processing event: {json.dumps(event)}")
+    logger.info("Processing event: %s", LogPayload(event))
     start_time = time.time()
     
     try:
@@ -54,7 +55,7 @@ def handler(event, context):
         document.status = Status.SUMMARIZING
         document_service = create_document_service()
         logger.info(f"Updating document status to {document.status}")
-        document_service.update_document(document)
+        document_service.update_document_status(document)
         
         # Load configuration and create the summarization service
         config = get_config()
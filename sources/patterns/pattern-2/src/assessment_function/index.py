@@ -2,15 +2,15 @@
 # SPDX-License-Identifier: MIT-0
 
 import os
-import json
 import time
 import logging
 
-from idp_common import get_config, assessment
+from idp_common import get_config, assessment, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common import s3
 from idp_common.utils import normalize_boolean_value, calculate_lambda_metering, merge_metering_data
+from idp_common.utils.log_utils import LogPayload
 from assessment_validator import AssessmentValidator
 
 # Custom exception for throttling scenarios
@@ -88,6 +88,7 @@ def check_document_for_throttling_errors(document):
     
     return False, None
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Lambda handler for document assessment.
@@ -95,12 +96,12 @@ def handler(event, context):
     using the Assessment service from the idp_common library.
     """
     start_time = time.time()  # Capture start time for Lambda metering
-    logger.info(f"Starting assessment processing for event: {json.dumps(event, default=str)}")
+    logger.info("Starting assessment processing for event: %s", LogPayload(event))
 
     # Load configuration
     config = get_config()
     # Use default=str to handle Decimal and other non-serializable types
-    logger.info(f"Config: {json.dumps(config, default=str)}")
+    logger.info("Config: %s", LogPayload(config))
     
     # Extract input from event - handle both compressed and uncompressed
     document_data = event.get('document', {})
@@ -180,13 +181,13 @@ def handler(event, context):
                 except Exception as e:
                     logger.warning(f"Failed to add Lambda metering for assessment skip: {str(e)}")
                 
-                # Return consistent format for Map state collation
+                # Return only the section delta for Map state collation
                 response = {
                     "section_id": section_id, 
-                    "document": section_document.serialize_document(working_bucket, f"assessment_skip_{section_id}", logger)
+                    "section_delta": section_document.get_section_delta(section_id).serialize(working_bucket, f"assessment_skip_{section_id}", logger)
                 }
                 
-                logger.info(f"Assessment skipped - Response: {json.dumps(response, default=str)}")
+                logger.info("Assessment skipped - Response: %s", LogPayload(response))
                 return response
             else:
                 logger.info(f"Assessment needed for section {section_id} - no explainability_info found in extraction results")
@@ -197,128 +198,128 @@ def handler(event, context):
     # Normal assessment processing
     document.status = Status.ASSESSING
 
-    # Update document status to ASSESSING for UI only
-    # Create new 'shell' document since our input document has only 1 section. 
-    docStatus = Document(
-        id=document.id,
-        input_key=document.input_key,
-        status=Status.ASSESSING,
-    )
+    # Update document status to ASSESSING for UI only. Status-only update,
+    # coalesced across the sections of the Map and sent in the background.
     document_service = create_document_service()
-    logger.info(f"Updating document status to {docStatus.status}")
-    document_service.update_document(docStatus)
+    logger.info(f"Updating document status to {document.status}")
+    document_service.update_document_status(document, wait=False)
 
-    # Initialize assessment service with cache table for enhanced retry handling
-    cache_table = os.environ.get('TRACKING_TABLE')
+    try:
+        # Initialize assessment service with cache table for enhanced retry handling
+        cache_table = os.environ.get('TRACKING_TABLE')
     
-    # Check if granular assessment is enabled
-    granular_config = config.get('assessment', {}).get('granular', {})
-    granular_enabled = granular_config.get('enabled', False)
+        # Check if granular assessment is enabled
+        granular_config = config.get('assessment', {}).get('granular', {})
+        granular_enabled = granular_config.get('enabled', False)
     
-    if granular_enabled:
-        # Use enhanced granular assessment service with caching and retry support
-        from idp_common.assessment.granular_service import GranularAssessmentService
-        assessment_service = GranularAssessmentService(config=config, cache_table=cache_table)
-        logger.info("Using granular assessment service with enhanced error handling and caching")
-    else:
-        # Use regular assessment service
-        assessment_service = assessment.AssessmentService(config=config)
-        logger.info("Using regular assessment service")
+        if granular_enabled:
+            # Use enhanced granular assessment service with caching and retry support
+            from idp_common.assessment.granular_service import GranularAssessmentService
+            assessment_service = GranularAssessmentService(config=config, cache_table=cache_table)
+            logger.info("Using granular assessment service with enhanced error handling and caching")
+        else:
+            # Use regular assessment service
+            assessment_service = assessment.AssessmentService(config=config)
+            logger.info("Using regular assessment service")
 
-    # Process the document section for assessment
-    t0 = time.time()
-    logger.info(f"Starting assessment for section {section_id}")
+        # Process the document section for assessment
+        t0 = time.time()
+        logger.info(f"Starting assessment for section {section_id}")
     
-    try:
-        updated_document = assessment_service.process_document_section(document, section_id)
-        t1 = time.time()
-        logger.info(f"Total assessment time: {t1-t0:.2f} seconds")
+        try:
+            updated_document = assessment_service.process_document_section(document, section_id)
+            t1 = time.time()
+            logger.info(f"Total assessment time: {t1-t0:.2f} seconds")
         
-        # Check for failed assessment tasks that might require retry (granular assessment)
-        if hasattr(updated_document, 'metadata') and updated_document.metadata:
-            failed_tasks = updated_document.metadata.get('failed_assessment_tasks', {})
-            if failed_tasks:
-                throttling_tasks = {
-                    task_id: task_info for task_id, task_info in failed_tasks.items()
-                    if task_info.get('is_throttling', False)
-                }
-                
-                logger.warning(
-                    f"Assessment completed with {len(failed_tasks)} failed tasks, "
-                    f"{len(throttling_tasks)} due to throttling"
-                )
+            # Check for failed assessment tasks that might require retry (granular assessment)
+            if hasattr(updated_document, 'metadata') and updated_document.metadata:
+                failed_tasks = updated_document.metadata.get('failed_assessment_tasks', {})
+                if failed_tasks:
+                    throttling_tasks = {
+                        task_id: task_info for task_id, task_info in failed_tasks.items()
+                        if task_info.get('is_throttling', False)
+                    }
                 
-                if throttling_tasks:
-                    logger.info(
-                        f"Throttling detected in {len(throttling_tasks)} tasks. "
-                        f"Successful tasks have been cached for retry."
+                    logger.warning(
+                        f"Assessment completed with {len(failed_tasks)} failed tasks, "
+                        f"{len(throttling_tasks)} due to throttling"
                     )
+                
+                    if throttling_tasks:
+                        logger.info(
+                            f"Throttling detected in {len(throttling_tasks)} tasks. "
+                            f"Successful tasks have been cached for retry."
+                        )
         
-        # Check for throttling errors in document status and errors field
-        has_throttling, throttling_error = check_document_for_throttling_errors(updated_document)
-        if has_throttling:
-            logger.error(f"Throttling error detected in document errors: {throttling_error}")
-            logger.error("Raising ThrottlingException to trigger Step Functions retry")
-            raise ThrottlingException(f"Throttling detected in document processing: {throttling_error}")
+            # Check for throttling errors in document status and errors field
+            has_throttling, throttling_error = check_document_for_throttling_errors(updated_document)
+            if has_throttling:
+                logger.error(f"Throttling error detected in document errors: {throttling_error}")
+                logger.error("Raising ThrottlingException to trigger Step Functions retry")
+                raise ThrottlingException(f"Throttling detected in document processing: {throttling_error}")
         
-    except Exception as e:
-        t1 = time.time()
-        logger.error(f"Assessment failed after {t1-t0:.2f} seconds: {str(e)}")
+        except Exception as e:
+            t1 = time.time()
+            logger.error(f"Assessment failed after {t1-t0:.2f} seconds: {str(e)}")
         
-        # Check if this is a throttling exception that should trigger retry
-        if is_throttling_exception(e):
-            logger.error(f"Throttling exception detected: {type(e).__name__}. This will trigger state machine retry.")
-            # Update document status before re-raising
-            document_service.update_document(docStatus)
-            # Re-raise to trigger state machine retry
-            raise
-        else:
-            logger.error(f"Non-throttling exception: {type(e).__name__}. Marking document as failed.")
-            # Set document status to failed for non-throttling exceptions
-            updated_document = document
-            updated_document.status = Status.FAILED
-            updated_document.errors.append(str(e))
+            # Check if this is a throttling exception that should trigger retry
+            if is_throttling_exception(e):
+                logger.error(f"Throttling exception detected: {type(e).__name__}. This will trigger state machine retry.")
+                # Update document status before re-raising
+                document_service.update_document_status(document, Status.ASSESSING)
+                # Re-raise to trigger state machine retry
+                raise
+            else:
+                logger.error(f"Non-throttling exception: {type(e).__name__}. Marking document as failed.")
+                # Set document status to failed for non-throttling exceptions
+                updated_document = document
+                updated_document.status = Status.FAILED
+                updated_document.errors.append(str(e))
 
-    # Assessment validation
-    assessment_config = config.get('assessment', {})
-    assessment_enabled = normalize_boolean_value(assessment_config.get('enabled', False))
-    validation_enabled = assessment_enabled and normalize_boolean_value(assessment_config.get('validation_enabled', True))
-    logger.info(f"Assessment Enabled:{assessment_enabled}")
-    logger.info(f"Validation Enabled:{validation_enabled}")
-    if not assessment_enabled:
-        logger.info("Assessment is disabled.")
-    elif not validation_enabled:
-        logger.info("Assessment validation is disabled.")
-    else:
-        for section in updated_document.sections:
-            if section.section_id == section_id and section.extraction_result_uri:
-                logger.info(f"Loading assessment results from: {section.extraction_result_uri}")
-                # Load extraction data with assessment results
-                extraction_data = s3.get_json_content(section.extraction_result_uri)
-                validator = AssessmentValidator(extraction_data,
-                                                assessment_config=assessment_config,
-                                                enable_missing_check=True,
-                                                enable_count_check=True)
-                validation_results = validator.validate_all()
-                if not validation_results['is_valid']:
-                    # Handle validation failure
-                    updated_document.status = Status.FAILED
-                    validation_errors = validation_results['validation_errors']
-                    updated_document.errors.extend(validation_errors)
-                    logger.error(f"Validation Error: {validation_errors}")
+        # Assessment validation
+        assessment_config = config.get('assessment', {})
+        assessment_enabled = normalize_boolean_value(assessment_config.get('enabled', False))
+        validation_enabled = assessment_enabled and normalize_boolean_value(assessment_config.get('validation_enabled', True))
+        logger.info(f"Assessment Enabled:{assessment_enabled}")
+        logger.info(f"Validation Enabled:{validation_enabled}")
+        if not assessment_enabled:
+            logger.info("Assessment is disabled.")
+        elif not validation_enabled:
+            logger.info("Assessment validation is disabled.")
+        else:
+            for section in updated_document.sections:
+                if section.section_id == section_id and section.extraction_result_uri:
+                    logger.info(f"Loading assessment results from: {section.extraction_result_uri}")
+                    # Load extraction data with assessment results
+                    extraction_data = s3.get_json_content(section.extraction_result_uri)
+                    validator = AssessmentValidator(extraction_data,
+                                                    assessment_config=assessment_config,
+                                                    enable_missing_check=True,
+                                                    enable_count_check=True)
+                    validation_results = validator.validate_all()
+                    if not validation_results['is_valid']:
+                        # Handle validation failure
+                        updated_document.status = Status.FAILED
+                        validation_errors = validation_results['validation_errors']
+                        updated_document.errors.extend(validation_errors)
+                        logger.error(f"Validation Error: {validation_errors}")
 
-    # Add Lambda metering for successful assessment execution with dynamic context
-    try:
-        lambda_metering = calculate_lambda_metering(assessment_context, context, start_time)
-        updated_document.metering = merge_metering_data(updated_document.metering, lambda_metering)
-    except Exception as e:
-        logger.warning(f"Failed to add Lambda metering for assessment: {str(e)}")
+        # Add Lambda metering for successful assessment execution with dynamic context
+        try:
+            lambda_metering = calculate_lambda_metering(assessment_context, context, start_time)
+            updated_document.metering = merge_metering_data(updated_document.metering, lambda_metering)
+        except Exception as e:
+            logger.warning(f"Failed to add Lambda metering for assessment: {str(e)}")
 
-    # Prepare output with automatic compression if needed
-    result = {
-        'document': updated_document.serialize_document(working_bucket, f"assessment_{section_id}", logger),
-        'section_id': section_id
-    }
+        # Return only the section delta: processresults merges the deltas of all
+        # sections into the classification document
+        result = {
+            'section_delta': updated_document.get_section_delta(section_id).serialize(working_bucket, f"assessment_{section_id}", logger),
+            'section_id': section_id
+        }
     
-    logger.info("Assessment processing completed")
-    return result
+        logger.info("Assessment processing completed")
+        return result
+    finally:
+        # The status update may still be running in the background
+        document_service.flush_status_updates()
@@ -6,7 +6,6 @@ Classification function that processes documents and classifies them using LLMs.
 Uses the idp_common.classification package for classification functionality.
 """
 
-import json
 import logging
 import os
 import time
@@ -15,6 +14,7 @@ from idp_common import classification, metrics, get_config
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common.utils import calculate_lambda_metering, merge_metering_data
+from idp_common.utils.log_utils import LogPayload
 
 # Configuration will be loaded in handler function
 region = os.environ['AWS_REGION']
@@ -24,17 +24,18 @@ logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Lambda handler for document classification.
     """
     start_time = time.time()  # Capture start time for Lambda metering
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.info("Event: %s", LogPayload(event))
     
     # Load configuration
     config = get_config()
     # Use default=str to handle Decimal and other non-serializable types
-    logger.info(f"Config: {json.dumps(config, default=str)}")
+    logger.info("Config: %s", LogPayload(config))
     
     # Extract document from the OCR result - handle both compressed and uncompressed
     working_bucket = os.environ.get('WORKING_BUCKET')
@@ -45,7 +46,7 @@ def handler(event, context):
     logger.info(f"Document buckets - input_bucket: {document.input_bucket}, output_bucket: {document.output_bucket}")
     logger.info(f"Document status: {document.status}, num_pages: {document.num_pages}")
     logger.info(f"Document pages count: {len(document.pages)}, sections count: {len(document.sections)}")
-    logger.info(f"Full document content: {json.dumps(document.to_dict(), default=str)}")
+    logger.info("Full document content: %s", LogPayload(document))
     
     # Intelligent Classification detection: Skip if pages already have classifications
     pages_with_classification = 0
@@ -76,7 +77,7 @@ def handler(event, context):
             "document": document.serialize_document(working_bucket, "classification_skip", logger)
         }
         
-        logger.info(f"Classification skipped - Response: {json.dumps(response, default=str)}")
+        logger.info("Classification skipped - Response: %s", LogPayload(response))
         return response
     
     # Normal classification processing
@@ -85,7 +86,7 @@ def handler(event, context):
     document.workflow_execution_arn = event.get("execution_arn")
     document_service = create_document_service()
     logger.info(f"Updating document status to {document.status}")
-    document_service.update_document(document)
+    document_service.update_document_status(document)
     
     if not document.pages:
         error_message = "Document has no pages to classify"
@@ -157,5 +158,5 @@ def handler(event, context):
         "document": document.serialize_document(working_bucket, "classification", logger)
     }
     
-    logger.info(f"Response: {json.dumps(response, default=str)}")
+    logger.info("Response: %s", LogPayload(response))
     return response
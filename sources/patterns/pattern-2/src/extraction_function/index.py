@@ -3,7 +3,6 @@
 
 
 import os
-import json
 import time
 import logging
 
@@ -11,6 +10,7 @@ from idp_common import metrics, get_config, extraction
 from idp_common.models import Document, Section, Status
 from idp_common.docs_service import create_document_service
 from idp_common.utils import calculate_lambda_metering, merge_metering_data
+from idp_common.utils.log_utils import LogPayload
 
 # Configuration will be loaded in handler function
 
@@ -21,16 +21,17 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Process a single section of a document for information extraction
     """
     start_time = time.time()  # Capture start time for Lambda metering
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.info("Event: %s", LogPayload(event))
 
     # Load configuration
     config = get_config()
-    logger.info(f"Config: {json.dumps(config)}")
+    logger.info("Config: %s", LogPayload(config))
     
     # For Map state, we get just one section from the document
     # Extract the document and section from the event - handle both compressed and uncompressed
@@ -42,7 +43,7 @@ def handler(event, context):
     logger.info(f"Document buckets - input_bucket: {full_document.input_bucket}, output_bucket: {full_document.output_bucket}")
     logger.info(f"Document status: {full_document.status}, num_pages: {full_document.num_pages}")
     logger.info(f"Document pages count: {len(full_document.pages)}, sections count: {len(full_document.sections)}")
-    logger.info(f"Full document content: {json.dumps(full_document.to_dict(), default=str)}")
+    logger.info("Full document content: %s", LogPayload(full_document))
     
     # Get the section ID directly from the Map state input
     # Now using the simplified array of section IDs format
@@ -80,7 +81,7 @@ def handler(event, context):
             "document": full_document.serialize_document(working_bucket, f"extraction_skip_{section_id}", logger)
         }
         
-        logger.info(f"Extraction skipped - Response: {json.dumps(response, default=str)}")
+        logger.info("Extraction skipped - Response: %s", LogPayload(response))
         return response
     else:
         logger.info(f"Processing section {section_id} - no extraction data found, proceeding with extraction")
@@ -90,54 +91,60 @@ def handler(event, context):
     full_document.status = Status.EXTRACTING
     document_service = create_document_service()
     logger.info(f"Updating document status to {full_document.status}")
-    document_service.update_document(full_document)
-       
-    # Create a section-specific document by modifying the original document
-    section_document = full_document
-    section_document.sections = [section]
-    section_document.metering = {}
-    
-    # Filter to keep only the pages needed for this section
-    needed_pages = {}
-    for page_id in section.page_ids:
-        if page_id in full_document.pages:
-            needed_pages[page_id] = full_document.pages[page_id]
-    section_document.pages = needed_pages
-    
-    # Initialize the extraction service
-    extraction_service = extraction.ExtractionService(config=config)
-    
-    # Track metrics
-    metrics.put_metric('InputDocuments', 1)
-    metrics.put_metric('InputDocumentPages', len(section.page_ids))
-    
-    # Process the section in our focused document
-    t0 = time.time()
-    section_document = extraction_service.process_document_section(
-        document=section_document,
-        section_id=section_id
-    )
-    t1 = time.time()
-    logger.info(f"Total extraction time: {t1-t0:.2f} seconds")
-    
-    # Check if document processing failed
-    if section_document.status == Status.FAILED:
-        error_message = f"Extraction failed for document {section_document.id}, section {section_id}"
-        logger.error(error_message)
-        raise Exception(error_message)
-    
-    # Add Lambda metering for successful extraction execution
+    # Status-only update, coalesced across the sections of the Map and sent
+    # in the background while the section is extracted
+    document_service.update_document_status(full_document, wait=False)
+
     try:
-        lambda_metering = calculate_lambda_metering("Extraction", context, start_time)
-        section_document.metering = merge_metering_data(section_document.metering, lambda_metering)
-    except Exception as e:
-        logger.warning(f"Failed to add Lambda metering for extraction: {str(e)}")
-    
-    # Prepare output with automatic compression if needed
-    response = {
-        "section_id": section_id,
-        "document": section_document.serialize_document(working_bucket, f"extraction_{section_id}", logger)
-    }
-    
-    logger.info(f"Response: {json.dumps(response, default=str)}")
-    return response
+        # Create a section-specific document by modifying the original document
+        section_document = full_document
+        section_document.sections = [section]
+        section_document.metering = {}
+    
+        # Filter to keep only the pages needed for this section
+        needed_pages = {}
+        for page_id in section.page_ids:
+            if page_id in full_document.pages:
+                needed_pages[page_id] = full_document.pages[page_id]
+        section_document.pages = needed_pages
+    
+        # Initialize the extraction service
+        extraction_service = extraction.ExtractionService(config=config)
+    
+        # Track metrics
+        metrics.put_metric('InputDocuments', 1)
+        metrics.put_metric('InputDocumentPages', len(section.page_ids))
+    
+        # Process the section in our focused document
+        t0 = time.time()
+        section_document = extraction_service.process_document_section(
+            document=section_document,
+            section_id=section_id
+        )
+        t1 = time.time()
+        logger.info(f"Total extraction time: {t1-t0:.2f} seconds")
+    
+        # Check if document processing failed
+        if section_document.status == Status.FAILED:
+            error_message = f"Extraction failed for document {section_document.id}, section {section_id}"
+            logger.error(error_message)
+            raise Exception(error_message)
+    
+        # Add Lambda metering for successful extraction execution
+        try:
+            lambda_metering = calculate_lambda_metering("Extraction", context, start_time)
+            section_document.metering = merge_metering_data(section_document.metering, lambda_metering)
+        except Exception as e:
+            logger.warning(f"Failed to add Lambda metering for extraction: {str(e)}")
+    
+        # Prepare output with automatic compression if needed
+        response = {
+            "section_id": section_id,
+            "document": section_document.serialize_document(working_bucket, f"extraction_{section_id}", logger)
+        }
+    
+        logger.info("Response: %s", LogPayload(response))
+        return response
+    finally:
+        # The status update may still be running in the background
+        document_service.flush_status_updates()
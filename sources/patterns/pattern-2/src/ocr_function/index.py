@@ -6,15 +6,15 @@ OCR function that processes PDFs and extracts text using AWS Textract.
 Uses the idp_common.ocr package for OCR functionality.
 """
 
-import json
 import logging
 import os
 import time
 
-from idp_common import get_config, ocr
+from idp_common import get_config, ocr, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common.utils import calculate_lambda_metering, merge_metering_data
+from idp_common.utils.log_utils import LogPayload
 
 # Configuration will be loaded in handler function
 
@@ -27,12 +27,13 @@ region = os.environ['AWS_REGION']
 METRIC_NAMESPACE = os.environ.get('METRIC_NAMESPACE')
 MAX_WORKERS = int(os.environ.get('MAX_WORKERS', 20))
 
+@metrics.flush_on_exit
 def handler(event, context): 
     """
     Lambda handler for OCR processing.
     """
     start_time = time.time()  # Capture start time for Lambda metering
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.info("Event: %s", LogPayload(event))
     
     # Get document from event - handle both compressed and uncompressed
     working_bucket = os.environ.get('WORKING_BUCKET')
@@ -43,7 +44,7 @@ def handler(event, context):
     logger.info(f"Document buckets - input_bucket: {document.input_bucket}, output_bucket: {document.output_bucket}")
     logger.info(f"Document status: {document.status}, num_pages: {document.num_pages}")
     logger.info(f"Document pages count: {len(document.pages)}, sections count: {len(document.sections)}")
-    logger.info(f"Full document content: {json.dumps(document.to_dict(), default=str)}")
+    logger.info("Full document content: %s", LogPayload(document))
     
     # Intelligent OCR detection: Skip if pages already have OCR data
     pages_with_ocr = 0
@@ -76,7 +77,7 @@ def handler(event, context):
             "document": document.serialize_document(working_bucket, "ocr_skip", logger)
         }
         
-        logger.info(f"OCR skipped - Response: {json.dumps(response, default=str)}")
+        logger.info("OCR skipped - Response: %s", LogPayload(response))
         return response
     
     # Normal OCR processing
@@ -85,7 +86,7 @@ def handler(event, context):
     document.workflow_execution_arn = event.get("execution_arn")
     document_service = create_document_service()
     logger.info(f"Updating document status to {document.status}")
-    document_service.update_document(document)
+    document_service.update_document_status(document)
     
     t0 = time.time()
     
@@ -127,5 +128,5 @@ def handler(event, context):
         "document": document.serialize_document(working_bucket, "ocr", logger)
     }
     
-    logger.info(f"Response: {json.dumps(response, default=str)}")
+    logger.info("Response: %s", LogPayload(response))
     return response
@@ -8,13 +8,15 @@ import os
 import boto3
 import random
 import string
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
 from decimal import Decimal
 
 from idp_common import s3, utils
-from idp_common.models import Document, Page, Section, Status, HitlMetadata
+from idp_common.models import Document, Page, Section, SectionDelta, Status, HitlMetadata
 from idp_common.docs_service import create_document_service
 from idp_common.config import get_config
+from idp_common.utils.log_utils import LogPayload
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
@@ -26,6 +28,8 @@ s3_client = boto3.client('s3')
 ssm_client = boto3.client('ssm')
 enable_hitl = os.environ.get('ENABLE_HITL', 'false').lower()
 SAGEMAKER_A2I_REVIEW_PORTAL_URL = os.environ.get('SAGEMAKER_A2I_REVIEW_PORTAL_URL', '')
+# Number of section results loaded from S3 concurrently
+MAX_WORKERS = int(os.environ.get('MAX_WORKERS', '20'))
 
 def get_confidence_threshold_from_config(document: Document) -> float:
     """
@@ -376,6 +380,72 @@ def process_section_for_hitl(section: Section, section_data: dict, confidence_th
     
     return any_hitl_triggered
 
+def load_section_snapshot(result: dict, working_bucket: str):
+    """
+    Reduce a section result that carries a full document snapshot (returned
+    by executions started before section deltas) to the delta of its section.
+    """
+    section_document = Document.load_document(result.get("document", {}), working_bucket, logger)
+    if not section_document or not section_document.sections:
+        return None
+    return section_document.get_section_delta(section_document.sections[0].section_id)
+
+def load_section_deltas(extraction_results: list, working_bucket: str) -> list:
+    """
+    Load the section deltas of the extraction Map concurrently, preserving their order.
+    
+    Returns:
+        List with one SectionDelta (or None for results without a section) per result
+    """
+    section_deltas = [None] * len(extraction_results)
+    delta_indexes = []
+    for i, result in enumerate(extraction_results):
+        if "section_delta" in result:
+            delta_indexes.append(i)
+        else:
+            section_deltas[i] = load_section_snapshot(result, working_bucket)
+    
+    if delta_indexes:
+        # Create the shared S3 client before the worker threads use it
+        s3.get_s3_client()
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(delta_indexes))) as executor:
+            loaded = executor.map(
+                lambda i: SectionDelta.load(extraction_results[i]["section_delta"], logger),
+                delta_indexes
+            )
+            for i, delta in zip(delta_indexes, loaded):
+                section_deltas[i] = delta
+    
+    logger.info(f"Loaded {len(delta_indexes)} section deltas and {len(extraction_results) - len(delta_indexes)} document snapshots")
+    return section_deltas
+
+def get_section_data(section: Section) -> dict:
+    """Download the extraction result of a section"""
+    parsed_uri = urlparse(section.extraction_result_uri)
+    section_obj = s3_client.get_object(Bucket=parsed_uri.netloc, Key=parsed_uri.path.lstrip('/'))
+    return json.loads(section_obj['Body'].read().decode('utf-8'))
+
+def fetch_hitl_section_data(sections: list) -> dict:
+    """
+    Download the extraction results of sections concurrently.
+    
+    Returns:
+        Dict mapping section ID to its extraction result. Sections whose
+        result could not be downloaded are left out.
+    """
+    section_data = {}
+    if not sections:
+        return section_data
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(sections))) as executor:
+        futures = {executor.submit(get_section_data, section): section for section in sections}
+        for future in as_completed(futures):
+            section = futures[future]
+            try:
+                section_data[section.section_id] = future.result()
+            except Exception as e:
+                logger.error(f"Error processing A2I for section {section.section_id}: {str(e)}")
+    return section_data
+
 def handler(event, context):
     """
     Consolidates the results from multiple extraction steps into a single output.
@@ -387,7 +457,7 @@ def handler(event, context):
     Returns:
         Dict containing the fully processed document
     """
-    logger.info(f"Processing event: {json.dumps(event)}")
+    logger.info("Processing event: %s", LogPayload(event))
     
     # Get the base document from the original classification result - handle both compressed and uncompressed
     working_bucket = os.environ.get('WORKING_BUCKET')
@@ -406,83 +476,69 @@ def handler(event, context):
     document.status = Status.POSTPROCESSING
     document_service = create_document_service()
     logger.info(f"Updating document status to {document.status}")
-    document_service.update_document(document)
+    document_service.update_document_status(document)
     
     # Clear sections list to rebuild from extraction results
     document.sections = []
     validation_errors = []
-    validation_errors = []
     hitl_triggered = False
     
-    # Combine all section results
-    for i, result in enumerate(extraction_results):
-        # New optimized format - document is at the top level
-        document_data = result.get("document", {})
-        section_document = Document.load_document(document_data, working_bucket, logger)
-        logger.info(f"section_document: {section_document}")
-        if section_document:       
-            # Add section to document if present
-            if section_document.sections:
-                section = section_document.sections[0]
-                logger.info(f"section: {section}")
-                document.sections.append(section)
+    # Load the per-section results concurrently and merge them in one pass
+    section_deltas = load_section_deltas(extraction_results, working_bucket)
+    for i, delta in enumerate(section_deltas):
+        if delta is None:
+            continue
+        section = delta.section
+        document.apply_section_delta(delta)
+        
+        # Create metadata file for section output
+        if section.extraction_result_uri:
+            create_metadata_file(section.extraction_result_uri, section.classification, 'section')
+
+        if delta.status == Status.FAILED:
+            error_message = (f"Processing failed for section {i + 1}: "
+                             f"{'; '.join(delta.errors)}")
+            validation_errors.append(error_message)
+            logger.error(f"Error: {error_message}")
+    
+    # Check if A2I should be triggered for sections with confidence threshold alerts
+    if enable_hitl == 'true':
+        hitl_sections = [section for section in document.sections if section.confidence_threshold_alerts]
+        section_data_by_id = fetch_hitl_section_data(hitl_sections)
+        for section in hitl_sections:
+            logger.info(f"Checking A2I trigger for section {section.section_id} with {len(section.confidence_threshold_alerts)} alerts")
+            logger.info(f"Processing section {section.section_id} for HITL with confidence threshold {confidence_threshold}")
+            logger.info(f"Section confidence threshold alerts: {section.confidence_threshold_alerts}")
+            
+            section_data = section_data_by_id.get(section.section_id)
+            if section_data is None:
+                continue
+            try:
+                # Process section for HITL (creates A2I tasks for each page)
+                section_hitl_triggered = process_section_for_hitl(
+                    section, section_data, confidence_threshold, execution_id, document.id
+                )
                 
-                # Check if A2I should be triggered for this section
-                if enable_hitl == 'true' and section.confidence_threshold_alerts:
-                    logger.info(f"Checking A2I trigger for section {section.section_id} with {len(section.confidence_threshold_alerts)} alerts")
-                    logger.info(f"Processing section {section.section_id} for HITL with confidence threshold {confidence_threshold}")
-                    logger.info(f"Section confidence threshold alerts: {section.confidence_threshold_alerts}")
+                if section_hitl_triggered:
+                    hitl_triggered = True
+                    logger.info(f"A2I triggered for section {section.section_id}")
                     
-                    # Download section data to get explainability_info
-                    try:
-                        # Parse S3 URI to get bucket and key
-                        from urllib.parse import urlparse
-                        parsed_uri = urlparse(section.extraction_result_uri)
-                        section_bucket = parsed_uri.netloc
-                        section_key = parsed_uri.path.lstrip('/')
-                        
-                        # Download section data
-                        section_obj = s3_client.get_object(Bucket=section_bucket, Key=section_key)
-                        section_data = json.loads(section_obj['Body'].read().decode('utf-8'))
-                        
-                        # Process section for HITL (creates A2I tasks for each page)
-                        section_hitl_triggered = process_section_for_hitl(
-                            section, section_data, confidence_threshold, execution_id, document.id
-                        )
-                        
-                        if section_hitl_triggered:
-                            hitl_triggered = True
-                            logger.info(f"A2I triggered for section {section.section_id}")
-                            
-                            # Create ONE HITL metadata entry per section (like Pattern-1)
-                            # Include all pages in the section that triggered HITL
-                            section_page_numbers = list(range(1, len(section.page_ids) + 1))
-                            hitl_metadata = HitlMetadata(
-                                execution_id=execution_id,
-                                record_number=int(section.section_id),  # Use actual section ID
-                                bp_match=True,
-                                extraction_bp_name=section.classification,
-                                hitl_triggered=True,
-                                page_array=section_page_numbers,  # All pages in this section
-                                review_portal_url=SAGEMAKER_A2I_REVIEW_PORTAL_URL
-                            )
-                            document.hitl_metadata.append(hitl_metadata)
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing A2I for section {section.section_id}: {str(e)}")
+                    # Create ONE HITL metadata entry per section (like Pattern-1)
+                    # Include all pages in the section that triggered HITL
+                    section_page_numbers = list(range(1, len(section.page_ids) + 1))
+                    hitl_metadata = HitlMetadata(
+                        execution_id=execution_id,
+                        record_number=int(section.section_id),  # Use actual section ID
+                        bp_match=True,
+                        extraction_bp_name=section.classification,
+                        hitl_triggered=True,
+                        page_array=section_page_numbers,  # All pages in this section
+                        review_portal_url=SAGEMAKER_A2I_REVIEW_PORTAL_URL
+                    )
+                    document.hitl_metadata.append(hitl_metadata)
                 
-                # Create metadata file for section output
-                if section.extraction_result_uri:
-                    create_metadata_file(section.extraction_result_uri, section.classification, 'section')
-
-                if section_document.status == Status.FAILED:
-                    error_message = (f"Processing failed for section {i + 1}: "
-                                     f"{'; '.join(section_document.errors)}")
-                    validation_errors.append(error_message)
-                    logger.error(f"Error: {error_message}")
-            
-            # Add metering from section processing
-            document.metering = utils.merge_metering_data(document.metering, section_document.metering)
+            except Exception as e:
+                logger.error(f"Error processing A2I for section {section.section_id}: {str(e)}")
     
     # Create metadata files for pages
     for page_id, page in document.pages.items():
@@ -510,7 +566,7 @@ def handler(event, context):
         "hitl_triggered": hitl_triggered
     }
     
-    logger.info(f"Response: {json.dumps(response, default=str)}")
+    logger.info("Response: %s", LogPayload(response))
 
     if document.errors:
         validation_errors.extend(document.errors)
@@ -6,6 +6,8 @@ import logging
 import os
 import torch
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import lightning.pytorch as pl
 
@@ -60,32 +62,106 @@ def model_fn(model_dir):
     }
 
 
-def predict_fn(input_data, model):
-    logger.info("===== Starting prediction... =====")
+def _predict_single(input_data, model):
     device = model["device"]
     model_instance = model["model"]
+    ih = InferenceHelper()
+    prompt = input_data["prompt"] if input_data.get("prompt") \
+        else model['validation_prompt']
+    prepped_model_input = ih.prepare_model_input(
+        processor=model["processor"],
+        image=input_data["image"],
+        textract=input_data["textract"],
+        prompt=prompt
+    )
+    for key in prepped_model_input:
+        if isinstance(prepped_model_input[key], torch.Tensor):
+            prepped_model_input[key] = prepped_model_input[key].to(device)
+    model_output = model_instance.model.generate(**prepped_model_input)
+    text_output = model["processor"].batch_decode(model_output, skip_special_tokens=True)[0]
+    return {"prediction": text_output, "prompt": prompt} if input_data.get('debug') \
+        else {"prediction": text_output}
+
+
+def _predict_batch(instances, model):
+    """
+    Predict several pages with a single generate call.
+
+    Returns one prediction per instance, in order. An instance whose input
+    cannot be prepared gets an error entry; the others are still predicted.
+    """
+    device = model["device"]
+    model_instance = model["model"]
+    ih = InferenceHelper()
+    predictions = [None] * len(instances)
+    batch = []  # (position, prompt, image, words, boxes)
+    for i, instance in enumerate(instances):
+        if "error" in instance:
+            predictions[i] = {"error": instance["error"]}
+            continue
+        try:
+            prompt = instance["prompt"] if instance.get("prompt") \
+                else model['validation_prompt']
+            words, boxes = ih.get_words_and_boxes(instance["textract"], prompt)
+            batch.append((i, prompt, instance["image"], words, boxes))
+        except Exception as e:
+            logger.error("===== Error preparing instance: %s =====", str(e), exc_info=True)
+            predictions[i] = {"error": str(e)}
+    if not batch:
+        return predictions
+
+    prepped_model_input = ih.prepare_batch_model_input(
+        processor=model["processor"],
+        images=[image for _, _, image, _, _ in batch],
+        words=[words for _, _, _, words, _ in batch],
+        boxes=[boxes for _, _, _, _, boxes in batch],
+    )
+    for key in prepped_model_input:
+        if isinstance(prepped_model_input[key], torch.Tensor):
+            prepped_model_input[key] = prepped_model_input[key].to(device)
+    model_output = model_instance.model.generate(**prepped_model_input)
+    text_outputs = model["processor"].batch_decode(model_output, skip_special_tokens=True)
+    for (i, prompt, _, _, _), text_output in zip(batch, text_outputs):
+        predictions[i] = {"prediction": text_output, "prompt": prompt} \
+            if instances[i].get('debug') else {"prediction": text_output}
+    return predictions
+
+
+def predict_fn(input_data, model):
+    logger.info("===== Starting prediction... =====")
+    if "instances" in input_data:
+        # Multi-page request: all pages go through the model in one generate
+        # call. If the batch fails, pages are predicted one by one so a failed
+        # instance returns an error entry the client can retry alone.
+        instances = input_data["instances"]
+        try:
+            return {"predictions": _predict_batch(instances, model)}
+        except Exception as e:
+            logger.error("===== Error during batch prediction: %s =====", str(e), exc_info=True)
+        predictions = []
+        for instance in instances:
+            if "error" in instance:
+                predictions.append({"error": instance["error"]})
+                continue
+            try:
+                predictions.append(_predict_single(instance, model))
+            except Exception as e:
+                logger.error("===== Error during prediction: %s =====", str(e), exc_info=True)
+                predictions.append({"error": str(e)})
+        return {"predictions": predictions}
     try:
-        ih = InferenceHelper()
-        prompt = input_data["prompt"] if input_data["prompt"] \
-            else model['validation_prompt']
-        prepped_model_input = ih.prepare_model_input(
-            processor=model["processor"],
-            image=input_data["image"],
-            textract=input_data["textract"],
-            prompt=prompt
-        )
-        for key in prepped_model_input:
-            if isinstance(prepped_model_input[key], torch.Tensor):
-                prepped_model_input[key] = prepped_model_input[key].to(device)
-        model_output = model_instance.model.generate(**prepped_model_input)
-        text_output = model["processor"].batch_decode(model_output, skip_special_tokens=True)[0]
-        return {"prediction": text_output, "prompt": prompt} if input_data['debug'] \
-            else {"prediction": text_output} 
+        return _predict_single(input_data, model)
     except Exception as e:
         logger.error("===== Error during prediction: %s =====", str(e), exc_info=True)
         raise
 
 
+def _load_instance(ih, instance):
+    instance['image'] = ih._get_image_from_s3(instance['input_image'])
+    instance['textract'] = ih._get_json_from_s3(instance['input_textract'])
+    return instance
+
+
 def input_fn(request_body, request_content_type):
     """
     Deserialize and prepare the prediction input
@@ -95,9 +171,20 @@ def input_fn(request_body, request_content_type):
         if request_content_type == "application/json":
             request = json.loads(request_body)
             ih = InferenceHelper()
-            # now let's load the image and the textract as actuall stuff
-            request['image'] = ih._get_image_from_s3(request['input_image'])
-            request['textract'] = ih._get_json_from_s3(request['input_textract'])
+            if "instances" in request:
+                # Multi-page request: load all pages concurrently and record
+                # per-instance load errors instead of failing the whole batch
+                def load(instance):
+                    try:
+                        return _load_instance(ih, instance)
+                    except Exception as e:
+                        logger.error("Error loading instance input: %s", str(e))
+                        return {"error": str(e)}
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    request["instances"] = list(executor.map(load, request["instances"]))
+            else:
+                # now let's load the image and the textract as actuall stuff
+                _load_instance(ih, request)
             logger.info("===== Successfully parsed JSON input =====")
         else:
             request = request_body
@@ -68,18 +68,35 @@ class InferenceHelper():
         textract = json.loads(response["Body"].read())
         return textract
 
-    def prepare_model_input(self, processor, image, textract, prompt):
+    def get_words_and_boxes(self, textract, prompt):
         # process the textract object
         textract = get_boxes_from_textract(textract)
 
         prompt_words = prompt.split(" ")
         prompt_boxes = np.array([[0, 0, 0, 0] for _ in prompt_words])
+        boxes = prompt_boxes if textract['boxes'] is None \
+            else np.concatenate([prompt_boxes, textract['boxes']])
+        return prompt_words + textract['words'], boxes
 
+    def prepare_model_input(self, processor, image, textract, prompt):
+        words, boxes = self.get_words_and_boxes(textract, prompt)
         encoding = processor(
             images=image,
-            text=prompt_words + textract['words'], 
-            boxes=prompt_boxes if textract['boxes'] is None \
-                else np.concatenate([prompt_boxes, textract['boxes']]),
+            text=words,
+            boxes=boxes,
+            truncation=True,
+            max_length=1024,
+            return_tensors="pt",
+        )
+        return encoding
+
+    def prepare_batch_model_input(self, processor, images, words, boxes):
+        # one encoding for several pages, padded to the longest page
+        encoding = processor(
+            images=images,
+            text=words,
+            boxes=boxes,
+            padding="longest",
             truncation=True,
             max_length=1024,
             return_tensors="pt",
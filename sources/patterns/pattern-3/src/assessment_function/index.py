@@ -2,14 +2,14 @@
 # SPDX-License-Identifier: MIT-0
 
 import os
-import json
 import time
 import logging
 
-from idp_common import get_config, assessment
+from idp_common import get_config, assessment, metrics
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common.utils import calculate_lambda_metering, merge_metering_data
+from idp_common.utils.log_utils import LogPayload
 
 # Configuration will be loaded in handler function
 
@@ -17,6 +17,7 @@ logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Lambda handler for document assessment.
@@ -24,11 +25,11 @@ def handler(event, context):
     using the Assessment service from the idp_common library.
     """
     start_time = time.time()  # Capture start time for Lambda metering
-    logger.info(f"Starting assessment processing for event: {json.dumps(event, default=str)}")
+    logger.info("Starting assessment processing for event: %s", LogPayload(event))
 
     # Load configuration
     config = get_config()
-    logger.info(f"Config: {json.dumps(config)}")
+    logger.info("Config: %s", LogPayload(config))
     
     # Extract input from event - handle both compressed and uncompressed
     document_data = event.get('document', {})
@@ -115,7 +116,7 @@ def handler(event, context):
                     "document": section_document.serialize_document(working_bucket, f"assessment_skip_{section_id}", logger)
                 }
                 
-                logger.info(f"Assessment skipped - Response: {json.dumps(response, default=str)}")
+                logger.info("Assessment skipped - Response: %s", LogPayload(response))
                 return response
             else:
                 logger.info(f"Assessment needed for section {section_id} - no explainability_info found in extraction results")
@@ -126,45 +127,44 @@ def handler(event, context):
     # Normal assessment processing
     document.status = Status.ASSESSING
 
-    # Update document status to ASSESSING for UI only
-    # Create new 'shell' document since our input document has only 1 section. 
-    docStatus = Document(
-        id=document.id,
-        input_key=document.input_key,
-        status=Status.ASSESSING,
-    )
+    # Update document status to ASSESSING for UI only. Status-only update,
+    # coalesced across the sections of the Map and sent in the background.
     document_service = create_document_service()
-    logger.info(f"Updating document status to {docStatus.status}")
-    document_service.update_document(docStatus)
+    logger.info(f"Updating document status to {document.status}")
+    document_service.update_document_status(document, wait=False)
 
-    # Initialize assessment service
-    assessment_service = assessment.AssessmentService(config=config)
+    try:
+        # Initialize assessment service
+        assessment_service = assessment.AssessmentService(config=config)
 
-    # Process the document section for assessment
-    t0 = time.time()
-    logger.info(f"Starting assessment for section {section_id}")
-    updated_document = assessment_service.process_document_section(document, section_id)
-    t1 = time.time()
-    logger.info(f"Total extraction time: {t1-t0:.2f} seconds")
+        # Process the document section for assessment
+        t0 = time.time()
+        logger.info(f"Starting assessment for section {section_id}")
+        updated_document = assessment_service.process_document_section(document, section_id)
+        t1 = time.time()
+        logger.info(f"Total extraction time: {t1-t0:.2f} seconds")
 
-    # Check if document processing failed
-    if updated_document.status == Status.FAILED:
-        error_message = f"Assessment failed for document {updated_document.id}, section {section_id}"
-        logger.error(error_message)
-        raise Exception(error_message)
+        # Check if document processing failed
+        if updated_document.status == Status.FAILED:
+            error_message = f"Assessment failed for document {updated_document.id}, section {section_id}"
+            logger.error(error_message)
+            raise Exception(error_message)
     
-    # Add Lambda metering for successful assessment execution with dynamic context
-    try:
-        lambda_metering = calculate_lambda_metering(assessment_context, context, start_time)
-        updated_document.metering = merge_metering_data(updated_document.metering, lambda_metering)
-    except Exception as e:
-        logger.warning(f"Failed to add Lambda metering for assessment: {str(e)}")
+        # Add Lambda metering for successful assessment execution with dynamic context
+        try:
+            lambda_metering = calculate_lambda_metering(assessment_context, context, start_time)
+            updated_document.metering = merge_metering_data(updated_document.metering, lambda_metering)
+        except Exception as e:
+            logger.warning(f"Failed to add Lambda metering for assessment: {str(e)}")
     
-    # Prepare output with automatic compression if needed
-    result = {
-        'document': updated_document.serialize_document(working_bucket, f"assessment_{section_id}", logger),
-        'section_id': section_id
-    }
+        # Prepare output with automatic compression if needed
+        result = {
+            'document': updated_document.serialize_document(working_bucket, f"assessment_{section_id}", logger),
+            'section_id': section_id
+        }
     
-    logger.info("Assessment processing completed")
-    return result
+        logger.info("Assessment processing completed")
+        return result
+    finally:
+        # The status update may still be running in the background
+        document_service.flush_status_updates()
@@ -6,7 +6,6 @@ Classification function for Pattern 3 that classifies documents using a SageMake
 Uses the common classification service with the SageMaker backend.
 """
 
-import json
 import logging
 import os
 import time
@@ -15,6 +14,7 @@ from idp_common import classification, metrics, get_config
 from idp_common.models import Document, Status
 from idp_common.docs_service import create_document_service
 from idp_common.utils import calculate_lambda_metering, merge_metering_data
+from idp_common.utils.log_utils import LogPayload
 
 # Configuration will be loaded in handler function
 region = os.environ['AWS_REGION']
@@ -25,12 +25,13 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_LOG_LEVEL", "INFO"))
 
 
+@metrics.flush_on_exit
 def handler(event, context):
     """
     Lambda handler for document classification using SageMaker UDOP model.
     """
     start_time = time.time()  # Capture start time for Lambda metering
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.info("Event: %s", LogPayload(event))
     
     # Extract document from the OCR result - handle both compressed and uncompressed
     working_bucket = os.environ.get('WORKING_BUCKET')
@@ -41,7 +42,7 @@ def handler(event, context):
     logger.info(f"Document buckets - input_bucket: {document.input_bucket}, output_bucket: {document.output_bucket}")
     logger.info(f"Document status: {document.status}, num_pages: {document.num_pages}")
     logger.info(f"Document pages count: {len(document.pages)}, sections count: {len(document.sections)}")
-    logger.info(f"Full document content: {json.dumps(document.to_dict(), default=str)}")
+    logger.info("Full document content: %s", LogPayload(document))
     
     # Intelligent Classification detection: Skip if pages already have classifications
     pages_with_classification = 0
@@ -72,7 +73,7 @@ def handler(event, context):
             "document": document.serialize_document(working_bucket, "classification_skip", logger)
         }
         
-        logger.info(f"Classification skipped - Response: {json.dumps(response, default=str)}")
+        logger.info("Classification skipped - Response: %s", LogPayload(response))
         return response
     
     # Normal classification processing
@@ -81,7 +82,7 @@ def handler(event, context):
     document.workflow_execution_arn = event.get("execution_arn")
     document_service = create_document_service()
     logger.info(f"Updating document status to {document.status}")
-    document_service.update_document(document)
+    document_service.update_document_status(document)
     
     if not document.pages:
         error_message = "Document has no pages to classify"
@@ -161,5 +162,5 @@ def handler(event, context):
         "document": document.serialize_document(working_bucket, "classification", logger)
     }
     
-    logger.info(f"Response: {json.dumps(response, default=str)}")
+    logger.info("Response: %s", LogPayload(response))
     return response
@@ -10,6 +10,7 @@ from urllib.parse import urlparse
 from idp_common import s3, utils
 from idp_common.models import Document, Page, Section, Status
 from idp_common.docs_service import create_document_service
+from idp_common.utils.log_utils import LogPayload
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
@@ -27,7 +28,7 @@ def handler(event, context):
     Returns:
         Dict containing the fully processed document
     """
-    logger.info(f"Processing event: {json.dumps(event)}")
+    logger.info("Processing event: %s", LogPayload(event))
     
     # Get the base document from the original classification result - handle both compressed and uncompressed
     working_bucket = os.environ.get('WORKING_BUCKET')
@@ -40,7 +41,7 @@ def handler(event, context):
     document.status = Status.POSTPROCESSING
     document_service = create_document_service()
     logger.info(f"Updating document status to {document.status}")
-    document_service.update_document(document)
+    document_service.update_document_status(document)
     
     # Clear sections list to rebuild from extraction results
     document.sections = []
@@ -77,7 +78,7 @@ def handler(event, context):
         "document": document.serialize_document(working_bucket, "processresults", logger)
     }
     
-    logger.info(f"Response: {json.dumps(response, default=str)}")
+    logger.info("Response: %s", LogPayload(response))
     return response
 
 def create_metadata_file(file_uri, class_type, file_type=None):
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Rebuild the reporting tables for documents processed in a date range.
+
+Reads the documents queued on each day from the tracking table, rebuilds
+their metering and document section records with the current configuration
+(pricing, classes and section schema logic), and writes them to the reporting
+bucket as partition-sized Parquet files that replace the per-document files.
+Glue tables of the section classes are updated once at the end. Finished days
+are recorded in the checkpoint file, so re-running the same command after an
+interruption continues where it stopped.
+
+Usage:
+    python backfill_reporting.py --stack-name my-idp-stack
+        --start 2025-01-01 --end 2025-01-31 [--data metering,sections]
+        [--checkpoint backfill.json] [--workers 8] [--keep-document-files]
+    python backfill_reporting.py --reporting-bucket my-reporting-bucket
+        --tracking-table my-tracking-table --config config.yaml
+        --start 2025-01-01 --end 2025-01-31
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "lib", "idp_common_pkg")
+)
+
+import boto3  # noqa: E402
+import yaml  # noqa: E402
+
+from idp_common.config import get_config  # noqa: E402
+from idp_common.reporting import ReportingBackfill  # noqa: E402
+from idp_common.reporting.backfill import (  # noqa: E402
+    DEFAULT_MAX_ROWS_PER_FILE,
+    SUPPORTED_DATA,
+)
+
+logger = logging.getLogger("backfill_reporting")
+
+
+def get_stack_resources(stack_name):
+    """Get the physical IDs of the resources of a stack by logical ID."""
+    cloudformation = boto3.client("cloudformation")
+    resources = {}
+    for page in cloudformation.get_paginator("list_stack_resources").paginate(
+        StackName=stack_name
+    ):
+        for resource in page["StackResourceSummaries"]:
+            resources[resource["LogicalResourceId"]] = resource["PhysicalResourceId"]
+    return resources
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--stack-name",
+        help="IDP stack to read the bucket, tables and configuration from",
+    )
+    parser.add_argument("--reporting-bucket", help="Reporting bucket name")
+    parser.add_argument("--tracking-table", help="Tracking table name")
+    parser.add_argument("--database-name", help="Glue database of the reporting tables")
+    parser.add_argument(
+        "--config", help="Configuration file (YAML or JSON) with the pricing section"
+    )
+    parser.add_argument("--start", required=True, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="Last day (YYYY-MM-DD)")
+    parser.add_argument(
+        "--data",
+        default=",".join(SUPPORTED_DATA),
+        help=f"Comma-separated data to rebuild: {', '.join(SUPPORTED_DATA)}",
+    )
+    parser.add_argument("--job-id", default="backfill", help="Name of the backfill")
+    parser.add_argument(
+        "--checkpoint", help="Checkpoint file (default: <job-id>-checkpoint.json)"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Transform processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--max-rows-per-file",
+        type=int,
+        default=DEFAULT_MAX_ROWS_PER_FILE,
+        help="Maximum rows per written Parquet file",
+    )
+    parser.add_argument(
+        "--keep-document-files",
+        action="store_true",
+        help="Keep the per-document files replaced by the backfill",
+    )
+    parser.add_argument(
+        "--log-level", default="INFO", help="Log level of the idp_common loggers"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level)
+
+    reporting_bucket = args.reporting_bucket
+    tracking_table = args.tracking_table
+    database_name = args.database_name
+    config = None
+    if args.stack_name:
+        resources = get_stack_resources(args.stack_name)
+        reporting_bucket = reporting_bucket or resources.get("ReportingBucket")
+        tracking_table = tracking_table or resources.get("TrackingTable")
+        database_name = database_name or f"{args.stack_name.lower()}-reporting-db"
+        if not args.config and resources.get("ConfigurationTable"):
+            config = get_config(resources["ConfigurationTable"])
+    if args.config:
+        with open(args.config) as f:
+            config = yaml.safe_load(f)
+    if not reporting_bucket or not tracking_table:
+        parser.error(
+            "--reporting-bucket and --tracking-table (or --stack-name) are required"
+        )
+
+    backfill = ReportingBackfill(
+        reporting_bucket,
+        tracking_table=tracking_table,
+        database_name=database_name,
+        config=config,
+        data_to_save=[data.strip() for data in args.data.split(",") if data.strip()],
+        checkpoint_path=args.checkpoint or f"{args.job_id}-checkpoint.json",
+        job_id=args.job_id,
+        max_workers=args.workers,
+        max_rows_per_file=args.max_rows_per_file,
+        remove_document_files=not args.keep_document_files,
+    )
+    summary = backfill.run(args.start, args.end)
+
+    days = summary["completed_dates"]
+    failed = [key for day in days.values() for key in day["failed"]]
+    print(
+        f"Backfilled {sum(day['documents'] for day in days.values())} documents "
+        f"in {sum(day['files'] for day in days.values())} files over {len(days)} days"
+    )
+    if failed:
+        print(f"{len(failed)} documents failed:\n" + json.dumps(failed, indent=2))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
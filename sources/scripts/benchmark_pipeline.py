@@ -0,0 +1,1048 @@
+#!/usr/bin/env python3
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Offline end-to-end throughput benchmark for the idp_common services.
+
+Runs OcrService, ClassificationService, ExtractionService,
+GranularAssessmentService, SummarizationService and EvaluationService on
+synthetic PDFs, with in-process stand-ins for S3, DynamoDB, Textract and
+Bedrock instead of AWS. The stand-ins answer with plausible responses after a
+configurable latency and can inject throttling errors, so the benchmark
+measures the library's own CPU, I/O and concurrency overhead per stage.
+
+Stages run one after another over all documents, with documents (and the
+sections of a document) processed concurrently within a stage. For each stage
+the benchmark reports wall time, process CPU time, the peak RSS growth over
+the RSS at the start of the stage, the process peak RSS so far, and the calls
+and bytes sent to and received from each stand-in.
+
+Usage:
+    python benchmark_pipeline.py [--documents 4] [--pages 10] [--concurrency 4]
+        [--latency bedrock=800,textract=150,s3=5] [--throttle bedrock=0.05]
+        [--stages ocr,classification,...] [--json results.json]
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, nullcontext
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "lib", "idp_common_pkg")
+)
+
+import boto3  # noqa: E402
+import fitz  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+
+from idp_common import bedrock, metrics, s3, tracing  # noqa: E402
+from idp_common.models import Document, Status  # noqa: E402
+from idp_common.ocr.render_budget import get_peak_rss_mb  # noqa: E402
+
+logger = logging.getLogger("benchmark_pipeline")
+
+STAGES = [
+    "ocr",
+    "classification",
+    "extraction",
+    "assessment",
+    "summarization",
+    "evaluation",
+]
+
+INPUT_BUCKET = "benchmark-input"
+OUTPUT_BUCKET = "benchmark-output"
+TRACKING_TABLE = "benchmark-tracking"
+
+CLASS_NAME = "Invoice"
+ATTRIBUTES = {
+    "InvoiceNumber": "INV-1001",
+    "InvoiceDate": "2025-01-15",
+    "VendorName": "Example Supplies LLC",
+    "CustomerName": "Acme Corp",
+    "TotalAmount": "12500.00",
+    "DueDate": "2025-02-14",
+}
+
+
+# ---------------------------------------------------------------------------
+# Stand-in services
+# ---------------------------------------------------------------------------
+
+
+class StandInStats:
+    """Thread-safe call, byte and throttle counters of one stand-in service."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.throttles = 0
+
+    def record(self, operation: str, bytes_in: int = 0, bytes_out: int = 0) -> None:
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    def record_throttle(self) -> None:
+        with self._lock:
+            self.throttles += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": sum(self.calls.values()),
+                "operations": dict(self.calls),
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "throttles": self.throttles,
+            }
+
+
+class StandIn:
+    """Base class adding latency and throttling injection to a stand-in."""
+
+    service_name = "generic"
+    throttle_code = "ThrottlingException"
+
+    def __init__(self, latency_ms: float = 0.0, throttle_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.throttle_rate = throttle_rate
+        self.stats = StandInStats()
+
+    def _call(self, operation: str, bytes_in: int = 0) -> None:
+        """Apply latency and throttling before an operation."""
+        if self.latency_ms:
+            # +/- 20% jitter around the configured latency
+            time.sleep(self.latency_ms * random.uniform(0.8, 1.2) / 1000)
+        if self.throttle_rate and random.random() < self.throttle_rate:
+            self.stats.record_throttle()
+            raise ClientError(
+                {"Error": {"Code": self.throttle_code, "Message": "Rate exceeded"}},
+                operation,
+            )
+        self.stats.record(operation, bytes_in=bytes_in)
+
+    def _returned(self, nbytes: int) -> None:
+        with self.stats._lock:
+            self.stats.bytes_out += nbytes
+
+    def __getattr__(self, name: str) -> Callable[..., Dict[str, Any]]:
+        # Operations the benchmark does not model (e.g. CloudWatch metrics)
+        # succeed with an empty response
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def operation(*args, **kwargs):
+            self._call(name)
+            return {}
+
+        return operation
+
+
+class _Body(io.BytesIO):
+    """Streaming body as returned by S3 get_object."""
+
+    def iter_chunks(self, chunk_size: int = 1024 * 1024):
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class StandInS3(StandIn):
+    """Dictionary-backed S3 stand-in."""
+
+    service_name = "s3"
+    throttle_code = "SlowDown"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._objects: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket, Key, Body=b"", ContentType=None, **kwargs):
+        if isinstance(Body, str):
+            Body = Body.encode("utf-8")
+        elif hasattr(Body, "read"):
+            Body = Body.read()
+        self._call("put_object", bytes_in=len(Body))
+        with self._lock:
+            self._objects[(Bucket, Key)] = {
+                "Body": bytes(Body),
+                "ContentType": ContentType or "binary/octet-stream",
+                "Metadata": kwargs.get("Metadata", {}),
+            }
+        return {"ETag": '"stand-in"'}
+
+    def _get(self, Bucket, Key):
+        with self._lock:
+            obj = self._objects.get((Bucket, Key))
+        if obj is None:
+            raise ClientError(
+                {"Error": {"Code": "NoSuchKey", "Message": f"{Key} not found"}},
+                "GetObject",
+            )
+        return obj
+
+    def get_object(self, Bucket, Key, **kwargs):
+        self._call("get_object")
+        obj = self._get(Bucket, Key)
+        self._returned(len(obj["Body"]))
+        return {
+            "Body": _Body(obj["Body"]),
+            "ContentLength": len(obj["Body"]),
+            "ContentType": obj["ContentType"],
+            "Metadata": obj["Metadata"],
+        }
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self._call("head_object")
+        obj = self._get(Bucket, Key)
+        return {
+            "ContentLength": len(obj["Body"]),
+            "ContentType": obj["ContentType"],
+            "Metadata": obj["Metadata"],
+        }
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, **kwargs):
+        extra = ExtraArgs or {}
+        self.put_object(Bucket, Key, Fileobj.read(), extra.get("ContentType"))
+
+    def list_objects_v2(self, Bucket, Prefix="", **kwargs):
+        self._call("list_objects_v2")
+        with self._lock:
+            keys = sorted(
+                k for b, k in self._objects if b == Bucket and k.startswith(Prefix)
+            )
+        contents = [
+            {"Key": key, "Size": len(self._objects[(Bucket, key)]["Body"])}
+            for key in keys
+        ]
+        return {"Contents": contents, "KeyCount": len(contents), "IsTruncated": False}
+
+    def get_paginator(self, operation_name):
+        stand_in = self
+
+        class Paginator:
+            def paginate(self, **kwargs):
+                yield getattr(stand_in, operation_name)(**kwargs)
+
+        return Paginator()
+
+    def delete_object(self, Bucket, Key, **kwargs):
+        self._call("delete_object")
+        with self._lock:
+            self._objects.pop((Bucket, Key), None)
+        return {}
+
+    def object_count(self) -> int:
+        with self._lock:
+            return len(self._objects)
+
+
+class StandInTextract(StandIn):
+    """Textract stand-in returning LINE and WORD blocks for a synthetic page."""
+
+    service_name = "textract"
+
+    def __init__(self, *args, lines_per_page: int = 40, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lines_per_page = lines_per_page
+
+    def _response(self) -> Dict[str, Any]:
+        blocks = []
+        line_ids = []
+        height = 0.9 / max(self.lines_per_page, 1)
+        for i in range(self.lines_per_page):
+            text = page_line(i)
+            top = 0.05 + i * height
+            word_ids = []
+            left = 0.05
+            for j, word in enumerate(text.split()):
+                width = 0.012 * len(word)
+                word_id = f"w-{i}-{j}"
+                word_ids.append(word_id)
+                blocks.append(
+                    {
+                        "BlockType": "WORD",
+                        "Id": word_id,
+                        "Text": word,
+                        "TextType": "PRINTED",
+                        "Confidence": 99.1,
+                        "Geometry": geometry(left, top, width, height * 0.8),
+                    }
+                )
+                left += width + 0.01
+            line_id = f"l-{i}"
+            line_ids.append(line_id)
+            blocks.append(
+                {
+                    "BlockType": "LINE",
+                    "Id": line_id,
+                    "Text": text,
+                    "Confidence": 98.7,
+                    "Geometry": geometry(0.05, top, left - 0.05, height * 0.8),
+                    "Relationships": [{"Type": "CHILD", "Ids": word_ids}],
+                }
+            )
+        blocks.insert(
+            0,
+            {
+                "BlockType": "PAGE",
+                "Id": "page",
+                "Geometry": geometry(0, 0, 1, 1),
+                "Relationships": [{"Type": "CHILD", "Ids": line_ids}],
+            },
+        )
+        return {
+            "DocumentMetadata": {"Pages": 1},
+            "Blocks": blocks,
+            "DetectDocumentTextModelVersion": "1.0",
+        }
+
+    def detect_document_text(self, Document, **kwargs):
+        self._call("detect_document_text", bytes_in=len(Document.get("Bytes", b"")))
+        response = self._response()
+        self._returned(len(json.dumps(response)))
+        return response
+
+    def analyze_document(self, Document, FeatureTypes=None, **kwargs):
+        self._call("analyze_document", bytes_in=len(Document.get("Bytes", b"")))
+        response = self._response()
+        self._returned(len(json.dumps(response)))
+        return response
+
+
+class StandInBedrock(StandIn):
+    """Bedrock runtime stand-in answering converse calls per pipeline stage."""
+
+    service_name = "bedrock"
+    stage_pattern = re.compile(r"\[benchmark:(\w+)\]")
+
+    def __init__(self, *args, output_tokens: int = 300, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.output_tokens = output_tokens
+
+    @staticmethod
+    def _text(blocks: List[Dict[str, Any]]) -> str:
+        return "\n".join(block["text"] for block in blocks if "text" in block)
+
+    def _reply(self, stage: str) -> str:
+        if stage == "classification":
+            return json.dumps({"class": CLASS_NAME})
+        if stage == "extraction":
+            return json.dumps(ATTRIBUTES)
+        if stage == "assessment":
+            return json.dumps(
+                {
+                    name: {
+                        "confidence": 0.95,
+                        "confidence_reason": "Value is clearly printed on the page.",
+                    }
+                    for name in ATTRIBUTES
+                }
+            )
+        if stage == "summarization":
+            summary = " ".join(page_line(i) for i in range(20))
+            return json.dumps({"summary": f"## Summary\n\n{summary}"})
+        return "{}"
+
+    def converse(self, modelId, messages, system=None, **kwargs):
+        request_text = self._text(system or []) + "".join(
+            self._text(message.get("content", [])) for message in messages
+        )
+        image_bytes = sum(
+            len(block["image"]["source"]["bytes"])
+            for message in messages
+            for block in message.get("content", [])
+            if "image" in block
+        )
+        self._call("converse", bytes_in=len(request_text) + image_bytes)
+
+        match = self.stage_pattern.search(self._text(system or []))
+        text = self._reply(match.group(1) if match else "")
+        self._returned(len(text))
+        images = image_bytes and sum(
+            1
+            for message in messages
+            for block in message.get("content", [])
+            if "image" in block
+        )
+        input_tokens = len(request_text) // 4 + 1500 * (images or 0)
+        output_tokens = max(len(text) // 4, 1)
+        return {
+            "output": {"message": {"role": "assistant", "content": [{"text": text}]}},
+            "stopReason": "end_turn",
+            "usage": {
+                "inputTokens": input_tokens,
+                "outputTokens": output_tokens,
+                "totalTokens": input_tokens + output_tokens,
+            },
+            "metrics": {"latencyMs": int(self.latency_ms)},
+        }
+
+
+class StandInTable:
+    """Dictionary-backed DynamoDB table supporting item reads and writes."""
+
+    def __init__(self, stand_in: "StandInDynamoDB", name: str):
+        self.stand_in = stand_in
+        self.name = name
+        self._items: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(key: Dict[str, Any]) -> tuple:
+        return (key.get("PK"), key.get("SK"))
+
+    def put_item(self, Item, **kwargs):
+        self.stand_in._call("put_item", bytes_in=len(json.dumps(Item, default=str)))
+        with self._lock:
+            self._items[self._key(Item)] = dict(Item)
+        return {}
+
+    def get_item(self, Key, **kwargs):
+        self.stand_in._call("get_item")
+        with self._lock:
+            item = self._items.get(self._key(Key))
+        if item is None:
+            return {}
+        self.stand_in._returned(len(json.dumps(item, default=str)))
+        return {"Item": dict(item)}
+
+    def update_item(self, Key, **kwargs):
+        # Expressions are not evaluated; the call is only counted
+        self.stand_in._call("update_item")
+        return {"Attributes": {}}
+
+    def delete_item(self, Key, **kwargs):
+        self.stand_in._call("delete_item")
+        with self._lock:
+            self._items.pop(self._key(Key), None)
+        return {}
+
+
+class StandInDynamoDB(StandIn):
+    """DynamoDB resource stand-in."""
+
+    service_name = "dynamodb"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tables: Dict[str, StandInTable] = {}
+        self._tables_lock = threading.Lock()
+
+    def Table(self, name):  # noqa: N802 - mirrors the boto3 resource API
+        with self._tables_lock:
+            if name not in self._tables:
+                self._tables[name] = StandInTable(self, name)
+            return self._tables[name]
+
+
+class StandIns:
+    """The set of stand-ins and the boto3 patches that install them."""
+
+    def __init__(
+        self,
+        latency: Dict[str, float],
+        throttle: Dict[str, float],
+        lines_per_page: int,
+    ):
+        def options(name):
+            return {
+                "latency_ms": latency.get(name, 0.0),
+                "throttle_rate": throttle.get(name, 0.0),
+            }
+
+        self.s3 = StandInS3(**options("s3"))
+        self.textract = StandInTextract(
+            **options("textract"), lines_per_page=lines_per_page
+        )
+        self.bedrock = StandInBedrock(**options("bedrock"))
+        self.dynamodb = StandInDynamoDB(**options("dynamodb"))
+        self.other = StandIn()
+        self.services = {
+            "s3": self.s3,
+            "textract": self.textract,
+            "bedrock-runtime": self.bedrock,
+            "dynamodb": self.dynamodb,
+        }
+
+    def client(self, service_name, *args, **kwargs):
+        return self.services.get(service_name, self.other)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: stand_in.stats.snapshot()
+            for name, stand_in in [
+                ("s3", self.s3),
+                ("textract", self.textract),
+                ("bedrock", self.bedrock),
+                ("dynamodb", self.dynamodb),
+            ]
+        }
+
+    def install(self, stack: ExitStack) -> None:
+        """Route boto3 clients and resources to the stand-ins."""
+        stack.enter_context(mock.patch.object(boto3, "client", self.client))
+        stack.enter_context(mock.patch.object(boto3, "resource", self.client))
+        # Drop clients cached before the stand-ins were installed
+        stack.enter_context(mock.patch.object(s3, "_s3_client", None))
+        stack.enter_context(mock.patch.object(metrics, "_cloudwatch_client", None))
+        stack.enter_context(mock.patch.object(bedrock.default_client, "_client", None))
+
+
+# ---------------------------------------------------------------------------
+# Synthetic input
+# ---------------------------------------------------------------------------
+
+
+def geometry(left: float, top: float, width: float, height: float) -> Dict[str, Any]:
+    """Textract geometry for a box."""
+    return {
+        "BoundingBox": {"Left": left, "Top": top, "Width": width, "Height": height},
+        "Polygon": [
+            {"X": left, "Y": top},
+            {"X": left + width, "Y": top},
+            {"X": left + width, "Y": top + height},
+            {"X": left, "Y": top + height},
+        ],
+    }
+
+
+def page_line(i: int) -> str:
+    """Line i of a synthetic invoice page."""
+    fields = list(ATTRIBUTES.items())
+    if i < len(fields):
+        return f"{fields[i][0]}: {fields[i][1]}"
+    return (
+        f"Item {i - len(fields) + 1} Office supplies "
+        f"quantity {i % 7 + 1} price {i * 3.5:.2f}"
+    )
+
+
+def make_pdf(num_pages: int, lines_per_page: int) -> bytes:
+    """Create a text PDF with the given number of invoice-like pages."""
+    pdf = fitz.open()
+    for _ in range(num_pages):
+        page = pdf.new_page(width=612, height=792)
+        y = 48
+        for i in range(lines_per_page):
+            page.insert_text((48, y), page_line(i), fontsize=9)
+            y += 700 / max(lines_per_page, 1)
+    content = pdf.tobytes()
+    pdf.close()
+    return content
+
+
+def make_config(max_workers: int) -> Dict[str, Any]:
+    """Configuration for all stages with stage markers in the system prompts."""
+
+    def prompts(stage: str, task_prompt: str) -> Dict[str, Any]:
+        return {
+            "model": "us.amazon.nova-pro-v1:0",
+            "temperature": 0.0,
+            "top_k": 5,
+            "top_p": 0.1,
+            "max_tokens": 4096,
+            "system_prompt": (
+                f"[benchmark:{stage}] You are a document processing expert."
+            ),
+            "task_prompt": task_prompt,
+        }
+
+    return {
+        "ocr": {
+            "backend": "textract",
+            "features": [],
+            "max_workers": max_workers,
+            "image": {"dpi": 150},
+        },
+        "classes": [
+            {
+                "name": CLASS_NAME,
+                "description": "A bill for goods or services.",
+                "attributes": [
+                    {
+                        "name": name,
+                        "description": f"The {name} of the invoice.",
+                        "attributeType": "simple",
+                        "evaluation_method": "EXACT",
+                    }
+                    for name in ATTRIBUTES
+                ],
+            },
+            {"name": "Letter", "description": "A formal letter.", "attributes": []},
+        ],
+        "classification": {
+            **prompts(
+                "classification",
+                "Classify the page into one of:\n{CLASS_NAMES_AND_DESCRIPTIONS}\n\n"
+                "<document-text>\n{DOCUMENT_TEXT}\n</document-text>\n{DOCUMENT_IMAGE}\n"
+                'Respond with JSON {"class": "<name>"}.',
+            ),
+            "classificationMethod": "multimodalPageLevelClassification",
+            "maxPagesForClassification": "ALL",
+        },
+        "extraction": prompts(
+            "extraction",
+            "Extract from this {DOCUMENT_CLASS} document:\n"
+            "{ATTRIBUTE_NAMES_AND_DESCRIPTIONS}\n\n"
+            "<document-text>\n{DOCUMENT_TEXT}\n</document-text>\n{DOCUMENT_IMAGE}",
+        ),
+        "assessment": {
+            **prompts(
+                "assessment",
+                "Assess the extraction of this {DOCUMENT_CLASS} document:\n"
+                "{ATTRIBUTE_NAMES_AND_DESCRIPTIONS}\n\n"
+                "<document-text>\n{DOCUMENT_TEXT}\n</document-text>\n"
+                "{OCR_TEXT_CONFIDENCE}\n{DOCUMENT_IMAGE}\n"
+                "<extraction-results>\n{EXTRACTION_RESULTS}\n</extraction-results>",
+            ),
+            "enabled": True,
+            "default_confidence_threshold": 0.9,
+            "granular": {
+                "enabled": True,
+                "max_workers": max_workers,
+                "simple_batch_size": 3,
+                "list_batch_size": 1,
+            },
+        },
+        "summarization": {
+            **prompts(
+                "summarization",
+                "Summarize this document:\n"
+                "<document-text>\n{DOCUMENT_TEXT}\n</document-text>",
+            ),
+            "enabled": True,
+        },
+        "evaluation": {"enabled": True},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Pipeline stages
+# ---------------------------------------------------------------------------
+
+
+def split_sections(document: Document, sections_per_document: int) -> None:
+    """Split classified pages into the requested number of sections."""
+    if not document.sections or sections_per_document <= 1:
+        return
+    page_ids = sorted(document.pages, key=int)
+    size = max(1, -(-len(page_ids) // sections_per_document))
+    template = document.sections[0]
+    document.sections = []
+    for i in range(0, len(page_ids), size):
+        section = type(template)(
+            section_id=str(len(document.sections) + 1),
+            classification=template.classification,
+            confidence=template.confidence,
+            page_ids=page_ids[i : i + size],
+        )
+        document.sections.append(section)
+
+
+def run_per_section(
+    documents: List[Document],
+    concurrency: int,
+    process: Callable[[Document, str], Document],
+) -> List[Document]:
+    """Process every section on its own copy of the document and merge results."""
+    tasks = [
+        (document, section.section_id)
+        for document in documents
+        for section in document.sections
+    ]
+
+    def run(task):
+        document, section_id = task
+        section_document = Document.from_dict(document.to_dict())
+        section_document.sections = [
+            s for s in section_document.sections if s.section_id == section_id
+        ]
+        section_document.metering = {}
+        return document, process(section_document, section_id).get_section_delta(
+            section_id
+        )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for document, delta in executor.map(run, tasks):
+            document.apply_section_delta(delta)
+            document.errors.extend(delta.errors)
+    return documents
+
+
+class Pipeline:
+    """Runs the stages of the pipeline over a set of synthetic documents."""
+
+    def __init__(self, args: argparse.Namespace, stand_ins: StandIns):
+        self.args = args
+        self.stand_ins = stand_ins
+        self.config = make_config(args.workers)
+        self.documents: List[Document] = []
+
+    def setup(self) -> None:
+        """Upload the synthetic PDFs to the input bucket."""
+        content = make_pdf(self.args.pages, self.args.lines_per_page)
+        for i in range(self.args.documents):
+            key = f"benchmark/doc-{i + 1}.pdf"
+            self.stand_ins.s3.put_object(
+                Bucket=INPUT_BUCKET,
+                Key=key,
+                Body=content,
+                ContentType="application/pdf",
+            )
+            self.documents.append(
+                Document(
+                    id=key,
+                    input_bucket=INPUT_BUCKET,
+                    input_key=key,
+                    output_bucket=OUTPUT_BUCKET,
+                    status=Status.QUEUED,
+                )
+            )
+
+    def _map(self, function: Callable[[Document], Document]) -> None:
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as executor:
+            self.documents = list(executor.map(function, self.documents))
+
+    def ocr(self) -> None:
+        from idp_common.ocr.service import OcrService
+
+        def run(document):
+            service = OcrService(
+                region="us-east-1", config=self.config, max_workers=self.args.workers
+            )
+            return service.process_document(document)
+
+        self._map(run)
+
+    def classification(self) -> None:
+        from idp_common.classification.service import ClassificationService
+
+        def run(document):
+            service = ClassificationService(
+                region="us-east-1", config=self.config, backend="bedrock"
+            )
+            document = service.classify_document(document)
+            split_sections(document, self.args.sections)
+            return document
+
+        self._map(run)
+
+    def extraction(self) -> None:
+        from idp_common.extraction.service import ExtractionService
+
+        service = ExtractionService(region="us-east-1", config=self.config)
+        run_per_section(
+            self.documents, self.args.concurrency, service.process_document_section
+        )
+
+    def assessment(self) -> None:
+        from idp_common.assessment.granular_service import GranularAssessmentService
+
+        service = GranularAssessmentService(
+            region="us-east-1", config=self.config, cache_table=TRACKING_TABLE
+        )
+        run_per_section(
+            self.documents, self.args.concurrency, service.process_document_section
+        )
+
+    def summarization(self) -> None:
+        from idp_common.summarization.service import SummarizationService
+
+        def run(document):
+            service = SummarizationService(region="us-east-1", config=self.config)
+            return service.process_document(document)
+
+        self._map(run)
+
+    def evaluation(self) -> None:
+        from idp_common.evaluation.service import EvaluationService
+
+        def run(document):
+            # Evaluate against a copy of itself, so every attribute matches
+            expected = Document.from_dict(document.to_dict())
+            service = EvaluationService(region="us-east-1", config=self.config)
+            return service.evaluate_document(document, expected)
+
+        self._map(run)
+
+    def run_stage(self, stage: str) -> Dict[str, Any]:
+        """Run one stage and measure it."""
+        before = self.stand_ins.snapshot()
+        errors_before = sum(len(d.errors) for d in self.documents)
+        cpu0 = time.process_time()
+        t0 = time.perf_counter()
+        with (
+            RssSampler() as rss,
+            tracing.collect() if self.args.spans else nullcontext([]) as spans,
+        ):
+            getattr(self, stage)()
+        wall = time.perf_counter() - t0
+        cpu = time.process_time() - cpu0
+        after = self.stand_ins.snapshot()
+
+        services = {}
+        for name, stats in after.items():
+            delta = {
+                key: stats[key] - before[name][key]
+                for key in ("calls", "bytes_in", "bytes_out", "throttles")
+            }
+            if any(delta.values()):
+                services[name] = delta
+
+        pages = sum(len(d.pages) for d in self.documents)
+        return {
+            "stage": stage,
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "stage_rss_growth_mb": rss.growth_mb,
+            "process_peak_rss_mb": get_peak_rss_mb(),
+            "pages_per_s": pages / wall if wall else 0.0,
+            "errors": sum(len(d.errors) for d in self.documents) - errors_before,
+            "failed_documents": sum(d.status == Status.FAILED for d in self.documents),
+            "services": services,
+            "spans": summarize_spans(spans),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Memory
+# ---------------------------------------------------------------------------
+
+
+def get_current_rss_mb() -> Optional[float]:
+    """Get the current resident set size of this process in MB (Linux only)."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class RssSampler:
+    """
+    Measure how far RSS grows above its level at the start of a block.
+
+    The process peak RSS is a high-water mark over the whole run, so a stage
+    that runs after a more memory hungry one would report that stage's peak.
+    The sampler instead polls the current RSS on a background thread. Where
+    the current RSS cannot be read, growth_mb is None.
+    """
+
+    def __init__(self, interval_s: float = 0.01):
+        self.interval_s = interval_s
+        self.growth_mb: Optional[float] = None
+        self._start = None
+        self._peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self) -> None:
+        rss = get_current_rss_mb()
+        if rss is not None and rss > self._peak:
+            self._peak = rss
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self._sample()
+
+    def __enter__(self) -> "RssSampler":
+        self._start = self._peak = get_current_rss_mb()
+        if self._start is not None:
+            self._thread = threading.Thread(target=self._poll, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        self.growth_mb = self._peak - self._start
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def summarize_spans(spans: List[tracing.Span]) -> Dict[str, Dict[str, float]]:
+    """Aggregate span durations by span name, slowest total first."""
+    summary: Dict[str, Dict[str, float]] = {}
+    for span in spans:
+        entry = summary.setdefault(span.name, {"count": 0, "total_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += span.duration_ms
+    return dict(sorted(summary.items(), key=lambda item: -item[1]["total_ms"]))
+
+
+def parse_rates(value: str) -> Dict[str, float]:
+    """Parse 'service=value,...' into a dict."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, number = item.partition("=")
+        rates[name.strip()] = float(number)
+    return rates
+
+
+def format_bytes(nbytes: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(nbytes) < 1024 or unit == "GB":
+            return f"{nbytes:.0f}{unit}" if unit == "B" else f"{nbytes:.1f}{unit}"
+        nbytes /= 1024
+    return f"{nbytes}B"
+
+
+def print_report(results: List[Dict[str, Any]], args: argparse.Namespace) -> None:
+    print(
+        f"\n{args.documents} documents x {args.pages} pages, {args.sections} "
+        f"sections/document, concurrency {args.concurrency}, workers {args.workers}"
+    )
+    header = (
+        f"{'stage':<15}{'wall s':>9}{'cpu s':>9}{'cpu/wall':>9}{'pages/s':>10}"
+        f"{'+RSS MB':>9}{'max MB':>9}{'errors':>8}"
+        "  calls (bytes sent/received, throttles)"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        growth = (
+            "n/a"
+            if result["stage_rss_growth_mb"] is None
+            else f"{result['stage_rss_growth_mb']:.0f}"
+        )
+        calls = "; ".join(
+            f"{name} {stats['calls']} ({format_bytes(stats['bytes_in'])}/"
+            f"{format_bytes(stats['bytes_out'])}"
+            + (f", {stats['throttles']} throttled" if stats["throttles"] else "")
+            + ")"
+            for name, stats in result["services"].items()
+        )
+        print(
+            f"{result['stage']:<15}{result['wall_s']:>9.2f}{result['cpu_s']:>9.2f}"
+            f"{result['cpu_s'] / result['wall_s'] if result['wall_s'] else 0:>9.2f}"
+            f"{result['pages_per_s']:>10.1f}{growth:>9}"
+            f"{result['process_peak_rss_mb']:>9.0f}{result['errors']:>8}  {calls}"
+        )
+    total_wall = sum(r["wall_s"] for r in results)
+    total_cpu = sum(r["cpu_s"] for r in results)
+    print("-" * len(header))
+    print(f"{'total':<15}{total_wall:>9.2f}{total_cpu:>9.2f}")
+    print(
+        "+RSS MB: peak RSS growth during the stage; "
+        "max MB: process peak RSS up to the end of the stage"
+    )
+
+    for result in results:
+        if not result["spans"]:
+            continue
+        # Spans in worker threads overlap, so totals can exceed the wall time
+        print(f"\nSpans in {result['stage']} (count, total ms, mean ms):")
+        for name, entry in result["spans"].items():
+            print(
+                f"  {name:<32}{entry['count']:>7}{entry['total_ms']:>12.1f}"
+                f"{entry['total_ms'] / entry['count']:>10.2f}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=4, help="Number of documents")
+    parser.add_argument("--pages", type=int, default=10, help="Pages per document")
+    parser.add_argument("--sections", type=int, default=2, help="Sections per document")
+    parser.add_argument(
+        "--lines-per-page", type=int, default=40, help="Text lines per page"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Documents (or sections) processed concurrently in a stage",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Worker threads inside the services"
+    )
+    parser.add_argument(
+        "--latency",
+        default="",
+        help="Stand-in latency in ms, e.g. bedrock=800,textract=150,s3=5,dynamodb=5",
+    )
+    parser.add_argument(
+        "--throttle",
+        default="",
+        help="Fraction of calls throttled, e.g. bedrock=0.05",
+    )
+    parser.add_argument(
+        "--stages",
+        default=",".join(STAGES),
+        help=f"Comma-separated stages to run, in order (default: {','.join(STAGES)})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--spans",
+        action="store_true",
+        help="Record idp_common tracing spans and report time per span name",
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--log-level", default="WARNING", help="Log level of the idp_common loggers"
+    )
+    args = parser.parse_args()
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"Unknown stages: {unknown}. Valid stages: {STAGES}")
+
+    logging.basicConfig(level=args.log_level)
+    random.seed(args.seed)
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    os.environ["TRACKING_TABLE"] = TRACKING_TABLE
+
+    stand_ins = StandIns(
+        latency=parse_rates(args.latency),
+        throttle=parse_rates(args.throttle),
+        lines_per_page=args.lines_per_page,
+    )
+    results = []
+    with ExitStack() as stack:
+        stand_ins.install(stack)
+        pipeline = Pipeline(args, stand_ins)
+        pipeline.setup()
+        for stage in stages:
+            results.append(pipeline.run_stage(stage))
+        # Publish buffered metrics while CloudWatch is still a stand-in
+        metrics.flush()
+
+    print_report(results, args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"arguments": vars(args), "stages": results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Micro-benchmark for Textract block processing in the OCR service.
+
+Times the Textract block processing of the OCR service on saved Textract
+responses (rawText.json files, default: the test fixture), on a synthetic
+full page (lines of text, a table and form fields, with geometry, like an
+analyze_document page) and on a synthetic table-heavy page. Columns:
+
+- per page: what OCR runs for every page, the text confidence table
+- previous loop: the inline text confidence loop OCR ran before
+- full parse: plain text, tables and form fields from the block index
+- scan tables: tables resolved by scanning the block list for every ID
+- textractor: the markdown conversion used for result.json, if installed
+
+Usage:
+    python benchmark_textract_blocks.py [rawText.json ...] [--lines 60]
+        [--rows 200] [--columns 12] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "lib", "idp_common_pkg")
+)
+
+from idp_common.ocr.textract_blocks import process_textract_response  # noqa: E402
+
+DEFAULT_FIXTURE = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "lib",
+    "idp_common_pkg",
+    "tests",
+    "unit",
+    "ocr",
+    "fixtures",
+    "textract_table_page.json",
+)
+
+
+def geometry(index):
+    """Build the geometry of a block, as Textract returns it."""
+    top = (index % 50) / 50
+    return {
+        "BoundingBox": {"Width": 0.1, "Height": 0.01, "Left": 0.1, "Top": top},
+        "Polygon": [
+            {"X": 0.1, "Y": top},
+            {"X": 0.2, "Y": top},
+            {"X": 0.2, "Y": top + 0.01},
+            {"X": 0.1, "Y": top + 0.01},
+        ],
+    }
+
+
+def make_document_page(lines, words_per_line=8, rows=15, columns=5, fields=12):
+    """Build a synthetic analyze_document page with text, a table and forms."""
+    blocks = [{"BlockType": "PAGE", "Id": "page", "Geometry": geometry(0)}]
+
+    def word(block_id, text):
+        blocks.append(
+            {
+                "BlockType": "WORD",
+                "Id": block_id,
+                "Text": text,
+                "TextType": "PRINTED",
+                "Confidence": 99.1,
+                "Geometry": geometry(len(blocks)),
+            }
+        )
+        return block_id
+
+    for n in range(lines):
+        word_ids = [word(f"w-{n}-{i}", f"word{i}") for i in range(words_per_line)]
+        blocks.append(
+            {
+                "BlockType": "LINE",
+                "Id": f"l-{n}",
+                "Text": " ".join(f"word{i}" for i in range(words_per_line)),
+                "Confidence": 98.7,
+                "Geometry": geometry(len(blocks)),
+                "Relationships": [{"Type": "CHILD", "Ids": word_ids}],
+            }
+        )
+    cell_ids = []
+    for r in range(1, rows + 1):
+        for c in range(1, columns + 1):
+            cell_ids.append(f"c-{r}-{c}")
+            blocks.append(
+                {
+                    "BlockType": "CELL",
+                    "Id": f"c-{r}-{c}",
+                    "RowIndex": r,
+                    "ColumnIndex": c,
+                    "Confidence": 95.0,
+                    "Geometry": geometry(len(blocks)),
+                    "Relationships": [
+                        {"Type": "CHILD", "Ids": [word(f"cw-{r}-{c}", f"{r}.{c}")]}
+                    ],
+                }
+            )
+    blocks.append(
+        {
+            "BlockType": "TABLE",
+            "Id": "table",
+            "Geometry": geometry(len(blocks)),
+            "Relationships": [{"Type": "CHILD", "Ids": cell_ids}],
+        }
+    )
+    for n in range(fields):
+        blocks.append(
+            {
+                "BlockType": "KEY_VALUE_SET",
+                "Id": f"k-{n}",
+                "EntityTypes": ["KEY"],
+                "Geometry": geometry(len(blocks)),
+                "Relationships": [
+                    {"Type": "VALUE", "Ids": [f"v-{n}"]},
+                    {"Type": "CHILD", "Ids": [word(f"kw-{n}", f"Field{n}:")]},
+                ],
+            }
+        )
+        blocks.append(
+            {
+                "BlockType": "KEY_VALUE_SET",
+                "Id": f"v-{n}",
+                "EntityTypes": ["VALUE"],
+                "Geometry": geometry(len(blocks)),
+                "Relationships": [
+                    {"Type": "CHILD", "Ids": [word(f"vw-{n}", f"value{n}")]}
+                ],
+            }
+        )
+    return {"DocumentMetadata": {"Pages": 1}, "Blocks": blocks}
+
+
+def make_table_page(rows, columns):
+    """Build a synthetic analyze_document response with one large table."""
+    blocks = []
+    cell_ids = []
+    for r in range(1, rows + 1):
+        line_words = []
+        for c in range(1, columns + 1):
+            word_id = f"w-{r}-{c}"
+            cell_id = f"c-{r}-{c}"
+            blocks.append(
+                {
+                    "BlockType": "WORD",
+                    "Id": word_id,
+                    "Text": f"r{r}c{c}",
+                    "Confidence": 99.0,
+                }
+            )
+            blocks.append(
+                {
+                    "BlockType": "CELL",
+                    "Id": cell_id,
+                    "RowIndex": r,
+                    "ColumnIndex": c,
+                    "Relationships": [{"Type": "CHILD", "Ids": [word_id]}],
+                }
+            )
+            cell_ids.append(cell_id)
+            line_words.append(f"r{r}c{c}")
+        blocks.append(
+            {
+                "BlockType": "LINE",
+                "Id": f"l-{r}",
+                "Text": " ".join(line_words),
+                "Confidence": 98.5,
+            }
+        )
+    blocks.append(
+        {
+            "BlockType": "TABLE",
+            "Id": "table",
+            "Relationships": [{"Type": "CHILD", "Ids": cell_ids}],
+        }
+    )
+    return {"DocumentMetadata": {"Pages": 1}, "Blocks": blocks}
+
+
+def ocr_per_page(response):
+    """Run what the OCR service computes for every page."""
+    return process_textract_response(response).text_confidence
+
+
+def previous_loop(response):
+    """Run the inline text confidence loop the OCR service used before."""
+    markdown_lines = ["| Text | Confidence |", "|:-----|:-----------|"]
+    for block in response.get("Blocks", []):
+        if block.get("BlockType") == "LINE" and block.get("Text"):
+            text = block.get("Text", "").replace("|", "\\|")
+            confidence = round(block.get("Confidence", 0.0), 1)
+            if block.get("TextType") == "HANDWRITING":
+                markdown_lines.append(f"| {text} (HANDWRITING) | {confidence} |")
+            else:
+                markdown_lines.append(f"| {text} | {confidence} |")
+    return {"text": "\n".join(markdown_lines)}
+
+
+def full_parse(response):
+    """Build the block index and read the text, tables and form fields."""
+    content = process_textract_response(response)
+    return content.text, content.tables, content.key_values
+
+
+def scan_tables(response):
+    """Resolve table cells by scanning the block list for each related ID."""
+    blocks = response.get("Blocks", [])
+
+    def find(block_id):
+        for block in blocks:
+            if block.get("Id") == block_id:
+                return block
+        return None
+
+    def children(block):
+        ids = [
+            i
+            for rel in block.get("Relationships", [])
+            if rel.get("Type") == "CHILD"
+            for i in rel.get("Ids", [])
+        ]
+        return [b for b in (find(i) for i in ids) if b is not None]
+
+    tables = []
+    for table in (b for b in blocks if b.get("BlockType") == "TABLE"):
+        cells = {}
+        for cell in children(table):
+            text = " ".join(w.get("Text", "") for w in children(cell))
+            cells[(cell.get("RowIndex"), cell.get("ColumnIndex"))] = text
+        tables.append(cells)
+    return tables
+
+
+def time_call(func, response, repeat):
+    """Return the mean milliseconds per call."""
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        func(response)
+    return (time.perf_counter() - t0) * 1000 / repeat
+
+
+def get_textractor_parse():
+    """Return a function that runs the textractor markdown conversion, if installed."""
+    try:
+        from textractor.parsers import response_parser
+    except ImportError:
+        return None
+    return lambda response: response_parser.parse(response).to_markdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark single-pass Textract block processing"
+    )
+    parser.add_argument(
+        "files", nargs="*", help="Saved Textract responses (default: test fixture)"
+    )
+    parser.add_argument(
+        "--lines", type=int, default=60, help="Text lines of the synthetic full page"
+    )
+    parser.add_argument("--rows", type=int, default=200, help="Synthetic table rows")
+    parser.add_argument(
+        "--columns", type=int, default=12, help="Synthetic table columns"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement")
+    args = parser.parse_args()
+
+    pages = []
+    for path in args.files or [DEFAULT_FIXTURE]:
+        with open(path) as f:
+            pages.append((os.path.basename(path), json.load(f)))
+    pages.append((f"synthetic {args.lines}-line page", make_document_page(args.lines)))
+    pages.append(
+        (
+            f"synthetic {args.rows}x{args.columns} table",
+            make_table_page(args.rows, args.columns),
+        )
+    )
+
+    measurements = [
+        ("per page ms", ocr_per_page, args.repeat),
+        ("previous loop ms", previous_loop, args.repeat),
+        ("full parse ms", full_parse, args.repeat),
+        ("scan tables ms", scan_tables, max(1, args.repeat // 10)),
+    ]
+    textractor_parse = get_textractor_parse()
+    if textractor_parse:
+        measurements.append(("textractor ms", textractor_parse, args.repeat))
+
+    print(
+        f"{'page':<36} {'blocks':>7} "
+        + " ".join(f"{title:>16}" for title, _, _ in measurements)
+    )
+    for name, response in pages:
+        row = f"{name[:36]:<36} {len(response.get('Blocks', [])):>7}"
+        for _, func, repeat in measurements:
+            try:
+                row += f" {time_call(func, response, repeat):>16.3f}"
+            except Exception as e:
+                row += f" {'error: ' + str(e)[:9]:>16}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
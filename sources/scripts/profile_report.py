@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Cost and latency profile reports from metering data and tracing spans.
+
+The document report breaks one document's cost down by stage and service/API
+(priced with the configuration's pricing section), and, given log files
+exported with TRACING_MODE=log or emf, its time by stage, span, page and
+section, its retries and throttles, and a waterfall of its spans.
+
+The batch report reads a local copy of the reporting bucket (for example made
+with `aws s3 sync s3://<reporting-bucket> ./reporting`) and prints p50/p90/p99
+tables of cost, cost per page, pages, tokens and Lambda GB-seconds per
+document class over a date range.
+
+Usage:
+    python profile_report.py document --document document.json
+        [--config config.yaml] [--spans logs.txt ...] [--json profile.json]
+    python profile_report.py document --reporting-dir ./reporting
+        --document-id invoice.pdf [--spans logs.txt ...]
+    python profile_report.py batch --reporting-dir ./reporting
+        [--start 2025-01-01] [--end 2025-01-31] [--json profiles.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "lib", "idp_common_pkg")
+)
+
+import yaml  # noqa: E402
+
+from idp_common.models import Document  # noqa: E402
+from idp_common.reporting import profile  # noqa: E402
+
+logger = logging.getLogger("profile_report")
+
+
+def load_unit_cost(config_path):
+    """Get the unit price function of SaveReportingData for a config file."""
+    if not config_path:
+        return None
+    from idp_common.reporting import SaveReportingData
+
+    with open(config_path) as f:
+        config = yaml.safe_load(f)
+    return SaveReportingData("", config=config)._get_unit_cost
+
+
+def document_report(args):
+    span_records = profile.load_span_records(args.spans or [])
+    if args.document:
+        with open(args.document) as f:
+            document = Document.from_dict(json.load(f))
+        document_id = document.id
+        num_pages = document.num_pages
+        metering = profile.metering_records(
+            document.metering, load_unit_cost(args.config)
+        )
+    else:
+        document_id = args.document_id
+        rows = [
+            row
+            for row in profile.read_reporting_rows(args.reporting_dir, "metering")
+            if row.get("document_id") == document_id
+        ]
+        if not rows:
+            raise SystemExit(f"No metering data for {document_id}")
+        # Profile the latest processing run of the document
+        latest = max(row["timestamp"] for row in rows)
+        metering = [row for row in rows if row["timestamp"] == latest]
+        num_pages = metering[0].get("number_of_pages") or None
+
+    result = profile.build_document_profile(
+        document_id,
+        metering,
+        span_records,
+        num_pages=num_pages,
+        top=args.top,
+        max_repeated_spans=args.max_repeated_spans,
+    )
+    print(profile.format_document_profile(result))
+    return result
+
+
+def batch_report(args):
+    metering = profile.read_reporting_rows(
+        args.reporting_dir,
+        "metering",
+        args.start,
+        args.end,
+        columns=[
+            "document_id",
+            "context",
+            "unit",
+            "value",
+            "number_of_pages",
+            "estimated_cost",
+            "timestamp",
+        ],
+    )
+    sections = profile.read_reporting_rows(
+        args.reporting_dir,
+        "document_sections",
+        args.start,
+        args.end,
+        columns=["document_id", "section_classification"],
+    )
+    result = profile.build_class_profiles(
+        metering, profile.primary_classes(sections)
+    )
+    if not result:
+        raise SystemExit(f"No metering data found in {args.reporting_dir}")
+    print(profile.format_class_profiles(result))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--log-level", default="WARNING", help="Log level of the idp_common loggers"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    document = commands.add_parser("document", help="Profile one document")
+    source = document.add_mutually_exclusive_group(required=True)
+    source.add_argument("--document", help="Document JSON with metering data")
+    source.add_argument(
+        "--document-id", help="Document ID to read from --reporting-dir"
+    )
+    document.add_argument("--reporting-dir", help="Local copy of the reporting bucket")
+    document.add_argument(
+        "--config", help="Configuration (YAML or JSON) with the pricing section"
+    )
+    document.add_argument(
+        "--spans", nargs="*", help="Log files with exported tracing spans"
+    )
+    document.add_argument(
+        "--top", type=int, default=profile.DEFAULT_TOP, help="Rows per top list"
+    )
+    document.add_argument(
+        "--max-repeated-spans",
+        type=int,
+        default=profile.DEFAULT_MAX_REPEATED_SPANS,
+        help="Collapse sibling spans with the same name beyond this count",
+    )
+
+    batch = commands.add_parser("batch", help="Percentiles per document class")
+    batch.add_argument(
+        "--reporting-dir", required=True, help="Local copy of the reporting bucket"
+    )
+    batch.add_argument("--start", help="First date partition (YYYY-MM-DD)")
+    batch.add_argument("--end", help="Last date partition (YYYY-MM-DD)")
+    for command in (document, batch):
+        command.add_argument("--json", help="Also write the report to this JSON file")
+
+    args = parser.parse_args()
+    if args.command == "document" and args.document_id and not args.reporting_dir:
+        parser.error("--document-id requires --reporting-dir")
+
+    logging.basicConfig(level=args.log_level)
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+    if args.command == "document":
+        result = document_report(args)
+    else:
+        result = batch_report(args)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2, default=str)
+        print(f"\nReport written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
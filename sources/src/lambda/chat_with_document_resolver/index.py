@@ -10,14 +10,26 @@ import base64
 import hashlib
 import os
 import re 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
 from botocore.exceptions import ClientError
+from idp_common import metrics
 from idp_common.bedrock.client import BedrockClient
+from idp_common.summarization.page_index import PageIndex
 
 # Set up logging
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
+# Documents within both limits are sent to the model in full
+FULLTEXT_MAX_PAGES = int(os.environ.get("CHAT_FULLTEXT_MAX_PAGES", "20"))
+FULLTEXT_MAX_CHARS = int(os.environ.get("CHAT_FULLTEXT_MAX_CHARS", "100000"))
+# Larger documents send only the most relevant pages
+TOP_K_PAGES = int(os.environ.get("CHAT_TOP_K_PAGES", "8"))
+RETRIEVAL_MAX_CHARS = int(os.environ.get("CHAT_RETRIEVAL_MAX_CHARS", "100000"))
+RETRIEVAL_HISTORY_TURNS = int(os.environ.get("CHAT_RETRIEVAL_HISTORY_TURNS", "2"))
+PAGE_FETCH_WORKERS = int(os.environ.get("CHAT_PAGE_FETCH_WORKERS", "16"))
+
 def remove_text_between_brackets(text):
     # Find position of first opening bracket
     start = text.find('{')
@@ -42,7 +54,14 @@ def s3_object_exists(bucket, key):
         else:
             raise
 
-def get_full_text(bucket, key):
+def fetch_page_text(s3, bucket, page):
+    # Extract S3 key from URI
+    text_key = page['TextUri'].replace(f"s3://{bucket}/", "")
+    response = s3.get_object(Bucket=bucket, Key=text_key)
+    return response['Body'].read().decode('utf-8')
+
+def get_page_texts(bucket, key):
+    """Read the text of every page of a document, fetching pages concurrently"""
     try:
         dynamodb = boto3.resource('dynamodb')
         tracking_table = dynamodb.Table(os.environ['TRACKING_TABLE_NAME'])
@@ -57,30 +76,94 @@ def get_full_text(bucket, key):
             raise Exception(f"Document {key} not found")
             
         document = response['Item']
-        pages = document.get('Pages', {})
-        sorted_pages = sorted(pages, key=lambda x: x['Id'])
+        pages = [page for page in document.get('Pages', []) if 'TextUri' in page]
+        if not pages:
+            return []
 
         s3 = boto3.client('s3')
-        all_text = ""
-        
-        for page in sorted_pages:
-            if 'TextUri' in page:
-                # Extract S3 key from URI
-                text_key = page['TextUri'].replace(f"s3://{bucket}/", "")
-                
+        page_texts = []
+        with ThreadPoolExecutor(max_workers=min(PAGE_FETCH_WORKERS, len(pages))) as executor:
+            futures = {executor.submit(fetch_page_text, s3, bucket, page): page for page in pages}
+            for future in as_completed(futures):
+                page = futures[future]
                 try:
-                    response = s3.get_object(Bucket=bucket, Key=text_key)
-                    page_text = response['Body'].read().decode('utf-8')
-                    all_text += f"<page-number>{page['Id']}</page-number>\n{page_text}\n\n"
+                    page_texts.append((str(page['Id']), future.result()))
                 except Exception as e:
                     logger.warning(f"Failed to load page {page['Id']}: {e}")
-                    
-        return all_text
+        
+        logger.info(f"Loaded text of {len(page_texts)}/{len(pages)} pages")
+        return page_texts
         
     except Exception as e:
         logger.error(f"Error getting document pages: {str(e)}")
         raise Exception(f"Error getting document pages: {str(e)}")
 
+def get_page_index(bucket, key):
+    """Load the page index of a document, building and storing it on first use"""
+    s3 = boto3.client('s3')
+    index_key = key + '/summary/page_index.json'
+    
+    if s3_object_exists(bucket, index_key):
+        response = s3.get_object(Bucket=bucket, Key=index_key)
+        try:
+            return PageIndex.from_dict(json.loads(response['Body'].read()))
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Rebuilding page index {index_key}: {e}")
+    
+    logger.info(f"Creating page index: {index_key}")
+    page_index = PageIndex.from_pages(get_page_texts(bucket, key))
+    s3.put_object(
+        Bucket=bucket,
+        Key=index_key,
+        Body=json.dumps(page_index.to_dict()).encode('utf-8'),
+        ContentType='application/json'
+    )
+    
+    fulltext_key = key + '/summary/fulltext.txt'
+    if not s3_object_exists(bucket, fulltext_key):
+        logger.info(f"Creating full text file: {fulltext_key}")
+        s3.put_object(
+            Bucket=bucket,
+            Key=fulltext_key,
+            Body=page_index.get_text().encode('utf-8')
+        )
+    return page_index
+
+def get_history_questions(history, turns):
+    """Get the questions of the most recent chat turns"""
+    if isinstance(history, str):
+        try:
+            history = json.loads(history)
+        except ValueError:
+            return []
+    if not isinstance(history, list) or turns <= 0:
+        return []
+    return [item.get('ask', '') for item in history[-turns:] if isinstance(item, dict)]
+
+def get_document_text(page_index, prompt, history):
+    """
+    Get the document text to send to the model for a question.
+    
+    Small documents are sent in full. For larger documents only the pages
+    most relevant to the question and the recent questions are sent, in page
+    order. If no page matches, the first pages that fit the retrieval budget
+    are sent.
+    """
+    if page_index.num_pages <= FULLTEXT_MAX_PAGES and page_index.num_chars <= FULLTEXT_MAX_CHARS:
+        logger.info(f"Using full text of {page_index.num_pages} pages")
+        return page_index.get_text()
+    
+    query = " ".join([prompt] + get_history_questions(history, RETRIEVAL_HISTORY_TURNS))
+    page_ids = page_index.search(query, TOP_K_PAGES, max_chars=RETRIEVAL_MAX_CHARS)
+    if not page_ids:
+        page_ids = page_index.leading_pages(RETRIEVAL_MAX_CHARS)
+        logger.info(f"No pages matched the question, using first {len(page_ids)} pages")
+        # The first page alone may exceed the budget
+        return page_index.get_text(page_ids)[:RETRIEVAL_MAX_CHARS]
+    
+    logger.info(f"Using {len(page_ids)}/{page_index.num_pages} pages: {page_ids}")
+    return page_index.get_text(page_ids)
+
 
 def get_summarization_model():
     """Get the summarization model from configuration table"""
@@ -106,6 +189,7 @@ def get_summarization_model():
         logger.error(f"Error getting summarization model from config: {str(e)}")
         return 'us.amazon.nova-pro-v1:0'  # Fallback default
 
+@metrics.flush_on_exit
 def handler(event, context):
     response_data = {}
 
@@ -129,22 +213,8 @@ def handler(event, context):
 
         if (len(objectKey)):
             fulltext_key = objectKey + '/summary/fulltext.txt'
-            content_str = ""
-            s3 = boto3.client('s3')
-
-            if not s3_object_exists(output_bucket, fulltext_key):
-                logger.info(f"Creating full text file: {fulltext_key}")
-                content_str = get_full_text(output_bucket, objectKey)
-
-                s3.put_object(
-                    Bucket=output_bucket,
-                    Key=fulltext_key,
-                    Body=content_str.encode('utf-8')
-                )
-            else:
-                # read full contents of the object as text
-                response = s3.get_object(Bucket=output_bucket, Key=fulltext_key)
-                content_str = response['Body'].read().decode('utf-8')
+            page_index = get_page_index(output_bucket, objectKey)
+            content_str = get_document_text(page_index, prompt, history)
 
             logger.info(f"Model: {selectedModelId}")
             logger.info(f"Output Bucket: {output_bucket}")
@@ -4,7 +4,9 @@
 import boto3
 import json
 import logging
+import os
 import traceback
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
@@ -15,6 +17,103 @@ logger.setLevel(logging.INFO)
 # Create boto3 client with logging
 stepfunctions = boto3.client('stepfunctions')
 
+# Parsed history of recent executions, kept across invocations of a warm container
+EXECUTION_HISTORY_CACHE_SIZE = int(os.environ.get('EXECUTION_HISTORY_CACHE_SIZE', '20'))
+_execution_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def get_cached_execution(execution_arn: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the cached parser and details of an execution
+    
+    Args:
+        execution_arn: Execution ARN
+        
+    Returns:
+        Dict with 'parser' (ExecutionHistoryParser) and 'details' (execution details
+        if the execution has succeeded, otherwise None), or None if not cached
+    """
+    cached = _execution_cache.get(execution_arn)
+    if cached is not None:
+        _execution_cache.move_to_end(execution_arn)
+    return cached
+
+
+def cache_execution(execution_arn: str, parser: "ExecutionHistoryParser", details: Optional[Dict[str, Any]]) -> None:
+    """
+    Cache the parser and, for succeeded executions, the details of an execution
+    
+    Args:
+        execution_arn: Execution ARN
+        parser: Parser holding the events processed so far
+        details: Execution details to return for later requests, or None if the
+            execution has not succeeded
+    """
+    if EXECUTION_HISTORY_CACHE_SIZE <= 0:
+        return
+    _execution_cache[execution_arn] = {'parser': parser, 'details': details}
+    _execution_cache.move_to_end(execution_arn)
+    while len(_execution_cache) > EXECUTION_HISTORY_CACHE_SIZE:
+        _execution_cache.popitem(last=False)
+
+
+def fetch_new_events(execution_arn: str, last_event_id: int = 0) -> List[Dict[str, Any]]:
+    """
+    Fetch the execution history events after an event ID
+    
+    Pages through the history newest first and stops at the first event that was
+    already processed, so only new events (and at most one partial page) are read.
+    
+    Args:
+        execution_arn: Execution ARN
+        last_event_id: ID of the last event already processed (0 for none)
+        
+    Returns:
+        New events in ascending event ID order
+    """
+    new_events = []
+    next_token = None
+    page_count = 0
+    
+    while True:
+        page_count += 1
+        history_params = {
+            'executionArn': execution_arn,
+            'maxResults': 1000,
+            'reverseOrder': True
+        }
+        
+        if next_token:
+            history_params['nextToken'] = next_token
+        
+        page_start_time = datetime.now()
+        logger.info(f"Fetching execution history page {page_count} with params: {history_params}")
+        
+        try:
+            history_response = stepfunctions.get_execution_history(**history_params)
+        except Exception as history_error:
+            logger.error(f"Failed to fetch execution history page {page_count}: {str(history_error)}")
+            logger.error(f"Error details: {traceback.format_exc()}")
+            raise history_error
+        
+        reached_processed_events = False
+        for event in history_response['events']:
+            if event['id'] <= last_event_id:
+                reached_processed_events = True
+                break
+            new_events.append(event)
+        
+        page_duration = (datetime.now() - page_start_time).total_seconds()
+        logger.info(f"Retrieved page {page_count} with {len(history_response['events'])} events in {page_duration:.2f} seconds")
+        
+        next_token = history_response.get('nextToken')
+        if reached_processed_events or not next_token:
+            break
+    
+    new_events.reverse()
+    return new_events
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler to get Step Functions execution details
@@ -33,6 +132,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         execution_arn = event['arguments']['executionArn']
         logger.info(f"Getting execution details for: {execution_arn}")
         
+        # Succeeded executions do not change, so they are served from the cache
+        cached = get_cached_execution(execution_arn)
+        if cached and cached['details'] is not None:
+            logger.info(f"Returning cached details for succeeded execution {execution_arn}")
+            return cached['details']
+        
         # Get execution details with detailed logging
         logger.info(f"Calling describe_execution API for {execution_arn}")
         start_time = datetime.now()
@@ -47,57 +152,24 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         api_duration = (datetime.now() - start_time).total_seconds()
         logger.info(f"describe_execution API call took {api_duration:.2f} seconds")
         
-        # Get execution history with pagination to capture all events
-        all_events = []
-        next_token = None
-        page_count = 0
-        
-        logger.info(f"Starting to fetch execution history for {execution_arn}")
+        # Fetch only the events added since the last request for this execution
+        parser = cached['parser'] if cached else ExecutionHistoryParser()
+        logger.info(f"Fetching execution history for {execution_arn} after event {parser.last_event_id}")
         history_start_time = datetime.now()
-        
-        while True:
-            page_count += 1
-            history_params = {
-                'executionArn': execution_arn,
-                'maxResults': 1000,  # Increased to capture more events
-                'reverseOrder': False
-            }
-            
-            if next_token:
-                history_params['nextToken'] = next_token
-            
-            page_start_time = datetime.now()
-            logger.info(f"Fetching execution history page {page_count} with params: {history_params}")
-            
-            try:
-                history_response = stepfunctions.get_execution_history(**history_params)
-                page_events = history_response['events']
-                all_events.extend(page_events)
-                
-                page_duration = (datetime.now() - page_start_time).total_seconds()
-                logger.info(f"Retrieved page {page_count} with {len(page_events)} events in {page_duration:.2f} seconds")
-                
-                next_token = history_response.get('nextToken')
-                if not next_token:
-                    break
-            except Exception as history_error:
-                logger.error(f"Failed to fetch execution history page {page_count}: {str(history_error)}")
-                logger.error(f"Error details: {traceback.format_exc()}")
-                raise history_error
-        
+        new_events = fetch_new_events(execution_arn, parser.last_event_id)
         history_duration = (datetime.now() - history_start_time).total_seconds()
-        logger.info(f"Retrieved {len(all_events)} total events in {page_count} pages, took {history_duration:.2f} seconds")
+        logger.info(f"Retrieved {len(new_events)} new events, took {history_duration:.2f} seconds")
         
         # Log event types and counts for debugging
         event_type_counts = {}
-        for event in all_events:
+        for event in new_events:
             event_type = event['type']
             event_type_counts[event_type] = event_type_counts.get(event_type, 0) + 1
         
         logger.info(f"Event type counts: {json.dumps(event_type_counts)}")
         
         # Check for failure events specifically
-        failure_events = [e for e in all_events if 'Failed' in e['type'] or 'TimedOut' in e['type'] or 'Aborted' in e['type']]
+        failure_events = [e for e in new_events if 'Failed' in e['type'] or 'TimedOut' in e['type'] or 'Aborted' in e['type']]
         if failure_events:
             logger.info(f"Found {len(failure_events)} failure events")
             for i, failure in enumerate(failure_events):
@@ -110,7 +182,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Process execution details
         parse_start_time = datetime.now()
         logger.info("Starting to parse execution history")
-        steps = parse_execution_history(all_events)
+        parser.add_events(new_events)
+        steps = parser.get_steps()
         parse_duration = (datetime.now() - parse_start_time).total_seconds()
         logger.info(f"Parsed execution history into {len(steps)} steps in {parse_duration:.2f} seconds")
         
@@ -151,6 +224,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             if 'error' not in execution_details and failed_steps:
                 execution_details['error'] = failed_steps[0]['error']
         
+        # Keep the parser for other executions and the full details for succeeded ones.
+        # Failed, timed out and aborted executions can still be redriven, which adds
+        # events to their history.
+        succeeded = execution_response['status'] == 'SUCCEEDED'
+        cache_execution(execution_arn, parser, execution_details if succeeded else None)
+        
         total_duration = (datetime.now() - start_time).total_seconds()
         logger.info(f"Successfully retrieved and processed execution details for {execution_arn} in {total_duration:.2f} seconds")
         return execution_details
@@ -173,36 +252,185 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'steps': []
         }
 
-def parse_execution_history(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+STATE_ENTERED_TYPES = ['TaskStateEntered', 'ChoiceStateEntered', 'PassStateEntered', 'WaitStateEntered', 'ParallelStateEntered', 'MapStateEntered']
+STATE_EXITED_TYPES = ['TaskStateExited', 'ChoiceStateExited', 'PassStateExited', 'WaitStateExited', 'ParallelStateExited', 'MapStateExited']
+
+# Internal step fields that are not returned to the UI
+INTERNAL_STEP_FIELDS = ['eventId', 'isMapState', 'isMapIteration', 'iterationIndex', 'parentMapName', 'isExecutionFailure']
+
+
+def format_task_failed_error(event: Dict[str, Any]) -> str:
+    """Format the error message of a TaskFailed event"""
+    task_failed_details = event.get('taskFailedEventDetails', {})
+    error_message = task_failed_details.get('error', 'Unknown error')
+    cause = task_failed_details.get('cause', '')
+    
+    # Enhanced error message formatting
+    if cause:
+        try:
+            # Try to parse cause as JSON for better formatting
+            cause_json = json.loads(cause)
+            if isinstance(cause_json, dict):
+                # Format Lambda errors nicely
+                if 'errorType' in cause_json and 'errorMessage' in cause_json:
+                    error_message = f"{cause_json['errorType']}: {cause_json['errorMessage']}"
+                    
+                    # Include stack trace if available
+                    if 'stackTrace' in cause_json and isinstance(cause_json['stackTrace'], list):
+                        stack_trace = '\n'.join([str(line) for line in cause_json['stackTrace']])
+                        error_message = f"{error_message}\n\nStack trace:\n{stack_trace}"
+                # Handle other error formats
+                elif 'message' in cause_json:
+                    error_message = cause_json['message']
+                else:
+                    # Just use the whole JSON as the message
+                    error_message = json.dumps(cause_json, indent=2)
+        except (json.JSONDecodeError, TypeError):
+            # If cause is not JSON, append it as-is
+            error_message = f"{error_message}: {cause}"
+    return error_message
+
+
+def format_task_timed_out_error(event: Dict[str, Any]) -> str:
+    """Format the error message of a TaskTimedOut event"""
+    timeout_details = event.get('taskTimedOutEventDetails', {})
+    error_message = f"Task timed out: {timeout_details.get('error', 'Timeout occurred')}"
+    cause = timeout_details.get('cause', '')
+    if cause:
+        try:
+            cause_json = json.loads(cause)
+            error_message = f"{error_message} - {json.dumps(cause_json, indent=2)}"
+        except (json.JSONDecodeError, TypeError):
+            error_message = f"{error_message} - {cause}"
+    return error_message
+
+
+def format_lambda_failed_error(event: Dict[str, Any]) -> str:
+    """Format the error message of a LambdaFunctionFailed event"""
+    lambda_failed_details = event.get('lambdaFunctionFailedEventDetails', {})
+    error_message = lambda_failed_details.get('error', 'Lambda function failed')
+    cause = lambda_failed_details.get('cause', '')
+    
+    # Enhanced Lambda error formatting
+    if cause:
+        try:
+            cause_json = json.loads(cause)
+            if isinstance(cause_json, dict):
+                if 'errorMessage' in cause_json:
+                    error_type = cause_json.get('errorType', 'Error')
+                    error_message = f"{error_type}: {cause_json['errorMessage']}"
+                    
+                    # Include stack trace if available
+                    if 'stackTrace' in cause_json and isinstance(cause_json['stackTrace'], list):
+                        stack_trace = '\n'.join([str(line) for line in cause_json['stackTrace']])
+                        error_message = f"{error_message}\n\nStack trace:\n{stack_trace}"
+                else:
+                    error_message = json.dumps(cause_json, indent=2)
+        except (json.JSONDecodeError, TypeError):
+            error_message = f"{error_message}: {cause}"
+    return error_message
+
+
+def format_error_with_cause(error: str, cause: str, indent: Optional[int] = None, use_message: bool = False) -> str:
+    """Format an error with the errorMessage (or message) of its JSON cause"""
+    error_message = error
+    if cause:
+        try:
+            # Try to parse cause as JSON for better formatting
+            cause_json = json.loads(cause)
+            if isinstance(cause_json, dict):
+                if 'errorMessage' in cause_json:
+                    error_message = f"{error}: {cause_json['errorMessage']}"
+                elif use_message and 'message' in cause_json:
+                    error_message = f"{error}: {cause_json['message']}"
+                else:
+                    error_message = f"{error}: {json.dumps(cause_json, indent=indent)}"
+        except (json.JSONDecodeError, TypeError):
+            # If cause is not JSON, append it as-is
+            error_message = f"{error}: {cause}"
+    return error_message
+
+
+class ExecutionHistoryParser:
     """
-    Parse Step Functions execution history events into step details with enhanced Map state support
+    Incremental parser of Step Functions execution history events into step details
     
-    Args:
-        events: List of execution history events
-        
-    Returns:
-        List of step details including Map state iterations
+    Events can be added in batches, in event ID order, as an execution progresses.
+    Every event ID is mapped to the step it belongs to by following previousEventId,
+    so state exits and task failures are attributed to their step with a dictionary
+    lookup instead of a scan of earlier events or steps.
     """
-    steps = []
-    step_map = {}
-    event_id_to_step = {}  # Map event IDs to step names for correlation
-    map_iterations = {}  # Track Map state iterations
     
-    # First pass: identify all states and their basic information
-    for event in events:
+    def __init__(self):
+        self.last_event_id = 0
+        self.step_map = {}
+        self.event_id_to_step = {}  # Map event IDs to step keys for correlation
+        self.map_iterations = {}  # Track Map state iterations
+        self.running_steps_by_name = {}  # Step name -> keys of running steps, in start order
+        self.running_iterations = {}  # (Map name, iteration index) -> keys of running iterations
+        self.last_task_step_key = None  # Most recent TaskStateEntered step
+    
+    def add_events(self, events: List[Dict[str, Any]]) -> None:
+        """
+        Add execution history events
+        
+        Args:
+            events: Events in ascending event ID order; events that were already
+                added are ignored
+        """
+        for event in events:
+            if event['id'] <= self.last_event_id:
+                continue
+            self._add_event(event)
+            self.last_event_id = event['id']
+    
+    def _find_step_key(self, event: Dict[str, Any]) -> Optional[str]:
+        """Find the step of an event from its previousEventId or scheduledEventId"""
+        step_key = self.event_id_to_step.get(event.get('previousEventId'))
+        if step_key is None and 'taskFailedEventDetails' in event:
+            step_key = self.event_id_to_step.get(event['taskFailedEventDetails'].get('scheduledEventId'))
+        return step_key
+    
+    def _find_running_step(self, event: Dict[str, Any], step_name: Optional[str]) -> Optional[str]:
+        """Find the running step an event belongs to"""
+        step_key = self._find_step_key(event)
+        if step_key and self.step_map.get(step_key, {}).get('status') == 'RUNNING':
+            return step_key
+        if step_name is None and self.last_task_step_key:
+            # Fall back to the most recent TaskStateEntered event before this one
+            step_name = self.step_map[self.last_task_step_key]['name']
+        running = self.running_steps_by_name.get(step_name)
+        return running[0] if running else None
+    
+    def _finish_step(self, step_key: str, status: str, timestamp: str) -> Dict[str, Any]:
+        """Mark a step as finished and remove it from the running steps"""
+        step_data = self.step_map[step_key]
+        step_data['status'] = status
+        step_data['stopDate'] = timestamp
+        running = self.running_steps_by_name.get(step_data['name'])
+        if running and step_key in running:
+            running.remove(step_key)
+        return step_data
+    
+    def _add_event(self, event: Dict[str, Any]) -> None:
         event_type = event['type']
         event_id = event['id']
         timestamp = event['timestamp'].isoformat()
         
+        # Events that follow a step's events belong to the same step
+        previous_step_key = self.event_id_to_step.get(event.get('previousEventId'))
+        if previous_step_key is not None:
+            self.event_id_to_step[event_id] = previous_step_key
+        
         # Handle state entered events
-        if event_type in ['TaskStateEntered', 'ChoiceStateEntered', 'PassStateEntered', 'WaitStateEntered', 'ParallelStateEntered', 'MapStateEntered']:
+        if event_type in STATE_ENTERED_TYPES:
             step_name = event['stateEnteredEventDetails']['name']
             step_type = event_type.replace('StateEntered', '')
             
             # Create unique key for this step instance
             step_key = f"{step_name}_{event_id}"
             
-            step_map[step_key] = {
+            self.step_map[step_key] = {
                 'name': step_name,
                 'type': step_type,
                 'status': 'RUNNING',
@@ -214,19 +442,23 @@ def parse_execution_history(events: List[Dict[str, Any]]) -> List[Dict[str, Any]
                 'eventId': event_id,
                 'isMapState': step_type == 'Map'
             }
-            event_id_to_step[event_id] = step_key
+            self.event_id_to_step[event_id] = step_key
+            self.running_steps_by_name.setdefault(step_name, []).append(step_key)
+            if event_type == 'TaskStateEntered':
+                self.last_task_step_key = step_key
             
         # Handle state exited events (successful completion)
-        elif event_type in ['TaskStateExited', 'ChoiceStateExited', 'PassStateExited', 'WaitStateExited', 'ParallelStateExited', 'MapStateExited']:
+        elif event_type in STATE_EXITED_TYPES:
             step_name = event['stateExitedEventDetails']['name']
             
-            # Find the corresponding step by name and update it
-            for step_key, step_data in step_map.items():
-                if step_data['name'] == step_name and step_data['status'] == 'RUNNING':
-                    step_data['status'] = 'SUCCEEDED'
-                    step_data['stopDate'] = timestamp
-                    step_data['output'] = event['stateExitedEventDetails'].get('output')
-                    break
+            # Find the corresponding running step and update it
+            step_key = self._find_step_key(event)
+            if not (step_key and self.step_map[step_key]['name'] == step_name and self.step_map[step_key]['status'] == 'RUNNING'):
+                running = self.running_steps_by_name.get(step_name)
+                step_key = running[0] if running else None
+            if step_key:
+                step_data = self._finish_step(step_key, 'SUCCEEDED', timestamp)
+                step_data['output'] = event['stateExitedEventDetails'].get('output')
                     
         # Handle Map iteration events
         elif event_type == 'MapIterationStarted':
@@ -237,7 +469,7 @@ def parse_execution_history(events: List[Dict[str, Any]]) -> List[Dict[str, Any]
             # Create a unique key for this iteration
             iteration_key = f"{map_name}_iteration_{iteration_index}_{event_id}"
             
-            step_map[iteration_key] = {
+            self.step_map[iteration_key] = {
                 'name': f"{map_name} (Iteration {iteration_index + 1})",
                 'type': 'MapIteration',
                 'status': 'RUNNING',
@@ -253,211 +485,65 @@ def parse_execution_history(events: List[Dict[str, Any]]) -> List[Dict[str, Any]
             }
             
             # Track iterations for the parent Map state
-            if map_name not in map_iterations:
-                map_iterations[map_name] = []
-            map_iterations[map_name].append(iteration_key)
+            self.map_iterations.setdefault(map_name, []).append(iteration_key)
+            self.running_iterations.setdefault((map_name, iteration_index), []).append(iteration_key)
             
-        elif event_type == 'MapIterationSucceeded':
-            iteration_details = event.get('mapIterationSucceededEventDetails', {})
+        elif event_type in ('MapIterationSucceeded', 'MapIterationFailed'):
+            succeeded = event_type == 'MapIterationSucceeded'
+            details_key = 'mapIterationSucceededEventDetails' if succeeded else 'mapIterationFailedEventDetails'
+            iteration_details = event.get(details_key, {})
             map_name = iteration_details.get('name', 'Unknown')
             iteration_index = iteration_details.get('index', 0)
             
             # Find and update the corresponding iteration
-            for step_key, step_data in step_map.items():
-                if (step_data.get('parentMapName') == map_name and 
-                    step_data.get('iterationIndex') == iteration_index and 
-                    step_data['status'] == 'RUNNING'):
-                    step_data['status'] = 'SUCCEEDED'
-                    step_data['stopDate'] = timestamp
+            running = self.running_iterations.get((map_name, iteration_index))
+            if running:
+                step_data = self.step_map[running.pop(0)]
+                step_data['status'] = 'SUCCEEDED' if succeeded else 'FAILED'
+                step_data['stopDate'] = timestamp
+                if succeeded:
                     step_data['output'] = iteration_details.get('output')
-                    break
-                    
-        elif event_type == 'MapIterationFailed':
-            iteration_details = event.get('mapIterationFailedEventDetails', {})
-            map_name = iteration_details.get('name', 'Unknown')
-            iteration_index = iteration_details.get('index', 0)
-            error = iteration_details.get('error', 'Map iteration failed')
-            cause = iteration_details.get('cause', '')
-            
-            # Format error message with cause if available
-            error_message = error
-            if cause:
-                try:
-                    # Try to parse cause as JSON for better formatting
-                    cause_json = json.loads(cause)
-                    if isinstance(cause_json, dict):
-                        if 'errorMessage' in cause_json:
-                            error_message = f"{error}: {cause_json['errorMessage']}"
-                        elif 'message' in cause_json:
-                            error_message = f"{error}: {cause_json['message']}"
-                        else:
-                            error_message = f"{error}: {json.dumps(cause_json)}"
-                except (json.JSONDecodeError, TypeError):
-                    # If cause is not JSON, append it as-is
-                    error_message = f"{error}: {cause}"
-            
-            # Find and update the corresponding iteration
-            for step_key, step_data in step_map.items():
-                if (step_data.get('parentMapName') == map_name and 
-                    step_data.get('iterationIndex') == iteration_index and 
-                    step_data['status'] == 'RUNNING'):
-                    step_data['status'] = 'FAILED'
-                    step_data['stopDate'] = timestamp
-                    step_data['error'] = error_message
-                    break
+                else:
+                    step_data['error'] = format_error_with_cause(
+                        iteration_details.get('error', 'Map iteration failed'),
+                        iteration_details.get('cause', ''),
+                        use_message=True,
+                    )
                     
-        # Handle task failure events
-        elif event_type == 'TaskFailed':
+        # Handle task and Lambda function failure events
+        elif event_type in ['TaskFailed', 'TaskTimedOut', 'TaskAborted', 'LambdaFunctionFailed']:
             # Log basic failure info without full event serialization
-            logger.debug(f"Processing TaskFailed event ID: {event.get('id')}")
-            
-            step_name = find_step_name_for_failure_event(event, events, event_id_to_step)
-            step_key = None
-            
-            # Find the corresponding step
-            if step_name:
-                for key, data in step_map.items():
-                    if data['name'] == step_name and data['status'] == 'RUNNING':
-                        step_key = key
-                        break
+            logger.debug(f"Processing {event_type} event ID: {event_id}")
             
+            step_key = self._find_running_step(event, None)
             if step_key:
-                step_map[step_key]['status'] = 'FAILED'
-                step_map[step_key]['stopDate'] = timestamp
-                
-                # Extract error details
-                task_failed_details = event.get('taskFailedEventDetails', {})
-                error_message = task_failed_details.get('error', 'Unknown error')
-                cause = task_failed_details.get('cause', '')
-                
-                # Enhanced error message formatting
-                if cause:
-                    try:
-                        # Try to parse cause as JSON for better formatting
-                        cause_json = json.loads(cause)
-                        if isinstance(cause_json, dict):
-                            # Format Lambda errors nicely
-                            if 'errorType' in cause_json and 'errorMessage' in cause_json:
-                                error_message = f"{cause_json['errorType']}: {cause_json['errorMessage']}"
-                                
-                                # Include stack trace if available
-                                if 'stackTrace' in cause_json and isinstance(cause_json['stackTrace'], list):
-                                    stack_trace = '\n'.join([str(line) for line in cause_json['stackTrace']])
-                                    error_message = f"{error_message}\n\nStack trace:\n{stack_trace}"
-                            # Handle other error formats
-                            elif 'message' in cause_json:
-                                error_message = cause_json['message']
-                            else:
-                                # Just use the whole JSON as the message
-                                error_message = json.dumps(cause_json, indent=2)
-                    except (json.JSONDecodeError, TypeError):
-                        # If cause is not JSON, append it as-is
-                        error_message = f"{error_message}: {cause}"
-                
-                step_map[step_key]['error'] = error_message
-                logger.info(f"Processed failure for step '{step_name}': {error_message}")
-            else:
-                logger.warning(f"Could not find step for TaskFailed event: {event['id']}")
-                
-        # Handle other failure events
-        elif event_type in ['TaskTimedOut', 'TaskAborted']:
-            step_name = find_step_name_for_failure_event(event, events, event_id_to_step)
-            step_key = None
-            
-            # Find the corresponding step
-            if step_name:
-                for key, data in step_map.items():
-                    if data['name'] == step_name and data['status'] == 'RUNNING':
-                        step_key = key
-                        break
-            
-            if step_key:
-                step_map[step_key]['status'] = 'FAILED'
-                step_map[step_key]['stopDate'] = timestamp
-                
-                if event_type == 'TaskTimedOut':
-                    timeout_details = event.get('taskTimedOutEventDetails', {})
-                    error_message = f"Task timed out: {timeout_details.get('error', 'Timeout occurred')}"
-                    cause = timeout_details.get('cause', '')
-                    if cause:
-                        try:
-                            cause_json = json.loads(cause)
-                            error_message = f"{error_message} - {json.dumps(cause_json, indent=2)}"
-                        except (json.JSONDecodeError, TypeError):
-                            error_message = f"{error_message} - {cause}"
+                if event_type == 'TaskFailed':
+                    error_message = format_task_failed_error(event)
+                elif event_type == 'TaskTimedOut':
+                    error_message = format_task_timed_out_error(event)
                 elif event_type == 'TaskAborted':
                     error_message = "Task was aborted"
-                    
-                step_map[step_key]['error'] = error_message
-                logger.info(f"Processed {event_type} for step '{step_name}': {error_message}")
-            else:
-                logger.warning(f"Could not find step for {event_type} event: {event['id']}")
+                else:
+                    error_message = format_lambda_failed_error(event)
                 
-        # Handle Lambda function failure events
-        elif event_type == 'LambdaFunctionFailed':
-            step_name = find_step_name_for_failure_event(event, events, event_id_to_step)
-            step_key = None
-            
-            # Find the corresponding step
-            if step_name:
-                for key, data in step_map.items():
-                    if data['name'] == step_name and data['status'] == 'RUNNING':
-                        step_key = key
-                        break
-            
-            if step_key:
-                step_map[step_key]['status'] = 'FAILED'
-                step_map[step_key]['stopDate'] = timestamp
-                
-                lambda_failed_details = event.get('lambdaFunctionFailedEventDetails', {})
-                error_message = lambda_failed_details.get('error', 'Lambda function failed')
-                cause = lambda_failed_details.get('cause', '')
-                
-                # Enhanced Lambda error formatting
-                if cause:
-                    try:
-                        cause_json = json.loads(cause)
-                        if isinstance(cause_json, dict):
-                            if 'errorMessage' in cause_json:
-                                error_type = cause_json.get('errorType', 'Error')
-                                error_message = f"{error_type}: {cause_json['errorMessage']}"
-                                
-                                # Include stack trace if available
-                                if 'stackTrace' in cause_json and isinstance(cause_json['stackTrace'], list):
-                                    stack_trace = '\n'.join([str(line) for line in cause_json['stackTrace']])
-                                    error_message = f"{error_message}\n\nStack trace:\n{stack_trace}"
-                            else:
-                                error_message = json.dumps(cause_json, indent=2)
-                    except (json.JSONDecodeError, TypeError):
-                        error_message = f"{error_message}: {cause}"
-                    
-                step_map[step_key]['error'] = error_message
-                logger.info(f"Processed Lambda failure for step '{step_name}': {error_message}")
+                step_data = self._finish_step(step_key, 'FAILED', timestamp)
+                step_data['error'] = error_message
+                logger.info(f"Processed {event_type} for step '{step_data['name']}': {error_message}")
             else:
-                logger.warning(f"Could not find step for LambdaFunctionFailed event: {event['id']}")
+                logger.warning(f"Could not find step for {event_type} event: {event_id}")
                 
         # Handle execution failed event
         elif event_type == 'ExecutionFailed':
             execution_failed_details = event.get('executionFailedEventDetails', {})
-            error = execution_failed_details.get('error', 'Execution failed')
-            cause = execution_failed_details.get('cause', '')
-            
-            # Format error message
-            error_message = error
-            if cause:
-                try:
-                    cause_json = json.loads(cause)
-                    if isinstance(cause_json, dict):
-                        if 'errorMessage' in cause_json:
-                            error_message = f"{error}: {cause_json['errorMessage']}"
-                        else:
-                            error_message = f"{error}: {json.dumps(cause_json, indent=2)}"
-                except (json.JSONDecodeError, TypeError):
-                    error_message = f"{error}: {cause}"
+            error_message = format_error_with_cause(
+                execution_failed_details.get('error', 'Execution failed'),
+                execution_failed_details.get('cause', ''),
+                indent=2,
+            )
             
             # Store execution failure in a special step
             execution_failed_key = f"ExecutionFailed_{event_id}"
-            step_map[execution_failed_key] = {
+            self.step_map[execution_failed_key] = {
                 'name': 'Execution',
                 'type': 'Execution',
                 'status': 'FAILED',
@@ -471,103 +557,51 @@ def parse_execution_history(events: List[Dict[str, Any]]) -> List[Dict[str, Any]
             }
             logger.info(f"Processed ExecutionFailed event: {error_message}")
     
-    # Second pass: enhance Map states with iteration information
-    for step_key, step_data in step_map.items():
-        if step_data.get('isMapState') and step_data['name'] in map_iterations:
-            iterations = map_iterations[step_data['name']]
-            step_data['mapIterations'] = len(iterations)
-            step_data['mapIterationDetails'] = [step_map[iter_key] for iter_key in iterations if iter_key in step_map]
-            
-            # If any iteration failed, mark the Map state as failed
-            if any(step_map[iter_key]['status'] == 'FAILED' for iter_key in iterations if iter_key in step_map):
-                step_data['status'] = 'FAILED'
-                # Collect errors from failed iterations
-                failed_iterations = [step_map[iter_key] for iter_key in iterations 
-                                    if iter_key in step_map and step_map[iter_key]['status'] == 'FAILED']
+    def get_steps(self) -> List[Dict[str, Any]]:
+        """
+        Get the step details for the events added so far
+        
+        Returns:
+            List of step details including Map state iterations, sorted by start time
+        """
+        # Copy the steps so that parser state is not changed by the summary
+        step_map = {step_key: dict(step_data) for step_key, step_data in self.step_map.items()}
+        
+        # Enhance Map states with iteration information
+        for step_key, step_data in step_map.items():
+            if step_data.get('isMapState') and step_data['name'] in self.map_iterations:
+                iterations = [step_map[iter_key] for iter_key in self.map_iterations[step_data['name']] if iter_key in step_map]
+                step_data['mapIterations'] = len(self.map_iterations[step_data['name']])
+                step_data['mapIterationDetails'] = iterations
+                
+                # If any iteration failed, mark the Map state as failed
+                failed_iterations = [iteration for iteration in iterations if iteration['status'] == 'FAILED']
                 if failed_iterations:
-                    step_data['error'] = f"Map state failed: {len(failed_iterations)} of {len(iterations)} iterations failed"
-    
-    # Convert to list and sort by start time
-    steps = list(step_map.values())
-    steps.sort(key=lambda x: x['startDate'] if x['startDate'] else '')
-    
-    # Clean up internal fields that shouldn't be exposed
-    for step in steps:
-        step.pop('eventId', None)
-        step.pop('isMapState', None)
-        step.pop('isMapIteration', None)
-        step.pop('iterationIndex', None)
-        step.pop('parentMapName', None)
-        step.pop('isExecutionFailure', None)
-    
-    return steps
+                    step_data['status'] = 'FAILED'
+                    step_data['error'] = f"Map state failed: {len(failed_iterations)} of {len(self.map_iterations[step_data['name']])} iterations failed"
+        
+        # Convert to list and sort by start time
+        steps = list(step_map.values())
+        steps.sort(key=lambda x: x['startDate'] if x['startDate'] else '')
+        
+        # Clean up internal fields that shouldn't be exposed
+        for step in steps:
+            for field in INTERNAL_STEP_FIELDS:
+                step.pop(field, None)
+        
+        return steps
 
-def find_step_name_for_failure_event(failure_event: Dict[str, Any], all_events: List[Dict[str, Any]], event_id_to_step: Dict[int, str]) -> Optional[str]:
+
+def parse_execution_history(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Find the step name associated with a failure event by correlating with previous events
+    Parse Step Functions execution history events into step details with enhanced Map state support
     
     Args:
-        failure_event: The failure event
-        all_events: All execution history events
-        event_id_to_step: Mapping of event IDs to step names
+        events: List of execution history events
         
     Returns:
-        Step name if found, None otherwise
+        List of step details including Map state iterations
     """
-    try:
-        failure_event_id = failure_event['id']
-        failure_event_type = failure_event['type']
-        logger.debug(f"Finding step name for {failure_event_type} event ID {failure_event_id}")
-        
-        # Try to get the step name from previousEventId correlation
-        previous_event_id = failure_event.get('previousEventId')
-        if previous_event_id and previous_event_id in event_id_to_step:
-            step_key = event_id_to_step[previous_event_id]
-            logger.debug(f"Found step key {step_key} from previous event ID {previous_event_id}")
-            return step_key
-        
-        # If we have a scheduled event ID, try to use that
-        if 'taskFailedEventDetails' in failure_event and 'scheduledEventId' in failure_event['taskFailedEventDetails']:
-            scheduled_event_id = failure_event['taskFailedEventDetails']['scheduledEventId']
-            if scheduled_event_id in event_id_to_step:
-                step_key = event_id_to_step[scheduled_event_id]
-                logger.debug(f"Found step key {step_key} from scheduled event ID {scheduled_event_id}")
-                return step_key
-            
-        # Alternative approach: look for the most recent TaskStateEntered event before this failure
-        logger.debug(f"Searching for most recent TaskStateEntered event before failure event {failure_event_id}")
-        for event in reversed(all_events):
-            if event['id'] >= failure_event_id:
-                continue
-            if event['type'] == 'TaskStateEntered':
-                step_name = event['stateEnteredEventDetails']['name']
-                logger.debug(f"Found most recent TaskStateEntered event with step name {step_name}")
-                return f"{step_name}_{event['id']}"
-                
-        # Fallback: try to extract from task details if available
-        if 'taskFailedEventDetails' in failure_event:
-            resource = failure_event['taskFailedEventDetails'].get('resource', '')
-            if resource:
-                # Extract step name from resource ARN if possible
-                # This is a best-effort approach
-                parts = resource.split(':')
-                if len(parts) > 1:
-                    step_name = parts[-1].split('/')[-1]
-                    logger.debug(f"Extracted step name {step_name} from resource ARN")
-                    # Since we don't have an event ID, create a synthetic one
-                    return f"{step_name}_synthetic_{failure_event_id}"
-        
-        # If we still don't have a step name, look for any running step
-        logger.debug("Searching for any running step that might be associated with this failure")
-        for step_key, step_id in event_id_to_step.items():
-            if step_key and step_id:
-                logger.debug(f"Found potential step key {step_key}")
-                return step_key
-                    
-        logger.warning(f"Could not find step name for failure event ID {failure_event_id}")
-        return None
-            
-    except Exception as e:
-        logger.warning(f"Error finding step name for failure event: {str(e)}")
-        logger.warning(f"Error details: {traceback.format_exc()}")
-        return None
+    parser = ExecutionHistoryParser()
+    parser.add_events(events)
+    return parser.get_steps()
@@ -5,7 +5,7 @@ import pytest
 import json
 from datetime import datetime
 from unittest.mock import Mock, patch
-from index import parse_execution_history, find_step_name_for_failure_event
+from index import parse_execution_history
 
 @pytest.mark.unit
 def test_parse_execution_history_with_failure():
@@ -96,43 +96,6 @@ def test_parse_execution_history_with_success():
     assert step['error'] is None
     assert step['output'] == '{"classification": "invoice"}'
 
-@pytest.mark.unit
-def test_find_step_name_for_failure_event():
-    """Test that find_step_name_for_failure_event correctly identifies the failed step"""
-    
-    failure_event = {
-        'id': 3,
-        'type': 'TaskFailed',
-        'previousEventId': 2,
-        'taskFailedEventDetails': {
-            'error': 'ValidationException',
-            'cause': 'Invalid input'
-        }
-    }
-    
-    all_events = [
-        {
-            'id': 1,
-            'type': 'ExecutionStarted',
-            'timestamp': datetime(2024, 1, 1, 10, 0, 0)
-        },
-        {
-            'id': 2,
-            'type': 'TaskStateEntered',
-            'timestamp': datetime(2024, 1, 1, 10, 0, 1),
-            'stateEnteredEventDetails': {
-                'name': 'ClassificationStep'
-            }
-        },
-        failure_event
-    ]
-    
-    event_id_to_step = {2: 'ClassificationStep'}
-    
-    step_name = find_step_name_for_failure_event(failure_event, all_events, event_id_to_step)
-    
-    assert step_name == 'ClassificationStep'
-
 @pytest.mark.unit
 def test_parse_execution_history_with_timeout():
     """Test that parse_execution_history correctly handles task timeouts"""
@@ -246,3 +209,102 @@ def test_parse_execution_history_multiple_steps():
     assert classification_step['name'] == 'ClassificationStep'
     assert classification_step['status'] == 'FAILED'
     assert classification_step['error'] == 'ValidationException: Invalid document format'
+
+
+def _history_event(event_id, event_type, previous_event_id=None, **details):
+    event = {
+        'id': event_id,
+        'type': event_type,
+        'timestamp': datetime(2024, 1, 1, 10, 0, event_id),
+    }
+    if previous_event_id is not None:
+        event['previousEventId'] = previous_event_id
+    event.update(details)
+    return event
+
+
+class FakeStepFunctions:
+    """Step Functions client returning a growing execution history"""
+
+    def __init__(self, events, status='RUNNING', page_size=2):
+        self.events = events
+        self.status = status
+        self.page_size = page_size
+        self.history_calls = []
+        self.describe_calls = 0
+
+    def describe_execution(self, executionArn):
+        self.describe_calls += 1
+        return {
+            'executionArn': executionArn,
+            'status': self.status,
+            'startDate': datetime(2024, 1, 1, 10, 0, 0),
+        }
+
+    def get_execution_history(self, executionArn, maxResults, reverseOrder, nextToken=None):
+        self.history_calls.append(nextToken)
+        ordered = list(reversed(self.events)) if reverseOrder else list(self.events)
+        start = int(nextToken or 0)
+        response = {'events': ordered[start:start + self.page_size]}
+        if start + self.page_size < len(ordered):
+            response['nextToken'] = str(start + self.page_size)
+        return response
+
+
+@pytest.mark.unit
+def test_lambda_handler_fetches_only_new_events():
+    """Test that repeated requests parse only new events and succeeded executions are cached"""
+    import index
+
+    events = [
+        _history_event(1, 'ExecutionStarted'),
+        _history_event(2, 'TaskStateEntered', 1, stateEnteredEventDetails={'name': 'OCRStep'}),
+        _history_event(3, 'TaskScheduled', 2),
+        _history_event(4, 'TaskStarted', 3),
+    ]
+    client = FakeStepFunctions(events)
+    request = {'arguments': {'executionArn': 'arn:execution:test'}}
+    index._execution_cache.clear()
+
+    with patch.object(index, 'stepfunctions', client):
+        first = index.lambda_handler(request, None)
+        assert first['steps'][0]['status'] == 'RUNNING'
+        assert client.history_calls == [None, '2']
+
+        # The step fails; only the new events are read
+        events.append(_history_event(5, 'TaskFailed', 4, taskFailedEventDetails={'error': 'Boom', 'cause': 'bad input'}))
+        events.append(_history_event(6, 'ExecutionFailed', 5, executionFailedEventDetails={'error': 'Boom'}))
+        client.status = 'FAILED'
+        client.history_calls = []
+        second = index.lambda_handler(request, None)
+        # Two new events, read newest first, stop at the first known event;
+        # a full read of the six events would need three pages
+        assert client.history_calls == [None, '2']
+        ocr_step = next(step for step in second['steps'] if step['name'] == 'OCRStep')
+        assert ocr_step['status'] == 'FAILED'
+        assert ocr_step['error'] == 'Boom: bad input'
+
+        # Failed executions can be redriven, so they are checked again
+        client.describe_calls = 0
+        client.history_calls = []
+        third = index.lambda_handler(request, None)
+        assert third == second
+        assert client.describe_calls == 1
+        assert client.history_calls == [None]
+
+        # The redriven execution succeeds
+        events.append(_history_event(7, 'ExecutionRedriven', 6))
+        events.append(_history_event(8, 'ExecutionSucceeded', 7))
+        client.status = 'SUCCEEDED'
+        fourth = index.lambda_handler(request, None)
+        assert fourth['status'] == 'SUCCEEDED'
+
+        # Succeeded executions are returned from the cache without API calls
+        client.describe_calls = 0
+        client.history_calls = []
+        fifth = index.lambda_handler(request, None)
+        assert fifth == fourth
+        assert client.describe_calls == 0
+        assert client.history_calls == []
+
+    index._execution_cache.clear()
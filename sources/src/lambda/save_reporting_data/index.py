@@ -23,7 +23,8 @@ def handler(event, context):
     Lambda handler for saving document evaluation data to the reporting bucket.
     
     Args:
-        event: Lambda event containing document data, reporting bucket name, and data_to_save
+        event: Lambda event containing document data (or a compressed document
+            reference), reporting bucket name, and data_to_save
         context: Lambda context
         
     Returns:
@@ -61,8 +62,10 @@ def handler(event, context):
                 'body': warning_msg
             }
             
-        # Convert document dict to Document object
-        document = Document.from_dict(document_dict)
+        # Convert document dict or compressed document reference to Document object
+        document = Document.load_document(
+            document_dict, os.environ.get('WORKING_BUCKET'), logger
+        )
         
         # Get the database name from event or environment variable
         # The database name is typically in the format: {stackname}-reporting-db
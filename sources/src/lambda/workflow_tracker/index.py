@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT-0
 
 import boto3
+import dataclasses
 import json
 import os
 from datetime import datetime, timezone
@@ -19,6 +20,7 @@ logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_
 METRIC_NAMESPACE = os.environ['METRIC_NAMESPACE']
 REPORTING_BUCKET = os.environ.get('REPORTING_BUCKET')
 SAVE_REPORTING_FUNCTION_NAME = os.environ.get('SAVE_REPORTING_FUNCTION_NAME')
+WORKING_BUCKET = os.environ.get('WORKING_BUCKET')
 
 dynamodb = boto3.resource('dynamodb')
 cloudwatch = boto3.client('cloudwatch')
@@ -49,6 +51,8 @@ def update_document_completion(object_key: str, workflow_status: str, output_dat
         completion_time=datetime.now(timezone.utc).isoformat()
     )
     
+    initial_event_time = None
+
     # Get sections, pages, and metering data if workflow succeeded
     if workflow_status == 'SUCCEEDED' and output_data:
         try:
@@ -60,6 +64,7 @@ def update_document_completion(object_key: str, workflow_status: str, output_dat
             processed_doc = Document.load_document(document_data, working_bucket, logger)
             
             # Copy data from processed document to our update document
+            initial_event_time = processed_doc.initial_event_time
             document.num_pages = processed_doc.num_pages
             document.pages = processed_doc.pages
             document.sections = processed_doc.sections
@@ -90,23 +95,7 @@ def update_document_completion(object_key: str, workflow_status: str, output_dat
         
         if data_to_save:
             try:
-                logger.info(f"Saving reporting data ({', '.join(data_to_save)}) to {REPORTING_BUCKET} by calling Lambda {SAVE_REPORTING_FUNCTION_NAME}")
-                lambda_response = lambda_client.invoke(
-                    FunctionName=SAVE_REPORTING_FUNCTION_NAME,
-                    InvocationType='RequestResponse',
-                    Payload=json.dumps({
-                        'document': document.to_dict(),
-                        'reporting_bucket': REPORTING_BUCKET,
-                        'data_to_save': data_to_save
-                    })
-                )
-                
-                # Check the response
-                response_payload = json.loads(lambda_response['Payload'].read().decode('utf-8'))
-                if response_payload.get('statusCode') != 200:
-                    logger.warning(f"SaveReportingData Lambda returned non-200 status: {response_payload}")
-                else:
-                    logger.info("SaveReportingData Lambda executed successfully")
+                invoke_save_reporting_data(document, data_to_save, initial_event_time)
             except Exception as e:
                 logger.error(f"Error invoking SaveReportingData Lambda: {str(e)}")
                 # Continue execution - don't fail the entire function if reporting fails
@@ -116,6 +105,35 @@ def update_document_completion(object_key: str, workflow_status: str, output_dat
     return updated_doc
 
 
+def invoke_save_reporting_data(document: Document, data_to_save: list, initial_event_time: Optional[str] = None) -> None:
+    """
+    Start the SaveReportingData Lambda asynchronously for a completed document
+    
+    The document is passed as a compressed reference in the working bucket, so the
+    payload stays small for large documents, and the tracker does not wait for the
+    Parquet files to be written. The reporting keys are derived from the document's
+    initial event time, so a retried invocation overwrites the same files.
+    
+    Args:
+        document: The completed document
+        data_to_save: Data types to save (metering, sections)
+        initial_event_time: Time the document was first received, used for partitioning
+    """
+    reporting_doc = dataclasses.replace(document, initial_event_time=initial_event_time or document.initial_event_time)
+    document_data = reporting_doc.serialize_document(WORKING_BUCKET, 'reporting', logger)
+    
+    logger.info(f"Saving reporting data ({', '.join(data_to_save)}) to {REPORTING_BUCKET} by invoking Lambda {SAVE_REPORTING_FUNCTION_NAME} asynchronously")
+    lambda_client.invoke(
+        FunctionName=SAVE_REPORTING_FUNCTION_NAME,
+        InvocationType='Event',
+        Payload=json.dumps({
+            'document': document_data,
+            'reporting_bucket': REPORTING_BUCKET,
+            'data_to_save': data_to_save
+        })
+    )
+
+
 def put_latency_metrics(document: Document) -> None:
     """
     Publish latency metrics to CloudWatch